@@ -1,8 +1,12 @@
 """Market hours utility for Indian equity markets."""
 
-from datetime import datetime, time
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Tuple
 
+IST = timezone(timedelta(hours=5, minutes=30))
+MARKET_OPEN = time(9, 15, 0)
+MARKET_CLOSE = time(15, 30, 0)
+
 
 def is_market_open(now: datetime = None) -> bool:
     """
@@ -24,11 +28,28 @@ def is_market_open(now: datetime = None) -> bool:
         return False
     
     # Market hours: 9:15 AM to 3:30 PM IST
-    market_open = time(9, 15, 0)
-    market_close = time(15, 30, 0)
-    
     current_time = now.time()
-    return market_open <= current_time < market_close  # Market closes AT 3:30, so < not <=
+    return MARKET_OPEN <= current_time < MARKET_CLOSE  # Market closes AT 3:30, so < not <=
+
+
+def get_session_date(now: datetime = None) -> date:
+    """
+    Get the trading session a timestamp belongs to.
+
+    Sessions are IST calendar days; timezone-aware timestamps are converted to
+    IST first, naive ones are taken as IST like is_market_open().
+
+    Args:
+        now: Optional datetime to check. Defaults to current time.
+
+    Returns:
+        Session date (changes at IST midnight, well outside market hours)
+    """
+    if now is None:
+        now = datetime.now()
+    if now.tzinfo is not None:
+        now = now.astimezone(IST)
+    return now.date()
 
 
 def get_market_status(now: datetime = None) -> Tuple[bool, str]:
@@ -51,7 +72,7 @@ def get_market_status(now: datetime = None) -> Tuple[bool, str]:
     else:
         if now.weekday() >= 5:
             return False, "Market is CLOSED (Weekend)"
-        elif now.time() < time(9, 15, 0):
+        elif now.time() < MARKET_OPEN:
             return False, "Market is CLOSED (Pre-market hours)"
         else:
             return False, "Market is CLOSED (Post-market hours)"
@@ -6,22 +6,102 @@ trading system to operate in virtual time during historical replay.
 
 from datetime import datetime, timezone
 from typing import Optional
+import logging
 import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+VIRTUAL_TIME_ENABLED_KEY = "system:virtual_time:enabled"
+VIRTUAL_TIME_CURRENT_KEY = "system:virtual_time:current"
+# Broadcast on every change: an ISO timestamp, or "" when virtual time is cleared
+VIRTUAL_TIME_CHANNEL = "system:virtual_time:updates"
+
+# Minimum event-time step between virtual clock updates from replayers
+VIRTUAL_TIME_STEP_SECONDS = float(os.getenv("VIRTUAL_TIME_STEP_SECONDS", "1.0"))
+
+
+def _decode(value) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
 
 
 class TimeService:
-    """Centralized time service supporting both real and virtual time."""
+    """Centralized time service supporting both real and virtual time.
+
+    With a Redis client, the virtual clock is cached in process and kept in
+    sync by a pub/sub listener on VIRTUAL_TIME_CHANNEL, so now() is a memory
+    read. Until the subscription is up (or if the client cannot subscribe)
+    now() reads the Redis keys directly, as before.
+    """
     
-    def __init__(self, redis_client=None):
+    def __init__(self, redis_client=None, subscribe: bool = True):
         """Initialize time service.
         
         Args:
             redis_client: Redis client for time synchronization across containers
+            subscribe: Follow virtual time updates via pub/sub instead of
+                       reading Redis on every now()
         """
         self.redis_client = redis_client
         self._virtual_time: Optional[datetime] = None
         self._use_virtual_time = False
-    
+        self._synced = False
+        self._pubsub = None
+        self._listener: Optional[threading.Thread] = None
+        if redis_client is not None and subscribe and hasattr(redis_client, "pubsub"):
+            self._start_sync()
+
+    def _apply(self, value: Optional[str]) -> None:
+        """Update the local clock from a broadcast or stored value."""
+        if value:
+            self._virtual_time = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            self._use_virtual_time = True
+        else:
+            self._use_virtual_time = False
+            self._virtual_time = None
+
+    def _load_from_redis(self) -> None:
+        enabled = _decode(self.redis_client.get(VIRTUAL_TIME_ENABLED_KEY))
+        current = _decode(self.redis_client.get(VIRTUAL_TIME_CURRENT_KEY)) if enabled == "1" else None
+        self._apply(current)
+
+    def _subscribe(self) -> None:
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(VIRTUAL_TIME_CHANNEL)
+        # Load after subscribing so no update between the two is missed
+        self._load_from_redis()
+        self._pubsub = pubsub
+        self._synced = True
+
+    def _start_sync(self) -> None:
+        try:
+            self._subscribe()
+        except Exception as e:
+            logger.debug(f"Virtual time pub/sub unavailable, reading Redis per call: {e}")
+            return
+        self._listener = threading.Thread(target=self._listen, name="virtual-time-sync", daemon=True)
+        self._listener.start()
+
+    def _listen(self) -> None:
+        """Apply broadcasts; on connection loss fall back to Redis reads and resubscribe."""
+        while True:
+            try:
+                for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply(_decode(message.get("data")))
+            except Exception as e:
+                logger.warning(f"Virtual time subscription lost: {e}")
+            self._synced = False
+            while not self._synced:
+                time.sleep(1.0)
+                try:
+                    self._subscribe()
+                except Exception:
+                    continue
+
     def set_virtual_time(self, timestamp: datetime | str) -> None:
         """Set the current virtual time for the system.
         
@@ -34,17 +114,19 @@ class TimeService:
         self._virtual_time = timestamp
         self._use_virtual_time = True
         
-        # Sync to Redis for cross-container coordination
+        # Sync to Redis for cross-container coordination (one round trip)
         if self.redis_client:
             try:
-                self.redis_client.set(
-                    "system:virtual_time:enabled",
-                    "1"
-                )
-                self.redis_client.set(
-                    "system:virtual_time:current",
-                    timestamp.isoformat()
-                )
+                value = timestamp.isoformat()
+                if hasattr(self.redis_client, "pipeline"):
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.set(VIRTUAL_TIME_ENABLED_KEY, "1")
+                    pipe.set(VIRTUAL_TIME_CURRENT_KEY, value)
+                    pipe.publish(VIRTUAL_TIME_CHANNEL, value)
+                    pipe.execute()
+                else:
+                    self.redis_client.set(VIRTUAL_TIME_ENABLED_KEY, "1")
+                    self.redis_client.set(VIRTUAL_TIME_CURRENT_KEY, value)
             except Exception:
                 pass
     
@@ -55,8 +137,10 @@ class TimeService:
         
         if self.redis_client:
             try:
-                self.redis_client.delete("system:virtual_time:enabled")
-                self.redis_client.delete("system:virtual_time:current")
+                self.redis_client.delete(VIRTUAL_TIME_ENABLED_KEY)
+                self.redis_client.delete(VIRTUAL_TIME_CURRENT_KEY)
+                if hasattr(self.redis_client, "publish"):
+                    self.redis_client.publish(VIRTUAL_TIME_CHANNEL, "")
             except Exception:
                 pass
     
@@ -66,20 +150,21 @@ class TimeService:
         Returns:
             Current datetime (virtual if set, otherwise real)
         """
-        # Check Redis first for cross-container sync
-        if self.redis_client:
+        # Without a live subscription, check Redis for cross-container sync
+        if self.redis_client and not self._synced:
             try:
-                enabled = self.redis_client.get("system:virtual_time:enabled")
-                if enabled and enabled.decode() == "1":
-                    vtime = self.redis_client.get("system:virtual_time:current")
+                enabled = _decode(self.redis_client.get(VIRTUAL_TIME_ENABLED_KEY))
+                if enabled == "1":
+                    vtime = _decode(self.redis_client.get(VIRTUAL_TIME_CURRENT_KEY))
                     if vtime:
-                        return datetime.fromisoformat(vtime.decode())
+                        return datetime.fromisoformat(vtime)
             except Exception:
                 pass
         
-        # Fall back to local virtual time
-        if self._use_virtual_time and self._virtual_time:
-            return self._virtual_time
+        # Local virtual time (kept current by the subscription when synced)
+        virtual_time = self._virtual_time
+        if self._use_virtual_time and virtual_time:
+            return virtual_time
         
         # Default to real time
         return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -90,10 +175,9 @@ class TimeService:
         Returns:
             True if in virtual time mode
         """
-        if self.redis_client:
+        if self.redis_client and not self._synced:
             try:
-                enabled = self.redis_client.get("system:virtual_time:enabled")
-                return enabled and enabled.decode() == "1"
+                return _decode(self.redis_client.get(VIRTUAL_TIME_ENABLED_KEY)) == "1"
             except Exception:
                 pass
         
@@ -116,6 +200,38 @@ class TimeService:
         return new_time
 
 
+class VirtualClockStepper:
+    """Advance virtual time in coarse steps of event time.
+
+    Replayers call advance() for each tick or batch; the shared clock is only
+    written (one pipelined SET/SET/PUBLISH) once event time has moved by at
+    least step_seconds since the last update.
+    """
+
+    def __init__(self, time_service: Optional[TimeService] = None, step_seconds: Optional[float] = None):
+        self.time_service = time_service
+        self.step_seconds = VIRTUAL_TIME_STEP_SECONDS if step_seconds is None else step_seconds
+        self.last_set: Optional[datetime] = None
+        self.updates = 0
+
+    def advance(self, timestamp: datetime, force: bool = False) -> bool:
+        """Set virtual time to timestamp if a step has elapsed (or force).
+
+        Returns:
+            True if the clock was updated
+        """
+        if (
+            not force
+            and self.last_set is not None
+            and abs((timestamp - self.last_set).total_seconds()) < self.step_seconds
+        ):
+            return False
+        (self.time_service or get_time_service()).set_virtual_time(timestamp)
+        self.last_set = timestamp
+        self.updates += 1
+        return True
+
+
 # Global time service instance
 _time_service: Optional[TimeService] = None
 
@@ -181,6 +297,7 @@ def is_virtual_time() -> bool:
 
 __all__ = [
     "TimeService",
+    "VirtualClockStepper",
     "get_time_service",
     "now",
     "set_virtual_time",
@@ -0,0 +1,143 @@
+import queue
+import time
+from datetime import datetime, timedelta, timezone
+
+from core_kernel.time_service import (
+    VIRTUAL_TIME_CURRENT_KEY,
+    TimeService,
+    VirtualClockStepper,
+)
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        self.broker.subscribers.setdefault(channel, []).append(self)
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def set(self, *args):
+        self.commands.append(("set", args))
+
+    def publish(self, *args):
+        self.commands.append(("publish", args))
+
+    def execute(self):
+        self.redis.round_trips += 1
+        for name, args in self.commands:
+            getattr(self.redis, f"_{name}")(*args)
+
+
+class FakeRedis:
+    """Shared in-memory Redis with bytes values and pub/sub."""
+
+    def __init__(self):
+        self.kv = {}
+        self.subscribers = {}
+        self.gets = 0
+        self.round_trips = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.kv.get(key)
+
+    def _set(self, key, value):
+        self.kv[key] = value.encode()
+
+    def set(self, key, value):
+        self.round_trips += 1
+        self._set(key, value)
+
+    def delete(self, key):
+        self.kv.pop(key, None)
+
+    def _publish(self, channel, message):
+        for pubsub in self.subscribers.get(channel, []):
+            pubsub.messages.put({"type": "message", "data": message.encode()})
+
+    def publish(self, channel, message):
+        self.round_trips += 1
+        self._publish(channel, message)
+
+    def pipeline(self, transaction=True):  # noqa: ARG002
+        return FakePipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages=False):  # noqa: ARG002
+        return FakePubSub(self)
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for broadcast"
+        time.sleep(0.005)
+
+
+def test_now_is_a_local_read_kept_in_sync_by_broadcast():
+    redis = FakeRedis()
+    writer = TimeService(redis, subscribe=False)
+    reader = TimeService(redis)
+    gets_after_subscribe = redis.gets
+
+    replay_time = datetime(2026, 1, 9, 10, 30)
+    writer.set_virtual_time(replay_time)
+    assert redis.round_trips == 1
+
+    _wait_for(lambda: reader.now() == replay_time)
+    assert reader.is_virtual()
+    assert redis.gets == gets_after_subscribe
+
+    writer.clear_virtual_time()
+    _wait_for(lambda: not reader.is_virtual())
+    assert abs((reader.now() - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()) < 5
+
+
+def test_late_subscriber_loads_current_virtual_time():
+    redis = FakeRedis()
+    TimeService(redis, subscribe=False).set_virtual_time(datetime(2026, 1, 9, 11, 0))
+    assert TimeService(redis).now() == datetime(2026, 1, 9, 11, 0)
+
+
+class PlainRedis:
+    """Client without pipeline or pub/sub support."""
+
+    def __init__(self):
+        self.kv = {}
+
+    def get(self, key):
+        return self.kv.get(key)
+
+    def set(self, key, value):
+        self.kv[key] = value
+
+
+def test_without_pubsub_now_reads_redis():
+    redis = PlainRedis()
+    service = TimeService(redis)
+    TimeService(redis).set_virtual_time(datetime(2026, 1, 9, 12, 0))
+    redis.kv[VIRTUAL_TIME_CURRENT_KEY] = "2026-01-09T12:05:00"
+    assert service.now() == datetime(2026, 1, 9, 12, 5)
+
+
+def test_stepper_advances_in_coarse_steps():
+    redis = FakeRedis()
+    service = TimeService(redis, subscribe=False)
+    stepper = VirtualClockStepper(service, step_seconds=60)
+    start = datetime(2026, 1, 9, 9, 15)
+
+    updates = [stepper.advance(start + timedelta(seconds=15 * i)) for i in range(9)]
+    assert updates == [True, False, False, False, True, False, False, False, True]
+    assert stepper.advance(start + timedelta(seconds=130), force=True)
+    assert service.now() == start + timedelta(seconds=130)
+    assert redis.round_trips == 4
@@ -360,7 +360,11 @@ except Exception as e:  # pragma: no cover - best effort to include routers
 
 
 def calculate_vwap(instrument: str = "BANKNIFTY", hours: int = 24) -> float | None:
-    """Calculate VWAP from stored tick data in Redis."""
+    """Calculate VWAP from stored tick data in Redis.
+
+    Prefers the session VWAP the market store keeps in session_stats:{instrument}
+    (one HGETALL); falls back to the last `hours` of the tick log.
+    """
     try:
         import redis
         import json
@@ -369,7 +373,29 @@ def calculate_vwap(instrument: str = "BANKNIFTY", hours: int = 24) -> float | No
         # Connect to Redis
         r = redis.Redis(host='localhost', port=6379, db=0)
 
-        # Get all tick keys for the instrument from the last N hours
+        session_vwap = r.hget(f"session_stats:{instrument}", "vwap")
+        if session_vwap:
+            return float(session_vwap)
+
+        total_price_volume = 0.0
+        total_volume = 0.0
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+
+        # Tick log stream: one XRANGE over the last N hours (stream IDs are epoch ms)
+        entries = r.xrange(f"tick_stream:{instrument}", min=str(int(cutoff_time.timestamp() * 1000)))
+        if entries:
+            for _, fields in entries:
+                try:
+                    price = float(fields.get(b'last_price', 0))
+                    volume = float(fields.get(b'volume', 0))
+                except (TypeError, ValueError):
+                    continue
+                if price > 0 and volume > 0:
+                    total_price_volume += price * volume
+                    total_volume += volume
+            return total_price_volume / total_volume if total_volume > 0 else None
+
+        # Legacy per-tick keys (MARKET_STORE_TICK_LOG=keys)
         pattern = f"tick:{instrument}:*"
         keys = r.keys(pattern)
 
@@ -380,10 +406,6 @@ def calculate_vwap(instrument: str = "BANKNIFTY", hours: int = 24) -> float | No
             # Fallback to synthetic calculation if no historical data
             return None
 
-        total_price_volume = 0.0
-        total_volume = 0.0
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-
         for key in tick_keys:
             try:
                 # Get tick data
@@ -1109,7 +1131,7 @@ async def options_chain():
     """Get options chain data."""
     try:
         # Mock options chain data
-        return {
+        chain = {
             "available": True,
             "futures_price": 45250.00,
             "expiry": "2026-01-30",
@@ -1170,10 +1192,26 @@ async def options_chain():
                     "pe_delta": -0.65
                 }
             ],
-            "pcr": 1.15,
-            "max_pain": 45250,
             "timestamp": datetime.now().isoformat()
         }
+        try:
+            market_data_src = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'market_data', 'src')
+            if market_data_src not in sys.path:
+                sys.path.insert(0, market_data_src)
+            from market_data.options_analytics import OptionChainArrays
+        except ImportError as e:
+            # market_data (or its dependencies) not installed: serve the chain without analytics
+            print(f"Warning: options analytics unavailable: {e}")
+            return chain
+        analytics = OptionChainArrays.from_strikes(chain["chain"]).summary(spot=chain["futures_price"])
+        chain.update(
+            pcr=analytics["pcr"],
+            max_pain=analytics["max_pain"],
+            support=analytics["support"],
+            resistance=analytics["resistance"],
+            oi_concentration=analytics["oi_concentration"],
+        )
+        return chain
     except Exception as e:
         return {"available": False, "error": str(e)}
 
@@ -9,11 +9,22 @@ This agent specializes in:
 """
 
 import logging
+import os
+import sys
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 from engine_module.contracts import Agent, AnalysisResult
 
+try:
+    from market_data.options_analytics import OptionChainArrays
+except ImportError:
+    # Fallback: ensure market_data/src is in path
+    market_data_src = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'market_data', 'src'))
+    if os.path.exists(market_data_src) and market_data_src not in sys.path:
+        sys.path.insert(0, market_data_src)
+    from market_data.options_analytics import OptionChainArrays
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,14 +68,14 @@ class OptionsAnalysisAgent(Agent):
         - 'calls': list of call options with strike, premium, oi, iv, delta
         - 'puts': list of put options with strike, premium, oi, iv, delta  
         - 'underlying_price': current spot price
-        - 'pcr': Put-Call Ratio
-        - 'max_pain': max pain strike
+        - 'pcr': Put-Call Ratio (computed from the chain if missing)
+        - 'max_pain': max pain strike (computed from the chain if missing)
         - 'consensus_direction': BUY/SELL/HOLD from other agents
         """
         calls = context.get("calls", [])
         puts = context.get("puts", [])
         underlying_price = context.get("underlying_price")
-        pcr = context.get("pcr", 1.0)
+        pcr = context.get("pcr")
         max_pain = context.get("max_pain")
         consensus = context.get("consensus_direction", "HOLD")
 
@@ -134,7 +145,7 @@ class OptionsAnalysisAgent(Agent):
         )
 
     def _analyze_options_chain(self, calls: List[Dict], puts: List[Dict],
-                               underlying_price: float, pcr: float,
+                               underlying_price: float, pcr: Optional[float],
                                max_pain: Optional[float]) -> Dict[str, Any]:
         """Analyze options chain metrics."""
         analysis = {}
@@ -143,18 +154,22 @@ class OptionsAnalysisAgent(Agent):
         atm_strike = self._find_atm_strike(calls, puts, underlying_price)
         analysis["atm_strike"] = atm_strike
 
-        # Analyze OI distribution
-        call_oi_total = sum(c.get("oi", 0) for c in calls)
-        put_oi_total = sum(p.get("oi", 0) for p in puts)
-        analysis["call_oi_total"] = call_oi_total
-        analysis["put_oi_total"] = put_oi_total
+        # OI distribution, walls and max pain from the vectorized chain
+        chain = OptionChainArrays.from_legs(calls, puts)
+        metrics = chain.summary(spot=underlying_price)
+        if not pcr:
+            pcr = metrics["pcr"] if metrics["pcr"] is not None else 1.0
+        if not max_pain:
+            max_pain = metrics["max_pain"]
+        analysis["call_oi_total"] = metrics["call_oi_total"]
+        analysis["put_oi_total"] = metrics["put_oi_total"]
         analysis["pcr"] = pcr
-
-        # Find max OI strikes
-        max_call_oi_strike = max(calls, key=lambda x: x.get("oi", 0), default={}).get("strike")
-        max_put_oi_strike = max(puts, key=lambda x: x.get("oi", 0), default={}).get("strike")
-        analysis["max_call_oi_strike"] = max_call_oi_strike
-        analysis["max_put_oi_strike"] = max_put_oi_strike
+        analysis["volume_pcr"] = metrics["volume_pcr"]
+        analysis["max_call_oi_strike"] = metrics["max_call_oi_strike"]
+        analysis["max_put_oi_strike"] = metrics["max_put_oi_strike"]
+        analysis["support_strikes"] = metrics["support"]
+        analysis["resistance_strikes"] = metrics["resistance"]
+        analysis["oi_concentration"] = metrics["oi_concentration"]
 
         # PCR interpretation
         if pcr > 1.3:
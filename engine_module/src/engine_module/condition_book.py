@@ -0,0 +1,142 @@
+"""Indexed threshold book for SignalMonitor conditions.
+
+Conditions are indexed by (instrument, indicator) and, within that, by
+operator into ladders sorted by threshold. For a new indicator value every
+met condition of an operator is a contiguous slice of its ladder, found with
+a bisect:
+
+    >   thresholds below the value          <   thresholds above the value
+    >=  thresholds at or below the value    <=  thresholds at or above the value
+    ==  thresholds within 0.01 of the value
+    crosses_above  previous <= threshold < value
+    crosses_below  value < threshold <= previous
+
+so a tick costs O(log n + k) per ladder (k = conditions met) instead of a walk
+over every resting condition. Entries carry the condition's insertion
+sequence so callers can restore the order conditions were added in.
+"""
+
+import bisect
+from typing import Dict, Iterator, List, Optional, Tuple
+
+EQUAL_TOLERANCE = 0.01
+CROSSING_OPERATORS = ("crosses_above", "crosses_below")
+
+Entry = Tuple[int, str]  # (insertion sequence, condition_id)
+
+
+class ThresholdLadder:
+    """Conditions of one operator on one (instrument, indicator), sorted by threshold."""
+
+    __slots__ = ("thresholds", "entries")
+
+    def __init__(self):
+        self.thresholds: List[float] = []
+        self.entries: List[Entry] = []
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    def add(self, threshold: float, seq: int, condition_id: str) -> None:
+        i = bisect.bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(i, threshold)
+        self.entries.insert(i, (seq, condition_id))
+
+    def remove(self, threshold: float, condition_id: str) -> bool:
+        lo = bisect.bisect_left(self.thresholds, threshold)
+        hi = bisect.bisect_right(self.thresholds, threshold, lo)
+        for i in range(lo, hi):
+            if self.entries[i][1] == condition_id:
+                del self.thresholds[i]
+                del self.entries[i]
+                return True
+        return False
+
+    def below(self, value: float, inclusive: bool) -> List[Entry]:
+        """Entries with threshold < value (<= when inclusive)."""
+        end = (bisect.bisect_right if inclusive else bisect.bisect_left)(self.thresholds, value)
+        return self.entries[:end]
+
+    def above(self, value: float, inclusive: bool) -> List[Entry]:
+        """Entries with threshold > value (>= when inclusive)."""
+        start = (bisect.bisect_left if inclusive else bisect.bisect_right)(self.thresholds, value)
+        return self.entries[start:]
+
+    def between(self, low: float, high: float, low_inclusive: bool, high_inclusive: bool) -> List[Entry]:
+        start = (bisect.bisect_left if low_inclusive else bisect.bisect_right)(self.thresholds, low)
+        end = (bisect.bisect_right if high_inclusive else bisect.bisect_left)(self.thresholds, high, start)
+        return self.entries[start:end]
+
+
+class ConditionBook:
+    """Threshold ladders keyed by instrument -> indicator -> operator."""
+
+    def __init__(self):
+        self._books: Dict[str, Dict[str, Dict[str, ThresholdLadder]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, instrument: str, indicator: str, operator: str, threshold: float,
+            seq: int, condition_id: str) -> None:
+        ladders = self._books.setdefault(instrument, {}).setdefault(indicator, {})
+        ladder = ladders.get(operator)
+        if ladder is None:
+            ladder = ladders[operator] = ThresholdLadder()
+        ladder.add(threshold, seq, condition_id)
+        self._size += 1
+
+    def remove(self, instrument: str, indicator: str, operator: str, threshold: float,
+               condition_id: str) -> bool:
+        indicators = self._books.get(instrument)
+        ladders = indicators.get(indicator) if indicators else None
+        ladder = ladders.get(operator) if ladders else None
+        if ladder is None or not ladder.remove(threshold, condition_id):
+            return False
+        self._size -= 1
+        # Drop empty levels so indicators() only lists what still has conditions
+        if not ladder:
+            del ladders[operator]
+            if not ladders:
+                del indicators[indicator]
+                if not indicators:
+                    del self._books[instrument]
+        return True
+
+    def indicators(self, instrument: str) -> Dict[str, Dict[str, ThresholdLadder]]:
+        """Indicator -> operator -> ladder for every indicator with conditions on the instrument."""
+        return self._books.get(instrument, {})
+
+    @staticmethod
+    def has_crossings(ladders: Dict[str, ThresholdLadder]) -> bool:
+        return any(operator in ladders for operator in CROSSING_OPERATORS)
+
+    @staticmethod
+    def matches(ladders: Dict[str, ThresholdLadder], value: float,
+                previous: Optional[float] = None) -> Iterator[Entry]:
+        """Entries of every condition met by `value` (crossings also need the previous value)."""
+        for operator, ladder in ladders.items():
+            if operator == ">":
+                yield from ladder.below(value, inclusive=False)
+            elif operator == ">=":
+                yield from ladder.below(value, inclusive=True)
+            elif operator == "<":
+                yield from ladder.above(value, inclusive=False)
+            elif operator == "<=":
+                yield from ladder.above(value, inclusive=True)
+            elif operator == "==":
+                # Widen the bisect window slightly, then apply the exact tolerance test
+                thresholds = ladder.thresholds
+                lo = bisect.bisect_left(thresholds, value - 2 * EQUAL_TOLERANCE)
+                hi = bisect.bisect_right(thresholds, value + 2 * EQUAL_TOLERANCE, lo)
+                yield from (ladder.entries[i] for i in range(lo, hi)
+                            if abs(value - thresholds[i]) < EQUAL_TOLERANCE)
+            elif previous is None:
+                continue
+            elif operator == "crosses_above":
+                if previous < value:
+                    yield from ladder.between(previous, value, low_inclusive=True, high_inclusive=False)
+            elif operator == "crosses_below":
+                if previous > value:
+                    yield from ladder.between(value, previous, low_inclusive=False, high_inclusive=True)
@@ -0,0 +1,234 @@
+"""Columnar condition kernel for SignalMonitor.
+
+Conditions are compiled once, when added, into NumPy columns instead of being
+re-read from TradingCondition objects and ``additional_conditions`` dicts on
+every tick:
+
+    rows (one per condition)   primary indicator id, operator code, threshold,
+                               first clause and clause count, alive flag
+    clauses (AND members)      indicator id, operator code, threshold
+
+A tick is evaluated against an indicator vector (one slot per indicator id,
+plus a presence mask) with one gather per column and a segmented AND
+(``np.add.reduceat`` over failing clauses) per group. Semantics are those of
+``SignalMonitor._evaluate_condition``:
+
+- the primary clause is false for a missing, non-numeric or NaN value; ``==``
+  means within 0.01; crossings need a previous value (prev <= t < value for
+  crosses_above, value < t <= prev for crosses_below);
+- additional clauses with no indicator, operator or threshold are ignored; a
+  missing or non-numeric value fails the group; an operator other than
+  >, <, >=, <= only requires the value to be present.
+
+Removed rows are tombstoned and compacted once they outnumber live rows, so
+row order (and the order triggers are reported in) stays insertion order.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .condition_book import EQUAL_TOLERANCE
+
+OP_GT, OP_LT, OP_GE, OP_LE, OP_EQ, OP_CROSSES_ABOVE, OP_CROSSES_BELOW, OP_PRESENT = range(8)
+
+PRIMARY_OPS = {">": OP_GT, "<": OP_LT, ">=": OP_GE, "<=": OP_LE, "==": OP_EQ,
+               "crosses_above": OP_CROSSES_ABOVE, "crosses_below": OP_CROSSES_BELOW}
+EXTRA_OPS = {">": OP_GT, "<": OP_LT, ">=": OP_GE, "<=": OP_LE}
+
+Clause = Tuple[str, int, float]  # (indicator, operator code, threshold)
+
+
+class _Columns:
+    """Equal-length NumPy columns with amortised O(1) appends."""
+
+    def __init__(self, **dtypes):
+        self.size = 0
+        self._data = {name: np.empty(16, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._data[name][:self.size]
+
+    def extend(self, count: int, **values) -> int:
+        """Append `count` rows (scalars broadcast); returns the index of the first one."""
+        start, end = self.size, self.size + count
+        capacity = len(next(iter(self._data.values())))
+        if end > capacity:
+            capacity = max(end, capacity * 2)
+            for name, column in self._data.items():
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:start] = column[:start]
+                self._data[name] = grown
+        for name, value in values.items():
+            self._data[name][start:end] = value
+        self.size = end
+        return start
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop the rows where mask is False, preserving order."""
+        kept = {name: self[name][mask] for name in self._data}
+        self.size = 0
+        self.extend(int(mask.sum()), **kept)
+
+
+def compile_clauses(additional_conditions: Iterable[Mapping[str, Any]]) -> List[Clause]:
+    """Compile additional_conditions dicts into (indicator, operator code, threshold) clauses."""
+    clauses = []
+    for extra in additional_conditions:
+        indicator, operator, threshold = extra.get("indicator"), extra.get("operator"), extra.get("threshold")
+        if not indicator or operator is None or threshold is None:
+            continue
+        try:
+            threshold = float(threshold)
+        except (ValueError, TypeError):
+            threshold = float("nan")  # never satisfies a comparison
+        clauses.append((indicator, EXTRA_OPS.get(operator, OP_PRESENT), threshold))
+    return clauses
+
+
+def _clause_results(op: np.ndarray, threshold: np.ndarray, value: np.ndarray, present: np.ndarray,
+                    previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """Evaluate clauses of mixed operators with one table lookup per clause."""
+    with np.errstate(invalid="ignore"):
+        results = [value > threshold, value < threshold, value >= threshold, value <= threshold,
+                   np.abs(value - threshold) < EQUAL_TOLERANCE]
+        if previous is None:
+            no_cross = np.zeros(len(op), dtype=bool)
+            results += [no_cross, no_cross]
+        else:
+            results += [(previous <= threshold) & (value > threshold),
+                        (previous >= threshold) & (value < threshold)]
+    results.append(present)
+    table = np.stack(results)
+    return table[op, np.arange(len(op))] & present
+
+
+class ConditionKernel:
+    """Compiled conditions of one instrument, evaluated with NumPy."""
+
+    def __init__(self):
+        self._indicator_ids: Dict[str, int] = {}
+        self.indicators: List[str] = []
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._rows = _Columns(indicator=np.int32, op=np.int8, threshold=np.float64,
+                              clause_start=np.int64, clause_count=np.int64, alive=bool)
+        self._clauses = _Columns(indicator=np.int32, op=np.int8, threshold=np.float64)
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, condition_id: str) -> bool:
+        return condition_id in self._row_of
+
+    def _indicator_id(self, name: str) -> int:
+        indicator_id = self._indicator_ids.get(name)
+        if indicator_id is None:
+            indicator_id = self._indicator_ids[name] = len(self.indicators)
+            self.indicators.append(name)
+        return indicator_id
+
+    def add(self, condition_id: str, indicator: str, operator: str, threshold: float,
+            additional_conditions: Iterable[Mapping[str, Any]] = ()) -> None:
+        """Compile one condition (replacing an earlier one with the same id)."""
+        self.remove(condition_id)
+        clauses = compile_clauses(additional_conditions)
+        start = self._clauses.extend(
+            len(clauses),
+            indicator=[self._indicator_id(name) for name, _, _ in clauses],
+            op=[code for _, code, _ in clauses],
+            threshold=[value for _, _, value in clauses],
+        )
+        row = self._rows.extend(1, indicator=self._indicator_id(indicator), op=PRIMARY_OPS[operator],
+                                threshold=float(threshold), clause_start=start, clause_count=len(clauses),
+                                alive=True)
+        self._ids.append(condition_id)
+        self._row_of[condition_id] = row
+
+    def remove(self, condition_id: str) -> bool:
+        row = self._row_of.pop(condition_id, None)
+        if row is None:
+            return False
+        self._rows["alive"][row] = False
+        self._ids[row] = None
+        self._dead += 1
+        if self._dead > 1024 and self._dead > len(self._row_of):
+            self._compact()
+        return True
+
+    def has_clauses(self, condition_id: str) -> bool:
+        row = self._row_of.get(condition_id)
+        return row is not None and self._rows["clause_count"][row] > 0
+
+    def _compact(self) -> None:
+        alive = self._rows["alive"].copy()
+        counts = self._rows["clause_count"][alive]
+        clause_alive = np.repeat(self._rows["alive"], self._rows["clause_count"])
+        self._clauses.keep(clause_alive)
+        self._rows.keep(alive)
+        self._rows["clause_start"][:] = np.cumsum(counts) - counts
+        self._ids = [cid for cid in self._ids if cid is not None]
+        self._row_of = {cid: row for row, cid in enumerate(self._ids)}
+        self._dead = 0
+
+    def vector(self, indicators: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Indicator vector (NaN where unusable) and presence mask (numeric value available)."""
+        values = np.full(len(self.indicators), np.nan)
+        present = np.zeros(len(self.indicators), dtype=bool)
+        for i, name in enumerate(self.indicators):
+            value = indicators.get(name)
+            if value is None:
+                continue
+            try:
+                values[i] = float(value)
+                present[i] = True
+            except (ValueError, TypeError):
+                pass
+        return values, present
+
+    def _groups_met(self, rows: np.ndarray, values: np.ndarray, present: np.ndarray) -> np.ndarray:
+        """AND of each row's additional clauses (True for rows without clauses)."""
+        counts = self._rows["clause_count"][rows]
+        total = int(counts.sum())
+        if not total:
+            return np.ones(len(rows), dtype=bool)
+        # Clause indices of every selected row, back to back
+        ends = np.cumsum(counts)
+        index = np.arange(total) + np.repeat(self._rows["clause_start"][rows] - (ends - counts), counts)
+        indicator = self._clauses["indicator"][index]
+        ok = _clause_results(self._clauses["op"][index], self._clauses["threshold"][index],
+                             values[indicator], present[indicator])
+        failed = np.zeros(len(rows), dtype=np.int64)
+        with_clauses = counts > 0
+        failed[with_clauses] = np.add.reduceat(~ok, (ends - counts)[with_clauses])
+        return failed == 0
+
+    def clauses_met(self, condition_ids: Sequence[str], indicators: Mapping[str, Any]) -> np.ndarray:
+        """Whether each condition's additional clauses hold (primary clauses are not evaluated)."""
+        rows = np.array(list(map(self._row_of.__getitem__, condition_ids)), dtype=np.int64)
+        values, present = self.vector(indicators)
+        return self._groups_met(rows, values, present)
+
+    def evaluate(self, indicators: Mapping[str, Any],
+                 previous: Optional[Mapping[str, float]] = None) -> List[str]:
+        """Ids of every live condition met by the indicators, in insertion order.
+
+        Args:
+            indicators: Current indicator values
+            previous: Previous indicator values for crossing conditions (none: crossings never trigger)
+        """
+        values, present = self.vector(indicators)
+        rows = self._rows
+        primary = rows["indicator"]
+        previous_values = None
+        if previous is not None:
+            previous_values = np.array([np.nan if previous.get(name) is None else float(previous[name])
+                                        for name in self.indicators], dtype=np.float64)[primary]
+        met = _clause_results(rows["op"], rows["threshold"], values[primary], present[primary], previous_values)
+        met &= rows["alive"]
+        selected = np.flatnonzero(met)
+        if len(selected):
+            selected = selected[self._groups_met(selected, values, present)]
+        ids = self._ids
+        return [ids[row] for row in selected.tolist()]
@@ -66,7 +66,8 @@ def select_leg(signal: str, chain: Dict[str, Any], orderflow: Dict[str, Any], cf
         return None
 
     fut_price = chain.get("futures_price")
-    strikes = chain.get("chain", [])
+    # Dashboard chains list rows under "chain", the market_data API under "strikes"
+    strikes = chain.get("chain") or chain.get("strikes", [])
     expiry = chain.get("expiry")
     if not fut_price or not strikes:
         return None
@@ -186,7 +187,7 @@ def evaluate(signal: str, chain: Dict[str, Any], orderflow: Dict[str, Any], cfg:
         # BUY signal -> Bull Call Spread (Buy CE lower, Sell CE higher)
         # SELL signal -> Bear Put Spread (Buy PE higher, Sell PE lower)
         try:
-            strikes = chain.get("chain", []) if chain else []
+            strikes = (chain.get("chain") or chain.get("strikes", [])) if chain else []
             if strikes:
                 # Sort by strike
                 strikes_sorted = sorted(strikes, key=lambda r: r.get("strike") or 0)
@@ -8,7 +8,8 @@ are left as TODOs for incremental development.
 import asyncio
 import logging
 import os
-from typing import Any, Dict, Optional, Protocol, runtime_checkable
+import time
+from typing import Any, Dict, Optional, Protocol, Tuple, runtime_checkable
 from datetime import datetime, timedelta
 
 from .contracts import AnalysisResult, TechnicalDataProvider, PositionManagerProvider
@@ -23,6 +24,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Data fetch stage: every source runs concurrently with its own timeout (seconds), all under
+# one cycle deadline; override per orchestrator with fetch_timeouts={source: s} / fetch_deadline=s
+FETCH_SOURCES = ("market", "options", "news", "technical", "positions")
+DEFAULT_FETCH_TIMEOUT = float(os.getenv("ORCHESTRATOR_FETCH_TIMEOUT", "5.0"))
+DEFAULT_FETCH_DEADLINE = float(os.getenv("ORCHESTRATOR_FETCH_DEADLINE", "8.0"))
+
 
 # Import contracts from other modules via duck typing
 # (avoid hard dependencies on other modules in implementation)
@@ -124,6 +131,8 @@ class TradingOrchestrator:
         self.signal_monitor = signal_monitor
         self.mongo_db = mongo_db
         self.config = kwargs
+        # Last successful fetch per (instrument, source): (data, monotonic time fetched)
+        self._last_good: Dict[Tuple[str, str], Tuple[Dict[str, Any], float]] = {}
 
     async def run_cycle(self, context: Dict[str, Any]) -> AnalysisResult:
         """Execute one trading cycle: fetch data, analyze, decide on options strategies.
@@ -163,20 +172,13 @@ class TradingOrchestrator:
         logger.info(f"Starting {cycle_interval} analysis cycle for {instrument} at {timestamp}")
 
         try:
-            # Step 1: Fetch market data (15min OHLC + recent ticks)
-            market_data = await self._fetch_market_data(instrument)
-
-            # Step 2: Fetch options chain data
-            options_chain = await self._fetch_options_data(instrument)
-
-            # Step 3: Fetch news data (if news service available)
-            news_data = await self._fetch_news_data(instrument)
-
-            # Step 3.5: Fetch technical indicators (if technical data provider available)
-            technical_data = await self._fetch_technical_data(instrument)
-
-            # Step 3.6: Fetch position data (if position manager available)
-            position_data = await self._fetch_position_data(instrument)
+            # Steps 1-3: Fetch market, options, news, technical and position data concurrently
+            fetched, data_sources = await self._fetch_data(instrument)
+            market_data = fetched["market"]
+            options_chain = fetched["options"]
+            news_data = fetched["news"]
+            technical_data = fetched["technical"]
+            position_data = fetched["positions"]
 
             # Step 4: Run all agents in parallel
             agent_results = await self._run_agents_parallel(market_data, options_chain, news_data, technical_data, position_data, context)
@@ -235,6 +237,7 @@ class TradingOrchestrator:
                 "agents_run": len(agent_results),
                 "data_points": len(market_data.get("ohlc", [])),
                 "options_expiries": len(options_chain.get("expiries", [])) if options_chain else 0,
+                "data_sources": data_sources,
                 "analysis_duration_seconds": (now - timestamp).total_seconds()
             })
 
@@ -284,6 +287,66 @@ class TradingOrchestrator:
                 }
             )
 
+    async def _fetch_data(self, instrument: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Fetch every data source concurrently, each bounded by its timeout and the cycle deadline.
+
+        A source that times out or reports an error falls back to its last-known-good data.
+        Providers must not block the event loop (a blocking call cannot be timed out and
+        stalls every other source); synchronous clients go through asyncio.to_thread, as
+        the Redis providers do.
+
+        Returns:
+            (data per source, report per source with status, latency_ms, stale and staleness_seconds)
+        """
+        fetchers = {
+            "market": self._fetch_market_data,
+            "options": self._fetch_options_data,
+            "news": self._fetch_news_data,
+            "technical": self._fetch_technical_data,
+            "positions": self._fetch_position_data,
+        }
+        timeouts = {source: DEFAULT_FETCH_TIMEOUT for source in FETCH_SOURCES}
+        timeouts.update(self.config.get("fetch_timeouts") or {})
+        deadline = float(self.config.get("fetch_deadline", DEFAULT_FETCH_DEADLINE))
+
+        async def fetch(source: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], float]:
+            started = time.monotonic()
+            try:
+                # All sources start together, so capping each at the deadline bounds the stage
+                data = await asyncio.wait_for(fetchers[source](instrument), min(float(timeouts[source]), deadline))
+                error = data.get("error")
+            except asyncio.TimeoutError:
+                data, error = None, "timeout"
+            except Exception as e:
+                data, error = None, str(e)
+            return data, error, time.monotonic() - started
+
+        results = await asyncio.gather(*(fetch(source) for source in FETCH_SOURCES))
+
+        fetched: Dict[str, Dict[str, Any]] = {}
+        report: Dict[str, Dict[str, Any]] = {}
+        now = time.monotonic()
+        for source, (data, error, latency) in zip(FETCH_SOURCES, results):
+            entry = {"status": "ok", "latency_ms": round(latency * 1000, 1), "stale": False, "staleness_seconds": 0.0}
+            if error is None:
+                self._last_good[(instrument, source)] = (data, now)
+            else:
+                entry.update(status="timeout" if error == "timeout" else "error", error=error)
+                cached = self._last_good.get((instrument, source))
+                if cached is not None:
+                    data = cached[0]
+                    entry.update(stale=True, staleness_seconds=round(now - cached[1], 3))
+                    logger.warning(f"{source} data for {instrument} unavailable ({error}), "
+                                   f"using last-known-good from {entry['staleness_seconds']:.1f}s ago")
+                else:
+                    entry["staleness_seconds"] = None
+                    logger.warning(f"{source} data for {instrument} unavailable ({error}), no earlier data")
+                    if data is None:
+                        data = {"instrument": instrument, "error": error}
+            fetched[source] = data
+            report[source] = entry
+        return fetched, report
+
     async def _fetch_market_data(self, instrument: str) -> Dict[str, Any]:
         """Fetch comprehensive market data for analysis."""
         try:
@@ -423,6 +486,10 @@ class TradingOrchestrator:
                 "news_available": False,
                 "error": str(e)
             }
+        finally:
+            # Cleanup news service (here, not after the technical fetch: fetches run concurrently)
+            if hasattr(self.news_service, '__aexit__'):
+                await self.news_service.__aexit__(None, None, None)
 
     async def _fetch_technical_data(self, instrument: str) -> Dict[str, Any]:
         """Fetch technical indicators data."""
@@ -469,10 +536,6 @@ class TradingOrchestrator:
                 "technical_data_available": False,
                 "error": str(e)
             }
-        finally:
-            # Cleanup news service
-            if hasattr(self.news_service, '__aexit__'):
-                await self.news_service.__aexit__(None, None, None)
 
     async def _fetch_position_data(self, instrument: str) -> Dict[str, Any]:
         """Fetch position data for the instrument."""
@@ -59,6 +59,15 @@ async def process_tick_for_signals(instrument: str, tick: Dict[str, Any]) -> Dic
         }
 
 
+async def get_tick_signal_monitor() -> Optional[Any]:
+    """SignalMonitor that process_tick_for_signals checks ticks against (None if unavailable)."""
+    global _realtime_processor
+
+    if _realtime_processor is None:
+        _realtime_processor = await _initialize_realtime_processor()
+    return getattr(_realtime_processor, "signal_monitor", None)
+
+
 async def _initialize_realtime_processor() -> Optional[Any]:
     """Initialize RealtimeSignalProcessor with trade execution callback.
     
@@ -1,9 +1,12 @@
 """Redis-based data providers for engine_module.
 
 Direct Redis access implementations of MarketDataProvider and TechnicalDataProvider
-protocols, bypassing API calls for better performance.
+protocols, bypassing API calls for better performance. The Redis client is synchronous,
+so each read runs in a worker thread (asyncio.to_thread) and never blocks the event loop
+the orchestrator fetches its sources on concurrently.
 """
 
+import asyncio
 import json
 import logging
 from typing import Dict, Any, List, Optional
@@ -14,6 +17,17 @@ from engine_module.contracts import TechnicalIndicators
 
 logger = logging.getLogger(__name__)
 
+# TechnicalIndicators field -> name used by the market_data TechnicalIndicatorsService snapshot
+_SERVICE_INDICATOR_NAMES = {
+    'rsi': 'rsi_14',
+    'macd': 'macd_value',
+    'adx': 'adx_14',
+    'bb_upper': 'bollinger_upper',
+    'bb_middle': 'bollinger_middle',
+    'bb_lower': 'bollinger_lower',
+    'volume_sma': 'volume_sma_20',
+}
+
 
 class RedisMarketDataProvider:
     """Redis-based market data provider that reads OHLC data directly from Redis.
@@ -39,7 +53,10 @@ class RedisMarketDataProvider:
         """
         if not self._available:
             return []
+        return await asyncio.to_thread(self._read_ohlc_data, symbol, periods)
 
+    def _read_ohlc_data(self, symbol: str, periods: int) -> List[Dict[str, Any]]:
+        """Blocking body of get_ohlc_data."""
         try:
             # Try different timeframes in order of preference
             timeframes = ['15min', '5min', '1min']
@@ -95,26 +112,46 @@ class RedisTechnicalDataProvider:
         except Exception as exc:
             logger.warning("Redis unavailable for technical data: %s", exc)
 
+    def _read_snapshot_hash(self, symbol: str, timeframe: str = "1min") -> Dict[str, Any]:
+        """Read the indicators_hash:{symbol}:{timeframe} snapshot with one HGETALL."""
+        if not hasattr(self.redis, "hgetall"):
+            return {}
+        raw = self.redis.hgetall(f"indicators_hash:{symbol}:{timeframe}") or {}
+        values: Dict[str, Any] = {}
+        for field, value in raw.items():
+            field = field.decode('utf-8') if isinstance(field, bytes) else field
+            value = value.decode('utf-8') if isinstance(value, bytes) else value
+            try:
+                values[field] = float(value)
+            except (ValueError, TypeError):
+                values[field] = value
+        return values
+
     async def get_technical_indicators(self, symbol: str, periods: int = 100) -> Optional[TechnicalIndicators]:
         """Get technical indicators for symbol from Redis.
 
-        Reads from indicators:{symbol}:{indicator_name} keys created by market_data TechnicalIndicatorsService.
+        Reads the indicators_hash:{symbol}:1min snapshot hash published by market_data
+        TechnicalIndicatorsService, falling back to legacy indicators:{symbol}:{indicator_name} keys.
         Returns a TechnicalIndicators dataclass instance.
         """
         if not self._available:
             return None
+        return await asyncio.to_thread(self._read_technical_indicators, symbol)
 
+    def _read_technical_indicators(self, symbol: str) -> Optional[TechnicalIndicators]:
+        """Blocking body of get_technical_indicators."""
         try:
-            # Get all indicator keys for this symbol
-            pattern = f"indicators:{symbol}:*"
-            keys = self.redis.keys(pattern)
+            # Snapshot hash written in one pipeline by TechnicalIndicatorsService
+            indicator_values = self._read_snapshot_hash(symbol)
 
-            if not keys:
+            # Legacy per-field keys
+            keys = [] if indicator_values else self.redis.keys(f"indicators:{symbol}:*")
+
+            if not indicator_values and not keys:
                 logger.debug(f"No technical indicators found in Redis for {symbol}")
                 return None
 
             # Read all indicator values from Redis
-            indicator_values = {}
             for key in keys:
                 try:
                     # Extract indicator name from key
@@ -154,6 +191,10 @@ class RedisTechnicalDataProvider:
                 except (ValueError, TypeError):
                     pass
 
+            for name, service_name in _SERVICE_INDICATOR_NAMES.items():
+                if indicator_values.get(name) is None and service_name in indicator_values:
+                    indicator_values[name] = indicator_values[service_name]
+
             # Map Redis keys to TechnicalIndicators fields
             # market_data uses keys like: rsi, sma_20, sma_50, ema_12, ema_26, macd, macd_signal, macd_histogram, etc.
             indicators = TechnicalIndicators(
@@ -1,13 +1,41 @@
 """Redis Tick Subscriber - Listens to Redis tick updates and processes signals.
 
-This service subscribes to Redis pub/sub channels where market data ticks are published,
-and processes each tick through the real-time signal monitoring system.
+By default ticks are read from the market data tick streams (tick_stream:{instrument},
+written by RedisMarketStore) through a Redis Streams consumer group:
+
+- one XREADGROUP per batch across every instrument stream,
+- only the latest tick per instrument in a batch is processed (older ones are coalesced),
+- entries are acknowledged (XACK) after the signal check, so ticks of a worker that dies
+  mid-check stay pending and are claimed (XAUTOCLAIM) by the stream's next owner,
+- every engine worker joins the same group, so each tick is processed by one worker only;
+  SignalMonitor's trigger claim keeps a condition from firing on two workers.
+
+Each instrument stream is owned by exactly one worker at a time. Crossing conditions compare
+a tick with the previous one the same SignalMonitor saw, and ticks must be checked in stream
+order, so one instrument's ticks are never split across workers. A worker holds a lease per
+stream (tick_stream_owner:{group}:{instrument}, SET NX PX, renewed every lease_ms / 3) and
+reads and claims only the streams it leases. Live workers register in tick_workers:{group};
+each takes streams up to an even share and hands back any above it, so streams spread out as
+workers join. A stream changes hands only when its owner stops renewing (dies or stalls for
+lease_ms) or rebalances.
+
+On a handover the releasing worker checkpoints SignalMonitor's previous indicator values
+before it drops the lease, and the acquiring worker discards any it still holds for those
+instruments and re-reads the checkpoints, so a crossing spanning the handover is still seen
+(a worker that dies loses at most one checkpoint interval). Conditions live in the memory
+of the process that added them; SignalMonitor mirrors them in signal_conditions:{instrument}
+and the owner of each stream re-syncs them on acquiring it and on every lease renewal, so a
+condition added on any worker is checked by the stream's owner within lease_ms / 3.
+
+TICK_SUBSCRIBER_MODE=pubsub keeps the legacy pub/sub + key polling loop for stores
+that log ticks as keys (MARKET_STORE_TICK_LOG=keys).
 """
 
 import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional
+import socket
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 import os
 
@@ -21,6 +49,288 @@ logger = logging.getLogger(__name__)
 
 _tick_subscriber_task = None
 _subscriber_running = False
+_stream_subscriber: Optional["TickStreamSubscriber"] = None
+
+TICK_STREAM_PREFIX = "tick_stream"  # Same prefix as market_data RedisMarketStore
+TICK_STREAM_OWNER_PREFIX = "tick_stream_owner"
+TICK_WORKERS_PREFIX = "tick_workers"
+TICK_SUBSCRIBER_MODE = os.getenv("TICK_SUBSCRIBER_MODE", "stream").lower()
+DEFAULT_CONSUMER_GROUP = os.getenv("TICK_CONSUMER_GROUP", "engine-signals")
+DEFAULT_LEASE_MS = int(os.getenv("TICK_STREAM_LEASE_MS", "10000"))
+
+# Renew / release a stream lease only while this consumer still holds it
+_RENEW_LEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _stream_id(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class TickStreamSubscriber:
+    """Consumer-group reader of the per-instrument tick streams.
+    
+    Args:
+        redis_client: redis.asyncio client (decode_responses=True)
+        process_tick: async (instrument, tick dict) callback; defaults to process_tick_for_signals
+        group: Consumer group shared by all engine workers (env TICK_CONSUMER_GROUP)
+        consumer: Name of this worker in the group (env TICK_CONSUMER_NAME, default host:pid)
+        instruments: Instruments to follow (env TICK_STREAM_INSTRUMENTS); discovered with SCAN when empty
+        batch_size: Maximum entries per stream per XREADGROUP
+        block_ms: XREADGROUP block time
+        claim_idle_ms: Pending entries idle this long are claimed from other (dead) consumers
+        discovery_interval: Seconds between SCANs for new instrument streams
+        lease_ms: Stream ownership lease (env TICK_STREAM_LEASE_MS); a dead worker's streams
+            move to another worker after this long
+        signal_monitor: SignalMonitor handed the owned instruments' conditions and crossing
+            state; defaults to the one process_tick_for_signals uses when process_tick is None
+    """
+    
+    def __init__(
+        self,
+        redis_client: Any,
+        process_tick: Optional[Callable] = None,
+        group: str = DEFAULT_CONSUMER_GROUP,
+        consumer: Optional[str] = None,
+        instruments: Optional[Iterable[str]] = None,
+        batch_size: int = 500,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 30000,
+        discovery_interval: float = 30.0,
+        lease_ms: int = DEFAULT_LEASE_MS,
+        signal_monitor: Optional[Any] = None,
+    ):
+        self.redis = redis_client
+        self._process_tick = process_tick
+        self.group = group
+        self.consumer = consumer or os.getenv("TICK_CONSUMER_NAME") or f"{socket.gethostname()}:{os.getpid()}"
+        if instruments is None:
+            instruments = [i.strip() for i in os.getenv("TICK_STREAM_INSTRUMENTS", "").split(",") if i.strip()]
+        self.instruments = [i.upper() for i in instruments]
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.discovery_interval = discovery_interval
+        self.lease_ms = lease_ms
+        self.signal_monitor = signal_monitor
+        self.streams: List[str] = []
+        # Streams this worker holds the lease for; the only ones it reads and claims
+        self.owned: List[str] = []
+        # Newest entry processed per stream; claimed entries older than this are only acked
+        self._last_processed: Dict[str, Tuple[int, int]] = {}
+        self._running = False
+        self.stats = {"entries_read": 0, "ticks_processed": 0, "ticks_coalesced": 0,
+                      "entries_acked": 0, "entries_claimed": 0, "errors": 0,
+                      "streams_acquired": 0, "streams_released": 0}
+    
+    async def refresh_streams(self) -> List[str]:
+        """Find instrument streams and join the consumer group on each new one."""
+        if self.instruments:
+            keys = [f"{TICK_STREAM_PREFIX}:{instrument}" for instrument in self.instruments]
+        else:
+            keys = []
+            async for key in self.redis.scan_iter(match=f"{TICK_STREAM_PREFIX}:*", count=500):
+                keys.append(key if isinstance(key, str) else key.decode())
+        for key in sorted(set(keys) - set(self.streams)):
+            try:
+                # New groups start at "$": only ticks stored from now on
+                await self.redis.xgroup_create(key, self.group, id="$", mkstream=True)
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self.streams.append(key)
+        return self.streams
+    
+    def _lease_key(self, key: str) -> str:
+        return f"{TICK_STREAM_OWNER_PREFIX}:{self.group}:{key.split(':', 1)[1]}"
+    
+    async def balance_streams(self) -> List[str]:
+        """Renew this worker's stream leases and take or hand back streams toward an even share."""
+        seconds, micros = await self.redis.time()
+        now_ms = int(seconds) * 1000 + int(micros) // 1000
+        workers_key = f"{TICK_WORKERS_PREFIX}:{self.group}"
+        await self.redis.zadd(workers_key, {self.consumer: now_ms + self.lease_ms})
+        await self.redis.zremrangebyscore(workers_key, "-inf", now_ms)
+        share = -(-len(self.streams) // max(1, await self.redis.zcard(workers_key)))
+        
+        owned = []
+        for key in self.owned:
+            if await self.redis.eval(_RENEW_LEASE, 1, self._lease_key(key), self.consumer, self.lease_ms):
+                owned.append(key)
+            else:
+                logger.warning(f"Lost the lease on {key} to another consumer")
+        if owned[share:]:
+            # Checkpoint before the leases go, so the next owner reads the current values
+            await self._checkpoint_monitor()
+        for key in owned[share:]:
+            await self.redis.eval(_RELEASE_LEASE, 1, self._lease_key(key), self.consumer)
+            self.stats["streams_released"] += 1
+        owned = owned[:share]
+        acquired = []
+        for key in self.streams:
+            if len(owned) >= share:
+                break
+            if key not in owned and await self.redis.set(self._lease_key(key), self.consumer,
+                                                          nx=True, px=self.lease_ms):
+                owned.append(key)
+                acquired.append(key)
+                self.stats["streams_acquired"] += 1
+        await self._sync_monitor(owned, acquired)
+        if set(owned) != set(self.owned):
+            logger.info(f"Consumer {self.consumer} owns {len(owned)}/{len(self.streams)} tick streams")
+        self.owned = owned
+        return owned
+    
+    async def release_streams(self) -> None:
+        """Hand back every lease (on shutdown) so other workers take the streams over at once."""
+        if self.owned:
+            await self._checkpoint_monitor()
+        for key in self.owned:
+            await self.redis.eval(_RELEASE_LEASE, 1, self._lease_key(key), self.consumer)
+        self.owned = []
+        await self.redis.zrem(f"{TICK_WORKERS_PREFIX}:{self.group}", self.consumer)
+    
+    async def _monitor(self) -> Optional[Any]:
+        if self.signal_monitor is None and self._process_tick is None:
+            from .realtime_tick_integration import get_tick_signal_monitor
+            self.signal_monitor = await get_tick_signal_monitor()
+        return self.signal_monitor
+    
+    async def _checkpoint_monitor(self) -> None:
+        monitor = await self._monitor()
+        if monitor is None:
+            return
+        try:
+            monitor.checkpoint_previous_values()
+        except Exception as e:
+            logger.warning(f"Could not checkpoint previous indicator values before a handover: {e}")
+    
+    async def _sync_monitor(self, owned: List[str], acquired: List[str]) -> None:
+        """Sync the owned instruments' conditions and reload crossing state of newly acquired ones."""
+        monitor = await self._monitor()
+        if monitor is None:
+            return
+        try:
+            for key in owned:
+                monitor.sync_conditions(key.split(":", 1)[1])
+            if acquired:
+                monitor.reload_previous_values([key.split(":", 1)[1] for key in acquired])
+        except Exception as e:
+            logger.warning(f"Could not sync signal state for owned tick streams: {e}")
+    
+    async def read_batch(self) -> int:
+        """Read one batch of new entries of the owned streams, process and ack it; returns entries read."""
+        if not self.owned:
+            return 0
+        response = await self.redis.xreadgroup(
+            self.group, self.consumer, {key: ">" for key in self.owned},
+            count=self.batch_size, block=self.block_ms,
+        )
+        return await self._handle({key: entries for key, entries in response or [] if entries})
+    
+    async def claim_stale(self) -> int:
+        """Take over entries of the owned streams left pending for claim_idle_ms; returns entries claimed."""
+        claimed: Dict[str, List] = {}
+        for key in self.owned:
+            start = "0-0"
+            while True:
+                response = await self.redis.xautoclaim(key, self.group, self.consumer, self.claim_idle_ms,
+                                                       start_id=start, count=self.batch_size)
+                start, entries = response[0], [entry for entry in response[1] if entry and entry[1]]
+                claimed.setdefault(key, []).extend(entries)
+                if start in ("0-0", b"0-0") or not response[1]:
+                    break
+        claimed = {key: entries for key, entries in claimed.items() if entries}
+        count = sum(len(entries) for entries in claimed.values())
+        self.stats["entries_claimed"] += count
+        if count:
+            logger.info(f"Claimed {count} stale tick entries for consumer {self.consumer}")
+        await self._handle(claimed)
+        return count
+    
+    async def _handle(self, batch: Dict[str, List]) -> int:
+        """Process the latest tick per stream, then ack every entry of the stream."""
+        read = 0
+        for key, entries in batch.items():
+            read += len(entries)
+            instrument = key.split(":", 1)[1]
+            entry_id, fields = entries[-1]
+            newest = _stream_id(entry_id)
+            self.stats["ticks_coalesced"] += len(entries) - 1
+            if newest > self._last_processed.get(key, (-1, -1)):
+                try:
+                    await self._process(instrument, fields)
+                    self._last_processed[key] = newest
+                except Exception as e:
+                    # Left pending: claimed and retried once idle
+                    self.stats["errors"] += 1
+                    logger.error(f"Error processing tick for {instrument}: {e}", exc_info=True)
+                    continue
+            self.stats["entries_acked"] += await self.redis.xack(key, self.group, *[eid for eid, _ in entries])
+        self.stats["entries_read"] += read
+        return read
+    
+    async def _process(self, instrument: str, fields: Dict[str, Any]) -> None:
+        tick = {
+            "last_price": float(fields["last_price"]),
+            "volume": int(float(fields["volume"])) if fields.get("volume") not in (None, "") else 0,
+            "timestamp": fields.get("timestamp") or datetime.now().isoformat(),
+        }
+        process_tick = self._process_tick
+        if process_tick is None:
+            from .realtime_tick_integration import process_tick_for_signals as process_tick
+        result = await process_tick(instrument, tick)
+        self.stats["ticks_processed"] += 1
+        if result and result.get("signals_triggered", 0) > 0:
+            logger.info(f"✅ {result['signals_triggered']} signal(s) triggered for {instrument} at price {tick['last_price']}")
+    
+    async def run(self) -> None:
+        """Read, claim, renew leases and rediscover streams until stop() is called."""
+        loop = asyncio.get_running_loop()
+        self._running = True
+        next_discovery = next_balance = next_claim = loop.time()
+        try:
+            while self._running:
+                try:
+                    now = loop.time()
+                    if now >= next_discovery:
+                        await self.refresh_streams()
+                        next_discovery = now + self.discovery_interval
+                    if now >= next_balance:
+                        await self.balance_streams()
+                        next_balance = now + self.lease_ms / 3000.0
+                    if now >= next_claim and self.owned:
+                        await self.claim_stale()
+                        next_claim = now + self.claim_idle_ms / 1000.0
+                    if not self.owned:
+                        await asyncio.sleep(min(self.block_ms / 1000.0, max(0.0, next_balance - now)))
+                        continue
+                    await self.read_batch()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.error(f"Error in tick stream subscriber: {e}", exc_info=True)
+                    await asyncio.sleep(1)
+        finally:
+            try:
+                await self.release_streams()
+            except Exception as e:
+                logger.debug(f"Could not release tick stream leases: {e}")
+    
+    def stop(self) -> None:
+        self._running = False
 
 
 async def start_tick_subscriber() -> None:
@@ -41,8 +351,9 @@ async def start_tick_subscriber() -> None:
     
     try:
         _subscriber_running = True
-        _tick_subscriber_task = asyncio.create_task(_tick_subscriber_loop())
-        logger.info("Redis tick subscriber started")
+        loop = _tick_subscriber_loop if TICK_SUBSCRIBER_MODE == "pubsub" else _tick_stream_loop
+        _tick_subscriber_task = asyncio.create_task(loop())
+        logger.info(f"Redis tick subscriber started ({TICK_SUBSCRIBER_MODE} mode)")
     except Exception as e:
         logger.error(f"Failed to start tick subscriber: {e}", exc_info=True)
         _subscriber_running = False
@@ -53,6 +364,8 @@ async def stop_tick_subscriber() -> None:
     global _tick_subscriber_task, _subscriber_running
     
     _subscriber_running = False
+    if _stream_subscriber:
+        _stream_subscriber.stop()
     if _tick_subscriber_task:
         _tick_subscriber_task.cancel()
         try:
@@ -62,8 +375,43 @@ async def stop_tick_subscriber() -> None:
         logger.info("Redis tick subscriber stopped")
 
 
+def get_tick_subscriber_stats() -> Dict[str, Any]:
+    """Counters of the running stream subscriber (empty in pub/sub mode or when stopped)."""
+    if _stream_subscriber is None:
+        return {}
+    return {"group": _stream_subscriber.group, "consumer": _stream_subscriber.consumer,
+            "streams": list(_stream_subscriber.streams), "owned": list(_stream_subscriber.owned),
+            **_stream_subscriber.stats}
+
+
+async def _tick_stream_loop() -> None:
+    """Main loop for the consumer-group tick subscriber."""
+    global _subscriber_running, _stream_subscriber
+    
+    redis_client = redis_async.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        db=0,
+        decode_responses=True
+    )
+    _stream_subscriber = TickStreamSubscriber(redis_client)
+    try:
+        await _stream_subscriber.run()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Tick stream subscriber error: {e}", exc_info=True)
+        _subscriber_running = False
+    finally:
+        _stream_subscriber = None
+        try:
+            await redis_client.close()
+        except Exception:
+            pass
+
+
 async def _tick_subscriber_loop() -> None:
-    """Main loop for Redis tick subscriber."""
+    """Main loop for the legacy pub/sub tick subscriber (TICK_SUBSCRIBER_MODE=pubsub)."""
     global _subscriber_running
     
     redis_host = os.getenv("REDIS_HOST", "localhost")
@@ -16,16 +16,34 @@ Architecture:
 """
 
 import asyncio
+import heapq
+import itertools
+import json
 import logging
+import operator
 import sys
 import os
-from typing import Dict, Any, List, Optional, Callable
-from dataclasses import dataclass, field
+import socket
+import time
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from .condition_book import CROSSING_OPERATORS, EQUAL_TOLERANCE, ConditionBook
+from .condition_kernel import ConditionKernel
+
 logger = logging.getLogger(__name__)
 
+# TTL of persisted indicators_prev:{instrument}:{indicator} values used for cross detection
+PREVIOUS_VALUE_TTL = 60 * 60 * 4
+# Seconds between pipelined checkpoints of previous values to Redis
+PREVIOUS_VALUE_CHECKPOINT_INTERVAL = float(os.getenv("SIGNAL_PREV_CHECKPOINT_INTERVAL", "5.0"))
+# TTL of signal_trigger:{condition_id} claims that stop two engine workers firing one condition
+TRIGGER_CLAIM_TTL = 60 * 60 * 24
+# Hash of condition_id -> JSON condition per instrument, shared by every engine worker
+CONDITION_REGISTRY_PREFIX = "signal_conditions"
+
 
 class ConditionOperator(Enum):
     """Comparison operators for conditions."""
@@ -38,6 +56,15 @@ class ConditionOperator(Enum):
     CROSSES_BELOW = "crosses_below"  # Value crosses from above to below threshold
 
 
+def _as_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
 @dataclass
 class TradingCondition:
     """Represents a conditional trading signal.
@@ -132,16 +159,38 @@ class SignalMonitor:
         # When RSI crosses 32, monitor triggers trade execution
     """
     
-    def __init__(self, technical_service=None):
+    def __init__(self, technical_service=None,
+                 checkpoint_interval: float = PREVIOUS_VALUE_CHECKPOINT_INTERVAL):
         """Initialize signal monitor.
         
         Args:
             technical_service: Optional TechnicalIndicatorsService instance.
                               If None, will fetch via get_technical_service()
+            checkpoint_interval: Seconds between Redis checkpoints of the previous
+                                 indicator values used for cross detection
         """
         self._active_signals: Dict[str, TradingCondition] = {}
         self._triggered_signals: List[SignalTriggerEvent] = []
         self._technical_service = technical_service
+
+        # Threshold ladders per (instrument, indicator, operator) and expiry heaps per instrument;
+        # _indexed keeps the key each condition was indexed under (seq, instrument, indicator, op, threshold)
+        self._book = ConditionBook()
+        self._sequence = itertools.count()
+        self._indexed: Dict[str, Tuple[int, str, str, str, float]] = {}
+        self._expiries: Dict[str, List[Tuple[str, int, str]]] = {}
+        # additional_conditions compiled per instrument into columnar AND-groups
+        self._kernels: Dict[str, ConditionKernel] = {}
+        
+        # Previous indicator values for cross detection, one per (instrument, indicator), kept in
+        # memory; changed values are checkpointed to Redis in one pipeline every checkpoint_interval
+        # and restored (one MGET) the first time a crossing condition needs them
+        self._previous_values: Dict[Tuple[str, str], float] = {}
+        self._dirty_previous: set = set()
+        self._restored_previous: set = set()
+        self._pending_restore: set = set()
+        self.checkpoint_interval = checkpoint_interval
+        self._last_checkpoint = time.monotonic()
         
         # Redis client for persisted previous values
         try:
@@ -151,21 +200,31 @@ class SignalMonitor:
         except Exception:
             self._redis_client = None
 
+        # Identifies this process in trigger claims
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
         # Callbacks for trade execution
         self._on_signal_triggered: Optional[Callable] = None
         
         logger.info("SignalMonitor initialized")
     
-    def add_signal(self, condition: TradingCondition) -> str:
+    def add_signal(self, condition: TradingCondition, share: bool = True) -> str:
         """Add a conditional signal to monitor.
         
         Args:
             condition: Trading condition to monitor
+            share: Also write it to the Redis condition registry, so the worker
+                   owning the instrument's tick stream picks it up (sync_conditions)
             
         Returns:
             condition_id for tracking
         """
+        if condition.condition_id in self._active_signals:
+            self._unindex(condition.condition_id)
         self._active_signals[condition.condition_id] = condition
+        self._index(condition)
+        if share:
+            self._share_condition(condition)
         logger.info(
             f"Added signal {condition.condition_id}: "
             f"{condition.action} {condition.instrument} when "
@@ -173,20 +232,109 @@ class SignalMonitor:
         )
         return condition.condition_id
     
-    def remove_signal(self, condition_id: str) -> bool:
+    def remove_signal(self, condition_id: str, share: bool = True) -> bool:
         """Remove a signal from monitoring.
         
         Args:
             condition_id: ID of condition to remove
+            share: Also delete it from the Redis condition registry
             
         Returns:
             True if removed, False if not found
         """
-        if condition_id in self._active_signals:
-            del self._active_signals[condition_id]
-            logger.info(f"Removed signal {condition_id}")
-            return True
-        return False
+        condition = self._active_signals.pop(condition_id, None)
+        if condition is None:
+            return False
+        self._unindex(condition_id)
+        if share:
+            self._unshare_condition(condition)
+        logger.info(f"Removed signal {condition_id}")
+        return True
+    
+    @staticmethod
+    def _registry_key(instrument: str) -> str:
+        return f"{CONDITION_REGISTRY_PREFIX}:{instrument}"
+    
+    def _share_condition(self, condition: TradingCondition) -> None:
+        if not self._redis_client:
+            return
+        payload = asdict(condition)
+        payload["operator"] = condition.operator.value
+        payload.pop("_previous_value", None)
+        try:
+            self._redis_client.hset(self._registry_key(condition.instrument), condition.condition_id,
+                                    json.dumps(payload, default=str))
+        except Exception as e:
+            logger.warning(f"Could not share signal {condition.condition_id}: {e}")
+    
+    def _unshare_condition(self, condition: TradingCondition) -> None:
+        if not self._redis_client:
+            return
+        try:
+            self._redis_client.hdel(self._registry_key(condition.instrument), condition.condition_id)
+        except Exception as e:
+            logger.warning(f"Could not unshare signal {condition.condition_id}: {e}")
+    
+    def sync_conditions(self, instrument: str) -> int:
+        """Make this worker's conditions for an instrument match the Redis registry.
+        
+        Conditions only live in the memory of the process that added them; the
+        worker owning the instrument's tick stream calls this on acquiring the
+        stream and on every lease renewal. Registry entries missing here are
+        added, local ones no longer in the registry (triggered, expired or
+        removed elsewhere) are dropped. Returns the number of changes.
+        """
+        if not self._redis_client:
+            return 0
+        try:
+            stored = self._redis_client.hgetall(self._registry_key(instrument))
+        except Exception as e:
+            logger.warning(f"Could not sync signals for {instrument}: {e}")
+            return 0
+        registry = {}
+        for condition_id, raw in stored.items():
+            condition_id = condition_id.decode() if isinstance(condition_id, bytes) else condition_id
+            registry[condition_id] = raw
+        changes = 0
+        for condition in self.get_active_signals(instrument):
+            if condition.condition_id not in registry:
+                changes += self.remove_signal(condition.condition_id, share=False)
+        for condition_id, raw in registry.items():
+            if condition_id in self._active_signals:
+                continue
+            try:
+                payload = json.loads(raw)
+                payload["operator"] = ConditionOperator(payload["operator"])
+                condition = TradingCondition(**payload)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Skipping malformed shared signal {condition_id}: {e}")
+                continue
+            if condition.is_active:
+                self.add_signal(condition, share=False)
+                changes += 1
+        return changes
+    
+    def _index(self, condition: TradingCondition) -> None:
+        seq = next(self._sequence)
+        key = (seq, condition.instrument, condition.indicator, condition.operator.value, float(condition.threshold))
+        self._indexed[condition.condition_id] = key
+        self._book.add(*key[1:], seq, condition.condition_id)
+        kernel = self._kernels.get(condition.instrument)
+        if kernel is None:
+            kernel = self._kernels[condition.instrument] = ConditionKernel()
+        kernel.add(condition.condition_id, *key[2:], condition.additional_conditions or ())
+        if key[3] in CROSSING_OPERATORS and key[1:3] not in self._restored_previous:
+            self._pending_restore.add(key[1:3])
+        if condition.expires_at:
+            heapq.heappush(self._expiries.setdefault(condition.instrument, []),
+                           (condition.expires_at, seq, condition.condition_id))
+
+    def _unindex(self, condition_id: str) -> None:
+        # Expiry heap entries are dropped lazily (their sequence no longer matches)
+        key = self._indexed.pop(condition_id, None)
+        if key is not None:
+            self._book.remove(*key[1:], condition_id)
+            self._kernels[key[1]].remove(condition_id)
     
     def get_active_signals(self, instrument: Optional[str] = None) -> List[TradingCondition]:
         """Get all active signals, optionally filtered by instrument.
@@ -263,31 +411,54 @@ class SignalMonitor:
         
         triggered_events = []
         
-        # Check each active signal for this instrument
-        signals_to_remove = []
+        # Recover previous values of newly added crossing conditions (after a restart) in one MGET
+        if self._pending_restore:
+            self._restore_previous_values(self._pending_restore)
+        
+        # Expired signals leave first so they are never triggered
+        signals_to_remove = await self._expire_signals(instrument)
+        expired = set(signals_to_remove)
         
-        for condition_id, condition in list(self._active_signals.items()):
-            if condition.instrument != instrument:
+        # Met conditions come out of the threshold ladders; restore insertion order
+        candidates: List[Tuple[int, str]] = []
+        values: Dict[str, float] = {}
+        for indicator, ladders in self._book.indicators(instrument).items():
+            value = _as_float(indicators_dict.get(indicator))
+            if value is None:  # missing or non-numeric
                 continue
-            
-            if not condition.is_active:
+            crossings = ConditionBook.has_crossings(ladders)
+            if value != value:
+                # NaN meets nothing, but still becomes the previous value, so a crossing never
+                # spans a NaN gap (as when each condition compared against its own last value)
+                if crossings:
+                    self._cross_previous(instrument, indicator, value)
+                continue
+            values[indicator] = value
+            previous = self._cross_previous(instrument, indicator, value) if crossings else None
+            candidates.extend(ConditionBook.matches(ladders, value, previous))
+        candidates.sort()
+        
+        # AND-groups of every candidate that has additional_conditions, in one kernel pass
+        kernel = self._kernels.get(instrument)
+        grouped = [cid for _, cid in candidates if cid not in expired and kernel.has_clauses(cid)]
+        groups_failed = set()
+        if grouped:
+            met = kernel.clauses_met(grouped, indicators_dict)
+            groups_failed = {cid for cid, ok in zip(grouped, met.tolist()) if not ok}
+        
+        for _, condition_id in candidates:
+            condition = self._active_signals.get(condition_id)
+            if condition is None or not condition.is_active or condition_id in expired:
                 continue
             
-            # Check if expired
-            if condition.expires_at:
-                if datetime.now().isoformat() > condition.expires_at:
-                    # Mark expired in MongoDB and publish update
-                    try:
-                        from .signal_creator import mark_signal_status
-                        await mark_signal_status(condition.condition_id, "expired")
-                    except Exception:
-                        pass
-                    signals_to_remove.append(condition_id)
-                    logger.info(f"Signal {condition_id} expired")
-                    continue
+            triggered = condition_id not in groups_failed
             
-            # Evaluate condition
-            triggered = self._evaluate_condition(condition, indicators_dict)
+            if triggered and not self._claim_trigger(condition_id):
+                # Another engine worker fired this condition first
+                condition.is_active = False
+                signals_to_remove.append(condition_id)
+                logger.info(f"Signal {condition_id} already triggered by another worker")
+                continue
             
             if triggered:
                 # Create trigger event
@@ -297,7 +468,7 @@ class SignalMonitor:
                     action=condition.action,
                     triggered_at=datetime.now().isoformat(),
                     indicator_name=condition.indicator,
-                    indicator_value=indicators_dict.get(condition.indicator, 0),
+                    indicator_value=values[condition.indicator],
                     threshold=condition.threshold,
                     current_price=indicators_dict.get("current_price", 0),
                     position_size=condition.position_size,
@@ -341,10 +512,123 @@ class SignalMonitor:
         for condition_id in signals_to_remove:
             self.remove_signal(condition_id)
         
+        if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint_previous_values()
+        
         return triggered_events
     
+    async def _expire_signals(self, instrument: str) -> List[str]:
+        """Pop signals of the instrument whose expires_at has passed; returns their ids."""
+        heap = self._expiries.get(instrument)
+        expired: List[str] = []
+        if not heap:
+            return expired
+        now = datetime.now().isoformat()
+        while heap and now > heap[0][0]:
+            _, seq, condition_id = heapq.heappop(heap)
+            key = self._indexed.get(condition_id)
+            condition = self._active_signals.get(condition_id)
+            if key is None or key[0] != seq or condition is None or not condition.is_active:
+                continue  # removed, re-added or inactive since it was queued
+            # Mark expired in MongoDB and publish update
+            try:
+                from .signal_creator import mark_signal_status
+                await mark_signal_status(condition.condition_id, "expired")
+            except Exception:
+                pass
+            expired.append(condition_id)
+            logger.info(f"Signal {condition_id} expired")
+        return expired
+    
+    def _claim_trigger(self, condition_id: str) -> bool:
+        """Claim a trigger in Redis (SET NX) so each condition fires on one worker only.
+        
+        Without Redis, or if the claim cannot be written, the local trigger stands.
+        """
+        if not self._redis_client:
+            return True
+        try:
+            return bool(self._redis_client.set(f"signal_trigger:{condition_id}", self.worker_id,
+                                               nx=True, ex=TRIGGER_CLAIM_TTL))
+        except Exception as e:
+            logger.warning(f"Could not claim trigger for {condition_id}: {e}")
+            return True
+    
+    def _cross_previous(self, instrument: str, indicator: str, value: float) -> Optional[float]:
+        """Previous value of an indicator for cross detection, recording `value` as the new one."""
+        key = (instrument, indicator)
+        if key not in self._restored_previous:
+            self._restore_previous_values([key])
+        previous = self._previous_values.get(key)
+        self._previous_values[key] = value
+        self._dirty_previous.add(key)
+        return previous
+    
+    @staticmethod
+    def _previous_key(instrument: str, indicator: str) -> str:
+        return f"indicators_prev:{instrument}:{indicator}"
+    
+    def _restore_previous_values(self, keys) -> int:
+        """Load checkpointed previous values for (instrument, indicator) keys with one MGET.
+        
+        Values already held in memory win; returns the number restored.
+        """
+        keys = [key for key in keys if key not in self._restored_previous]
+        self._restored_previous.update(keys)
+        self._pending_restore.difference_update(keys)
+        if not keys or not self._redis_client:
+            return 0
+        try:
+            stored = self._redis_client.mget([self._previous_key(*key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Could not restore previous indicator values: {e}")
+            return 0
+        restored = 0
+        for key, raw in zip(keys, stored):
+            value = _as_float(raw)
+            if value is not None and key not in self._previous_values:
+                self._previous_values[key] = value
+                restored += 1
+        return restored
+    
+    def reload_previous_values(self, instruments) -> int:
+        """Replace in-memory previous values of instruments with their checkpoints.
+        
+        Called when this worker takes over the instruments' tick streams: values
+        it still holds from an earlier ownership are stale, the releasing worker
+        checkpointed the current ones. Returns the number restored.
+        """
+        instruments = set(instruments)
+        keys = {key for key in self._previous_values if key[0] in instruments}
+        keys.update(key for key in self._restored_previous if key[0] in instruments)
+        keys.update(key[1:3] for key in self._indexed.values()
+                    if key[1] in instruments and key[3] in CROSSING_OPERATORS)
+        for key in keys:
+            self._previous_values.pop(key, None)
+            self._dirty_previous.discard(key)
+            self._restored_previous.discard(key)
+        return self._restore_previous_values(keys)
+    
+    def checkpoint_previous_values(self) -> int:
+        """Persist previous values changed since the last checkpoint in one pipeline; returns how many."""
+        self._last_checkpoint = time.monotonic()
+        if not self._dirty_previous or not self._redis_client:
+            return 0
+        dirty, self._dirty_previous = self._dirty_previous, set()
+        try:
+            pipe = self._redis_client.pipeline(transaction=False)
+            for key in dirty:
+                # Set with TTL to avoid stale storage
+                pipe.setex(self._previous_key(*key), PREVIOUS_VALUE_TTL, str(self._previous_values[key]))
+            pipe.execute()
+        except Exception as e:
+            self._dirty_previous |= dirty  # retry on the next checkpoint
+            logger.warning(f"Previous indicator value checkpoint failed: {e}")
+            return 0
+        return len(dirty)
+    
     def _evaluate_condition(self, condition: TradingCondition, indicators: Dict[str, Any]) -> bool:
-        """Evaluate if a condition is met.
+        """Evaluate if a single condition is met (check_signals uses the threshold book and kernel instead).
         
         Args:
             condition: Trading condition to evaluate
@@ -353,116 +637,67 @@ class SignalMonitor:
         Returns:
             True if condition is met, False otherwise
         """
-        # Get current value
-        current_value = indicators.get(condition.indicator)
+        current_value = _as_float(indicators.get(condition.indicator))
         if current_value is None:
             return False
         
-        try:
-            current_value = float(current_value)
-        except (ValueError, TypeError):
-            return False
-        
-        # Evaluate based on operator
-        result = False
-        
-        if condition.operator == ConditionOperator.GREATER_THAN:
-            result = current_value > condition.threshold
-        
-        elif condition.operator == ConditionOperator.LESS_THAN:
-            result = current_value < condition.threshold
-        
-        elif condition.operator == ConditionOperator.GREATER_EQUAL:
-            result = current_value >= condition.threshold
-        
-        elif condition.operator == ConditionOperator.LESS_EQUAL:
-            result = current_value <= condition.threshold
+        if condition.operator in (ConditionOperator.CROSSES_ABOVE, ConditionOperator.CROSSES_BELOW):
+            prev_val = self._cross_previous(condition.instrument, condition.indicator, current_value)
+            condition._previous_value = current_value
+            if prev_val is None:
+                result = False
+            elif condition.operator == ConditionOperator.CROSSES_ABOVE:
+                result = prev_val <= condition.threshold and current_value > condition.threshold
+            else:
+                result = prev_val >= condition.threshold and current_value < condition.threshold
+        else:
+            result = _COMPARATORS[condition.operator](current_value, condition.threshold)
         
-        elif condition.operator == ConditionOperator.EQUAL:
-            result = abs(current_value - condition.threshold) < 0.01
+        if result and condition.additional_conditions:
+            result = self._additional_conditions_met(condition, indicators)
         
-        elif condition.operator == ConditionOperator.CROSSES_ABOVE:
-            # Check cross using persisted previous value in Redis (more robust across restarts)
-            prev_val = None
-            try:
-                if self._redis_client:
-                    key = f"indicators_prev:{condition.instrument}:{condition.indicator}"
-                    pv = self._redis_client.get(key)
-                    prev_val = float(pv) if pv is not None else None
-            except Exception:
-                prev_val = condition._previous_value
+        return result
+    
+    @staticmethod
+    def _additional_conditions_met(condition: TradingCondition, indicators: Dict[str, Any]) -> bool:
+        """Check additional conditions (AND logic); incomplete entries are ignored, unknown operators only need a value.
 
-            # Fall back to in-memory previous if Redis not available
-            if prev_val is not None:
-                result = (prev_val <= condition.threshold and current_value > condition.threshold)
-            # Update both Redis and in-memory previous value
-            try:
-                if self._redis_client:
-                    key = f"indicators_prev:{condition.instrument}:{condition.indicator}"
-                    # Set with TTL to avoid stale storage (e.g., 4 hours)
-                    self._redis_client.setex(key, 60 * 60 * 4, str(current_value))
-            except Exception:
-                pass
-            condition._previous_value = current_value
+        Scalar reference for ConditionKernel, which check_signals uses.
+        """
+        for extra_cond in condition.additional_conditions:
+            indicator_name = extra_cond.get("indicator")
+            op = extra_cond.get("operator")
+            threshold = extra_cond.get("threshold")
+            
+            if not indicator_name or op is None or threshold is None:
+                continue
+            
+            value = _as_float(indicators.get(indicator_name))
+            if value is None:
+                return False
+            
+            compare = _EXTRA_COMPARATORS.get(op)
+            if compare is not None and not compare(value, threshold):
+                return False
         
-        elif condition.operator == ConditionOperator.CROSSES_BELOW:
-            # Check cross using persisted previous value in Redis
-            prev_val = None
-            try:
-                if self._redis_client:
-                    key = f"indicators_prev:{condition.instrument}:{condition.indicator}"
-                    pv = self._redis_client.get(key)
-                    prev_val = float(pv) if pv is not None else None
-            except Exception:
-                prev_val = condition._previous_value
+        return True
 
-            if prev_val is not None:
-                result = (prev_val >= condition.threshold and current_value < condition.threshold)
 
-            # Update persisted previous value and in-memory
-            try:
-                if self._redis_client:
-                    key = f"indicators_prev:{condition.instrument}:{condition.indicator}"
-                    self._redis_client.setex(key, 60 * 60 * 4, str(current_value))
-            except Exception:
-                pass
-            condition._previous_value = current_value
-        
-        # Check additional conditions (AND logic)
-        if result and condition.additional_conditions:
-            for extra_cond in condition.additional_conditions:
-                indicator_name = extra_cond.get("indicator")
-                operator = extra_cond.get("operator")
-                threshold = extra_cond.get("threshold")
-                
-                if not indicator_name or operator is None or threshold is None:
-                    continue
-                
-                value = indicators.get(indicator_name)
-                if value is None:
-                    result = False
-                    break
-                
-                try:
-                    value = float(value)
-                except (ValueError, TypeError):
-                    result = False
-                    break
-                
-                # Simple comparison for additional conditions
-                if operator == ">":
-                    result = result and (value > threshold)
-                elif operator == "<":
-                    result = result and (value < threshold)
-                elif operator == ">=":
-                    result = result and (value >= threshold)
-                elif operator == "<=":
-                    result = result and (value <= threshold)
-                
-                if not result:
-                    break
-        
-        return result
+_COMPARATORS: Dict[ConditionOperator, Callable[[float, float], bool]] = {
+    ConditionOperator.GREATER_THAN: operator.gt,
+    ConditionOperator.LESS_THAN: operator.lt,
+    ConditionOperator.GREATER_EQUAL: operator.ge,
+    ConditionOperator.LESS_EQUAL: operator.le,
+    ConditionOperator.EQUAL: lambda value, threshold: abs(value - threshold) < EQUAL_TOLERANCE,
+}
+
+# Operators allowed in additional_conditions
+_EXTRA_COMPARATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
 
 
 # Global singleton instance
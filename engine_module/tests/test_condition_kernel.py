@@ -0,0 +1,126 @@
+import asyncio
+import random
+
+import numpy as np
+
+from engine_module.condition_kernel import ConditionKernel
+from engine_module.signal_monitor import ConditionOperator, SignalMonitor, TradingCondition
+
+OPERATORS = list(ConditionOperator)
+EXTRA_OPERATORS = [">", "<", ">=", "<=", "!="]
+INDICATORS = ["rsi_14", "adx_14", "macd_value", "missing"]
+
+
+class FakeTech:
+    def __init__(self, indicators=None):
+        self.indicators = {"BANKNIFTY": dict(indicators or {})}
+
+    def get_indicators_dict(self, instrument):
+        return self.indicators.get(instrument, {})
+
+
+def _random_conditions(rng, count):
+    conditions = []
+    for i in range(count):
+        extras = []
+        for _ in range(rng.choice([0, 0, 1, 2, 3])):
+            extra = {"indicator": rng.choice(INDICATORS), "operator": rng.choice(EXTRA_OPERATORS),
+                     "threshold": round(rng.uniform(20, 80), 1)}
+            if rng.random() < 0.1:
+                del extra[rng.choice(list(extra))]  # incomplete clauses are ignored
+            extras.append(extra)
+        conditions.append(TradingCondition(
+            condition_id=f"c{i}", instrument="BANKNIFTY", indicator=rng.choice(INDICATORS),
+            operator=rng.choice(OPERATORS), threshold=round(rng.uniform(20, 80), 2), action="BUY",
+            additional_conditions=extras))
+    return conditions
+
+
+def _random_indicators(rng):
+    indicators = {"rsi_14": round(rng.uniform(15, 85), 2), "adx_14": rng.uniform(15, 85),
+                  "macd_value": rng.choice([str(round(rng.uniform(15, 85), 2)), "n/a", float("nan"), None])}
+    if rng.random() < 0.2:
+        del indicators["adx_14"]
+    return indicators
+
+
+def _scalar(monitor, conditions, indicators, previous):
+    met = []
+    for c in conditions:
+        # One previous value per indicator per tick, as check_signals sees it
+        monitor._previous_values = {("BANKNIFTY", name): value for name, value in previous.items()}
+        if monitor._evaluate_condition(c, indicators):
+            met.append(c.condition_id)
+    return met
+
+
+def test_kernel_matches_scalar_evaluation():
+    rng = random.Random(3)
+    monitor = SignalMonitor(technical_service=FakeTech())
+    monitor._redis_client = None
+    conditions = _random_conditions(rng, 3000)
+    kernel = ConditionKernel()
+    for c in conditions:
+        kernel.add(c.condition_id, c.indicator, c.operator.value, c.threshold, c.additional_conditions)
+
+    for tick in range(30):
+        indicators = _random_indicators(rng)
+        previous = {} if tick == 0 else {"rsi_14": rng.uniform(15, 85), "adx_14": rng.uniform(15, 85)}
+        expected = _scalar(monitor, conditions, indicators, previous)
+        assert kernel.evaluate(indicators, previous) == expected
+
+
+def test_removal_and_compaction_keep_insertion_order():
+    rng = random.Random(5)
+    monitor = SignalMonitor(technical_service=FakeTech())
+    monitor._redis_client = None
+    conditions = [c for c in _random_conditions(rng, 5000) if not c.operator.value.startswith("crosses")]
+    kernel = ConditionKernel()
+    for c in conditions:
+        kernel.add(c.condition_id, c.indicator, c.operator.value, c.threshold, c.additional_conditions)
+    removed = set(rng.sample([c.condition_id for c in conditions], 3500))
+    for cid in removed:
+        assert kernel.remove(cid)
+    assert not kernel.remove("c-unknown")
+    assert len(kernel) == len(conditions) - len(removed)
+    assert kernel._rows.size < len(conditions)  # compacted
+
+    remaining = [c for c in conditions if c.condition_id not in removed]
+    indicators = _random_indicators(rng)
+    assert kernel.evaluate(indicators) == _scalar(monitor, remaining, indicators, {})
+    ids = [c.condition_id for c in remaining]
+    expected = [SignalMonitor._additional_conditions_met(c, indicators) for c in remaining]
+    assert kernel.clauses_met(ids, indicators).tolist() == expected
+
+
+def test_check_signals_applies_compiled_and_groups():
+    monitor = SignalMonitor(technical_service=FakeTech({"rsi_14": 60.0, "adx_14": 30.0, "vol": "n/a"}))
+    monitor._redis_client = None
+    groups = {
+        "c1": [{"indicator": "adx_14", "operator": ">", "threshold": 25}],
+        "c2": [{"indicator": "adx_14", "operator": ">", "threshold": 25},
+               {"indicator": "adx_14", "operator": "<", "threshold": 28}],
+        "c3": [{"indicator": "vol", "operator": ">", "threshold": 0}],           # non-numeric value
+        "c4": [{"indicator": "adx_14", "operator": "!=", "threshold": 30}],      # unknown operator: value present
+        "c5": [{"indicator": "adx_14", "operator": ">"}],                       # incomplete: ignored
+        "c6": [],
+    }
+    for cid, extras in groups.items():
+        monitor.add_signal(TradingCondition(condition_id=cid, instrument="BANKNIFTY", indicator="rsi_14",
+                                            operator=ConditionOperator.GREATER_THAN, threshold=50.0,
+                                            action="BUY", additional_conditions=extras))
+
+    triggered = asyncio.run(monitor.check_signals("BANKNIFTY"))
+    assert [e.condition_id for e in triggered] == ["c1", "c4", "c5", "c6"]
+    assert sorted(monitor._active_signals) == ["c2", "c3"]
+    assert len(monitor._kernels["BANKNIFTY"]) == 2
+
+
+def test_indicator_vector_marks_unusable_values():
+    kernel = ConditionKernel()
+    kernel.add("c1", "a", ">", 1.0, [{"indicator": "b", "operator": ">", "threshold": 0},
+                                     {"indicator": "c", "operator": ">", "threshold": 0}])
+    values, present = kernel.vector({"a": "2.5", "b": "x", "c": float("nan")})
+    assert kernel.indicators == ["b", "c", "a"]
+    assert present.tolist() == [False, True, True]
+    assert np.isnan(values[:2]).all() and values[2] == 2.5
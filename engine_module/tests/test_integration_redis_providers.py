@@ -78,3 +78,27 @@ async def test_orchestrator_with_redis_providers():
     assert isinstance(tech, list)
     if tech:
         assert all('agent' in t for t in tech)
+
+
+@pytest.mark.asyncio
+async def test_technical_provider_reads_indicator_snapshot_hash():
+    from engine_module.redis_providers import RedisTechnicalDataProvider
+
+    class HashRedis(InMemoryRedis):
+        def __init__(self):
+            super().__init__()
+            self.hashes = {}
+        def hgetall(self, key):
+            return self.hashes.get(key, {})
+
+    r = HashRedis()
+    r.hashes["indicators_hash:BANKNIFTY:1min"] = {
+        b"rsi_14": b"61.5", b"sma_20": b"60350.0", b"macd_value": b"12.5", b"trend_direction": b"UP",
+    }
+    # Legacy keys are ignored once the snapshot hash exists
+    r.set("indicators:BANKNIFTY:sma_20", "1.0")
+
+    indicators = await RedisTechnicalDataProvider(r).get_technical_indicators("BANKNIFTY")
+    assert indicators.rsi == 61.5
+    assert indicators.sma_20 == 60350.0
+    assert indicators.macd == 12.5
@@ -44,3 +44,12 @@ def test_sell_signal_returns_bear_put_spread():
     assert legs[0]["option_type"] == legs[1]["option_type"] == "PE"
     assert result.get("net_debit") is not None
 
+
+
+def test_api_chain_rows_under_strikes_key_use_delta_and_iv_filters():
+    api_chain = {key: value for key, value in CHAIN.items() if key != "chain"}
+    api_chain["strikes"] = CHAIN["chain"]
+    cfg = RuleConfig(min_oi=75000, target_delta=0.22, max_iv=19.0)
+    result = evaluate("BUY", api_chain, {}, cfg)
+    assert result["available"] is True
+    assert result["recommendation"]["strike"] == 45500
@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+from engine_module.orchestrator_stub import TradingOrchestrator
+from engine_module.redis_providers import RedisMarketDataProvider, RedisTechnicalDataProvider
+
+
+class SlowSource:
+    """Every provider method the fetch stage uses, each taking `delay` seconds."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def _wait(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+    async def get_ohlc_data(self, instrument, periods=100):
+        await self._wait()
+        return [{"close": 45000.0 + self.calls}]
+
+    async def fetch_chain(self, instrument):
+        await self._wait()
+        return {"expiries": ["2026-10-27"], "pcr": 1.1 + self.calls}
+
+    async def get_latest_news(self, instrument, limit=10):
+        await self._wait()
+        return [{"title": "RBI holds rates"}]
+
+    async def get_sentiment_summary(self, instrument, hours=24):
+        return {"average_sentiment": 0.2}
+
+    async def get_technical_indicators(self, instrument, periods=100):
+        await self._wait()
+        return {"rsi_14": 55.0}
+
+    async def get_positions(self, symbol=None):
+        await self._wait()
+        return []
+
+    def get_portfolio_summary(self):
+        return {"open_positions": 0}
+
+
+def _orchestrator(delays=None, **config):
+    delays = delays or {}
+    sources = {name: SlowSource(delays.get(name, 0.0)) for name in ("market", "options", "news", "technical", "positions")}
+    orchestrator = TradingOrchestrator(
+        llm_client=None,
+        market_data_provider=sources["market"],
+        options_data_provider=sources["options"],
+        news_service=sources["news"],
+        technical_data_provider=sources["technical"],
+        position_manager=sources["positions"],
+        **config,
+    )
+    return orchestrator, sources
+
+
+def test_sources_are_fetched_concurrently():
+    orchestrator, _ = _orchestrator({name: 0.2 for name in ("market", "options", "news", "technical", "positions")})
+    started = time.perf_counter()
+    fetched, report = asyncio.run(orchestrator._fetch_data("BANKNIFTY"))
+    assert time.perf_counter() - started < 0.5  # one wait, not the sum of five
+    assert fetched["market"]["current_price"] == 45001.0
+    assert fetched["technical"]["technical_indicators"] == {"rsi_14": 55.0}
+    assert all(entry["status"] == "ok" and not entry["stale"] for entry in report.values())
+    assert all(entry["latency_ms"] >= 150 for entry in report.values())
+
+
+def test_timed_out_source_falls_back_to_last_known_good():
+    orchestrator, sources = _orchestrator(fetch_timeouts={"options": 0.1})
+
+    async def two_cycles():
+        first = await orchestrator._fetch_data("BANKNIFTY")
+        sources["options"].delay = 1.0
+        await asyncio.sleep(0.05)
+        return first, await orchestrator._fetch_data("BANKNIFTY")
+
+    (first, _), (fetched, report) = asyncio.run(two_cycles())
+    assert fetched["options"] == first["options"] and fetched["options"]["pcr"] == 2.1
+    assert report["options"]["status"] == "timeout" and report["options"]["stale"]
+    assert report["options"]["staleness_seconds"] >= 0.05
+    assert report["options"]["latency_ms"] < 500
+    assert report["market"]["status"] == "ok" and fetched["market"]["current_price"] == 45002.0
+
+
+def test_deadline_bounds_every_source_without_earlier_data():
+    orchestrator, _ = _orchestrator({"news": 1.0, "technical": 1.0}, fetch_timeouts={"news": 5.0}, fetch_deadline=0.15)
+    started = time.perf_counter()
+    fetched, report = asyncio.run(orchestrator._fetch_data("NIFTY"))
+    assert time.perf_counter() - started < 0.5
+    assert report["news"]["status"] == report["technical"]["status"] == "timeout"
+    assert report["news"]["staleness_seconds"] is None
+    assert fetched["news"] == {"instrument": "NIFTY", "error": "timeout"}
+    assert report["market"]["status"] == "ok"
+
+
+def test_cycle_result_records_source_report():
+    orchestrator, _ = _orchestrator()
+    result = asyncio.run(orchestrator.run_cycle({"instrument": "BANKNIFTY"}))
+    assert result.decision == "HOLD"
+    assert set(result.details["data_sources"]) == {"market", "options", "news", "technical", "positions"}
+
+
+class BlockingRedis:
+    """Synchronous Redis client whose reads block the calling thread for `delay` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def ping(self):
+        return True
+
+    def zrange(self, key, start, end):
+        time.sleep(self.delay)
+        return ['{"close": 45100.0}'] if key.endswith(":15min") else []
+
+    def hgetall(self, key):
+        time.sleep(self.delay)
+        return {"rsi_14": "61.5"}
+
+    def get(self, key):
+        return None
+
+
+def test_blocking_redis_providers_do_not_stall_the_other_sources():
+    orchestrator, _ = _orchestrator({"options": 0.2, "news": 0.2}, fetch_timeouts={"technical": 0.1})
+    orchestrator.market_data_provider = RedisMarketDataProvider(BlockingRedis(0.2))
+    orchestrator.technical_data_provider = RedisTechnicalDataProvider(BlockingRedis(0.4))
+
+    started = time.perf_counter()
+    fetched, report = asyncio.run(orchestrator._fetch_data("BANKNIFTY"))
+    assert time.perf_counter() - started < 0.55  # the event loop kept running while Redis blocked
+    assert fetched["market"]["current_price"] == 45100.0
+    assert report["options"]["status"] == "ok" and report["options"]["latency_ms"] < 350
+    assert report["technical"]["status"] == "timeout" and report["technical"]["latency_ms"] < 300
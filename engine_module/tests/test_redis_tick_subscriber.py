@@ -0,0 +1,454 @@
+import asyncio
+
+from engine_module.redis_tick_subscriber import TickStreamSubscriber
+from engine_module.signal_monitor import ConditionOperator, SignalMonitor, TradingCondition
+
+
+class FakeStreamRedis:
+    """Async Redis Streams with consumer groups (pending lists, idle times, XAUTOCLAIM) and leases."""
+
+    def __init__(self):
+        self.streams = {}
+        self.groups = {}
+        self.now_ms = 0
+        self.deliveries = []  # (consumer, entry_id)
+        self.values = {}  # key -> [value, expires_at_ms]
+        self.zsets = {}
+
+    async def time(self):
+        return self.now_ms // 1000, self.now_ms % 1000 * 1000
+
+    def _get(self, key):
+        value = self.values.get(key)
+        if value and value[1] is not None and value[1] <= self.now_ms:
+            del self.values[key]
+            return None
+        return value[0] if value else None
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._get(key) is not None:
+            return None
+        self.values[key] = [value, None if px is None else self.now_ms + px]
+        return True
+
+    async def eval(self, script, numkeys, key, consumer, *args):
+        if self._get(key) != consumer:
+            return 0
+        if "PEXPIRE" in script:
+            self.values[key][1] = self.now_ms + int(args[0])
+        else:
+            del self.values[key]
+        return 1
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrem(self, key, member):
+        return self.zsets.get(key, {}).pop(member, None) is not None
+
+    async def xadd(self, key, fields):
+        entries = self.streams.setdefault(key, [])
+        entry_id = f"{self.now_ms}-{len(entries)}"
+        entries.append((entry_id, {k: str(v) for k, v in fields.items()}))
+        return entry_id
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.streams):
+            if key.startswith(prefix):
+                yield key
+
+    async def xgroup_create(self, key, group, id="$", mkstream=False):
+        if (key, group) in self.groups:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+        entries = self.streams.setdefault(key, [])
+        self.groups[(key, group)] = {"delivered": len(entries) if id == "$" else 0, "pending": {}}
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        response = []
+        for key in streams:
+            state = self.groups[(key, group)]
+            entries = self.streams[key][state["delivered"]:][:count]
+            state["delivered"] += len(entries)
+            for entry_id, _ in entries:
+                state["pending"][entry_id] = [consumer, self.now_ms]
+                self.deliveries.append((consumer, entry_id))
+            if entries:
+                response.append([key, entries])
+        return response
+
+    async def xack(self, key, group, *entry_ids):
+        pending = self.groups[(key, group)]["pending"]
+        return sum(pending.pop(entry_id, None) is not None for entry_id in entry_ids)
+
+    async def xautoclaim(self, key, group, consumer, min_idle_time, start_id="0-0", count=None):
+        pending = self.groups[(key, group)]["pending"]
+        claimed = []
+        for entry_id, fields in self.streams[key]:
+            owner = pending.get(entry_id)
+            if owner and self.now_ms - owner[1] >= min_idle_time:
+                pending[entry_id] = [consumer, self.now_ms]
+                claimed.append((entry_id, fields))
+        return ["0-0", claimed, []]
+
+
+class Recorder:
+    def __init__(self, fail=False):
+        self.ticks = []
+        self.fail = fail
+
+    async def __call__(self, instrument, tick):
+        if self.fail:
+            raise RuntimeError("signal check failed")
+        self.ticks.append((instrument, tick["last_price"]))
+        return {"signals_triggered": 0}
+
+
+def _subscriber(redis_client, recorder, consumer, **kwargs):
+    return TickStreamSubscriber(redis_client, process_tick=recorder, group="engine", consumer=consumer,
+                                block_ms=0, claim_idle_ms=1000, lease_ms=3000, **kwargs)
+
+
+async def _join(*workers):
+    for worker in workers:
+        await worker.refresh_streams()
+    for _ in range(2):  # the first round registers every worker, the second evens out the shares
+        for worker in workers:
+            await worker.balance_streams()
+
+
+async def _add_ticks(redis_client, instrument, prices):
+    for price in prices:
+        await redis_client.xadd(f"tick_stream:{instrument}", {"timestamp": "2026-10-16T10:00:00",
+                                                              "last_price": price, "volume": 10})
+
+
+def test_batch_is_coalesced_to_latest_tick_per_instrument_and_acked():
+    async def scenario():
+        redis_client, recorder = FakeStreamRedis(), Recorder()
+        subscriber = _subscriber(redis_client, recorder, "w1", instruments=["banknifty", "NIFTY"])
+        await _join(subscriber)
+        await _add_ticks(redis_client, "BANKNIFTY", [45000.0, 45001.0, 45002.5])
+        await _add_ticks(redis_client, "NIFTY", [24500.0, 24499.0])
+        assert await subscriber.read_batch() == 5
+        assert await subscriber.read_batch() == 0
+        return redis_client, recorder, subscriber
+
+    redis_client, recorder, subscriber = asyncio.run(scenario())
+    assert recorder.ticks == [("BANKNIFTY", 45002.5), ("NIFTY", 24499.0)]
+    assert all(not state["pending"] for state in redis_client.groups.values())
+    assert subscriber.stats["ticks_coalesced"] == 3 and subscriber.stats["entries_acked"] == 5
+
+
+def test_streams_are_discovered_and_groups_start_at_new_ticks():
+    async def scenario():
+        redis_client, recorder = FakeStreamRedis(), Recorder()
+        await _add_ticks(redis_client, "BANKNIFTY", [1.0])  # stored before the group existed
+        subscriber = _subscriber(redis_client, recorder, "w1", instruments=[])
+        assert await subscriber.refresh_streams() == ["tick_stream:BANKNIFTY"]
+        await subscriber.refresh_streams()  # existing group (BUSYGROUP) is fine
+        await subscriber.balance_streams()
+        await _add_ticks(redis_client, "BANKNIFTY", [2.0])
+        await subscriber.read_batch()
+        return recorder
+
+    assert asyncio.run(scenario()).ticks == [("BANKNIFTY", 2.0)]
+
+
+def test_workers_in_one_group_never_see_the_same_entry():
+    instruments = ["BANKNIFTY", "NIFTY", "FINNIFTY"]
+
+    async def scenario():
+        redis_client = FakeStreamRedis()
+        workers = [_subscriber(redis_client, Recorder(), f"w{i}", instruments=instruments, batch_size=1)
+                   for i in range(3)]
+        await _join(*workers)
+        for round_ in range(10):
+            for instrument in instruments:
+                await _add_ticks(redis_client, instrument, [100.0 + round_ * 10 + i for i in range(4)])
+            for worker in workers:
+                while await worker.read_batch():
+                    pass
+        return redis_client, workers
+
+    redis_client, workers = asyncio.run(scenario())
+    delivered = [entry_id for _, entry_id in redis_client.deliveries]
+    assert len(delivered) == 120
+    assert sum(w.stats["entries_acked"] for w in workers) == 120
+    # One stream per worker, and every tick of an instrument went to that worker in order
+    assert sorted(key for w in workers for key in w.owned) == sorted(f"tick_stream:{i}" for i in instruments)
+    for worker in workers:
+        assert len(worker.owned) == 1
+        prices = [price for _, price in worker._process_tick.ticks]
+        assert len(prices) == 40 and prices == sorted(prices)
+        assert {instrument for instrument, _ in worker._process_tick.ticks} == \
+            {worker.owned[0].split(":", 1)[1]}
+
+
+def test_streams_spread_out_as_workers_join_and_move_when_an_owner_dies():
+    async def scenario():
+        redis_client = FakeStreamRedis()
+        instruments = ["BANKNIFTY", "NIFTY"]
+        first = _subscriber(redis_client, Recorder(), "w1", instruments=instruments)
+        await _join(first)
+        assert len(first.owned) == 2
+
+        second = _subscriber(redis_client, Recorder(), "w2", instruments=instruments)
+        await _join(second)
+        assert second.owned == []  # both leases still held
+        await first.balance_streams()  # w1 sees two workers and hands one back
+        await second.balance_streams()
+        assert len(first.owned) == len(second.owned) == 1
+
+        redis_client.now_ms += 4000  # w1 stops renewing
+        await second.balance_streams()
+        assert sorted(second.owned) == ["tick_stream:BANKNIFTY", "tick_stream:NIFTY"]
+        await second.release_streams()
+        return redis_client
+
+    redis_client = asyncio.run(scenario())
+    assert redis_client.zsets["tick_workers:engine"] == {}
+
+
+def test_failed_check_stays_pending_until_claimed_by_another_worker():
+    async def scenario():
+        redis_client = FakeStreamRedis()
+        crashed = _subscriber(redis_client, Recorder(fail=True), "w1", instruments=["BANKNIFTY"])
+        healthy = _subscriber(redis_client, Recorder(), "w2", instruments=["BANKNIFTY"])
+        await _join(crashed, healthy)
+        await _add_ticks(redis_client, "BANKNIFTY", [10.0, 11.0])
+        await crashed.read_batch()
+        assert len(redis_client.groups[("tick_stream:BANKNIFTY", "engine")]["pending"]) == 2
+        assert await healthy.claim_stale() == 0  # not the stream's owner
+        redis_client.now_ms += 1500
+        await healthy.balance_streams()
+        assert await healthy.claim_stale() == 0  # crashed still holds the lease
+        redis_client.now_ms += 1500
+        await healthy.balance_streams()
+        assert await healthy.claim_stale() == 2
+        return redis_client, crashed, healthy
+
+    redis_client, crashed, healthy = asyncio.run(scenario())
+    assert healthy._process_tick.ticks == [("BANKNIFTY", 11.0)]
+    assert crashed.stats["errors"] == 1
+    assert not redis_client.groups[("tick_stream:BANKNIFTY", "engine")]["pending"]
+
+
+def test_claimed_entries_older_than_processed_ticks_are_only_acked():
+    async def scenario():
+        redis_client = FakeStreamRedis()
+        subscriber = _subscriber(redis_client, Recorder(), "w1", instruments=["BANKNIFTY"])
+        await _join(subscriber)
+        await _add_ticks(redis_client, "BANKNIFTY", [10.0])
+        subscriber._process_tick.fail = True
+        await subscriber.read_batch()
+        subscriber._process_tick.fail = False
+        await _add_ticks(redis_client, "BANKNIFTY", [12.0])
+        await subscriber.read_batch()
+        redis_client.now_ms += 1500
+        await subscriber.claim_stale()
+        return subscriber
+
+    subscriber = asyncio.run(scenario())
+    assert subscriber._process_tick.ticks == [("BANKNIFTY", 12.0)]
+    assert subscriber.stats["entries_acked"] == 2
+
+
+class FakeClaimRedis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def mget(self, keys):
+        return [None for _ in keys]
+
+
+class FakeTech:
+    def get_indicators_dict(self, instrument):
+        return {"rsi_14": 60.0}
+
+
+def test_a_condition_triggers_on_one_worker_only():
+    redis_client = FakeClaimRedis()
+    workers = []
+    for _ in range(2):
+        monitor = SignalMonitor(technical_service=FakeTech())
+        monitor._redis_client = redis_client
+        monitor.add_signal(TradingCondition(condition_id="sig-1", instrument="BANKNIFTY", indicator="rsi_14",
+                                            operator=ConditionOperator.GREATER_THAN, threshold=50.0, action="BUY"))
+        workers.append(monitor)
+
+    triggered = [asyncio.run(monitor.check_signals("BANKNIFTY")) for monitor in workers]
+    assert [len(events) for events in triggered] == [1, 0]
+    assert redis_client.values == {"signal_trigger:sig-1": workers[0].worker_id}
+    assert not workers[1].get_active_signals()  # the loser drops the condition too
+
+
+class FakePriceTech:
+    def __init__(self):
+        self.prices = {}
+
+    def get_indicators_dict(self, instrument):
+        return {"current_price": self.prices[instrument]} if instrument in self.prices else {}
+
+
+def test_crossing_is_seen_with_two_workers_sharing_the_group():
+    """29 -> 31 crosses 30 only if both ticks reach the same SignalMonitor, in order."""
+    claims = FakeClaimRedis()
+    triggered = []
+
+    def worker(name):
+        tech = FakePriceTech()
+        monitor = SignalMonitor(technical_service=tech)
+        monitor._redis_client = claims
+        monitor.add_signal(TradingCondition(condition_id="cross-30", instrument="BANKNIFTY",
+                                            indicator="current_price", operator=ConditionOperator.CROSSES_ABOVE,
+                                            threshold=30.0, action="BUY"))
+
+        async def process_tick(instrument, tick):
+            tech.prices[instrument] = tick["last_price"]
+            events = await monitor.check_signals(instrument)
+            triggered.extend((name, event.condition_id) for event in events)
+            return {"signals_triggered": len(events)}
+
+        return process_tick
+
+    async def scenario():
+        redis_client = FakeStreamRedis()
+        workers = [_subscriber(redis_client, worker(name), name, instruments=["BANKNIFTY"], batch_size=1)
+                   for name in ("w1", "w2")]
+        await _join(*workers)
+        await _add_ticks(redis_client, "BANKNIFTY", [29.0, 31.0])
+        for _ in range(2):
+            for subscriber in workers:  # the workers take turns reading
+                await subscriber.read_batch()
+        return workers
+
+    workers = asyncio.run(scenario())
+    assert [len(w.owned) for w in workers] == [1, 0]
+    assert triggered == [("w1", "cross-30")]
+
+
+class FakeMonitorRedis(FakeClaimRedis):
+    """Synchronous Redis of the SignalMonitors: trigger claims, previous values and the condition registry."""
+
+    def __init__(self):
+        super().__init__()
+        self.hashes = {}
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def execute(self):
+        return []
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+def _monitor_worker(monitor_redis, name, triggered):
+    """SignalMonitor with a tick callback feeding it current_price, as one engine worker."""
+    tech = FakePriceTech()
+    monitor = SignalMonitor(technical_service=tech, checkpoint_interval=3600)
+    monitor._redis_client = monitor_redis
+
+    async def process_tick(instrument, tick):
+        tech.prices[instrument] = tick["last_price"]
+        events = await monitor.check_signals(instrument)
+        triggered.extend((name, event.condition_id) for event in events)
+        return {"signals_triggered": len(events)}
+
+    return monitor, process_tick
+
+
+def _cross_30(condition_id="cross-30"):
+    return TradingCondition(condition_id=condition_id, instrument="BANKNIFTY", indicator="current_price",
+                            operator=ConditionOperator.CROSSES_ABOVE, threshold=30.0, action="BUY")
+
+
+def test_crossing_state_moves_with_the_stream_on_handover():
+    """w2 saw 35 long ago; after w1 saw 29 and handed over, w2 must compare 31 with 29, not 35."""
+    monitor_redis = FakeMonitorRedis()
+    triggered = []
+    m1, tick1 = _monitor_worker(monitor_redis, "w1", triggered)
+    m2, tick2 = _monitor_worker(monitor_redis, "w2", triggered)
+
+    async def scenario():
+        redis_client = FakeStreamRedis()
+        w1 = TickStreamSubscriber(redis_client, process_tick=tick1, group="engine", consumer="w1",
+                                  instruments=["BANKNIFTY"], block_ms=0, lease_ms=3000, signal_monitor=m1)
+        w2 = TickStreamSubscriber(redis_client, process_tick=tick2, group="engine", consumer="w2",
+                                  instruments=["BANKNIFTY"], block_ms=0, lease_ms=3000, signal_monitor=m2)
+        # The condition is added on w1 only; w2 learns it from the registry when it takes the stream
+        m1.add_signal(_cross_30())
+        await _join(w2)
+        await _add_ticks(redis_client, "BANKNIFTY", [35.0])
+        await w2.read_batch()
+
+        await w2.release_streams()  # shutdown: checkpoint 35, hand the stream over
+        await _join(w1)
+        await _add_ticks(redis_client, "BANKNIFTY", [29.0])
+        await w1.read_batch()
+
+        await w1.release_streams()  # checkpoint 29 before the lease goes
+        await _join(w2)
+        await _add_ticks(redis_client, "BANKNIFTY", [31.0])
+        await w2.read_batch()
+        return w1, w2
+
+    w1, w2 = asyncio.run(scenario())
+    assert w2.owned == ["tick_stream:BANKNIFTY"] and not w1.owned
+    assert triggered == [("w2", "cross-30")]
+    assert monitor_redis.hashes["signal_conditions:BANKNIFTY"] == {}  # triggered conditions leave the registry
+
+
+def test_conditions_added_on_another_worker_reach_the_stream_owner():
+    monitor_redis = FakeMonitorRedis()
+    triggered = []
+    owner, owner_tick = _monitor_worker(monitor_redis, "owner", triggered)
+    api, _ = _monitor_worker(monitor_redis, "api", triggered)
+
+    async def scenario():
+        redis_client = FakeStreamRedis()
+        worker = TickStreamSubscriber(redis_client, process_tick=owner_tick, group="engine", consumer="owner",
+                                      instruments=["BANKNIFTY"], block_ms=0, lease_ms=3000, signal_monitor=owner)
+        await _join(worker)
+        api.add_signal(_cross_30())
+        api.add_signal(_cross_30("cancelled"))
+        await worker.balance_streams()  # lease renewal syncs the registry
+        assert sorted(c.condition_id for c in owner.get_active_signals()) == ["cancelled", "cross-30"]
+
+        api.remove_signal("cancelled")
+        await worker.balance_streams()
+        await _add_ticks(redis_client, "BANKNIFTY", [29.0])
+        await worker.read_batch()
+        await _add_ticks(redis_client, "BANKNIFTY", [31.0])
+        await worker.read_batch()
+
+    asyncio.run(scenario())
+    assert triggered == [("owner", "cross-30")]
@@ -0,0 +1,206 @@
+import dataclasses
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from engine_module.condition_book import ConditionBook
+from engine_module.signal_monitor import ConditionOperator, SignalMonitor, TradingCondition
+
+COMPARISONS = [ConditionOperator.GREATER_THAN, ConditionOperator.LESS_THAN, ConditionOperator.GREATER_EQUAL,
+               ConditionOperator.LESS_EQUAL, ConditionOperator.EQUAL]
+
+
+class FakeTech:
+    def __init__(self, indicators=None):
+        self.indicators = {"BANKNIFTY": dict(indicators or {})}
+
+    def get_indicators_dict(self, instrument):
+        return self.indicators.get(instrument, {})
+
+
+def _monitor(indicators=None):
+    monitor = SignalMonitor(technical_service=FakeTech(indicators))
+    monitor._redis_client = None
+    return monitor
+
+
+def _condition(i, indicator="rsi_14", operator=ConditionOperator.GREATER_THAN, threshold=50.0,
+               instrument="BANKNIFTY", **kwargs):
+    return TradingCondition(condition_id=f"c{i}", instrument=instrument, indicator=indicator,
+                            operator=operator, threshold=threshold, action="BUY", **kwargs)
+
+
+def test_book_matches_brute_force_evaluation():
+    rng = random.Random(7)
+    monitor = _monitor()
+    conditions = []
+    for i in range(2000):
+        extra = [{"indicator": "adx_14", "operator": rng.choice([">", "<", ">=", "<=", "!="]),
+                  "threshold": rng.uniform(10, 40)}] if i % 3 == 0 else []
+        conditions.append(_condition(i, indicator=rng.choice(["rsi_14", "macd_value", "missing"]),
+                                     operator=rng.choice(COMPARISONS), threshold=round(rng.uniform(20, 80), 2),
+                                     instrument=rng.choice(["BANKNIFTY", "NIFTY"]), additional_conditions=extra))
+    for condition in conditions:
+        monitor.add_signal(condition)
+
+    for _ in range(20):
+        indicators = {"rsi_14": round(rng.uniform(15, 85), 2), "macd_value": str(round(rng.uniform(15, 85), 2)),
+                      "adx_14": rng.uniform(5, 45)}
+        expected = [c.condition_id for c in conditions
+                    if c.condition_id in monitor._active_signals and c.instrument == "BANKNIFTY"
+                    and monitor._evaluate_condition(c, indicators)]
+        monitor._technical_service.indicators["BANKNIFTY"] = indicators
+        triggered = asyncio.run(monitor.check_signals("BANKNIFTY"))
+        assert [event.condition_id for event in triggered] == expected
+        assert all(cid not in monitor._active_signals for cid in expected)
+    assert len(monitor._book) == len(monitor._active_signals)
+
+
+def test_crossings_use_previous_value_per_indicator():
+    monitor = _monitor({"rsi_14": 29.0})
+    monitor.add_signal(_condition(1, operator=ConditionOperator.CROSSES_ABOVE, threshold=30.0))
+    monitor.add_signal(_condition(2, operator=ConditionOperator.CROSSES_ABOVE, threshold=31.0))
+    monitor.add_signal(_condition(3, operator=ConditionOperator.CROSSES_BELOW, threshold=25.0))
+
+    assert asyncio.run(monitor.check_signals("BANKNIFTY")) == []  # no previous value yet
+    monitor._technical_service.indicators["BANKNIFTY"]["rsi_14"] = 30.5
+    assert [e.condition_id for e in asyncio.run(monitor.check_signals("BANKNIFTY"))] == ["c1"]
+    monitor._technical_service.indicators["BANKNIFTY"]["rsi_14"] = 24.0
+    assert [e.condition_id for e in asyncio.run(monitor.check_signals("BANKNIFTY"))] == ["c3"]
+    assert list(monitor._active_signals) == ["c2"]
+
+
+def test_nan_breaks_crossings_like_the_scalar_rule():
+    """A NaN tick becomes the previous value, so no crossing spans it (parity with _evaluate_condition)."""
+    series = [29.0, float("nan"), 31.0, 29.0, 31.0, float("nan"), float("nan"), 25.0, 35.0, None, 25.0]
+    conditions = [_condition(1, operator=ConditionOperator.CROSSES_ABOVE, threshold=30.0),
+                  _condition(2, operator=ConditionOperator.CROSSES_BELOW, threshold=30.0)]
+    monitor = _monitor()
+    references = {c.condition_id: _monitor() for c in conditions}  # one scalar monitor per condition
+    for condition in conditions:
+        monitor.add_signal(condition)
+
+    booked, expected = [], []
+    for tick, value in enumerate(series):
+        indicators = {} if value is None else {"rsi_14": value}
+        monitor._technical_service.indicators["BANKNIFTY"] = indicators
+        for event in asyncio.run(monitor.check_signals("BANKNIFTY")):
+            booked.append((tick, event.condition_id))
+            # re-arm so every crossing of the series is counted
+            armed = next(c for c in conditions if c.condition_id == event.condition_id)
+            monitor.add_signal(dataclasses.replace(armed, is_active=True, triggered_at=None))
+        expected.extend((tick, c.condition_id) for c in conditions
+                        if references[c.condition_id]._evaluate_condition(c, indicators))
+
+    assert booked == expected == [(3, "c2"), (4, "c1"), (8, "c1"), (10, "c2")]
+
+
+def test_expired_signals_are_removed_before_evaluation():
+    monitor = _monitor({"rsi_14": 60.0})
+    past = (datetime.now() - timedelta(minutes=1)).isoformat()
+    future = (datetime.now() + timedelta(minutes=5)).isoformat()
+    monitor.add_signal(_condition(1, expires_at=past))
+    monitor.add_signal(_condition(2, expires_at=future, threshold=70.0))
+
+    assert asyncio.run(monitor.check_signals("BANKNIFTY")) == []
+    assert list(monitor._active_signals) == ["c2"]
+
+
+def test_readding_and_removing_keeps_the_book_in_sync():
+    monitor = _monitor({"rsi_14": 60.0})
+    monitor.add_signal(_condition(1, threshold=70.0))
+    monitor.add_signal(_condition(1, threshold=50.0))  # replaces the first definition
+    assert len(monitor._book) == 1
+    assert [e.threshold for e in asyncio.run(monitor.check_signals("BANKNIFTY"))] == [50.0]
+    assert len(monitor._book) == 0 and not monitor._book.indicators("BANKNIFTY")
+
+
+def test_equal_operator_tolerance_matches_scalar_rule():
+    book = ConditionBook()
+    for i, threshold in enumerate([49.98, 49.99, 49.995, 50.0, 50.009, 50.01, 50.02]):
+        book.add("X", "rsi", "==", threshold, i, f"c{i}")
+    matched = sorted(cid for _, cid in ConditionBook.matches(book.indicators("X")["rsi"], 50.0))
+    # abs(50.0 - 50.01) is just under 0.01 in floating point, exactly as the scalar rule sees it
+    assert matched == ["c1", "c2", "c3", "c4", "c5"]
+
+
+def test_ten_thousand_resting_conditions_check_under_a_millisecond():
+    rng = random.Random(1)
+    monitor = _monitor({"rsi_14": 50.0})
+    for i in range(10_000):
+        monitor.add_signal(_condition(i, indicator=f"ind_{i % 50}", operator=rng.choice(COMPARISONS),
+                                      threshold=rng.uniform(0, 1000) + 10_000,
+                                      instrument=rng.choice(["BANKNIFTY", "NIFTY", "FINNIFTY"])))
+    monitor._technical_service.indicators["BANKNIFTY"] = {f"ind_{i}": 5_000.0 + i for i in range(50)}
+
+    async def timed():
+        await monitor.check_signals("BANKNIFTY")  # warm up
+        started = time.perf_counter()
+        for _ in range(100):
+            await monitor.check_signals("BANKNIFTY")
+        return (time.perf_counter() - started) / 100
+
+    # The warm-up triggers the "<" / "<=" conditions; timed ticks probe the remaining resting ones
+    assert asyncio.run(timed()) < 0.001
+
+
+class FakeRedis:
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+        self.calls = []
+
+    def mget(self, keys):
+        self.calls.append(("mget", list(keys)))
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        redis_client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def setex(self, key, ttl, value):
+                self.commands.append((key, value))
+
+            def execute(self):
+                redis_client.calls.append(("pipeline", len(self.commands)))
+                redis_client.values.update(self.commands)
+
+        return Pipeline()
+
+
+def test_previous_values_are_checkpointed_and_restored_in_bulk():
+    redis_client = FakeRedis({"indicators_prev:BANKNIFTY:rsi_14": "29", "indicators_prev:BANKNIFTY:adx_14": "19"})
+    monitor = SignalMonitor(technical_service=FakeTech({"rsi_14": 31.0, "adx_14": 18.0, "cci_20": 5.0}),
+                            checkpoint_interval=3600)
+    monitor._redis_client = redis_client
+    monitor.add_signal(_condition(1, operator=ConditionOperator.CROSSES_ABOVE, threshold=30.0))
+    monitor.add_signal(_condition(2, indicator="adx_14", operator=ConditionOperator.CROSSES_BELOW, threshold=18.5))
+    monitor.add_signal(_condition(3, indicator="cci_20", operator=ConditionOperator.CROSSES_ABOVE, threshold=0.0))
+
+    # Restart recovery: one MGET for every crossing indicator, no per-condition round trips
+    triggered = asyncio.run(monitor.check_signals("BANKNIFTY"))
+    assert [e.condition_id for e in triggered] == ["c1", "c2"]
+    (call, keys), = redis_client.calls
+    assert call == "mget" and sorted(keys) == ["indicators_prev:BANKNIFTY:adx_14", "indicators_prev:BANKNIFTY:cci_20",
+                                               "indicators_prev:BANKNIFTY:rsi_14"]
+
+    monitor._technical_service.indicators["BANKNIFTY"]["cci_20"] = 6.0
+    asyncio.run(monitor.check_signals("BANKNIFTY"))
+    assert len(redis_client.calls) == 1  # still nothing written until the checkpoint
+
+    assert monitor.checkpoint_previous_values() == 3
+    assert redis_client.calls[-1] == ("pipeline", 3)
+    assert redis_client.values["indicators_prev:BANKNIFTY:cci_20"] == "6.0"
+    assert monitor.checkpoint_previous_values() == 0  # nothing changed since
+
+
+def test_checkpoint_runs_from_the_tick_path_once_due():
+    redis_client = FakeRedis()
+    monitor = SignalMonitor(technical_service=FakeTech({"rsi_14": 29.0}), checkpoint_interval=0)
+    monitor._redis_client = redis_client
+    monitor.add_signal(_condition(1, operator=ConditionOperator.CROSSES_ABOVE, threshold=30.0))
+    asyncio.run(monitor.check_signals("BANKNIFTY"))
+    assert redis_client.values == {"indicators_prev:BANKNIFTY:rsi_14": "29.0"}
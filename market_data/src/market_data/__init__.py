@@ -13,6 +13,7 @@ from .technical_indicators_service import (
     TechnicalIndicatorsService,
     get_technical_service
 )
+from .streaming_indicators import StreamingIndicatorEngine
 
 __all__ = [
     "normalize_instrument",
@@ -33,5 +34,6 @@ __all__ = [
     "TechnicalIndicators",
     "TechnicalIndicatorsService",
     "get_technical_service",
+    "StreamingIndicatorEngine",
 ]
 
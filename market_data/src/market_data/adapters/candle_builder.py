@@ -2,23 +2,61 @@
 
 This is the SAME code used for both live and historical data.
 Strategy should NOT know whether ticks come from WebSocket or CSV.
+
+Candles follow the NSE session in IST: intraday buckets are counted from the
+09:15 open (so 30min/60min bars start at 09:15, 10:15, ...) and daily bars from
+IST midnight. Naive tick timestamps are read as IST wall time, so naive and
+timezone-aware feeds of one instrument land on the same grid.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Callable
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterable, Optional, List, Callable
+
+import numpy as np
 
 from ..contracts import MarketTick, OHLCBar
 
 logger = logging.getLogger(__name__)
 
+# Timeframes built by MultiTimeframeCandleBuilder unless told otherwise
+DEFAULT_TIMEFRAMES = ("1min", "3min", "5min", "15min", "30min", "60min", "1d")
+
+IST = timezone(timedelta(hours=5, minutes=30))
+_IST_OFFSET_S = 5 * 3600 + 30 * 60
+_DAY_S = 86400
+# Bucket origins in epoch seconds: IST midnight, and the 09:15 IST session open
+_IST_MIDNIGHT_ORIGIN = -_IST_OFFSET_S
+_SESSION_OPEN_ORIGIN = _IST_MIDNIGHT_ORIGIN + 9 * 3600 + 15 * 60
+
+
+def _epoch_seconds(timestamp: datetime) -> float:
+    """Epoch seconds of a timestamp, reading naive values as IST wall time."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=IST)
+    return timestamp.timestamp()
+
+
+def _bucket_origin(timeframe_seconds: int) -> int:
+    return _IST_MIDNIGHT_ORIGIN if timeframe_seconds >= _DAY_S else _SESSION_OPEN_ORIGIN
+
+
+def bucket_start(seconds, timeframe_seconds: int):
+    """Start (epoch seconds) of the IST-session bucket holding `seconds` (int or int array)."""
+    origin = _bucket_origin(timeframe_seconds)
+    return seconds - (seconds - origin) % timeframe_seconds
+
 
 class CandleBuilder:
     """Builds OHLC candles from market ticks.
     
     This aggregates ticks into time-based candles (1min, 5min, etc.)
     and emits OHLCBar objects when candles close.
+
+    Candles are keyed by integer epoch bucket (candle start in epoch seconds) and
+    each instrument has at most one active candle, so a tick costs one integer
+    division and a few float compares. process_ticks_batch() aggregates whole
+    arrays of ticks with NumPy for historical replay.
     """
     
     def __init__(
@@ -38,8 +76,10 @@ class CandleBuilder:
         # Parse timeframe
         self.timeframe_seconds = self._parse_timeframe(timeframe)
         
-        # Active candles per instrument: {instrument: {timeframe_key: CandleData}}
-        self._active_candles: Dict[str, Dict[str, 'CandleData']] = defaultdict(dict)
+        # Active candle per instrument: {instrument: CandleData}
+        self._active_candles: Dict[str, 'CandleData'] = {}
+        # Ticks older than the active candle (already closed bucket), dropped
+        self.late_ticks = 0
         
     def _parse_timeframe(self, timeframe: str) -> int:
         """Parse timeframe string to seconds."""
@@ -68,68 +108,109 @@ class CandleBuilder:
             OHLCBar if a candle closed, None otherwise
         """
         instrument = tick.instrument
-        
-        # Calculate which candle this tick belongs to
-        candle_key = self._get_candle_key(tick.timestamp)
-        
-        # Get or create active candle
-        if candle_key not in self._active_candles[instrument]:
-            # Check if we need to close previous candle
-            closed_candle = self._check_and_close_candle(instrument, tick.timestamp)
-            
-            # Create new candle
-            self._active_candles[instrument][candle_key] = CandleData(
-                instrument=instrument,
-                timeframe=self.timeframe,
-                start_time=self._get_candle_start_time(tick.timestamp)
+        seconds = int(_epoch_seconds(tick.timestamp))
+        bucket = bucket_start(seconds, self.timeframe_seconds)
+
+        closed = None
+        candle = self._active_candles.get(instrument)
+        if candle is None or candle.bucket != bucket:
+            if candle is not None:
+                if bucket < candle.bucket:
+                    self.late_ticks += 1
+                    logger.debug(f"Dropped late tick for {instrument} at {tick.timestamp}")
+                    return None
+                # Tick starts a new bucket: the previous candle is complete
+                closed = self._close_candle(instrument)
+            candle = self._active_candles[instrument] = CandleData(
+                instrument, self.timeframe, bucket, tick.timestamp.tzinfo
             )
-        
+
         # Update active candle with tick
-        candle = self._active_candles[instrument][candle_key]
-        candle.update(tick)
-        
-        # Check if candle should close
-        if self._should_close_candle(tick.timestamp, candle.start_time):
-            return self._close_candle(instrument, candle_key)
-        
-        return None
-    
-    def _get_candle_key(self, timestamp: datetime) -> str:
-        """Get unique key for candle based on timestamp."""
-        start_time = self._get_candle_start_time(timestamp)
-        return start_time.isoformat()
-    
-    def _get_candle_start_time(self, timestamp: datetime) -> datetime:
-        """Get the start time of the candle containing this timestamp."""
-        # Round down to candle boundary
-        total_seconds = int(timestamp.timestamp())
-        candle_start_seconds = (total_seconds // self.timeframe_seconds) * self.timeframe_seconds
-        return datetime.fromtimestamp(candle_start_seconds, tz=timestamp.tzinfo)
-    
-    def _should_close_candle(self, current_time: datetime, candle_start: datetime) -> bool:
-        """Check if candle should close based on time."""
-        elapsed = (current_time - candle_start).total_seconds()
-        return elapsed >= self.timeframe_seconds
-    
-    def _check_and_close_candle(self, instrument: str, new_tick_time: datetime) -> Optional[OHLCBar]:
-        """Check if any previous candle should be closed before starting new one."""
-        closed = None
-        
-        # Find candles that should be closed
-        to_close = []
-        for candle_key, candle in self._active_candles[instrument].items():
-            if self._should_close_candle(new_tick_time, candle.start_time):
-                to_close.append(candle_key)
-        
-        # Close them
-        for candle_key in to_close:
-            closed = self._close_candle(instrument, candle_key)
-        
+        candle.add(tick.last_price, tick.volume)
+        return closed
+
+    def process_ticks_batch(
+        self,
+        instrument: str,
+        timestamps,
+        prices,
+        volumes=None,
+        tz: Optional[tzinfo] = None,
+    ) -> List[OHLCBar]:
+        """Aggregate an array of time-ordered ticks in one vectorized pass.
+
+        Equivalent to calling process_tick() for each tick: the first ticks merge
+        into the active candle, every completed bucket is closed (callback fired)
+        and the last bucket stays active for later ticks.
+
+        Args:
+            instrument: Instrument symbol of every tick
+            timestamps: Epoch seconds (int/float) or datetime64 values, non-decreasing
+            prices: Last traded prices
+            volumes: Optional per-tick volumes
+            tz: Timezone for bar start times (naive IST wall time if None)
+
+        Returns:
+            Closed OHLCBars in time order
+        """
+        timestamps = np.asarray(timestamps)
+        if timestamps.size == 0:
+            return []
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            seconds = timestamps.astype("datetime64[s]").astype(np.int64)
+        else:
+            seconds = np.floor(timestamps.astype(np.float64)).astype(np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if volumes is None:
+            volumes = np.zeros(len(prices), dtype=np.int64)
+        else:
+            volumes = np.asarray(volumes)
+            if not np.issubdtype(volumes.dtype, np.integer):
+                volumes = np.nan_to_num(volumes.astype(np.float64))
+        if np.any(seconds[1:] < seconds[:-1]):
+            raise ValueError("process_ticks_batch requires timestamps in non-decreasing order")
+
+        buckets = bucket_start(seconds, self.timeframe_seconds)
+        active = self._active_candles.get(instrument)
+        if active is not None and buckets[0] < active.bucket:
+            # Drop the leading ticks that belong to already closed buckets
+            late = int(np.searchsorted(buckets, active.bucket))
+            self.late_ticks += late
+            buckets, prices, volumes = buckets[late:], prices[late:], volumes[late:]
+            if buckets.size == 0:
+                return []
+
+        # Segment boundaries: one segment per bucket
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)]
+        opens = prices[starts]
+        highs = np.maximum.reduceat(prices, starts)
+        lows = np.minimum.reduceat(prices, starts)
+        closes = prices[ends - 1]
+        segment_volumes = np.add.reduceat(volumes, starts)
+        counts = ends - starts
+
+        closed: List[OHLCBar] = []
+        segment_buckets = buckets[starts]
+        last = len(starts) - 1
+        for index, bucket in enumerate(segment_buckets.tolist()):
+            candle = self._active_candles.get(instrument)
+            if candle is not None and candle.bucket != bucket:
+                closed.append(self._close_candle(instrument))
+                candle = None
+            if candle is None:
+                candle = self._active_candles[instrument] = CandleData(instrument, self.timeframe, bucket, tz)
+            candle.merge_values(
+                float(opens[index]), float(highs[index]), float(lows[index]), float(closes[index]),
+                segment_volumes[index].item(), int(counts[index])
+            )
+            if index < last:
+                closed.append(self._close_candle(instrument))
         return closed
     
-    def _close_candle(self, instrument: str, candle_key: str) -> OHLCBar:
+    def _close_candle(self, instrument: str) -> OHLCBar:
         """Close a candle and emit OHLCBar."""
-        candle = self._active_candles[instrument].pop(candle_key)
+        candle = self._active_candles.pop(instrument)
         
         ohlc_bar = OHLCBar(
             instrument=candle.instrument,
@@ -156,63 +237,211 @@ class CandleBuilder:
     
     def get_active_candle(self, instrument: str) -> Optional['CandleData']:
         """Get current active candle for instrument (for debugging)."""
-        candles = self._active_candles.get(instrument, {})
-        if candles:
-            # Return most recent candle
-            return max(candles.values(), key=lambda c: c.start_time)
-        return None
+        return self._active_candles.get(instrument)
     
     def force_close_all(self) -> List[OHLCBar]:
         """Force close all active candles (useful at end of day)."""
-        closed = []
-        
-        for instrument in list(self._active_candles.keys()):
-            for candle_key in list(self._active_candles[instrument].keys()):
-                ohlc = self._close_candle(instrument, candle_key)
-                if ohlc:
-                    closed.append(ohlc)
-        
+        return [self._close_candle(instrument) for instrument in list(self._active_candles)]
+
+
+class MultiTimeframeCandleBuilder:
+    """Builds candles for several timeframes from one tick stream in a single pass.
+
+    Only the smallest timeframe is built from ticks (with a CandleBuilder); each
+    closed base bar is rolled up into the active bar of every higher timeframe.
+    Per-tick cost is that of the base timeframe, plus one merge per higher
+    timeframe once per base bar.
+
+    A higher-timeframe bar closes as soon as the base bar that ends its period
+    closes, or when a later base bar falls into a new period (gaps, sessions).
+    Daily bars therefore close on the next session's first bar or force_close_all().
+    """
+
+    def __init__(
+        self,
+        timeframes: Iterable[str] = DEFAULT_TIMEFRAMES,
+        on_candle_close: Optional[Callable[[OHLCBar], None]] = None,
+        timeframe_callbacks: Optional[Dict[str, Callable[[OHLCBar], None]]] = None,
+    ):
+        """Initialize multi-timeframe candle builder.
+
+        Args:
+            timeframes: Timeframes to build; each must be a multiple of the smallest
+            on_candle_close: Callback called for every closed bar of any timeframe
+            timeframe_callbacks: Per-timeframe callbacks, e.g. {"15min": on_15min_close}
+        """
+        self.on_candle_close = on_candle_close
+        self.timeframe_callbacks = dict(timeframe_callbacks or {})
+
+        parser = CandleBuilder()
+        seconds = {timeframe: parser._parse_timeframe(timeframe) for timeframe in timeframes}
+        if not seconds:
+            raise ValueError("At least one timeframe is required")
+        ordered = sorted(seconds, key=seconds.get)
+        base_timeframe = ordered[0]
+        for timeframe in ordered[1:]:
+            if seconds[timeframe] % seconds[base_timeframe]:
+                raise ValueError(f"Timeframe {timeframe} is not a multiple of {base_timeframe}")
+
+        self._base = CandleBuilder(timeframe=base_timeframe, on_candle_close=self._on_base_close)
+        self.timeframes = tuple(ordered)
+        self.base_timeframe = base_timeframe
+
+        # Higher timeframes: (timeframe, seconds), active rolled-up candle per instrument
+        self._higher = [(timeframe, seconds[timeframe]) for timeframe in ordered[1:]]
+        self._rollups: Dict[str, Dict[str, 'CandleData']] = {timeframe: {} for timeframe, _ in self._higher}
+        self._closed: List[OHLCBar] = []
+
+    def process_tick(self, tick: MarketTick) -> List[OHLCBar]:
+        """Process a market tick and update/close candles of every timeframe.
+
+        Args:
+            tick: MarketTick to process
+
+        Returns:
+            Bars closed by this tick, base timeframe first
+        """
+        self._base.process_tick(tick)
+        return self._drain()
+
+    def process_ticks_batch(self, instrument: str, timestamps, prices, volumes=None,
+                            tz: Optional[tzinfo] = None) -> List[OHLCBar]:
+        """Aggregate an array of time-ordered ticks (see CandleBuilder.process_ticks_batch).
+
+        Returns:
+            Bars of every timeframe closed by the batch, in emission order
+        """
+        self._base.process_ticks_batch(instrument, timestamps, prices, volumes, tz)
+        return self._drain()
+
+    def _drain(self) -> List[OHLCBar]:
+        closed, self._closed = self._closed, []
         return closed
 
+    def _on_base_close(self, bar: OHLCBar) -> None:
+        """Emit a closed base bar and roll it up into the higher timeframes."""
+        self._emit(bar)
+
+        base_start = int(_epoch_seconds(bar.start_at))
+        base_end = base_start + self._base.timeframe_seconds
+        for timeframe, seconds in self._higher:
+            active_candles = self._rollups[timeframe]
+            start_seconds = bucket_start(base_start, seconds)
+            candle = active_candles.get(bar.instrument)
+            if candle is not None and candle.bucket != start_seconds:
+                self._close_rollup(timeframe, bar.instrument)
+                candle = None
+            if candle is None:
+                candle = active_candles[bar.instrument] = CandleData(
+                    bar.instrument, timeframe, start_seconds, bar.start_at.tzinfo
+                )
+            candle.merge(bar)
+            if base_end >= start_seconds + seconds:
+                self._close_rollup(timeframe, bar.instrument)
+
+    def _close_rollup(self, timeframe: str, instrument: str) -> None:
+        candle = self._rollups[timeframe].pop(instrument)
+        self._emit(OHLCBar(
+            instrument=candle.instrument,
+            timeframe=timeframe,
+            open=candle.open,
+            high=candle.high,
+            low=candle.low,
+            close=candle.close,
+            volume=candle.volume,
+            start_at=candle.start_time
+        ))
+
+    def _emit(self, bar: OHLCBar) -> None:
+        self._closed.append(bar)
+        for callback in (self.on_candle_close, self.timeframe_callbacks.get(bar.timeframe)):
+            if callback is None:
+                continue
+            try:
+                callback(bar)
+            except Exception as e:
+                logger.error(f"Error in {bar.timeframe} candle close callback: {e}")
+
+    def get_active_candle(self, instrument: str, timeframe: Optional[str] = None) -> Optional['CandleData']:
+        """Get current active candle for instrument and timeframe (base timeframe by default).
+
+        Higher-timeframe candles only include base bars that have already closed.
+        """
+        if timeframe is None or timeframe == self.base_timeframe:
+            return self._base.get_active_candle(instrument)
+        return self._rollups.get(timeframe, {}).get(instrument)
+
+    def force_close_all(self) -> List[OHLCBar]:
+        """Force close all active candles of every timeframe (useful at end of day)."""
+        self._base.force_close_all()
+        for timeframe, _ in self._higher:
+            for instrument in list(self._rollups[timeframe]):
+                self._close_rollup(timeframe, instrument)
+        return self._drain()
+
 
 class CandleData:
     """Internal data structure for building a candle."""
-    
-    def __init__(self, instrument: str, timeframe: str, start_time: datetime):
+
+    __slots__ = ("instrument", "timeframe", "bucket", "tzinfo",
+                 "open", "high", "low", "close", "volume", "tick_count")
+
+    def __init__(self, instrument: str, timeframe: str, bucket: int, tz: Optional[tzinfo] = None):
         self.instrument = instrument
         self.timeframe = timeframe
-        self.start_time = start_time
-        
+        self.bucket = bucket  # Candle start, epoch seconds
+        self.tzinfo = tz  # None: start_time is naive IST wall time
+
         self.open: Optional[float] = None
         self.high: Optional[float] = None
         self.low: Optional[float] = None
         self.close: Optional[float] = None
         self.volume: int = 0
         self.tick_count: int = 0
-    
-    def update(self, tick: MarketTick):
-        """Update candle with new tick."""
-        price = tick.last_price
-        
-        # Set open on first tick
+
+    @property
+    def start_time(self) -> datetime:
+        if self.tzinfo is None:
+            return datetime.fromtimestamp(self.bucket, tz=IST).replace(tzinfo=None)
+        return datetime.fromtimestamp(self.bucket, tz=self.tzinfo)
+
+    def add(self, price: float, volume: Optional[float] = None):
+        """Update candle with one tick's price and volume."""
         if self.open is None:
-            self.open = price
+            self.open = self.high = self.low = price
+        elif price > self.high:
             self.high = price
+        elif price < self.low:
             self.low = price
-        
-        # Update high/low
-        if self.high is None or price > self.high:
-            self.high = price
-        if self.low is None or price < self.low:
-            self.low = price
-        
+
         # Close is always latest price
         self.close = price
-        
+
         # Accumulate volume
-        if tick.volume:
-            self.volume += tick.volume
-        
+        if volume:
+            self.volume += volume
+
         self.tick_count += 1
 
+    def update(self, tick: MarketTick):
+        """Update candle with new tick."""
+        self.add(tick.last_price, tick.volume)
+
+    def merge_values(self, open_: float, high: float, low: float, close: float,
+                     volume: Optional[float] = None, tick_count: int = 0):
+        """Update candle with an already aggregated run of ticks or bars."""
+        if self.open is None:
+            self.open, self.high, self.low = open_, high, low
+        else:
+            if high > self.high:
+                self.high = high
+            if low < self.low:
+                self.low = low
+        self.close = close
+        if volume:
+            self.volume += volume
+        self.tick_count += tick_count
 
+    def merge(self, bar: OHLCBar):
+        """Update candle with a closed lower-timeframe bar."""
+        self.merge_values(bar.open, bar.high, bar.low, bar.close, bar.volume)
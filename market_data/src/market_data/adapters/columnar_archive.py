@@ -0,0 +1,198 @@
+"""Local columnar archive of candles and ticks for replay and backtests.
+
+Layout (one raw .npy file per column, partitioned by instrument and IST date):
+
+    {root}/{instrument}/{timeframe}/{YYYY-MM-DD}/timestamp.npy   int64 epoch ns
+    {root}/{instrument}/{timeframe}/{YYYY-MM-DD}/open.npy        float64
+    ...
+
+Candles use the OHLCVRingBuffer columns (timestamp, open, high, low, close,
+volume) under their timeframe ("1min", "day", ...); ticks use timeframe "tick"
+with timestamp, last_price and volume. Partitions are opened with
+np.load(mmap_mode="r"), so loading never builds a Python object per row: a
+single partition is returned as memory-mapped views, several are concatenated.
+"""
+
+import logging
+import os
+from datetime import date, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from ..ohlcv_ring import COLUMNS as CANDLE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+IST = timezone(timedelta(hours=5, minutes=30))
+TICK_TIMEFRAME = "tick"
+TICK_COLUMNS = ("timestamp", "last_price", "volume")
+
+_IST_OFFSET_NS = int(timedelta(hours=5, minutes=30).total_seconds()) * 1_000_000_000
+_DAY_NS = 86_400 * 1_000_000_000
+
+
+def _partition_days(timestamps_ns: np.ndarray) -> np.ndarray:
+    """IST day number (days since epoch) of each timestamp."""
+    return (timestamps_ns + _IST_OFFSET_NS) // _DAY_NS
+
+
+class ColumnarArchive:
+    """Instrument/date partitioned .npy column store."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _partition_dir(self, instrument: str, timeframe: str, day: date) -> Path:
+        return self.root / instrument / timeframe / day.isoformat()
+
+    def dates(self, instrument: str, timeframe: str) -> List[date]:
+        """Archived partition dates for an instrument and timeframe, oldest first."""
+        base = self.root / instrument / timeframe
+        if not base.is_dir():
+            return []
+        return sorted(date.fromisoformat(path.name) for path in base.iterdir() if path.is_dir())
+
+    def instruments(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+
+    def write(self, instrument: str, timeframe: str, columns: Dict[str, np.ndarray]) -> int:
+        """Write rows, merging with existing partitions.
+
+        Rows are split by IST date; within a partition they are sorted by
+        timestamp and a row replaces an archived one with the same timestamp.
+
+        Args:
+            instrument: Instrument symbol
+            timeframe: Candle timeframe, or "tick"
+            columns: Equal-length arrays including "timestamp" (epoch ns)
+
+        Returns:
+            Number of rows written
+        """
+        if "timestamp" not in columns:
+            raise ValueError("columns must include 'timestamp' (epoch nanoseconds)")
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+        timestamps = columns["timestamp"].astype(np.int64)
+        if any(len(values) != len(timestamps) for values in columns.values()):
+            raise ValueError("all columns must have the same length")
+        if not len(timestamps):
+            return 0
+        columns["timestamp"] = timestamps
+
+        days = _partition_days(timestamps)
+        for day_number in np.unique(days).tolist():
+            mask = days == day_number
+            part = {name: values[mask] for name, values in columns.items()}
+            day = date(1970, 1, 1) + timedelta(days=day_number)
+            directory = self._partition_dir(instrument, timeframe, day)
+            existing = self._read_partition(directory, list(part), mmap=False)
+            if existing is not None:
+                part = {name: np.concatenate([existing[name], part[name]]) for name in part}
+            # Stable sort, then keep the last row per timestamp (new data wins)
+            order = np.argsort(part["timestamp"], kind="stable")
+            part = {name: values[order] for name, values in part.items()}
+            keep = np.r_[part["timestamp"][1:] != part["timestamp"][:-1], True]
+            self._write_partition(directory, {name: values[keep] for name, values in part.items()})
+        return len(timestamps)
+
+    def write_candles(self, instrument: str, timeframe: str, timestamps_ns, open_, high, low, close, volume) -> int:
+        return self.write(instrument, timeframe, {
+            "timestamp": timestamps_ns,
+            "open": np.asarray(open_, dtype=np.float64),
+            "high": np.asarray(high, dtype=np.float64),
+            "low": np.asarray(low, dtype=np.float64),
+            "close": np.asarray(close, dtype=np.float64),
+            "volume": np.asarray(volume, dtype=np.float64),
+        })
+
+    def write_ticks(self, instrument: str, timestamps_ns, last_price, volume) -> int:
+        return self.write(instrument, TICK_TIMEFRAME, {
+            "timestamp": timestamps_ns,
+            "last_price": np.asarray(last_price, dtype=np.float64),
+            "volume": np.asarray(volume, dtype=np.float64),
+        })
+
+    def load(
+        self,
+        instrument: str,
+        timeframe: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Load archived columns for a date range (inclusive), memory-mapped.
+
+        Args:
+            instrument: Instrument symbol
+            timeframe: Candle timeframe, or "tick"
+            start: First IST date to include (default: oldest partition)
+            end: Last IST date to include (default: newest partition)
+            columns: Columns to load (default: all candle or tick columns)
+
+        Returns:
+            Column name -> array in time order; read-only memory maps when the
+            range is a single partition. Empty arrays if nothing is archived.
+        """
+        if columns is None:
+            columns = TICK_COLUMNS if timeframe == TICK_TIMEFRAME else CANDLE_COLUMNS
+        columns = list(columns)
+        parts = []
+        for day in self.dates(instrument, timeframe):
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            part = self._read_partition(self._partition_dir(instrument, timeframe, day), columns, mmap=True)
+            if part is not None:
+                parts.append(part)
+
+        if not parts:
+            return {name: np.empty(0, dtype=np.int64 if name == "timestamp" else np.float64) for name in columns}
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name in columns}
+
+    def count(self, instrument: str, timeframe: str, start: Optional[date] = None,
+              end: Optional[date] = None) -> int:
+        """Archived rows in a date range (inclusive), read from the .npy headers only."""
+        rows = 0
+        for day in self.dates(instrument, timeframe):
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            part = self._read_partition(self._partition_dir(instrument, timeframe, day), ["timestamp"], mmap=True)
+            if part is not None:
+                rows += len(part["timestamp"])
+        return rows
+
+    def load_candles(self, instrument: str, timeframe: str = "1min",
+                     start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, np.ndarray]:
+        return self.load(instrument, timeframe, start, end, CANDLE_COLUMNS)
+
+    def load_ticks(self, instrument: str, start: Optional[date] = None,
+                   end: Optional[date] = None) -> Dict[str, np.ndarray]:
+        return self.load(instrument, TICK_TIMEFRAME, start, end, TICK_COLUMNS)
+
+    @staticmethod
+    def _read_partition(directory: Path, columns: List[str], mmap: bool) -> Optional[Dict[str, np.ndarray]]:
+        if not directory.is_dir():
+            return None
+        try:
+            return {
+                name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+                for name in columns
+            }
+        except FileNotFoundError as exc:
+            logger.warning("Incomplete archive partition %s: %s", directory, exc)
+            return None
+
+    @staticmethod
+    def _write_partition(directory: Path, columns: Dict[str, np.ndarray]) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, values in columns.items():
+            # Write then rename so readers never map a half-written column
+            tmp = directory / f".{name}.npy.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(values))
+            os.replace(tmp, directory / f"{name}.npy")
@@ -7,30 +7,13 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+from core_kernel.time_service import VirtualClockStepper
+
 from ..contracts import MarketIngestion, MarketStore, MarketTick, OHLCBar
 
 logger = logging.getLogger(__name__)
 
 
-def _set_system_virtual_time(timestamp: datetime):
-    """Set system-wide virtual time via Redis."""
-    try:
-        import redis
-        import os
-        
-        host = os.getenv("REDIS_HOST", "localhost")
-        port = int(os.getenv("REDIS_PORT", "6379"))
-        r = redis.Redis(host=host, port=port, db=0)
-        
-        # Enable virtual time mode
-        r.set("system:virtual_time:enabled", "1")
-        r.set("system:virtual_time:current", timestamp.isoformat())
-        
-        logger.info(f"Set system virtual time to: {timestamp}")
-    except Exception as e:
-        logger.warning(f"Could not set virtual time: {e}")
-
-
 class HistoricalDataReplay(MarketIngestion):
     """Replay historical market data for testing and backtesting.
 
@@ -60,6 +43,9 @@ class HistoricalDataReplay(MarketIngestion):
         self.rebase_to = rebase_to
         self.rebase_offset: Optional[timedelta] = None
         self.start_date = start_date or (datetime.now() - timedelta(hours=1))
+        # Shared virtual clock, advanced in coarse steps when USE_VIRTUAL_TIME is on
+        use_virtual = os.getenv('USE_VIRTUAL_TIME', '0').lower() in ('1', 'true', 'yes')
+        self.virtual_clock = VirtualClockStepper() if use_virtual else None
 
     def bind_store(self, store: MarketStore) -> None:
         """Bind market store (already done in __init__)."""
@@ -202,9 +188,8 @@ class HistoricalDataReplay(MarketIngestion):
                 timestamp = timestamp + self.rebase_offset
             else:
                 # Set system virtual time if not rebasing and env indicates it
-                use_virtual = os.getenv('USE_VIRTUAL_TIME', '0').lower() in ('1', 'true', 'yes')
-                if use_virtual:
-                    _set_system_virtual_time(timestamp)
+                if self.virtual_clock:
+                    self.virtual_clock.advance(timestamp)
 
             # Store as OHLC bar
             if all(k in point for k in ["open", "high", "low", "close"]):
@@ -8,38 +8,102 @@ Flow:
 
 import asyncio
 import csv
+import heapq
 import logging
 import os
 from datetime import datetime, timedelta, timezone, date
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, AsyncIterator, Callable, Iterable, Iterator, Tuple, Union
 from collections import deque
+from itertools import islice
+
+import numpy as np
+
+from core_kernel.time_service import VirtualClockStepper
 
 from ..contracts import MarketTick, MarketIngestion, MarketStore
+from ..instrument_master import get_instrument_master
+from .replay_scheduler import ReplayScheduler
 
 logger = logging.getLogger(__name__)
 
 # IST timezone
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# Max days per kite.historical_data() request, by interval
+ZERODHA_MAX_DAYS = {
+    "minute": 60,
+    "3minute": 100,
+    "5minute": 100,
+    "10minute": 100,
+    "15minute": 200,
+    "30minute": 200,
+    "60minute": 400,
+    "day": 2000,
+}
 
-def _set_system_virtual_time(timestamp: datetime):
-    """Set system-wide virtual time via Redis."""
-    try:
-        import redis
-        import os
-        
-        host = os.getenv("REDIS_HOST", "localhost")
-        port = int(os.getenv("REDIS_PORT", "6379"))
-        r = redis.Redis(host=host, port=port, db=0)
-        
-        # Enable virtual time mode
-        r.set("system:virtual_time:enabled", "1")
-        r.set("system:virtual_time:current", timestamp.isoformat())
+
+def find_instrument_token(kite, instrument_symbol: str) -> Optional[int]:
+    """Get instrument token for a symbol from the shared instrument master.
+    
+    Matches an NSE tradingsymbol or name (equity/index) first, then the
+    nearest NFO future of that name (e.g., "BANKNIFTY").
+    
+    Args:
+        kite: KiteConnect-like client with instruments()
+        instrument_symbol: Instrument symbol (e.g., "NIFTY BANK", "BANKNIFTY")
         
-        logger.debug(f"Set system virtual time to: {timestamp}")
+    Returns:
+        Instrument token or None if not found
+    """
+    try:
+        instrument_token = get_instrument_master(kite).token_for(instrument_symbol)
     except Exception as e:
-        logger.warning(f"Could not set virtual time: {e}")
+        logger.error(f"Error getting instrument token: {e}")
+        return None
+    if instrument_token is None:
+        logger.warning(f"Instrument token not found for {instrument_symbol}")
+    return instrument_token
+
+
+def zerodha_date_chunks(from_date: date, to_date: date, interval: str) -> Iterator[Tuple[date, date]]:
+    """Split an inclusive date range into kite.historical_data() sized chunks."""
+    chunk_days = ZERODHA_MAX_DAYS.get(interval, 100)
+    chunk_start = from_date
+    while chunk_start <= to_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), to_date)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end + timedelta(days=1)
+
+
+def _tick_time(tick: MarketTick) -> datetime:
+    return tick.timestamp
+
+
+class ArchiveCandleTicks:
+    """Archived 1min candles of one instrument, expanded to ticks on demand.
+
+    len() is read from the memory-mapped timestamp columns; iterating loads one
+    day partition at a time and creates each MarketTick only as it is consumed,
+    so a long date range is never held as a list of Python objects.
+    """
+
+    def __init__(self, archive, instrument: str, start: Optional[date] = None,
+                 end: Optional[date] = None, num_ticks: int = 4):
+        self.archive = archive
+        self.instrument = instrument
+        self.num_ticks = num_ticks
+        self.days = [day for day in archive.dates(instrument, "1min")
+                     if (start is None or day >= start) and (end is None or day <= end)]
+        self.candles = archive.count(instrument, "1min", start, end) if self.days else 0
+
+    def __len__(self) -> int:
+        return self.candles * self.num_ticks
+
+    def __iter__(self) -> Iterator[MarketTick]:
+        for day in self.days:
+            candles = self.archive.load_candles(self.instrument, "1min", day, day)
+            yield from HistoricalTickReplayer._candle_columns_to_ticks(candles, self.instrument, self.num_ticks)
 
 
 class HistoricalTickReplayer(MarketIngestion):
@@ -61,13 +125,17 @@ class HistoricalTickReplayer(MarketIngestion):
         to_date: Optional[date] = None,
         interval: str = "minute",
         rebase: bool = False,
-        rebase_to: Optional[datetime] = None
+        rebase_to: Optional[datetime] = None,
+        streaming: Optional[bool] = None,
+        instruments: Optional[Iterable[str]] = None,
+        skip_closed_hours: bool = True
     ):
         """Initialize historical tick replayer.
-        
+
         Args:
             store: MarketStore to write ticks to
-            data_source: "zerodha" for API, path to CSV file, or "synthetic" for generated data
+            data_source: "zerodha" for API, path to CSV file, ColumnarArchive directory,
+                         or "synthetic" for generated data
             speed: Replay speed (0.0 = instant, 1.0 = real-time, 2.0 = 2x speed)
             on_tick_callback: Optional callback function called for each tick
             kite: KiteConnect instance (required if data_source="zerodha")
@@ -75,6 +143,13 @@ class HistoricalTickReplayer(MarketIngestion):
             from_date: Start date for historical data (required if data_source="zerodha")
             to_date: End date for historical data (required if data_source="zerodha")
             interval: Data interval ("minute", "3minute", "5minute", "day", etc.)
+            streaming: Yield ticks lazily (one Zerodha chunk / archive day per
+                       instrument in memory) instead of loading and sorting
+                       everything first. Default: HISTORICAL_STREAMING env, else off
+            instruments: Instruments to merge in time order when streaming from
+                         Zerodha or an archive (default: [instrument_symbol])
+            skip_closed_hours: When speed > 0, replay overnight/weekend gaps
+                               without waiting (see ReplayScheduler)
         """
         self.store = store
         self.data_source = data_source
@@ -85,7 +160,16 @@ class HistoricalTickReplayer(MarketIngestion):
         self.from_date = from_date
         self.to_date = to_date
         self.interval = interval
-        
+        if streaming is None:
+            streaming = os.getenv("HISTORICAL_STREAMING", "0").lower() in ("1", "true", "yes")
+        self.streaming = streaming
+        self.instruments = list(instruments) if instruments else [instrument_symbol]
+        self.skip_closed_hours = skip_closed_hours
+        self.scheduler: Optional[ReplayScheduler] = None
+        # Shared virtual clock, advanced per batch in coarse steps (USE_VIRTUAL_TIME)
+        self.use_virtual_time = os.getenv('USE_VIRTUAL_TIME', '0').lower() in ('1', 'true', 'yes')
+        self.virtual_clock: Optional[VirtualClockStepper] = None
+
         self.running = False
         self.task: Optional[asyncio.Task] = None
         self.ticks_loaded = 0
@@ -118,84 +202,57 @@ class HistoricalTickReplayer(MarketIngestion):
         logger.info("Stopped historical tick replayer")
     
     async def _replay_loop(self):
-        """Main replay loop - replays ticks in chronological order."""
+        """Main replay loop - replays ticks in chronological order.
+
+        With speed > 0 ticks are paced by ReplayScheduler on their own
+        timestamps (scaled by speed) and emitted in batches of ticks due
+        together; at speed 0 they are replayed as fast as possible.
+        """
+        self.rebase_offset = None
         try:
-            ticks = self._load_ticks()
-            self.ticks_loaded = len(ticks)
-            
-            if not ticks:
+            if self.streaming:
+                # Ticks are counted as they are pulled from the source
+                ticks = self._iter_ticks()
+                logger.info(f"Streaming ticks for {', '.join(self.instruments)}, starting replay...")
+            else:
+                ticks = self._load_ticks()
+                self.ticks_loaded = len(ticks)
+
+                if not ticks:
+                    logger.error("No ticks loaded for replay")
+                    return
+
+                logger.info(f"Loaded {len(ticks)} ticks, starting replay...")
+
+            if self.speed > 0:
+                self.scheduler = ReplayScheduler(self.speed, skip_closed_hours=self.skip_closed_hours)
+                batches = self.scheduler.batches_of(ticks)
+            else:
+                self.scheduler = None
+                batches = self._instant_batches(ticks)
+
+            # Only set system virtual time when not rebasing and when enabled via env
+            self.virtual_clock = VirtualClockStepper() if self.use_virtual_time and not self.rebase else None
+            last_tick = None
+
+            async for batch in batches:
+                if self.virtual_clock:
+                    self.virtual_clock.advance(batch[0].timestamp)
+                for tick in batch:
+                    if not self.running:
+                        return
+                    await self._emit_tick(tick)
+                last_tick = batch[-1]
+
+            if self.virtual_clock and last_tick:
+                self.virtual_clock.advance(last_tick.timestamp, force=True)
+
+            if self.streaming and not self.ticks_loaded:
                 logger.error("No ticks loaded for replay")
                 return
-            
-            logger.info(f"Loaded {len(ticks)} ticks, starting replay...")
-            
-            # If rebase is enabled, compute offset to make first tick land at rebase_to or now
-            if self.rebase:
-                first_ts = ticks[0].timestamp
-                target = self.rebase_to or datetime.now(IST)
-                # Ensure both datetimes are in the same timezone state for subtraction
-                if first_ts.tzinfo is not None and target.tzinfo is None:
-                    # first_ts is aware, target is naive - make target aware
-                    target = target.replace(tzinfo=first_ts.tzinfo)
-                elif first_ts.tzinfo is None and target.tzinfo is not None:
-                    # first_ts is naive, target is aware - make first_ts aware
-                    first_ts = first_ts.replace(tzinfo=target.tzinfo)
-                self.rebase_offset = target - first_ts
-                logger.info(f"Rebase enabled: offset={self.rebase_offset}")
-
-            # Calculate sleep duration based on speed
-            sleep_duration = 0.0
-            if self.speed > 0:
-                # Calculate average time between ticks
-                if len(ticks) > 1:
-                    time_span = (ticks[-1].timestamp - ticks[0].timestamp).total_seconds()
-                    avg_interval = time_span / len(ticks) if len(ticks) > 1 else 1.0
-                    sleep_duration = avg_interval / self.speed
-            
-            last_timestamp = None
-            
-            for tick in ticks:
-                if not self.running:
-                    break
-
-                # Adjust timestamp if rebase mode
-                if self.rebase and self.rebase_offset is not None:
-                    tick.original_timestamp = tick.timestamp
-                    tick.timestamp = tick.timestamp + self.rebase_offset
-                else:
-                    # Only set system virtual time when not rebasing and when enabled via env
-                    use_virtual = os.getenv('USE_VIRTUAL_TIME', '0').lower() in ('1', 'true', 'yes')
-                    if use_virtual:
-                        _set_system_virtual_time(tick.timestamp)
-                
-                # Store tick in market store (same as live data)
-                self.store.store_tick(tick)
-                
-                # Call callback if provided (for strategy/indicators)
-                if self.on_tick_callback:
-                    try:
-                        if asyncio.iscoroutinefunction(self.on_tick_callback):
-                            await self.on_tick_callback(tick)
-                        else:
-                            self.on_tick_callback(tick)
-                    except Exception as e:
-                        logger.error(f"Error in tick callback: {e}")
-                
-                self.ticks_replayed += 1
-                
-                # Sleep to simulate real-time (if speed > 0)
-                if self.speed > 0 and sleep_duration > 0:
-                    await asyncio.sleep(sleep_duration)
-                elif self.speed == 0.0 and self.ticks_replayed % 1000 == 0:
-                    # Yield control periodically even at instant speed for large datasets
-                    await asyncio.sleep(0)  # Yield to event loop
-                
-                # Log progress every 100 ticks (or more frequently for large datasets)
-                log_interval = 100 if self.ticks_loaded < 1000 else 1000
-                if self.ticks_replayed % log_interval == 0:
-                    logger.info(f"Replayed {self.ticks_replayed}/{self.ticks_loaded} ticks ({self.ticks_replayed*100//self.ticks_loaded}%)")
-            
             logger.info(f"Replay complete: {self.ticks_replayed} ticks replayed")
+            if self.scheduler:
+                logger.info(f"Replay timing: {self.scheduler.get_statistics()}")
             
         except asyncio.CancelledError:
             logger.info("Replay cancelled")
@@ -206,19 +263,71 @@ class HistoricalTickReplayer(MarketIngestion):
         finally:
             self.running = False
     
-    def _load_ticks(self) -> List[MarketTick]:
-        """Load historical ticks from data source."""
+    @staticmethod
+    async def _instant_batches(ticks: Iterable[MarketTick], size: int = 1000) -> AsyncIterator[List[MarketTick]]:
+        """Unpaced batches; yields to the event loop between them for large datasets."""
+        iterator = iter(ticks)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            yield batch
+            await asyncio.sleep(0)
+
+    async def _emit_tick(self, tick: MarketTick) -> None:
+        """Store one tick and notify the callback, as live data would."""
+        if self.streaming:
+            self.ticks_loaded += 1
+
+        # If rebase is enabled, compute offset to make first tick land at rebase_to or now
+        if self.rebase and self.rebase_offset is None:
+            self.rebase_offset = self._compute_rebase_offset(tick.timestamp)
+            logger.info(f"Rebase enabled: offset={self.rebase_offset}")
+
+        # Adjust timestamp if rebase mode
+        if self.rebase and self.rebase_offset is not None:
+            tick.original_timestamp = tick.timestamp
+            tick.timestamp = tick.timestamp + self.rebase_offset
+        
+        # Store tick in market store (same as live data)
+        self.store.store_tick(tick)
+        
+        # Call callback if provided (for strategy/indicators)
+        if self.on_tick_callback:
+            try:
+                if asyncio.iscoroutinefunction(self.on_tick_callback):
+                    await self.on_tick_callback(tick)
+                else:
+                    self.on_tick_callback(tick)
+            except Exception as e:
+                logger.error(f"Error in tick callback: {e}")
+        
+        self.ticks_replayed += 1
+        
+        # Log progress every 100 ticks (or more frequently for large datasets)
+        if self.streaming:
+            if self.ticks_replayed % 1000 == 0:
+                logger.info(f"Replayed {self.ticks_replayed} ticks (up to {tick.timestamp})")
+            return
+        log_interval = 100 if self.ticks_loaded < 1000 else 1000
+        if self.ticks_replayed % log_interval == 0:
+            logger.info(f"Replayed {self.ticks_replayed}/{self.ticks_loaded} ticks ({self.ticks_replayed*100//self.ticks_loaded}%)")
+
+    def _load_ticks(self) -> Union[List[MarketTick], ArchiveCandleTicks]:
+        """Load historical ticks from data source (archives are expanded lazily)."""
         if self.data_source == "zerodha":
             return self._load_from_zerodha()
         elif self.data_source.endswith('.csv'):
             return self._load_from_csv()
+        elif Path(self.data_source).is_dir():
+            return self._load_from_archive()
         elif self.data_source == "synthetic":
             # Synthetic data generation removed - only real data sources allowed
             logger.error("Synthetic data generation is not allowed. Use 'zerodha' or CSV file.")
             return []
         else:
             logger.error(f"Unknown or unsupported data source: {self.data_source}")
-            logger.error("Supported sources: 'zerodha' or path to CSV file")
+            logger.error("Supported sources: 'zerodha', path to CSV file or archive directory")
             return []
     
     def _load_from_csv(self) -> List[MarketTick]:
@@ -237,46 +346,8 @@ class HistoricalTickReplayer(MarketIngestion):
         
         try:
             with open(path, 'r') as f:
-                reader = csv.DictReader(f)
-                
-                for row in reader:
-                    try:
-                        # Parse date and time
-                        date_str = row.get('Date', '').strip()
-                        time_str = row.get('Time', '').strip()
-                        
-                        if not date_str or not time_str:
-                            continue
-                        
-                        # Combine date and time
-                        dt_str = f"{date_str} {time_str}"
-                        timestamp = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-                        timestamp = timestamp.replace(tzinfo=IST)
-                        
-                        # Parse OHLC
-                        open_price = float(row.get('Open', 0))
-                        high_price = float(row.get('High', 0))
-                        low_price = float(row.get('Low', 0))
-                        close_price = float(row.get('Close', 0))
-                        volume = int(float(row.get('Volume', 0)))
-                        
-                        # Convert OHLC candle to ticks
-                        # Method 2: Multiple ticks per candle (more realistic)
-                        candle_ticks = self._ohlc_to_ticks(
-                            timestamp=timestamp,
-                            open=open_price,
-                            high=high_price,
-                            low=low_price,
-                            close=close_price,
-                            volume=volume,
-                            instrument="BANKNIFTY"
-                        )
-                        
-                        ticks.extend(candle_ticks)
-                        
-                    except Exception as e:
-                        logger.warning(f"Error parsing CSV row: {e}, row: {row}")
-                        continue
+                for row in csv.DictReader(f):
+                    ticks.extend(self._csv_row_to_ticks(row))
             
             # Sort by timestamp to ensure chronological order
             ticks.sort(key=lambda t: t.timestamp)
@@ -288,6 +359,87 @@ class HistoricalTickReplayer(MarketIngestion):
             logger.error(f"Error loading CSV: {e}", exc_info=True)
             return []
     
+    def _csv_row_to_ticks(self, row: Dict[str, str]) -> List[MarketTick]:
+        """Convert one Date,Time,Open,High,Low,Close,Volume CSV row to ticks."""
+        try:
+            # Parse date and time
+            date_str = row.get('Date', '').strip()
+            time_str = row.get('Time', '').strip()
+            
+            if not date_str or not time_str:
+                return []
+            
+            # Combine date and time
+            dt_str = f"{date_str} {time_str}"
+            timestamp = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
+            timestamp = timestamp.replace(tzinfo=IST)
+            
+            # Parse OHLC
+            open_price = float(row.get('Open', 0))
+            high_price = float(row.get('High', 0))
+            low_price = float(row.get('Low', 0))
+            close_price = float(row.get('Close', 0))
+            volume = int(float(row.get('Volume', 0)))
+            
+            # Convert OHLC candle to ticks
+            # Method 2: Multiple ticks per candle (more realistic)
+            return self._ohlc_to_ticks(
+                timestamp=timestamp,
+                open=open_price,
+                high=high_price,
+                low=low_price,
+                close=close_price,
+                volume=volume,
+                instrument="BANKNIFTY"
+            )
+            
+        except Exception as e:
+            logger.warning(f"Error parsing CSV row: {e}, row: {row}")
+            return []
+
+    def _load_from_archive(self, num_ticks: int = 4) -> ArchiveCandleTicks:
+        """Open 1-minute candles from a ColumnarArchive directory (memory-mapped).
+
+        Candles are expanded to ticks in the same pattern as _ohlc_to_ticks
+        (open, high, low, close spread over the minute), one day partition at
+        a time as the replay consumes them.
+        """
+        from .columnar_archive import ColumnarArchive
+
+        ticks = ArchiveCandleTicks(ColumnarArchive(self.data_source), self.instrument_symbol,
+                                   self.from_date, self.to_date, num_ticks)
+        if not ticks:
+            logger.error(f"No archived 1min candles for {self.instrument_symbol} in {self.data_source}")
+            return ticks
+
+        logger.info(f"Opened {ticks.candles} archived candles over {len(ticks.days)} days as {len(ticks)} ticks")
+        return ticks
+
+    @staticmethod
+    def _candle_columns_to_ticks(candles: Dict[str, np.ndarray], instrument: str,
+                                 num_ticks: int = 4) -> Iterator[MarketTick]:
+        """Vectorised _ohlc_to_ticks over archived candle columns.
+
+        Prices, times and volumes are laid out with NumPy; the MarketTick
+        objects are created lazily as the caller iterates.
+        """
+        prices = np.stack([candles["open"], candles["high"], candles["low"], candles["close"]], axis=1)
+        prices = prices[:, np.arange(num_ticks) % 4]
+        offsets_s = np.arange(num_ticks) * (60 // num_ticks)
+        seconds = candles["timestamp"] // 1_000_000_000
+        timestamps = (seconds[:, None] + offsets_s[None, :]).ravel()
+        volume = candles["volume"].astype(np.int64)
+        volumes = np.repeat((volume // num_ticks)[:, None], num_ticks, axis=1)
+        volumes[:, -1] += volume % num_ticks
+
+        for ts, price, vol in zip(timestamps.tolist(), prices.ravel().tolist(), volumes.ravel().tolist()):
+            yield MarketTick(
+                instrument=instrument,
+                timestamp=datetime.fromtimestamp(ts, tz=IST),
+                last_price=price,
+                volume=vol
+            )
+
     def _load_from_zerodha(self) -> List[MarketTick]:
         """Load historical data from Zerodha API using kite.historical_data().
         
@@ -333,42 +485,7 @@ class HistoricalTickReplayer(MarketIngestion):
             # Convert OHLC candles to ticks (filter for market hours only)
             ticks = []
             for candle in historical_data:
-                # Parse timestamp (Zerodha returns datetime objects)
-                timestamp = candle.get("date")
-                if isinstance(timestamp, str):
-                    timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                elif isinstance(timestamp, datetime):
-                    # Ensure timezone aware
-                    if timestamp.tzinfo is None:
-                        timestamp = timestamp.replace(tzinfo=IST)
-
-                # Filter for market hours only (9:15 AM to 3:30 PM IST)
-                market_open = timestamp.replace(hour=9, minute=15, second=0, microsecond=0)
-                market_close = timestamp.replace(hour=15, minute=30, second=0, microsecond=0)
-
-                # Only process candles within market hours (9:15 AM to 3:30 PM IST)
-                if timestamp.hour < 9 or (timestamp.hour == 9 and timestamp.minute < 15) or timestamp.hour > 15 or (timestamp.hour == 15 and timestamp.minute > 30):
-                    continue
-
-                # Parse OHLC
-                open_price = float(candle.get("open", 0))
-                high_price = float(candle.get("high", 0))
-                low_price = float(candle.get("low", 0))
-                close_price = float(candle.get("close", 0))
-                volume = int(candle.get("volume", 0))
-
-                # Convert OHLC candle to multiple ticks
-                candle_ticks = self._ohlc_to_ticks(
-                    timestamp=timestamp,
-                    open=open_price,
-                    high=high_price,
-                    low=low_price,
-                    close=close_price,
-                    volume=volume,
-                    instrument=self.instrument_symbol
-                )
-
-                ticks.extend(candle_ticks)
+                ticks.extend(self._zerodha_candle_to_ticks(candle, self.instrument_symbol))
             
             # Sort by timestamp to ensure chronological order
             ticks.sort(key=lambda t: t.timestamp)
@@ -380,37 +497,115 @@ class HistoricalTickReplayer(MarketIngestion):
             logger.error(f"Error loading historical data from Zerodha: {e}", exc_info=True)
             return []
     
-    def _get_instrument_token(self, instrument_symbol: str) -> Optional[int]:
-        """Get instrument token for a symbol.
-        
-        Args:
-            instrument_symbol: Instrument symbol (e.g., "NIFTY BANK", "BANKNIFTY")
-            
-        Returns:
-            Instrument token or None if not found
+    def _zerodha_candle_to_ticks(self, candle: Dict[str, Any], instrument: str) -> List[MarketTick]:
+        """Convert one kite.historical_data() candle to ticks (empty outside market hours)."""
+        # Parse timestamp (Zerodha returns datetime objects)
+        timestamp = candle.get("date")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        elif isinstance(timestamp, datetime):
+            # Ensure timezone aware
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=IST)
+
+        # Only process candles within market hours (9:15 AM to 3:30 PM IST)
+        if timestamp.hour < 9 or (timestamp.hour == 9 and timestamp.minute < 15) or timestamp.hour > 15 or (timestamp.hour == 15 and timestamp.minute > 30):
+            return []
+
+        # Convert OHLC candle to multiple ticks
+        return self._ohlc_to_ticks(
+            timestamp=timestamp,
+            open=float(candle.get("open", 0)),
+            high=float(candle.get("high", 0)),
+            low=float(candle.get("low", 0)),
+            close=float(candle.get("close", 0)),
+            volume=int(candle.get("volume", 0)),
+            instrument=instrument
+        )
+
+    def _iter_ticks(self) -> Iterator[MarketTick]:
+        """Lazily yield ticks from the data source in chronological order.
+
+        Each instrument is read as its own time-ordered stream (one Zerodha
+        request chunk or one archive day at a time) and the streams are merged
+        with a k-way heap, so replay starts immediately and memory stays bounded
+        by the chunk size rather than the date range. CSV files are read row by
+        row and must already be in time order.
         """
-        try:
-            # Try NSE first (for equity/index)
-            instruments = self.kite.instruments("NSE")
-            for inst in instruments:
-                if inst.get("tradingsymbol") == instrument_symbol or inst.get("name") == instrument_symbol:
-                    return inst.get("instrument_token")
-            
-            # Try NFO (for futures/options)
-            instruments = self.kite.instruments("NFO")
-            for inst in instruments:
-                # Match by name (e.g., "BANKNIFTY")
-                if inst.get("name") == instrument_symbol:
-                    # Get the nearest expiry future
-                    if inst.get("instrument_type") == "FUT":
-                        return inst.get("instrument_token")
-            
-            logger.warning(f"Instrument token not found for {instrument_symbol}")
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting instrument token: {e}")
-            return None
+        if self.data_source == "zerodha":
+            streams = [self._iter_from_zerodha(symbol) for symbol in self.instruments]
+        elif self.data_source.endswith('.csv'):
+            streams = [self._iter_from_csv()]
+        elif Path(self.data_source).is_dir():
+            streams = [self._iter_from_archive(symbol) for symbol in self.instruments]
+        else:
+            logger.error(f"Unsupported data source for streaming replay: {self.data_source}")
+            logger.error("Supported sources: 'zerodha', path to CSV file or archive directory")
+            return iter(())
+        return heapq.merge(*streams, key=_tick_time)
+
+    def _iter_from_csv(self) -> Iterator[MarketTick]:
+        path = Path(self.data_source)
+        if not path.exists():
+            logger.error(f"CSV file not found: {self.data_source}")
+            return
+        with open(path, 'r') as f:
+            for row in csv.DictReader(f):
+                yield from self._csv_row_to_ticks(row)
+
+    def _iter_from_archive(self, instrument: str) -> Iterator[MarketTick]:
+        from .columnar_archive import ColumnarArchive
+
+        ticks = ArchiveCandleTicks(ColumnarArchive(self.data_source), instrument, self.from_date, self.to_date)
+        if not ticks.days:
+            logger.error(f"No archived 1min candles for {instrument} in {self.data_source}")
+        yield from ticks
+
+    def _iter_from_zerodha(self, instrument: str) -> Iterator[MarketTick]:
+        if not self.kite:
+            logger.error("Kite client not provided for Zerodha historical data")
+            return
+        if not self.from_date or not self.to_date:
+            logger.error("from_date and to_date required for Zerodha historical data")
+            return
+
+        instrument_token = self._get_instrument_token(instrument)
+        if not instrument_token:
+            logger.error(f"Instrument token not found for {instrument}")
+            return
+
+        for chunk_start, chunk_end in zerodha_date_chunks(self.from_date, self.to_date, self.interval):
+            try:
+                candles = self.kite.historical_data(
+                    instrument_token=instrument_token,
+                    from_date=chunk_start,
+                    to_date=chunk_end,
+                    interval=self.interval,
+                    continuous=False,
+                    oi=False
+                ) or []
+            except Exception as e:
+                logger.error(f"Error loading historical data from Zerodha for {instrument}: {e}", exc_info=True)
+                return
+            logger.info(f"Fetched {len(candles)} {instrument} candles from Zerodha ({chunk_start} to {chunk_end})")
+            for candle in candles:
+                yield from self._zerodha_candle_to_ticks(candle, instrument)
+
+    def _compute_rebase_offset(self, first_ts: datetime) -> timedelta:
+        """Offset that makes first_ts land at rebase_to (or now)."""
+        target = self.rebase_to or datetime.now(IST)
+        # Ensure both datetimes are in the same timezone state for subtraction
+        if first_ts.tzinfo is not None and target.tzinfo is None:
+            # first_ts is aware, target is naive - make target aware
+            target = target.replace(tzinfo=first_ts.tzinfo)
+        elif first_ts.tzinfo is None and target.tzinfo is not None:
+            # first_ts is naive, target is aware - make first_ts aware
+            first_ts = first_ts.replace(tzinfo=target.tzinfo)
+        return target - first_ts
+
+    def _get_instrument_token(self, instrument_symbol: str) -> Optional[int]:
+        """Get instrument token for a symbol (see find_instrument_token)."""
+        return find_instrument_token(self.kite, instrument_symbol)
     
     def _ohlc_to_ticks(
         self,
@@ -503,7 +698,9 @@ class HistoricalTickReplayer(MarketIngestion):
             "ticks_loaded": self.ticks_loaded,
             "ticks_replayed": self.ticks_replayed,
             "running": self.running,
-            "speed": self.speed
+            "speed": self.speed,
+            "streaming": self.streaming,
+            "timing": self.scheduler.get_statistics() if self.scheduler else None
         }
 
 
@@ -7,14 +7,23 @@ This adapter works for historical data and after-hours trading by using:
 """
 
 import logging
+import os
+import threading
 from typing import Optional, Dict, Any, List
 from datetime import datetime, date, timedelta
 import pandas as pd
 
 from ..contracts import OptionsData
+from ..instrument_master import InstrumentMaster, parse_expiry, get_instrument_master
+from ..live_option_chain import LiveOptionChain
 
 logger = logging.getLogger(__name__)
 
+_OPTION_COLUMNS = ["instrument_token", "tradingsymbol", "name", "expiry", "strike", "instrument_type"]
+
+# A live chain with no quote for this many seconds is bypassed for a broker poll
+LIVE_CHAIN_MAX_AGE = float(os.getenv("OPTIONS_LIVE_CHAIN_MAX_AGE", "10"))
+
 
 class MockOptionsChainAdapter(OptionsData):
     """Options chain adapter using Zerodha API.
@@ -23,23 +32,29 @@ class MockOptionsChainAdapter(OptionsData):
     The "Mock" name is historical - it actually uses real Zerodha APIs.
     """
 
-    def __init__(self, kite=None, instrument_symbol: str = "BANKNIFTY", use_live_quotes: bool = False):
+    def __init__(self, kite=None, instrument_symbol: str = "BANKNIFTY", use_live_quotes: bool = False,
+                 max_live_age: float = LIVE_CHAIN_MAX_AGE):
         """Initialize options chain adapter.
 
         Args:
             kite: KiteConnect instance (optional, for fetching instruments)
             instrument_symbol: Underlying symbol (e.g., "BANKNIFTY", "NIFTY")
             use_live_quotes: If True, use kite.quote() for real-time bid/ask. If False, use kite.ltp() for last traded price.
+            max_live_age: Seconds without a quote after which a live chain is refreshed from the broker
+                          instead of being served (env OPTIONS_LIVE_CHAIN_MAX_AGE)
         """
         self.kite = kite
         self.instrument_symbol = instrument_symbol.upper()
         self.use_live_quotes = use_live_quotes
-        self._instruments_df: Optional[pd.DataFrame] = None
+        self._master: Optional[InstrumentMaster] = None
         self._options_df: Optional[pd.DataFrame] = None
         self._last_prices: Dict[str, Dict] = {}
+        self.max_live_age = max_live_age
+        self._live_chains: Dict[tuple, LiveOptionChain] = {}
+        self._live_feeds: Dict[tuple, threading.Event] = {}
 
     async def initialize(self) -> None:
-        """Initialize by downloading and caching NFO instruments."""
+        """Initialize from the shared instrument master (NFO downloaded at most once a day)."""
         try:
             logger.info(f"Initializing MockOptionsChainAdapter for {self.instrument_symbol}")
 
@@ -47,38 +62,26 @@ class MockOptionsChainAdapter(OptionsData):
                 logger.warning("No kite client provided, using empty instruments")
                 return
 
-            # Download all NFO instruments
-            logger.info("Downloading NFO instruments...")
-            instruments = self.kite.instruments("NFO")
-
-            # Convert to DataFrame for easier filtering
-            self._instruments_df = pd.DataFrame(instruments)
-            logger.info(f"Loaded {len(self._instruments_df)} NFO instruments")
-
-            # Filter for our underlying options
-            self._options_df = self._instruments_df[
-                (self._instruments_df["name"] == self.instrument_symbol) &
-                (self._instruments_df["instrument_type"].isin(["CE", "PE"]))
-            ].copy()
-
-            logger.info(f"Filtered {len(self._options_df)} {self.instrument_symbol} options")
+            self._master = get_instrument_master(self.kite)
+            self._options_df = self._options_frame(self.instrument_symbol)
+            logger.info(f"Loaded {len(self._options_df)} {self.instrument_symbol} options")
 
             if len(self._options_df) > 0:
-                # Sort by expiry and strike for better organization
-                self._options_df = self._options_df.sort_values(['expiry', 'strike'])
-
-                # Get unique expiries
-                expiries = sorted(self._options_df['expiry'].unique())
+                expiries = self._master.expiries(self.instrument_symbol)
                 logger.info(f"Available expiries: {expiries[:3]}...")  # Show first 3
 
-                # Get strike range
-                strikes = sorted(self._options_df['strike'].unique())
+                strikes = self._master.strikes(self.instrument_symbol, expiries[0])
                 logger.info(f"Strike range: {strikes[0]} - {strikes[-1]} (interval: {strikes[1] - strikes[0] if len(strikes) > 1 else 'N/A'})")
 
         except Exception as e:
             logger.error(f"Failed to initialize mock options chain: {e}")
             raise
 
+    def _options_frame(self, name: str, expiry=None) -> pd.DataFrame:
+        """Option contracts of an underlying (one expiry if given), sorted by expiry and strike."""
+        rows = self._master.options(name) if expiry is None else self._master.option_chain(name, expiry)
+        return pd.DataFrame(rows, columns=None if rows else _OPTION_COLUMNS)
+
     async def fetch_options_chain(self, instrument: Optional[str] = None, expiry: Optional[str] = None,
                                  strikes: Optional[List[int]] = None) -> Dict[str, Any]:
         """Fetch options chain using cached instrument data and last prices."""
@@ -86,37 +89,35 @@ class MockOptionsChainAdapter(OptionsData):
         try:
             target_instrument = instrument or self.instrument_symbol
 
-            if self._options_df is None or len(self._options_df) == 0:
+            if self._master is None:
                 logger.warning("No options data available, initializing...")
                 if self.kite:
                     await self.initialize()
                 else:
                     return self._create_empty_response("No kite client available for initialization")
 
-            # Filter options for target instrument
-            options_df = self._options_df
-            if instrument and instrument.upper() != self.instrument_symbol:
-                # If different instrument requested, filter from main instruments
-                if self._instruments_df is not None:
-                    options_df = self._instruments_df[
-                        (self._instruments_df["name"] == instrument.upper()) &
-                        (self._instruments_df["instrument_type"].isin(["CE", "PE"]))
-                    ]
-                else:
-                    return self._create_empty_response(f"No data for {instrument}")
-
-            if len(options_df) == 0:
+            # Select expiry from the master's sorted expiry index
+            name = target_instrument.upper()
+            available_expiries = self._master.expiries(name)
+            if not available_expiries:
                 return self._create_empty_response(f"No options found for {target_instrument}")
 
-            # Select expiry
-            available_expiries = sorted(options_df['expiry'].unique())
-            selected_expiry = expiry or available_expiries[0] if available_expiries else None
-
+            selected_expiry = parse_expiry(expiry) if expiry else available_expiries[0]
             if not selected_expiry:
                 return self._create_empty_response("No expiry dates available")
 
-            # Filter by expiry
-            expiry_options = options_df[options_df['expiry'] == selected_expiry]
+            # A live chain for this expiry is kept current by streaming quotes: no broker round trip
+            # unless its feed has gone quiet for longer than max_live_age
+            live = self._live_chains.get((name, selected_expiry))
+            if live is not None and live.age() <= self.max_live_age:
+                chain = live.to_chain_dict(strikes)
+                chain["available_expiries"] = [exp.isoformat() for exp in available_expiries]
+                return chain
+            if live is not None:
+                logger.info(f"Live {name} {selected_expiry} chain is {live.age():.0f}s old, polling the broker")
+
+            # Contracts for the expiry
+            expiry_options = self._options_frame(name, selected_expiry)
 
             if len(expiry_options) == 0:
                 return self._create_empty_response(f"No options for expiry {selected_expiry}")
@@ -127,6 +128,8 @@ class MockOptionsChainAdapter(OptionsData):
 
             # Get last prices for these options
             price_data = await self._get_last_prices(expiry_options)
+            if live is not None:
+                live.apply_ticks({"instrument_token": int(token), **quote} for token, quote in price_data.items())
 
             # Organize by strikes
             strikes_data = self._organize_by_strikes(expiry_options, price_data)
@@ -145,6 +148,63 @@ class MockOptionsChainAdapter(OptionsData):
             logger.error(f"Error fetching mock options chain: {e}")
             return self._create_empty_response(f"Error: {str(e)}")
 
+    async def live_chain(self, instrument: Optional[str] = None, expiry: Optional[str] = None,
+                         seed: bool = True) -> LiveOptionChain:
+        """Get (or create) the in-memory chain for an underlying/expiry (nearest expiry by default).
+
+        A new chain is seeded with one quote poll; feed it afterwards from the ticker
+        (``kws.on_ticks = chain.on_ticks``) or the store (``chain.subscribe_store(redis)``).
+        While it exists and has had a quote within max_live_age seconds,
+        fetch_options_chain serves that expiry from it.
+        """
+        if self._master is None:
+            await self.initialize()
+        if self._master is None:
+            raise ValueError("No kite client available for the instrument master")
+        name = (instrument or self.instrument_symbol).upper()
+        selected_expiry = parse_expiry(expiry) if expiry else next(iter(self._master.expiries(name)), None)
+        if selected_expiry is None:
+            raise ValueError(f"No options found for {name}")
+
+        chain = self._live_chains.get((name, selected_expiry))
+        if chain is None:
+            chain = LiveOptionChain(name, selected_expiry, self._master.option_chain(name, selected_expiry))
+            if seed and chain.tokens:
+                price_data = await self._get_last_prices(self._options_frame(name, selected_expiry))
+                chain.apply_ticks({"instrument_token": int(token), **quote} for token, quote in price_data.items())
+            self._live_chains[(name, selected_expiry)] = chain
+        return chain
+
+    async def start_live_feed(self, redis_client, instrument: Optional[str] = None,
+                              expiry: Optional[str] = None) -> LiveOptionChain:
+        """Get the live chain for an underlying/expiry, feeding it from the store's market:tick pub/sub.
+
+        The subscription is started once per chain and stopped by drop_live_chain.
+        """
+        chain = await self.live_chain(instrument, expiry)
+        key = (chain.name, chain.expiry)
+        if key not in self._live_feeds:
+            self._live_feeds[key] = chain.subscribe_store(redis_client)
+            logger.info(f"Live {chain.name} {chain.expiry} chain subscribed to {len(chain.symbols)} contracts")
+        return chain
+
+    def publish_live_deltas(self, redis_client) -> int:
+        """Publish the pending changes of every live chain; returns the number of updated cells."""
+        return sum(chain.publish_delta(redis_client) for chain in list(self._live_chains.values()))
+
+    def drop_live_chain(self, instrument: Optional[str] = None, expiry: Optional[str] = None) -> None:
+        """Stop serving an expiry from its live chain (all live chains when no instrument is given)."""
+        if instrument is None:
+            keys = list(self._live_chains)
+        else:
+            name = instrument.upper()
+            keys = [key for key in self._live_chains if key[0] == name and (expiry is None or key[1] == parse_expiry(expiry))]
+        for key in keys:
+            del self._live_chains[key]
+            feed = self._live_feeds.pop(key, None)
+            if feed is not None:
+                feed.set()
+
     async def _get_last_prices(self, options_df: pd.DataFrame) -> Dict[str, Dict]:
         """Get prices for option contracts using real Zerodha API."""
 
@@ -4,18 +4,32 @@ This adapter is a thin wrapper so we can reuse the existing Redis client
 without binding to legacy settings or globals.
 
 Automatically builds OHLC candles from ticks and updates technical indicators.
+
+Tick history is an append-only Redis Stream per instrument (tick_stream:{instrument},
+trimmed by MINID/MAXLEN) read with XRANGE by time or through consumer groups;
+set tick_log="keys" for the legacy tick:{instrument}:{timestamp} TTL keys.
+Entry IDs are <tick epoch ms>-<seq>, from the tick's own timestamp (naive
+timestamps are IST), kept increasing per instrument; a tick older than the newest
+logged one is appended right after it. One writer per instrument stream is assumed.
 """
+import atexit
 import json
 import logging
 import os
+import threading
 from dataclasses import asdict
-from datetime import datetime, timedelta
-from typing import Iterable, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 
 from ..contracts import MarketStore, MarketTick, OHLCBar
 
 logger = logging.getLogger(__name__)
 
+TICK_STREAM_PREFIX = "tick_stream"
+TICK_LOG_STREAM = "stream"  # XADD to tick_stream:{instrument}
+TICK_LOG_KEYS = "keys"      # Legacy SETEX tick:{instrument}:{timestamp} per tick
+IST = timezone(timedelta(hours=5, minutes=30))
+
 # Lazy import to avoid circular dependencies
 _candle_builders: Dict[str, Optional[Any]] = {}
 _technical_service: Optional[Any] = None
@@ -69,6 +83,53 @@ def _parse_tick(payload: Optional[str]) -> Optional[MarketTick]:
         return None
 
 
+def tick_stream_key(instrument: str) -> str:
+    """Redis Stream holding the tick log of an instrument."""
+    return f"{TICK_STREAM_PREFIX}:{instrument}"
+
+
+def _tick_stream_fields(tick: MarketTick) -> Dict[str, Any]:
+    fields = {"timestamp": _iso(tick.timestamp), "last_price": tick.last_price}
+    if tick.volume is not None:
+        fields["volume"] = tick.volume
+    if tick.original_timestamp is not None:
+        fields["original_timestamp"] = _iso(tick.original_timestamp)
+    return fields
+
+
+def _parse_stream_tick(instrument: str, fields: Dict[Any, Any]) -> Optional[MarketTick]:
+    try:
+        data = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in fields.items()
+        }
+        original = data.get("original_timestamp")
+        return MarketTick(
+            instrument=instrument,
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            last_price=float(data["last_price"]),
+            volume=int(float(data["volume"])) if data.get("volume") not in (None, "") else None,
+            original_timestamp=datetime.fromisoformat(original) if original else None,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to parse tick from stream: %s", exc)
+        return None
+
+
+def _tick_epoch_ms(value: datetime) -> int:
+    """Epoch ms of a tick time; naive timestamps are IST wall time, as the feeds send them."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=IST)
+    return int(value.timestamp() * 1000)
+
+
+def _stream_id_ms(value: Optional[datetime], default: str) -> str:
+    # Stream IDs are <tick epoch ms>-<seq>; XRANGE accepts a bare epoch ms as bound
+    if value is None:
+        return default
+    return str(_tick_epoch_ms(value))
+
+
 def _parse_ohlc(payload: str) -> Optional[OHLCBar]:
     try:
         data = json.loads(payload)
@@ -105,6 +166,13 @@ class RedisMarketStore(MarketStore):
         ohlc_ttl_hours: int = 24,
         enable_candle_building: bool = True,
         enable_technical_indicators: bool = True,  # Enabled - ichimoku bug fixed
+        candle_timeframes: Optional[Iterable[str]] = None,
+        write_batch_window_ms: Optional[float] = None,
+        write_batch_max_ticks: int = 500,
+        tick_log: Optional[str] = None,
+        tick_stream_maxlen: Optional[int] = None,
+        enable_session_stats: bool = True,
+        session_windows_minutes: Optional[Iterable[int]] = None,
     ):
         self.redis = redis_client
         self._available = False
@@ -116,112 +184,447 @@ class RedisMarketStore(MarketStore):
         self._tick_ttl = int(timedelta(hours=tick_ttl_hours).total_seconds())
         self._price_ttl = int(price_ttl_seconds)
         self._ohlc_ttl = int(timedelta(hours=ohlc_ttl_hours).total_seconds())
-        
-        # Candle builders per instrument and timeframe
-        self._candle_builders: Dict[str, Dict[str, Any]] = {}
+
+        # Tick log: one stream per instrument, trimmed to tick_stream_maxlen entries
+        # or (default) to entries younger than tick_ttl_hours. Clients without
+        # stream commands keep the legacy per-tick keys.
+        tick_log = (tick_log or os.getenv("MARKET_STORE_TICK_LOG", TICK_LOG_STREAM)).lower()
+        if tick_log not in (TICK_LOG_STREAM, TICK_LOG_KEYS):
+            raise ValueError(f"Unknown tick log '{tick_log}', expected '{TICK_LOG_STREAM}' or '{TICK_LOG_KEYS}'")
+        self._tick_stream = tick_log == TICK_LOG_STREAM and hasattr(redis_client, "xadd")
+        self._tick_stream_maxlen = tick_stream_maxlen
+        # Newest entry ID (ms, seq) written per instrument stream, read once per process
+        self._stream_last_ids: Dict[str, Tuple[int, int]] = {}
+        self._stream_id_lock = threading.Lock()
+
+        # Batched tick writes: ticks arriving within write_batch_window_ms (or until
+        # write_batch_max_ticks are queued) go to Redis in one pipeline. 0 disables.
+        if write_batch_window_ms is None:
+            write_batch_window_ms = float(os.getenv("MARKET_STORE_BATCH_WINDOW_MS", "0"))
+        self._batch_window = max(float(write_batch_window_ms), 0.0) / 1000.0
+        self._batch_max_ticks = max(int(write_batch_max_ticks), 1)
+        self._pending_ticks: List[MarketTick] = []
+        # Ticks of a failed flush are re-queued; past this many queued, the oldest are dropped
+        self._max_pending_ticks = self._batch_max_ticks * 10
+        self.ticks_dropped = 0
+        self._batch_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._ticks_pending = threading.Event()
+        self._stopping = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        if self._batch_window:
+            atexit.register(self.close)
+
+        # Running session aggregates (VWAP, volume, OHLC, rolling windows) per instrument,
+        # written to session_stats:{instrument} with every tick write
+        self._session_stats: Dict[str, Any] = {}
+        self._session_lock = threading.Lock()
+        self._session_windows = tuple(session_windows_minutes) if session_windows_minutes else None
+        self._enable_session_stats = enable_session_stats and hasattr(redis_client, "hset")
+        if self._enable_session_stats:
+            try:
+                from ..session_aggregates import SessionAggregates  # noqa: F401
+            except Exception as e:
+                logger.warning(f"Could not enable session aggregates: {e}")
+                self._enable_session_stats = False
+
+        # One multi-timeframe candle builder per instrument (1min rolled up to 3min..1d)
+        self._candle_builders: Dict[str, Any] = {}
+        self._candle_timeframes = tuple(candle_timeframes) if candle_timeframes else None
         self._enable_candle_building = enable_candle_building
         self._enable_technical_indicators = enable_technical_indicators
-        
-        # Initialize technical indicators service if enabled
+
+        # Initialize technical indicators service if enabled; the 1min service also
+        # takes ticks, each other timeframe gets its own service (own windows/snapshot)
+        self._technical_services: Dict[str, Any] = {}
         if self._enable_technical_indicators:
-            try:
-                from ..technical_indicators_service import TechnicalIndicatorsService
-                self._technical_service = TechnicalIndicatorsService(redis_client=redis_client)
+            self._technical_service = self._get_technical_service("1min")
+            if self._technical_service is not None:
                 logger.info("Technical indicators service initialized in MarketStore")
-            except Exception as e:
-                logger.warning(f"Could not initialize technical indicators service: {e}")
-                self._technical_service = None
         else:
             self._technical_service = None
 
+    def _get_technical_service(self, timeframe: str) -> Optional[Any]:
+        """Get (or create) the technical indicators service for a candle timeframe."""
+        if timeframe not in self._technical_services:
+            try:
+                from ..technical_indicators_service import TechnicalIndicatorsService
+                self._technical_services[timeframe] = TechnicalIndicatorsService(
+                    redis_client=self.redis, timeframe=timeframe
+                )
+            except Exception as e:
+                logger.warning(f"Could not initialize {timeframe} technical indicators service: {e}")
+                self._technical_services[timeframe] = None
+        return self._technical_services[timeframe]
+
     def store_tick(self, tick: MarketTick) -> None:
         if not self._available:
             return
-        payload = _serialize_tick(tick)
-        ts_key = _iso(tick.timestamp)
-        payload_json = json.dumps(payload)
         try:
-            self.redis.setex(f"tick:{tick.instrument}:{ts_key}", self._tick_ttl, payload_json)
-            # Also store latest tick blob and price for quick lookup
-            self.redis.setex(f"tick:{tick.instrument}:latest", self._tick_ttl, payload_json)
-            self.redis.setex(f"price:{tick.instrument}:latest", self._price_ttl, str(tick.last_price))
-            self.redis.setex(f"price:{tick.instrument}:latest_ts", self._price_ttl, ts_key)
-            if tick.volume is not None:
-                self.redis.setex(f"volume:{tick.instrument}:latest", self._price_ttl, str(tick.volume))
-            
-            # Publish tick to Redis pub/sub for real-time subscribers (Socket.IO, signal monitoring, etc.)
-            try:
-                self.redis.publish(f"market:tick:{tick.instrument}", payload_json)
-                # Also publish to general tick channel
-                self.redis.publish("market:tick", payload_json)
-            except Exception as pub_exc:
-                # Don't fail if pub/sub fails (may not be enabled)
-                logger.debug(f"Failed to publish tick to pub/sub: {pub_exc}")
-            
+            if self._enable_session_stats:
+                self._update_session_stats(tick)
+            batched = self._batch_window and not self._closed
+            if batched:
+                self._queue_tick(tick)
+            else:
+                self._write_tick(tick)
+
             # Automatically build OHLC candles from ticks (if enabled)
             if self._enable_candle_building:
                 self._process_tick_for_ohlc(tick)
             
-            # Automatically update technical indicators (if enabled)
-            if self._enable_technical_indicators and self._technical_service:
-                try:
-                    tick_dict = {
-                        "last_price": tick.last_price,
-                        "volume": tick.volume or 0,
-                        "timestamp": tick.timestamp.isoformat()
-                    }
-                    self._technical_service.update_tick(tick.instrument, tick_dict)
-                except Exception as e:
-                    logger.debug(f"Error updating technical indicators: {e}")
+            # Automatically update technical indicators (if enabled); batched ticks
+            # update them once per instrument when their batch is flushed
+            if not batched:
+                self._update_indicators(tick.instrument, [tick])
         except Exception as exc:  # noqa: BLE001
+            self._stream_last_ids.clear()  # re-read the stream tails in case another writer moved them
             logger.error("Error storing tick: %s", exc, exc_info=True)
+
+    def _update_indicators(self, instrument: str, ticks: List[MarketTick]) -> None:
+        if not self._enable_technical_indicators or not self._technical_service:
+            return
+        try:
+            tick_dicts = [{
+                "last_price": tick.last_price,
+                "volume": tick.volume or 0,
+                "timestamp": tick.timestamp.isoformat()
+            } for tick in ticks]
+            if len(tick_dicts) == 1:
+                self._technical_service.update_tick(instrument, tick_dicts[0])
+            else:
+                self._technical_service.update_ticks(instrument, tick_dicts)
+        except Exception as e:
+            logger.debug(f"Error updating technical indicators: {e}")
     
+    def _write_tick(self, tick: MarketTick) -> None:
+        """Write one tick and its latest keys, and publish it (unbatched mode)."""
+        payload = _serialize_tick(tick)
+        ts_key = _iso(tick.timestamp)
+        payload_json = json.dumps(payload)
+        self._append_tick_log(self.redis, tick, ts_key, payload_json)
+        # Also store latest tick blob and price for quick lookup
+        self.redis.setex(f"tick:{tick.instrument}:latest", self._tick_ttl, payload_json)
+        self.redis.setex(f"price:{tick.instrument}:latest", self._price_ttl, str(tick.last_price))
+        self.redis.setex(f"price:{tick.instrument}:latest_ts", self._price_ttl, ts_key)
+        if tick.volume is not None:
+            self.redis.setex(f"volume:{tick.instrument}:latest", self._price_ttl, str(tick.volume))
+        self._write_session_stats(self.redis, tick.instrument)
+
+        # Publish tick to Redis pub/sub for real-time subscribers (Socket.IO, signal monitoring, etc.)
+        try:
+            self.redis.publish(f"market:tick:{tick.instrument}", payload_json)
+            # Also publish to general tick channel
+            self.redis.publish("market:tick", payload_json)
+        except Exception as pub_exc:
+            # Don't fail if pub/sub fails (may not be enabled)
+            logger.debug(f"Failed to publish tick to pub/sub: {pub_exc}")
+
+    def _update_session_stats(self, tick: MarketTick) -> None:
+        from ..session_aggregates import SessionAggregates, DEFAULT_WINDOWS_MINUTES
+
+        with self._session_lock:
+            aggregates = self._session_stats.get(tick.instrument)
+            if aggregates is None:
+                aggregates = self._session_stats[tick.instrument] = SessionAggregates(
+                    self._session_windows or DEFAULT_WINDOWS_MINUTES
+                )
+            aggregates.update(tick)
+
+    def _write_session_stats(self, client, instrument: str) -> None:
+        """Replace session_stats:{instrument} with the current aggregates on a client or pipeline."""
+        if not self._enable_session_stats or instrument not in self._session_stats:
+            return
+        from ..session_aggregates import session_stats_key
+
+        with self._session_lock:
+            snapshot = self._session_stats[instrument].snapshot()
+        key = session_stats_key(instrument)
+        # Unavailable values are written as "" so fields from an earlier session never linger
+        client.hset(key, mapping={field: "" if value is None else str(value) for field, value in snapshot.items()})
+        client.expire(key, self._price_ttl)
+
+    def get_session_stats(self, instrument: str) -> Dict[str, Any]:
+        """Session aggregates (VWAP, volume, open/high/low, rolling windows) with one HGETALL."""
+        if not self._available or not self._enable_session_stats:
+            return {}
+        from ..session_aggregates import read_session_stats
+
+        try:
+            return read_session_stats(self.redis, instrument)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Error reading session stats: %s", exc)
+            return {}
+
+    def _append_tick_log(self, client, tick: MarketTick, ts_key: str, payload_json: str) -> None:
+        """Append a tick to its instrument's stream (or legacy key) on a client or pipeline."""
+        if not self._tick_stream:
+            client.setex(f"tick:{tick.instrument}:{ts_key}", self._tick_ttl, payload_json)
+            return
+        entry_ms, entry_id = self._next_stream_id(tick)
+        if self._tick_stream_maxlen:
+            client.xadd(tick_stream_key(tick.instrument), _tick_stream_fields(tick), id=entry_id,
+                        maxlen=self._tick_stream_maxlen, approximate=True)
+        else:
+            # Keep tick_ttl_hours of tick time behind the newest tick (replayed days included)
+            client.xadd(tick_stream_key(tick.instrument), _tick_stream_fields(tick), id=entry_id,
+                        minid=entry_ms - self._tick_ttl * 1000, approximate=True)
+
+    def _next_stream_id(self, tick: MarketTick) -> Tuple[int, str]:
+        """Stream entry ID for a tick: its epoch ms, or just after the newest logged entry if not newer."""
+        tick_ms = _tick_epoch_ms(tick.timestamp)
+        with self._stream_id_lock:
+            last = self._stream_last_ids.get(tick.instrument)
+            if last is None:
+                last = self._read_last_stream_id(tick.instrument)
+            ms, seq = (tick_ms, 0) if tick_ms > last[0] else (last[0], last[1] + 1)
+            self._stream_last_ids[tick.instrument] = (ms, seq)
+        return ms, f"{ms}-{seq}"
+
+    def _read_last_stream_id(self, instrument: str) -> Tuple[int, int]:
+        try:
+            entries = self.redis.xrevrange(tick_stream_key(instrument), count=1)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Could not read the last tick stream ID: %s", exc)
+            entries = None
+        if not entries:
+            return -1, -1
+        entry_id = entries[0][0]
+        ms, _, seq = (entry_id.decode() if isinstance(entry_id, bytes) else entry_id).partition("-")
+        return int(ms), int(seq or 0)
+
+    def get_ticks(
+        self,
+        instrument: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        count: Optional[int] = None,
+    ) -> List[MarketTick]:
+        """Read logged ticks in a time window with one XRANGE (no keyspace scan).
+
+        The window applies to tick timestamps, which the stream IDs are built from
+        (naive bounds are IST, like naive tick timestamps).
+
+        Args:
+            instrument: Instrument symbol
+            start: Oldest tick time to include (default: start of the log)
+            end: Newest tick time to include (default: newest tick)
+            count: Maximum number of ticks, oldest first
+
+        Returns:
+            Ticks in stream order
+        """
+        if not self._available or not self._tick_stream:
+            return []
+        try:
+            entries = self.redis.xrange(
+                tick_stream_key(instrument), min=_stream_id_ms(start, "-"), max=_stream_id_ms(end, "+"), count=count
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Error reading tick stream: %s", exc)
+            return []
+        ticks = (_parse_stream_tick(instrument, fields) for _, fields in entries)
+        return [tick for tick in ticks if tick]
+
+    def create_tick_consumer_group(self, instrument: str, group: str, start_id: str = "$") -> None:
+        """Create a consumer group on an instrument's tick stream (no-op if it exists).
+
+        Args:
+            instrument: Instrument symbol
+            group: Consumer group name
+            start_id: "$" for new ticks only, "0" to replay the retained log
+        """
+        try:
+            self.redis.xgroup_create(tick_stream_key(instrument), group, id=start_id, mkstream=True)
+        except Exception as exc:  # noqa: BLE001
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    def read_tick_group(
+        self,
+        instrument: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block_ms: Optional[int] = None,
+    ) -> List[Tuple[str, MarketTick]]:
+        """Read ticks not yet delivered to a consumer group.
+
+        Returns:
+            (entry_id, tick) pairs; acknowledge them with ack_ticks() once processed
+        """
+        response = self.redis.xreadgroup(
+            group, consumer, {tick_stream_key(instrument): ">"}, count=count, block=block_ms
+        )
+        result = []
+        for _, entries in response or []:
+            for entry_id, fields in entries:
+                tick = _parse_stream_tick(instrument, fields)
+                if tick:
+                    result.append((entry_id.decode() if isinstance(entry_id, bytes) else entry_id, tick))
+        return result
+
+    def ack_ticks(self, instrument: str, group: str, *entry_ids: str) -> int:
+        """Acknowledge processed tick entries for a consumer group."""
+        if not entry_ids:
+            return 0
+        return self.redis.xack(tick_stream_key(instrument), group, *entry_ids)
+
+    def _queue_tick(self, tick: MarketTick) -> None:
+        """Queue a tick for the next batched write, flushing when the batch is full."""
+        with self._batch_lock:
+            self._pending_ticks.append(tick)
+            self._ticks_pending.set()
+            full = len(self._pending_ticks) >= self._batch_max_ticks
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="redis-market-store-flush", daemon=True
+                )
+                self._flusher.start()
+        if full:
+            self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            # Sleep until a tick is queued, then give the batch one window to fill
+            self._ticks_pending.wait()
+            self._stopping.wait(self._batch_window)
+            try:
+                self.flush()
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Error flushing tick batch: %s", exc, exc_info=True)
+
+    def flush(self) -> int:
+        """Write all queued ticks to Redis in one pipeline.
+
+        Every tick is appended to the tick log; the latest tick/price/volume
+        keys and the market:tick:{instrument} and market:tick messages are written
+        once per instrument (its newest tick). Each message holds a single tick, as
+        in unbatched mode, since the WebSocket gateway forwards them to clients as is.
+        Technical indicators are then updated once per instrument from the batch.
+
+        If the pipeline fails the ticks are re-queued ahead of newer ones (ticks
+        written before the failure may be logged twice) and the error is raised;
+        beyond ten full batches the oldest queued ticks are dropped and counted in
+        ticks_dropped.
+
+        Returns:
+            Number of ticks written
+        """
+        with self._flush_lock:
+            with self._batch_lock:
+                ticks, self._pending_ticks = self._pending_ticks, []
+                self._ticks_pending.clear()
+            if not ticks:
+                return 0
+
+            pipe = self.redis.pipeline(transaction=False)
+            latest: Dict[str, tuple] = {}
+            for tick in ticks:
+                ts_key = _iso(tick.timestamp)
+                payload_json = json.dumps(_serialize_tick(tick))
+                self._append_tick_log(pipe, tick, ts_key, payload_json)
+                latest[tick.instrument] = (tick, ts_key, payload_json)
+
+            for instrument, (tick, ts_key, payload_json) in latest.items():
+                pipe.setex(f"tick:{instrument}:latest", self._tick_ttl, payload_json)
+                pipe.setex(f"price:{instrument}:latest", self._price_ttl, str(tick.last_price))
+                pipe.setex(f"price:{instrument}:latest_ts", self._price_ttl, ts_key)
+                if tick.volume is not None:
+                    pipe.setex(f"volume:{instrument}:latest", self._price_ttl, str(tick.volume))
+                self._write_session_stats(pipe, instrument)
+                pipe.publish(f"market:tick:{instrument}", payload_json)
+                pipe.publish("market:tick", payload_json)
+            try:
+                pipe.execute()
+            except Exception:
+                self._stream_last_ids.clear()
+                self._requeue(ticks)
+                raise
+
+            by_instrument: Dict[str, List[MarketTick]] = {}
+            for tick in ticks:
+                by_instrument.setdefault(tick.instrument, []).append(tick)
+            for instrument, instrument_ticks in by_instrument.items():
+                self._update_indicators(instrument, instrument_ticks)
+            return len(ticks)
+
+    def _requeue(self, ticks: List[MarketTick]) -> None:
+        """Put the ticks of a failed flush back ahead of newer ones, dropping the oldest over the limit."""
+        with self._batch_lock:
+            pending = ticks + self._pending_ticks
+            dropped = max(len(pending) - self._max_pending_ticks, 0)
+            self._pending_ticks = pending[dropped:]
+            self.ticks_dropped += dropped
+            if self._pending_ticks:
+                self._ticks_pending.set()
+        if dropped:
+            logger.error("Tick batch write failed: dropped %d queued ticks (%d since start)",
+                         dropped, self.ticks_dropped)
+        else:
+            logger.warning("Tick batch write failed: re-queued %d ticks", len(ticks))
+
+    def close(self) -> None:
+        """Stop batching and flush queued ticks (also registered with atexit)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stopping.set()
+        self._ticks_pending.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=5)
+        if self._available:
+            try:
+                self.flush()
+            except Exception as exc:  # noqa: BLE001
+                lost = len(self._pending_ticks)
+                self._pending_ticks = []
+                self.ticks_dropped += lost
+                logger.error("Error flushing tick batch on shutdown, %d ticks lost: %s", lost, exc, exc_info=True)
+
     def _process_tick_for_ohlc(self, tick: MarketTick) -> None:
-        """Process tick through candle builder to generate OHLC bars."""
+        """Process tick through the multi-timeframe candle builder to generate OHLC bars."""
         try:
-            from ..adapters.candle_builder import CandleBuilder
-            
+            from ..adapters.candle_builder import MultiTimeframeCandleBuilder, DEFAULT_TIMEFRAMES
+
             instrument = tick.instrument
-            timeframe = "1min"  # Default timeframe for minute candles
-            
-            # Get or create candle builder for this instrument and timeframe
+
+            # Get or create candle builder for this instrument
             if instrument not in self._candle_builders:
-                self._candle_builders[instrument] = {}
-            
-            if timeframe not in self._candle_builders[instrument]:
-                # Create candle builder with callback to store OHLC bars
-                def on_candle_close(bar: OHLCBar):
-                    """Callback when candle closes - store it and update indicators."""
-                    try:
-                        self.store_ohlc(bar)
-                        # Also update technical indicators when candle closes
-                        if self._enable_technical_indicators and self._technical_service:
-                            candle_dict = {
-                                "open": bar.open,
-                                "high": bar.high,
-                                "low": bar.low,
-                                "close": bar.close,
-                                "volume": bar.volume or 0,
-                                "start_at": bar.start_at.isoformat(),
-                                "timestamp": bar.start_at.isoformat()
-                            }
-                            self._technical_service.update_candle(instrument, candle_dict)
-                    except Exception as e:
-                        logger.warning(f"Error in candle close callback: {e}")
-                
-                self._candle_builders[instrument][timeframe] = CandleBuilder(
-                    timeframe=timeframe,
-                    on_candle_close=on_candle_close
+                self._candle_builders[instrument] = MultiTimeframeCandleBuilder(
+                    timeframes=self._candle_timeframes or DEFAULT_TIMEFRAMES,
+                    on_candle_close=self._on_candle_close,
                 )
-            
-            # Process tick through candle builder
-            candle_builder = self._candle_builders[instrument][timeframe]
-            closed_bar = candle_builder.process_tick(tick)
-            # closed_bar is already stored via on_candle_close callback
-            
+
+            # Closed bars (any timeframe) are stored via the on_candle_close callback
+            self._candle_builders[instrument].process_tick(tick)
+
         except Exception as e:
             logger.debug(f"Error processing tick for OHLC: {e}")
 
+    def _on_candle_close(self, bar: OHLCBar) -> None:
+        """Callback when a candle of any timeframe closes - store it and update its indicators."""
+        try:
+            self.store_ohlc(bar)
+            # Also update the timeframe's technical indicators when candle closes
+            if self._enable_technical_indicators:
+                technical_service = self._get_technical_service(bar.timeframe)
+                if technical_service is None:
+                    return
+                candle_dict = {
+                    "open": bar.open,
+                    "high": bar.high,
+                    "low": bar.low,
+                    "close": bar.close,
+                    "volume": bar.volume or 0,
+                    "start_at": bar.start_at.isoformat(),
+                    "timestamp": bar.start_at.isoformat()
+                }
+                technical_service.update_candle(bar.instrument, candle_dict)
+        except Exception as e:
+            logger.warning(f"Error in candle close callback: {e}")
+
     def get_latest_tick(self, instrument: str) -> Optional[MarketTick]:
         if not self._available:
             return None
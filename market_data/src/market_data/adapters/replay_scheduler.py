@@ -0,0 +1,142 @@
+"""Event-time scheduler for paced historical replay.
+
+Each tick gets a wall-clock deadline of
+
+    start + (event time elapsed since the first tick) / speed
+
+and the scheduler sleeps until that deadline rather than a fixed interval, so
+bursts, lulls and session gaps keep their shape at any speed. Ticks due in the
+same millisecond (or already overdue) are emitted as one batch, which bounds
+the number of sleeps per second and lets 100x replays keep up.
+
+With skip_closed_hours, time outside market hours (weekday 09:15-15:30 IST) is
+removed from the event clock: overnight and weekend gaps replay instantly.
+Lateness (wall clock minus deadline when a batch is emitted) is tracked as
+drift.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from core_kernel.market_hours import IST, MARKET_CLOSE, MARKET_OPEN
+
+from ..contracts import MarketTick
+
+# Gaps up to this long are assumed to lie within market hours
+_INTRADAY_GAP_SECONDS = 60.0
+
+
+def _as_ist(timestamp: datetime) -> datetime:
+    return timestamp.replace(tzinfo=IST) if timestamp.tzinfo is None else timestamp.astimezone(IST)
+
+
+def trading_seconds_between(start: datetime, end: datetime) -> float:
+    """Seconds of [start, end) that fall within market hours (weekdays, IST)."""
+    start, end = _as_ist(start), _as_ist(end)
+    total = 0.0
+    day = start.date()
+    while day <= end.date():
+        if day.weekday() < 5:
+            session_open = datetime.combine(day, MARKET_OPEN, IST)
+            session_close = datetime.combine(day, MARKET_CLOSE, IST)
+            overlap = (min(end, session_close) - max(start, session_open)).total_seconds()
+            if overlap > 0:
+                total += overlap
+        day += timedelta(days=1)
+    return total
+
+
+class ReplayScheduler:
+    """Paces ticks on a wall clock scaled from their event timestamps."""
+
+    def __init__(
+        self,
+        speed: float,
+        skip_closed_hours: bool = True,
+        batch_window_ms: float = 1.0,
+        max_batch: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            speed: Replay speed (1.0 = real time, 10.0 = 10x); must be > 0
+            skip_closed_hours: Remove non-market hours from the event clock
+            batch_window_ms: Ticks whose deadlines fall within this window are one batch
+            max_batch: Upper bound on ticks per batch (keeps overdue replays responsive)
+            clock: Monotonic wall clock in seconds
+            sleep: Awaitable sleep (seconds)
+        """
+        if speed <= 0:
+            raise ValueError("ReplayScheduler speed must be > 0")
+        self.speed = speed
+        self.skip_closed_hours = skip_closed_hours
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max_batch
+        self._clock = clock
+        self._sleep = sleep
+
+        self._start_wall: Optional[float] = None
+        self._last_event: Optional[datetime] = None
+        self._event_elapsed = 0.0
+        self.batches = 0
+        self.ticks = 0
+        self.drift_last = 0.0
+        self.drift_max = 0.0
+        self._drift_total = 0.0
+
+    def _deadline(self, timestamp: datetime) -> float:
+        if self._start_wall is None:
+            self._start_wall = self._clock()
+        elif timestamp > self._last_event:
+            gap = (timestamp - self._last_event).total_seconds()
+            if self.skip_closed_hours and gap > _INTRADAY_GAP_SECONDS:
+                gap = trading_seconds_between(self._last_event, timestamp)
+            self._event_elapsed += gap
+        if self._last_event is None or timestamp > self._last_event:
+            self._last_event = timestamp
+        return self._start_wall + self._event_elapsed / self.speed
+
+    async def _wait(self, deadline: float) -> None:
+        delay = deadline - self._clock()
+        await self._sleep(delay if delay > 0 else 0)
+        drift = self._clock() - deadline
+        self.drift_last = drift
+        self.drift_max = max(self.drift_max, drift)
+        self._drift_total += drift
+        self.batches += 1
+
+    async def batches_of(self, ticks: Iterable[MarketTick]) -> AsyncIterator[List[MarketTick]]:
+        """Yield ticks in batches, each once its deadline is reached."""
+        batch: List[MarketTick] = []
+        batch_deadline = 0.0
+        for tick in ticks:
+            deadline = self._deadline(tick.timestamp)
+            if batch and (
+                len(batch) >= self.max_batch
+                or (deadline - batch_deadline >= self.batch_window and deadline > self._clock())
+            ):
+                await self._wait(batch_deadline)
+                self.ticks += len(batch)
+                yield batch
+                batch = []
+            if not batch:
+                batch_deadline = deadline
+            batch.append(tick)
+        if batch:
+            await self._wait(batch_deadline)
+            self.ticks += len(batch)
+            yield batch
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Batch counts and drift (lateness of emitted batches) in milliseconds."""
+        return {
+            "batches": self.batches,
+            "ticks": self.ticks,
+            "drift_ms_last": round(self.drift_last * 1000, 3),
+            "drift_ms_max": round(self.drift_max * 1000, 3),
+            "drift_ms_avg": round(self._drift_total * 1000 / self.batches, 3) if self.batches else 0.0,
+        }
@@ -0,0 +1,272 @@
+"""Local stand-in for the Kite ticker: replays archived ticks over a WebSocket.
+
+Speaks the same protocol TickerStreamIngestion expects (JSON subscribe/mode
+messages in, binary packet messages out, 1-byte heartbeats), so streaming
+ingestion can be exercised end to end without a broker connection.
+
+Pacing:
+    speed > 0   ticks follow their own timestamps scaled by speed (ReplayScheduler)
+    rate > 0    a fixed number of ticks per second, regardless of timestamps
+    neither     as fast as clients accept them
+
+Each batch of ticks due together goes out as one message per client, holding
+only the tokens that client subscribed to. Replay starts with the first
+subscription, so a client connecting right after start() sees every tick.
+
+Usage:
+    python -m market_data.adapters.ticker_feed_server --archive data/archive \\
+        --instruments BANKNIFTY=260105 --speed 60
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Set
+
+from ..contracts import MarketTick
+from .historical_tick_replayer import IST, ArchiveCandleTicks
+from .replay_scheduler import ReplayScheduler
+from .ticker_stream import MODES, PRICE_DIVISOR, encode_message, encode_packet, websockets
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = b"\x00"
+
+
+def archive_ticks(root: str, instruments: Iterable[str], start: Optional[date] = None,
+                  end: Optional[date] = None) -> Iterator[MarketTick]:
+    """Archived ticks for the instruments in time order (1min candles expanded where no ticks exist)."""
+    from .columnar_archive import ColumnarArchive
+
+    archive = ColumnarArchive(root)
+
+    def stream(instrument: str) -> Iterator[MarketTick]:
+        days = [day for day in archive.dates(instrument, "tick")
+                if (start is None or day >= start) and (end is None or day <= end)]
+        if days:
+            for day in days:
+                ticks = archive.load_ticks(instrument, day, day)
+                for ts, price, volume in zip((ticks["timestamp"] // 1_000_000_000).tolist(),
+                                             ticks["last_price"].tolist(), ticks["volume"].tolist()):
+                    yield MarketTick(instrument=instrument, timestamp=datetime.fromtimestamp(ts, tz=IST),
+                                     last_price=price, volume=int(volume) or None)
+            return
+        candle_ticks = ArchiveCandleTicks(archive, instrument, start, end)
+        if not candle_ticks.days:
+            logger.error(f"No archived ticks or 1min candles for {instrument} in {root}")
+        yield from candle_ticks
+
+    return heapq.merge(*(stream(instrument) for instrument in instruments), key=lambda tick: tick.timestamp)
+
+
+@dataclass
+class _Client:
+    ws: Any
+    tokens: Set[int] = field(default_factory=set)
+    mode: str = "quote"  # Kite's default mode for new subscriptions
+
+
+class TickerFeedServer:
+    """WebSocket server replaying MarketTicks as binary ticker packets."""
+
+    def __init__(
+        self,
+        ticks: Iterable[MarketTick],
+        tokens: Mapping[str, int],
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        speed: float = 0.0,
+        rate: float = 0.0,
+        rebase: bool = False,
+        heartbeat: float = 1.0,
+        max_batch: int = 1000,
+        divisor: float = PRICE_DIVISOR,
+    ):
+        """Initialize feed server.
+
+        Args:
+            ticks: Ticks to replay, in time order (e.g. archive_ticks(...))
+            tokens: Instrument name -> instrument token sent on the wire
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port; see url after start())
+            speed: Replay speed against tick timestamps (1.0 = real time)
+            rate: Fixed ticks per second (used when speed is 0)
+            rebase: Stamp packets with the send time instead of the archived time
+            heartbeat: Seconds between heartbeats (0 disables)
+            max_batch: Upper bound on ticks per message
+            divisor: Price multiplier used to encode prices as integers
+        """
+        self.ticks = ticks
+        self.tokens = dict(tokens)
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.rate = rate
+        self.rebase = rebase
+        self.heartbeat = heartbeat
+        self.max_batch = max_batch
+        self.divisor = divisor
+
+        self.clients: Dict[int, _Client] = {}
+        self.finished = asyncio.Event()
+        self._subscribed = asyncio.Event()
+        self._server = None
+        self._tasks: List[asyncio.Task] = []
+        self.ticks_sent = 0
+        self.messages_sent = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        """Listen for clients and start the replay; returns the server URL."""
+        if websockets is None:
+            raise RuntimeError("websockets is required for TickerFeedServer (pip install websockets)")
+        self._server = await websockets.serve(self._handle, self.host, self.port, max_size=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks.append(asyncio.create_task(self._replay()))
+        if self.heartbeat > 0:
+            self._tasks.append(asyncio.create_task(self._heartbeats()))
+        logger.info(f"Ticker feed server listening on {self.url}")
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop replaying and close every connection."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, ws, path: Optional[str] = None) -> None:
+        client = self.clients[id(ws)] = _Client(ws)
+        try:
+            async for message in ws:
+                if isinstance(message, str):
+                    self._on_request(client, message)
+        except Exception as e:
+            logger.debug(f"Ticker client disconnected: {e}")
+        finally:
+            self.clients.pop(id(ws), None)
+
+    def _on_request(self, client: _Client, message: str) -> None:
+        try:
+            request = json.loads(message)
+            action, value = request["a"], request["v"]
+            if action == "subscribe":
+                client.tokens.update(int(token) for token in value)
+                self._subscribed.set()
+            elif action == "unsubscribe":
+                client.tokens.difference_update(int(token) for token in value)
+            elif action == "mode" and value[0] in MODES:
+                client.mode = value[0]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            logger.warning(f"Ignoring malformed ticker request {message!r}: {e}")
+
+    async def _batches(self) -> AsyncIterator[List[MarketTick]]:
+        if self.speed > 0:
+            async for batch in ReplayScheduler(self.speed, max_batch=self.max_batch).batches_of(self.ticks):
+                yield batch
+            return
+        iterator = iter(self.ticks)
+        if self.rate <= 0:
+            while True:
+                batch = list(islice(iterator, self.max_batch))
+                if not batch:
+                    return
+                yield batch
+                await asyncio.sleep(0)
+        started = time.monotonic()
+        sent = 0
+        while True:
+            due = int((time.monotonic() - started) * self.rate) + 1 - sent
+            batch = list(islice(iterator, min(max(due, 1), self.max_batch)))
+            if not batch:
+                return
+            yield batch
+            sent += len(batch)
+            await asyncio.sleep(max(0.0, started + sent / self.rate - time.monotonic()))
+
+    async def _replay(self) -> None:
+        try:
+            await self._subscribed.wait()
+            async for batch in self._batches():
+                await self.broadcast(batch)
+            logger.info(f"Ticker feed replay complete: {self.ticks_sent} ticks in {self.messages_sent} messages")
+        finally:
+            self.finished.set()
+
+    async def broadcast(self, batch: List[MarketTick]) -> None:
+        """Send one batch to every client as a single message holding its subscribed tokens."""
+        sent_at = int(time.time()) if self.rebase else None
+        encoded: Dict[str, List[tuple]] = {}
+        sends = []
+        for client in list(self.clients.values()):
+            packets = encoded.get(client.mode)
+            if packets is None:
+                packets = encoded[client.mode] = [
+                    (token, encode_packet(token, tick.last_price, tick.volume,
+                                          sent_at or int(tick.timestamp.timestamp()), client.mode, self.divisor))
+                    for tick in batch for token in (self.tokens.get(tick.instrument),) if token is not None
+                ]
+            selected = [packet for token, packet in packets if token in client.tokens]
+            if selected:
+                sends.append(client.ws.send(encode_message(selected)))
+                self.ticks_sent += len(selected)
+        if sends:
+            self.messages_sent += len(sends)
+            await asyncio.gather(*sends, return_exceptions=True)
+
+    async def _heartbeats(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            await asyncio.gather(*(client.ws.send(HEARTBEAT) for client in list(self.clients.values())),
+                                 return_exceptions=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay archived ticks as a local Kite-style ticker feed")
+    parser.add_argument("--archive", required=True, help="ColumnarArchive root directory")
+    parser.add_argument("--instruments", required=True,
+                        help="Comma separated NAME=TOKEN pairs, e.g. BANKNIFTY=260105,NIFTY=256265")
+    parser.add_argument("--from-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--to-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay speed vs tick timestamps (0 = off)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Fixed ticks per second (0 = unpaced)")
+    parser.add_argument("--rebase", action="store_true", help="Stamp ticks with the send time")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    tokens = {name.strip(): int(token) for name, token in
+              (pair.split("=", 1) for pair in args.instruments.split(",") if pair.strip())}
+
+    async def serve() -> None:
+        server = TickerFeedServer(archive_ticks(args.archive, tokens, args.from_date, args.to_date), tokens,
+                                  host=args.host, port=args.port, speed=args.speed, rate=args.rate,
+                                  rebase=args.rebase)
+        await server.start()
+        try:
+            await asyncio.Future()  # serve until interrupted
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Streaming market ingestion from a Kite-ticker style binary WebSocket feed.
+
+Wire format (Kite Connect WebSocket v3, all integers big-endian):
+
+    message  = packet count (int16), then per packet: length (int16) + packet
+    packet   = instrument token (int32) followed by mode-specific fields;
+               prices are integers in paise (divide by 100)
+
+    length  8   ltp mode:   token, last price
+    length 28   index quote: token, ltp, high, low, open, close, change
+    length 32   index full:  index quote + exchange timestamp (epoch seconds)
+    length 44   quote mode: token, ltp, last qty, avg price, volume, buy qty,
+                            sell qty, open, high, low, close
+    length 184  full mode:  quote + last trade time, oi, oi high, oi low,
+                            exchange timestamp, 10 depth entries (12 bytes each)
+
+A 1-byte binary message is a heartbeat; text messages carry order updates and
+errors. Packets are decoded in place with precompiled ``struct.Struct``
+readers on a memoryview of the message - no per-packet slices or copies - and
+the message's ticks go into the market store in one call on a worker thread,
+so the store's blocking Redis writes never stall the event loop.
+
+``TickerStreamIngestion`` works against the real ticker (``kite_ticker_url``)
+or the local replay server in ``ticker_feed_server`` for broker-free testing.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import websockets  # type: ignore
+except ImportError:
+    websockets = None
+
+from ..contracts import MarketIngestion, MarketStore, MarketTick
+
+logger = logging.getLogger(__name__)
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+KITE_TICKER_URL = "wss://ws.kite.trade"
+MODES = ("ltp", "quote", "full")
+PRICE_DIVISOR = 100.0
+
+LTP_PACKET = 8
+INDEX_QUOTE_PACKET = 28
+INDEX_FULL_PACKET = 32
+QUOTE_PACKET = 44
+FULL_PACKET = 184
+DEPTH_LEVELS = 10
+
+_HEADER = struct.Struct(">H")
+_LTP = struct.Struct(">ii")            # token, last price
+_VOLUME = struct.Struct(">i")           # quote/full offset 16
+_TIMESTAMP = struct.Struct(">i")        # index full offset 28, full offset 60
+_QUOTE = struct.Struct(">11i")
+_FULL_EXTRA = struct.Struct(">5i")      # last trade time, oi, oi high, oi low, exchange timestamp
+_DEPTH = struct.Struct(">iihxx")        # quantity, price, orders, padding
+
+# (token, last price, cumulative day volume or None, exchange epoch seconds or None)
+Packet = Tuple[int, float, Optional[int], Optional[int]]
+
+
+def kite_ticker_url(api_key: str, access_token: str) -> str:
+    return f"{KITE_TICKER_URL}?api_key={api_key}&access_token={access_token}"
+
+
+def iter_packets(message: bytes, divisor: float = PRICE_DIVISOR) -> Iterator[Packet]:
+    """Decode the packets of one binary ticker message without copying them.
+
+    Unknown packet lengths are skipped; a truncated trailing packet ends the message.
+    """
+    view = memoryview(message)
+    size = len(view)
+    if size < 2:
+        return  # heartbeat
+    count, = _HEADER.unpack_from(view, 0)
+    offset = 2
+    for _ in range(count):
+        if offset + 2 > size:
+            return
+        length, = _HEADER.unpack_from(view, offset)
+        offset += 2
+        if offset + length > size:
+            logger.warning(f"Truncated ticker packet ({length} bytes at offset {offset} of {size})")
+            return
+        if length >= LTP_PACKET:
+            token, price = _LTP.unpack_from(view, offset)
+            if length >= QUOTE_PACKET:
+                volume, = _VOLUME.unpack_from(view, offset + 16)
+                exchange_ts = _TIMESTAMP.unpack_from(view, offset + 60)[0] if length >= FULL_PACKET else None
+                yield token, price / divisor, volume, exchange_ts
+            elif length == INDEX_FULL_PACKET:
+                yield token, price / divisor, None, _TIMESTAMP.unpack_from(view, offset + 28)[0]
+            else:
+                yield token, price / divisor, None, None
+        offset += length
+
+
+def encode_packet(token: int, last_price: float, volume: Optional[int] = None,
+                  exchange_ts: Optional[int] = None, mode: str = "full",
+                  divisor: float = PRICE_DIVISOR) -> bytes:
+    """Encode one tradable-instrument packet in the given mode.
+
+    Fields a MarketTick does not carry (OHLC, quantities, OI, depth) are zero.
+    """
+    price = int(round(last_price * divisor))
+    if mode == "ltp":
+        return _LTP.pack(token, price)
+    quote = _QUOTE.pack(token, price, 0, 0, int(volume or 0), 0, 0, 0, 0, 0, 0)
+    if mode == "quote":
+        return quote
+    ts = int(exchange_ts or 0)
+    return quote + _FULL_EXTRA.pack(ts, 0, 0, 0, ts) + bytes(_DEPTH.size * DEPTH_LEVELS)
+
+
+def encode_message(packets: Sequence[bytes]) -> bytes:
+    """Frame encoded packets as one binary ticker message."""
+    parts: List[bytes] = [_HEADER.pack(len(packets))]
+    for packet in packets:
+        parts.append(_HEADER.pack(len(packet)))
+        parts.append(packet)
+    return b"".join(parts)
+
+
+class TickerStreamIngestion(MarketIngestion):
+    """Consumes a binary ticker WebSocket and stores every decoded tick."""
+
+    def __init__(
+        self,
+        store: Optional[MarketStore] = None,
+        url: Optional[str] = None,
+        instruments: Optional[Mapping[int, str]] = None,
+        mode: str = "full",
+        divisor: float = PRICE_DIVISOR,
+        on_tick_callback: Optional[Callable[[MarketTick], Any]] = None,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        """Initialize streaming ingestion.
+
+        Args:
+            store: Market store receiving ticks
+            url: WebSocket URL (default: TICKER_URL env, e.g. ws://127.0.0.1:8765
+                 for the local feed server, or kite_ticker_url(...) for Kite)
+            instruments: Instrument token -> instrument name stored on ticks
+            mode: Subscription mode: "ltp", "quote" (adds volume) or "full" (adds exchange time)
+            divisor: Price divisor (100 for paise; 10000000 for currency segments)
+            on_tick_callback: Called with each stored tick (sync or async)
+            reconnect_delay: Initial delay before reconnecting, doubled per failure
+            max_reconnect_delay: Upper bound on the reconnect delay
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown ticker mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.store = store
+        self.url = url or os.getenv("TICKER_URL", "ws://127.0.0.1:8765")
+        self.instruments: Dict[int, str] = dict(instruments or {})
+        self.mode = mode
+        self.divisor = divisor
+        self.on_tick_callback = on_tick_callback
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.running = False
+        self.connected = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.messages_received = 0
+        self.ticks_received = 0
+        self.unknown_packets = 0
+        self.reconnects = 0
+
+    def bind_store(self, store: MarketStore) -> None:
+        """Bind market store."""
+        self.store = store
+
+    def start(self) -> None:
+        """Connect and stream ticks on a background task (reconnecting until stopped)."""
+        if websockets is None:
+            raise RuntimeError("websockets is required for TickerStreamIngestion (pip install websockets)")
+        if self.running:
+            logger.warning("Ticker stream already running")
+            return
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+        logger.info(f"Started ticker stream ingestion ({len(self.instruments)} instruments, mode={self.mode})")
+
+    def stop(self) -> None:
+        """Stop streaming and close the connection."""
+        self.running = False
+        if self.task:
+            self.task.cancel()
+        logger.info("Stopped ticker stream ingestion")
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        try:
+            while self.running:
+                try:
+                    async with websockets.connect(self.url, max_size=None) as ws:
+                        await self._subscribe(ws)
+                        self.connected.set()
+                        delay = self.reconnect_delay
+                        async for message in ws:
+                            await self.on_message(message)
+                    logger.warning("Ticker connection closed by server")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Ticker connection error: {e}")
+                self.connected.clear()
+                if not self.running:
+                    break
+                self.reconnects += 1
+                logger.info(f"Reconnecting to ticker in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+        except asyncio.CancelledError:
+            logger.info("Ticker stream cancelled")
+        finally:
+            self.connected.clear()
+            self.running = False
+
+    async def _subscribe(self, ws) -> None:
+        tokens = list(self.instruments)
+        await ws.send(json.dumps({"a": "subscribe", "v": tokens}))
+        await ws.send(json.dumps({"a": "mode", "v": [self.mode, tokens]}))
+
+    async def on_message(self, message: Any) -> int:
+        """Store the ticks of one message; returns how many were stored."""
+        if isinstance(message, str):
+            logger.info(f"Ticker message: {message}")
+            return 0
+        if len(message) < 2:
+            return 0  # heartbeat
+        self.messages_received += 1
+        received_at = None
+        ticks: List[MarketTick] = []
+        instruments = self.instruments
+        for token, price, volume, exchange_ts in iter_packets(message, self.divisor):
+            instrument = instruments.get(token)
+            if instrument is None:
+                self.unknown_packets += 1
+                continue
+            if exchange_ts:
+                timestamp = datetime.fromtimestamp(exchange_ts, tz=IST)
+            else:
+                if received_at is None:
+                    received_at = datetime.now(IST)
+                timestamp = received_at
+            ticks.append(MarketTick(instrument=instrument, timestamp=timestamp, last_price=price,
+                                    volume=volume if volume else None))
+        if not ticks:
+            return 0
+        # Messages are awaited in order, so ticks still reach the store in feed order
+        await asyncio.to_thread(self._store_ticks, ticks)
+        if self.on_tick_callback:
+            for tick in ticks:
+                try:
+                    result = self.on_tick_callback(tick)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Error in tick callback: {e}")
+        self.ticks_received += len(ticks)
+        return len(ticks)
+
+    def _store_ticks(self, ticks: List[MarketTick]) -> None:
+        for tick in ticks:
+            self.store.store_tick(tick)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "url": self.url.split("?")[0],
+            "connected": self.connected.is_set(),
+            "messages_received": self.messages_received,
+            "ticks_received": self.ticks_received,
+            "unknown_packets": self.unknown_packets,
+            "reconnects": self.reconnects,
+        }
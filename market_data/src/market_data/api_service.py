@@ -9,6 +9,7 @@ This provides HTTP endpoints for:
 
 from __future__ import annotations
 
+import asyncio
 import os
 import sys
 from datetime import datetime, timedelta, timezone
@@ -18,6 +19,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+import numpy as np
 import redis
 
 # Add parent directory to path for config
@@ -30,11 +32,16 @@ IST = timezone(timedelta(hours=5, minutes=30))
 from .api import build_store
 from .adapters.mock_options_chain import MockOptionsChainAdapter
 from .contracts import MarketTick, OHLCBar, OptionsData, MarketStore
+from .depth_history import DepthHistory, depth_key, read_depth_snapshot
+from .options_analytics import OIReference, OptionChainArrays
+from .options_chain_cache import OptionsChainCache
+from .options_greeks import chain_greeks, years_to_expiry
 try:
-    from .technical_indicators_service import TechnicalIndicatorsService
+    from .technical_indicators_service import TechnicalIndicatorsService, read_indicators_snapshot
 except ImportError:
     # Fallback if technical indicators service is not available
     TechnicalIndicatorsService = None
+    read_indicators_snapshot = None
 
 # Socket.IO removed - real-time updates now handled by Redis WebSocket Gateway
 # See redis_ws_gateway module for direct Redis pub/sub to WebSocket forwarding
@@ -79,6 +86,7 @@ class OptionsChainResponse(BaseModel):
     futures_price: Optional[float] = None
     pcr: Optional[float] = None
     max_pain: Optional[int] = None
+    analytics: Optional[Dict[str, Any]] = None
 
 
 class TechnicalIndicatorsResponse(BaseModel):
@@ -109,6 +117,18 @@ async def lifespan(app: FastAPI):
         
         # Try to initialize options client (non-blocking)
         get_options_client()
+
+        # Keep recently requested options chains fresh during market hours
+        refresh_interval = float(os.getenv("OPTIONS_CHAIN_REFRESH_INTERVAL", "3"))
+        if refresh_interval > 0:
+            global _options_refresh_task
+            _options_refresh_task = asyncio.create_task(get_options_chain_cache().run_refresh(refresh_interval))
+
+        # Publish the changed cells of tick-driven option chains on options:chain:{instrument}:{expiry}
+        delta_interval = float(os.getenv("OPTIONS_LIVE_DELTA_INTERVAL", "1"))
+        if delta_interval > 0:
+            global _options_delta_task
+            _options_delta_task = asyncio.create_task(_publish_live_chain_deltas(delta_interval))
         
         # Socket.IO removed - real-time updates now handled by Redis WebSocket Gateway
         # Market Data API now focuses on REST endpoints only
@@ -122,6 +142,12 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         print("Market Data API: Starting cleanup...")
+        if _options_refresh_task is not None:
+            _options_refresh_task.cancel()
+        if _options_delta_task is not None:
+            _options_delta_task.cancel()
+        if isinstance(_options_client, MockOptionsChainAdapter):
+            _options_client.drop_live_chain()
         # Socket.IO removed - no cleanup needed
 
 
@@ -147,6 +173,13 @@ _store: Optional[MarketStore] = None
 _options_client: Optional[OptionsData] = None
 _redis_client: Optional[redis.Redis] = None
 _technical_service: Optional[TechnicalIndicatorsService] = None
+_options_client_ready = False
+_options_chain_cache: Optional[OptionsChainCache] = None
+_options_refresh_task: Optional[asyncio.Task] = None
+_options_delta_task: Optional[asyncio.Task] = None
+# Reference snapshots per (instrument, expiry) for change in OI: "session" (first snapshot of the
+# IST day) or a look-back in seconds
+_oi_reference = OIReference(os.getenv("OPTIONS_OI_CHANGE_REFERENCE", "session"))
 
 # Socket.IO removed - real-time updates now handled by Redis WebSocket Gateway
 
@@ -505,8 +538,51 @@ async def get_market_overview(symbol: str = "BANKNIFTY"):
 
 
 @app.get("/api/v1/options/chain/{instrument}", response_model=OptionsChainResponse)
-async def get_options_chain(instrument: str):
-    """Get options chain for an instrument."""
+async def get_options_chain(instrument: str, expiry: Optional[str] = None):
+    """Get options chain for an instrument (nearest expiry unless one is given).
+
+    Served from the snapshot cache: at most one fetch per instrument/expiry is
+    in flight, and snapshots are reused for OPTIONS_CHAIN_CACHE_TTL seconds.
+    """
+    try:
+        return await get_options_chain_cache().get(instrument, expiry)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def get_options_chain_cache() -> OptionsChainCache:
+    """Get the options chain snapshot cache."""
+    global _options_chain_cache
+    if _options_chain_cache is None:
+        _options_chain_cache = OptionsChainCache(
+            _build_options_chain,
+            ttl=float(os.getenv("OPTIONS_CHAIN_CACHE_TTL", "5")),
+        )
+    return _options_chain_cache
+
+
+def _live_chain_enabled(options_client: OptionsData) -> bool:
+    """Live (not replay) Zerodha chains are fed from option ticks unless OPTIONS_LIVE_CHAIN=0."""
+    return (isinstance(options_client, MockOptionsChainAdapter) and options_client.use_live_quotes
+            and os.getenv("OPTIONS_LIVE_CHAIN", "1").lower() in ("1", "true", "yes"))
+
+
+async def _publish_live_chain_deltas(interval: float) -> None:
+    """Publish pending live chain changes every ``interval`` seconds (until cancelled)."""
+    while True:
+        await asyncio.sleep(interval)
+        if isinstance(_options_client, MockOptionsChainAdapter):
+            try:
+                _options_client.publish_live_deltas(get_redis_client())
+            except Exception as e:
+                print(f"Market Data API: Live option chain delta publish failed: {e}")
+
+
+async def _build_options_chain(instrument: str, expiry: Optional[str] = None) -> OptionsChainResponse:
+    """Fetch and enrich one options chain snapshot (quotes, analytics, IV/Greeks, futures price)."""
+    global _options_client_ready
     try:
         # Try to get or initialize options client
         options_client = get_options_client()
@@ -522,8 +598,17 @@ async def get_options_chain(instrument: str):
                 )
             )
         
-        await options_client.initialize()
-        chain = await options_client.fetch_options_chain(instrument=instrument)
+        if not _options_client_ready:
+            await options_client.initialize()
+            _options_client_ready = True
+        if _live_chain_enabled(options_client):
+            # Keep this expiry in memory from streamed option ticks; the adapter polls the
+            # broker instead whenever the chain has had no quote for OPTIONS_LIVE_CHAIN_MAX_AGE
+            try:
+                await options_client.start_live_feed(get_redis_client(), instrument, expiry)
+            except Exception as e:
+                print(f"Market Data API: Live option chain unavailable for {instrument}: {e}")
+        chain = await options_client.fetch_options_chain(instrument=instrument, expiry=expiry)
 
         # Ensure expiry is a string
         expiry_str = chain.get("expiry", "")
@@ -534,70 +619,36 @@ async def get_options_chain(instrument: str):
         strikes_raw = chain.get("strikes", [])
         normalized_strikes = []
         
-        total_put_oi = 0
-        total_call_oi = 0
-        
         for strike_data in strikes_raw:
             ce_data = strike_data.get("CE")
             pe_data = strike_data.get("PE")
             
-            # Extract CE data
-            ce_ltp = ce_data.get("last_price") if ce_data else None
-            ce_oi = ce_data.get("oi", 0) if ce_data else 0
-            ce_volume = ce_data.get("volume", 0) if ce_data else 0
-            ce_iv = None  # IV not available from basic LTP/quote
-            
-            # Extract PE data
-            pe_ltp = pe_data.get("last_price") if pe_data else None
-            pe_oi = pe_data.get("oi", 0) if pe_data else 0
-            pe_volume = pe_data.get("volume", 0) if pe_data else 0
-            pe_iv = None  # IV not available from basic LTP/quote
-            
-            # Accumulate OI for PCR calculation
-            total_call_oi += ce_oi or 0
-            total_put_oi += pe_oi or 0
-            
             normalized_strike = {
                 "strike": strike_data.get("strike"),
-                "ce_ltp": ce_ltp,
-                "ce_oi": ce_oi,
-                "ce_volume": ce_volume,
-                "ce_iv": ce_iv,
-                "pe_ltp": pe_ltp,
-                "pe_oi": pe_oi,
-                "pe_volume": pe_volume,
-                "pe_iv": pe_iv,
+                "ce_ltp": ce_data.get("last_price") if ce_data else None,
+                "ce_oi": ce_data.get("oi", 0) if ce_data else 0,
+                "ce_volume": ce_data.get("volume", 0) if ce_data else 0,
+                "ce_iv": None,  # filled from the Black-76 solver below
+                "pe_ltp": pe_data.get("last_price") if pe_data else None,
+                "pe_oi": pe_data.get("oi", 0) if pe_data else 0,
+                "pe_volume": pe_data.get("volume", 0) if pe_data else 0,
+                "pe_iv": None,
             }
             normalized_strikes.append(normalized_strike)
         
-        # Calculate PCR (Put/Call Ratio)
-        pcr = (total_put_oi / total_call_oi) if total_call_oi > 0 else None
-        
-        # Calculate Max Pain (strike with minimum total value of open interest)
-        max_pain = None
-        min_pain_value = float('inf')
-        
-        for strike_data in strikes_raw:
-            strike_price = strike_data.get("strike")
-            
-            # Calculate pain value: sum of (strike - price) * OI for calls below strike
-            # and (price - strike) * OI for puts above strike
-            pain_value = 0
-            for s in strikes_raw:
-                s_price = s.get("strike")
-                s_ce_oi = s.get("CE", {}).get("oi", 0) or 0
-                s_pe_oi = s.get("PE", {}).get("oi", 0) or 0
-                
-                if s_price < strike_price:
-                    # Call options ITM
-                    pain_value += (strike_price - s_price) * s_ce_oi
-                elif s_price > strike_price:
-                    # Put options ITM
-                    pain_value += (s_price - strike_price) * s_pe_oi
-            
-            if pain_value < min_pain_value:
-                min_pain_value = pain_value
-                max_pain = strike_price
+        # PCR, max pain (O(n) prefix sums), OI walls and change in OI since the reference snapshot
+        arrays = OptionChainArrays.from_strikes(normalized_strikes)
+        previous, reference = _oi_reference.update((instrument.upper(), expiry_str), arrays)
+        analytics = arrays.summary(previous=previous)
+        analytics["oi_change_reference"] = reference
+        change = arrays.change_in_oi(previous)
+        by_strike = dict(zip(arrays.strike.tolist(), zip(change["ce"].tolist(), change["pe"].tolist())))
+        for row in normalized_strikes:
+            ce_change, pe_change = by_strike.get(row["strike"], (None, None))
+            row["ce_oi_change"] = ce_change
+            row["pe_oi_change"] = pe_change
+        pcr = analytics["pcr"]
+        max_pain = int(analytics["max_pain"]) if analytics["max_pain"] is not None else None
         
         # Fetch futures price
         futures_price = None
@@ -634,6 +685,20 @@ async def get_options_chain(instrument: str):
             # Futures price is optional, log debug only
             pass  # futures_price remains None
 
+        # Implied volatility (%) and Greeks for every strike in one vectorized solve;
+        # without a futures quote the forward comes from put-call parity
+        if expiry_str and len(arrays):
+            rate = float(os.getenv("OPTIONS_RISK_FREE_RATE", "0.065"))
+            solved = chain_greeks(arrays, years_to_expiry(expiry_str, datetime.now(IST)),
+                                  forward=futures_price, rate=rate)
+            columns = {name: [None if np.isnan(v) else round(float(v), 6) for v in values]
+                       for name, values in solved.items()}
+            row_of = {strike: i for i, strike in enumerate(arrays.strike.tolist())}
+            for row in normalized_strikes:
+                i = row_of.get(row["strike"])
+                if i is not None:
+                    row.update({name: values[i] for name, values in columns.items()})
+
         return OptionsChainResponse(
             instrument=instrument.upper(),
             expiry=expiry_str,
@@ -641,7 +706,8 @@ async def get_options_chain(instrument: str):
             timestamp=datetime.now(IST).isoformat(),
             futures_price=futures_price,
             pcr=pcr,
-            max_pain=max_pain
+            max_pain=max_pain,
+            analytics=analytics
         )
     except HTTPException:
         raise
@@ -668,17 +734,27 @@ async def get_technical_indicators(
                 detail="Technical indicators service not initialized"
             )
 
-        # Try to get from Redis cache first
+        # Try to get from Redis cache first: one HGETALL of the snapshot hash
         redis_client = get_redis_client()
-        key_prefix = f"indicators:{instrument.upper()}:"
+        timeframe_key = timeframe.lower()
+        if timeframe_key == "minute":
+            timeframe_key = "1min"
+        elif timeframe_key.endswith("minute"):
+            timeframe_key = f"{timeframe_key.replace('minute', '').strip()}min"
         indicators_dict = {}
-        for key in redis_client.scan_iter(match=f"{key_prefix}*"):
-            indicator_name = key.replace(key_prefix, "")
-            value = redis_client.get(key)
-            try:
-                indicators_dict[indicator_name] = float(value) if value else None
-            except (ValueError, TypeError):
-                indicators_dict[indicator_name] = value
+        if read_indicators_snapshot is not None:
+            indicators_dict = read_indicators_snapshot(redis_client, instrument.upper(), timeframe_key)
+
+        # Legacy per-field keys (writers running with INDICATORS_LEGACY_KEYS)
+        if not indicators_dict:
+            key_prefix = f"indicators:{instrument.upper()}:"
+            for key in redis_client.scan_iter(match=f"{key_prefix}*"):
+                indicator_name = key.replace(key_prefix, "")
+                value = redis_client.get(key)
+                try:
+                    indicators_dict[indicator_name] = float(value) if value else None
+                except (ValueError, TypeError):
+                    indicators_dict[indicator_name] = value
 
         # If no cached indicators, try to calculate from OHLC data
         if not indicators_dict and _technical_service is not None:
@@ -906,8 +982,16 @@ async def get_market_depth(instrument: str):
         sell_depth = None
         timestamp = None
         
-        # Find the data
+        # Find the data: packed snapshot (one read, never torn) first, then legacy per-field keys
         for key_var in key_variations:
+            snapshot = read_depth_snapshot(redis_client, key_var)
+            if snapshot:
+                fields = ("price", "quantity", "orders")
+                buy_depth = [dict(zip(fields, level)) for level in snapshot["buy"]]
+                sell_depth = [dict(zip(fields, level)) for level in snapshot["sell"]]
+                timestamp = snapshot["ts"]
+                break
+
             buy_key = f"depth:{key_var}:buy"
             sell_key = f"depth:{key_var}:sell"
             ts_key = f"depth:{key_var}:timestamp"
@@ -968,6 +1052,37 @@ async def get_market_depth(instrument: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/v1/market/depth/{instrument}/history")
+async def get_market_depth_history(instrument: str, window: int = 60):
+    """Rolling order-flow metrics over the last `window` depth snapshots."""
+    try:
+        redis_client = get_redis_client()
+        key = depth_key(instrument)
+        history = DepthHistory.load(redis_client, key, window)
+        if not len(history):
+            alias = key.replace("BANKNIFTY", "NIFTYBANK") if "BANKNIFTY" in key else key.replace("NIFTYBANK", "BANKNIFTY")
+            history = DepthHistory.load(redis_client, alias, window)
+        if not len(history):
+            raise HTTPException(status_code=404, detail=f"No depth history for {instrument}")
+
+        imbalance = history.book_imbalance()
+        ofi = history.order_flow_imbalance()
+        return {
+            "instrument": instrument.upper(),
+            "snapshots": len(history),
+            "from": datetime.fromtimestamp(history.timestamp[0], IST).isoformat(),
+            "to": datetime.fromtimestamp(history.timestamp[-1], IST).isoformat(),
+            "book_imbalance": None if np.isnan(imbalance[-1]) else round(float(imbalance[-1]), 4),
+            "book_imbalance_avg": None if np.isnan(imbalance).all() else round(float(np.nanmean(imbalance)), 4),
+            "order_flow_imbalance": float(ofi.sum()),
+            "order_flow_imbalance_series": ofi.tolist(),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Socket.IO removed - real-time updates now handled by Redis WebSocket Gateway
 # Export the FastAPI app directly (no Socket.IO wrapping)
 main_app = app
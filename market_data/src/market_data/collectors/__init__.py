@@ -2,6 +2,7 @@
 
 from .ltp_collector import LTPDataCollector, build_kite_client
 from .depth_collector import DepthCollector
+from .quote_poller import QuotePoller
 
-__all__ = ["LTPDataCollector", "DepthCollector", "build_kite_client"]
+__all__ = ["LTPDataCollector", "DepthCollector", "QuotePoller", "build_kite_client"]
 
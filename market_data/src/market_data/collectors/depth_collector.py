@@ -8,22 +8,25 @@ Environment Variables:
     INSTRUMENT_EXCHANGE: e.g., "NSE", "BSE", "BINANCE"
     REDIS_HOST: Redis server host (default: localhost)
     REDIS_PORT: Redis server port (default: 6379)
+    DEPTH_HISTORY_LENGTH: Snapshots kept per instrument in depth:{key}:history (default: 300)
     KITE_API_KEY: Zerodha API key
     KITE_ACCESS_TOKEN: Zerodha access token
 """
-import json
 import os
 import redis
 import sys
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 try:
     from kiteconnect import KiteConnect
 except ImportError:
     KiteConnect = None
 
+from market_data.depth_history import DEFAULT_HISTORY_LENGTH, pack_depth, write_depth_snapshot
+from market_data.instrument_master import get_instrument_master
+
 try:
     from market_data.tools.kite_auth import CredentialsValidator
 except ImportError:
@@ -60,46 +63,8 @@ def get_banknifty_futures_symbol(kite, exchange: str = "NFO") -> Optional[str]:
         Trading symbol like "BANKNIFTY26JAN2026FUT" or None if not found
     """
     try:
-        # Get all NFO instruments
-        instruments = kite.instruments(exchange)
-        
-        # Filter for BANKNIFTY futures
-        from datetime import datetime
-        today = datetime.now()
-        
-        banknifty_futures = [
-            inst for inst in instruments
-            if inst.get("name") == "BANKNIFTY"
-            and inst.get("instrument_type") == "FUT"
-            and inst.get("expiry")
-        ]
-        
-        if not banknifty_futures:
-            return None
-        
-        # Sort by expiry date and get the nearest (current/next expiry)
-        def get_expiry_date(inst):
-            expiry_str = inst.get("expiry", "")
-            try:
-                return datetime.strptime(expiry_str, "%Y-%m-%d")
-            except:
-                return datetime.max
-        
-        banknifty_futures.sort(key=get_expiry_date)
-        
-        # Get the nearest expiry that's not expired
-        for fut in banknifty_futures:
-            expiry_date = get_expiry_date(fut)
-            if expiry_date >= today:
-                trading_symbol = fut.get("tradingsymbol")
-                if trading_symbol:
-                    return trading_symbol
-        
-        # If all are expired, return the most recent one anyway
-        if banknifty_futures:
-            return banknifty_futures[0].get("tradingsymbol")
-        
-        return None
+        future = get_instrument_master(kite).nearest_future("BANKNIFTY", exchange=exchange)
+        return future.get("tradingsymbol") if future else None
     except Exception as e:
         print(f"[depth] Error getting BANKNIFTY futures: {e}", file=sys.stderr)
         return None
@@ -108,14 +73,17 @@ def get_banknifty_futures_symbol(kite, exchange: str = "NFO") -> Optional[str]:
 class DepthCollector:
     """Collects and stores market depth data for any instrument."""
     
-    def __init__(self, kite: Optional[Any] = None, redis_client: Optional[redis.Redis] = None):
+    def __init__(self, kite: Optional[Any] = None, redis_client: Optional[redis.Redis] = None,
+                 history_length: int = DEFAULT_HISTORY_LENGTH):
         """Initialize depth collector.
         
         Args:
             kite: KiteConnect instance (optional, will build from env if None)
             redis_client: Redis client (optional, will build from env if None)
+            history_length: Snapshots kept in the depth:{key}:history ring (0 disables)
         """
         self.kite = kite
+        self.history_length = history_length
         self.exchange, self.symbol = get_symbol_config()
         self.full_symbol = f"{self.exchange}:{self.symbol}"
         self.key = sanitize_key(self.symbol)
@@ -132,98 +100,89 @@ class DepthCollector:
         else:
             self.r = redis_client
     
+    def _kite_instance(self) -> Any:
+        # Get the actual KiteConnect instance (might be wrapped in provider)
+        if hasattr(self.kite, 'kite'):
+            return self.kite.kite
+        return self.kite
+
+    def depth_symbols(self) -> List[str]:
+        """Symbols to quote for depth, most likely first.
+
+        Indices have no depth, so for an NSE index the nearest futures contract
+        (looked up at most once an hour) is used instead.
+        """
+        # Check if we're trying to get depth for an index (which doesn't have depth)
+        # If so, automatically switch to the futures contract
+        symbol_upper = self.symbol.upper()
+        is_index = symbol_upper in ["BANKNIFTY", "NIFTY BANK", "NIFTYBANK", "NIFTY", "NIFTY 50"]
+        
+        # If it's an index, get the futures contract instead
+        if is_index and self.exchange == "NSE":
+            # Cache futures symbol lookup (refresh every hour)
+            current_time = time.time()
+            if (self._futures_symbol is None or 
+                self._futures_symbol_cache_time is None or 
+                (current_time - self._futures_symbol_cache_time) > 3600):
+                
+                futures_symbol = get_banknifty_futures_symbol(self._kite_instance(), "NFO")
+                if futures_symbol:
+                    self._futures_symbol = futures_symbol
+                    self._futures_symbol_cache_time = current_time
+                    print(f"[depth] Using BANKNIFTY futures {futures_symbol} for depth data (index doesn't have depth)")
+                else:
+                    print(f"[depth] Warning: Could not find BANKNIFTY futures contract, trying index anyway")
+            
+            if self._futures_symbol:
+                depth_symbol = f"NFO:{self._futures_symbol}"
+            else:
+                depth_symbol = f"{self.exchange}:NIFTY BANK"
+        else:
+            # Use the configured symbol
+            normalized_symbol = self.symbol
+            if normalized_symbol.upper() == "BANKNIFTY":
+                normalized_symbol = "NIFTY BANK"
+            elif normalized_symbol.upper() == "NIFTYBANK":
+                normalized_symbol = "NIFTY BANK"
+            elif normalized_symbol.upper() == "NIFTY":
+                normalized_symbol = "NIFTY 50"
+            
+            depth_symbol = f"{self.exchange}:{normalized_symbol}"
+
+        # Alternative symbol formats
+        return list(dict.fromkeys([depth_symbol, "NSE:NIFTY BANK", f"NSE:{self.symbol}", self.symbol]))
+
     def collect_once(self) -> None:
         """Collect and store depth data once."""
         try:
             if not self.kite:
                 raise ValueError("Kite client required for live depth data")
             
-            # Check if we're trying to get depth for an index (which doesn't have depth)
-            # If so, automatically switch to the futures contract
-            symbol_upper = self.symbol.upper()
-            is_index = symbol_upper in ["BANKNIFTY", "NIFTY BANK", "NIFTYBANK", "NIFTY", "NIFTY 50"]
-            
-            # If it's an index, get the futures contract instead
-            if is_index and self.exchange == "NSE":
-                # Cache futures symbol lookup (refresh every hour)
-                current_time = time.time()
-                if (self._futures_symbol is None or 
-                    self._futures_symbol_cache_time is None or 
-                    (current_time - self._futures_symbol_cache_time) > 3600):
-                    
-                    # Get the actual KiteConnect instance (might be wrapped in provider)
-                    kite_instance = self.kite
-                    if hasattr(self.kite, 'kite'):
-                        kite_instance = self.kite.kite
-                    
-                    futures_symbol = get_banknifty_futures_symbol(kite_instance, "NFO")
-                    if futures_symbol:
-                        self._futures_symbol = futures_symbol
-                        self._futures_symbol_cache_time = current_time
-                        print(f"[depth] Using BANKNIFTY futures {futures_symbol} for depth data (index doesn't have depth)")
-                    else:
-                        print(f"[depth] Warning: Could not find BANKNIFTY futures contract, trying index anyway")
-                        depth_symbol = f"{self.exchange}:NIFTY BANK"
-                
-                if self._futures_symbol:
-                    depth_symbol = f"NFO:{self._futures_symbol}"
-                else:
-                    depth_symbol = f"{self.exchange}:NIFTY BANK"
-            else:
-                # Use the configured symbol
-                normalized_symbol = self.symbol
-                if normalized_symbol.upper() == "BANKNIFTY":
-                    normalized_symbol = "NIFTY BANK"
-                elif normalized_symbol.upper() == "NIFTYBANK":
-                    normalized_symbol = "NIFTY BANK"
-                elif normalized_symbol.upper() == "NIFTY":
-                    normalized_symbol = "NIFTY 50"
-                
-                depth_symbol = f"{self.exchange}:{normalized_symbol}"
-            
             # Fetch quote with depth
             q = None
-            try:
-                # Get the actual KiteConnect instance (might be wrapped in provider)
-                kite_instance = self.kite
-                if hasattr(self.kite, 'kite'):
-                    kite_instance = self.kite.kite
-                
-                quotes = kite_instance.quote([depth_symbol])
-                if quotes and len(quotes) > 0:
-                    q = list(quotes.values())[0]
-                else:
-                    raise ValueError(f"No quote data returned for {depth_symbol}")
-            except (IndexError, KeyError, ValueError) as e:
-                # Try alternative symbol formats
-                alt_symbols = [
-                    depth_symbol,
-                    f"NSE:NIFTY BANK",
-                    f"NSE:{self.symbol}",
-                    self.symbol,
-                ]
-                
-                kite_instance = self.kite
-                if hasattr(self.kite, 'kite'):
-                    kite_instance = self.kite.kite
-                
-                for alt_symbol in alt_symbols:
-                    try:
-                        quotes = kite_instance.quote([alt_symbol])
-                        if quotes and len(quotes) > 0:
-                            q = list(quotes.values())[0]
-                            break
-                    except:
-                        continue
+            kite_instance = self._kite_instance()
+            for candidate in self.depth_symbols():
+                try:
+                    quotes = kite_instance.quote([candidate])
+                    if quotes and len(quotes) > 0:
+                        q = list(quotes.values())[0]
+                        break
+                except Exception:
+                    continue
             
             # Check if we got a quote
             if q is None:
                 # All attempts failed
                 print(f"[depth] Warning: Could not fetch depth for {self.full_symbol} (tried: NSE:NIFTY BANK, {self.exchange}:{self.symbol}, and alternatives)")
-                buy_depth = []
-                sell_depth = []
                 return
-            
+
+            self.write_depth(q)
+        except Exception as e:
+            print(f"[depth] Error collecting depth for {self.full_symbol}: {e}", file=sys.stderr)
+
+    def write_depth(self, q: Any) -> None:
+        """Store the top bid/ask levels of one quote in Redis."""
+        try:
             # KiteConnect quote() returns a dict-like object or dict
             # The depth data can be accessed in multiple ways depending on the response format
             buy_depth = []
@@ -245,15 +204,15 @@ class DepthCollector:
                 if isinstance(depth_data, dict):
                     buy_depth = depth_data.get('buy', [])
                     sell_depth = depth_data.get('sell', [])
-                # If depth_data is an object with buy/sell attributes
-                elif hasattr(depth_data, 'buy') and hasattr(depth_data, 'sell'):
-                    buy_depth = list(depth_data.buy) if depth_data.buy else []
-                    sell_depth = list(depth_data.sell) if depth_data.sell else []
-                # If depth_data has to_dict method
+                # If depth_data has to_dict method (provider Depth: levels become plain dicts)
                 elif hasattr(depth_data, 'to_dict'):
                     depth_dict = depth_data.to_dict()
                     buy_depth = depth_dict.get('buy', [])
                     sell_depth = depth_dict.get('sell', [])
+                # If depth_data is an object with buy/sell attributes
+                elif hasattr(depth_data, 'buy') and hasattr(depth_data, 'sell'):
+                    buy_depth = list(depth_data.buy) if depth_data.buy else []
+                    sell_depth = list(depth_data.sell) if depth_data.sell else []
             
             # If still no depth data, check if market is open and depth is available
             if not buy_depth and not sell_depth:
@@ -269,21 +228,12 @@ class DepthCollector:
                     print(f"[depth] Info: Depth data not available for {self.full_symbol} (normal for indices or outside market hours)")
                 return
             
-            # Store in Redis
-            timestamp = datetime.now().isoformat()
-            self.r.set(f"depth:{self.key}:buy", json.dumps(buy_depth))
-            self.r.set(f"depth:{self.key}:sell", json.dumps(sell_depth))
-            self.r.set(f"depth:{self.key}:timestamp", timestamp)
-            
-            # Calculate depth stats
-            total_bid_qty = sum(level.get('quantity', 0) for level in buy_depth)
-            total_ask_qty = sum(level.get('quantity', 0) for level in sell_depth)
-            
-            self.r.set(f"depth:{self.key}:total_bid_qty", total_bid_qty)
-            self.r.set(f"depth:{self.key}:total_ask_qty", total_ask_qty)
+            # Store in Redis: packed snapshot, history ring and legacy keys in one transaction
+            snapshot = pack_depth(buy_depth, sell_depth, datetime.now())
+            write_depth_snapshot(self.r, self.key, snapshot, self.history_length)
             
-            print(f"[depth] {self.full_symbol} - {len(buy_depth)} bids ({total_bid_qty}), "
-                  f"{len(sell_depth)} asks ({total_ask_qty})")
+            print(f"[depth] {self.full_symbol} - {len(buy_depth)} bids ({snapshot['tbq']}), "
+                  f"{len(sell_depth)} asks ({snapshot['taq']})")
         
         except Exception as e:
             print(f"[depth] Error collecting depth for {self.full_symbol}: {e}", file=sys.stderr)
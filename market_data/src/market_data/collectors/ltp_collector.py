@@ -4,7 +4,7 @@ import random
 import sys
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 try:
     import pytz
@@ -118,6 +118,14 @@ def get_symbol_config():
         return exchange, symbol
 
 
+def now_ist() -> datetime:
+    """Current IST time as a naive datetime (UTC if pytz is unavailable)."""
+    if pytz:
+        ist = pytz.timezone('Asia/Kolkata')
+        return datetime.now(ist).replace(tzinfo=None)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 def sanitize_key(symbol: str) -> str:
     return symbol.upper().replace(" ", "")
 
@@ -143,48 +151,40 @@ class LTPDataCollector:
             }
             self.r = redis.Redis(**redis_config)
 
+    def quote_symbols(self) -> List[str]:
+        """Symbol spellings to quote, most likely first (BANKNIFTY -> NSE:NIFTY BANK)."""
+        # Normalize symbol: BANKNIFTY -> NIFTY BANK (Zerodha format)
+        normalized_symbol = self.symbol
+        if normalized_symbol.upper() == "BANKNIFTY":
+            normalized_symbol = "NIFTY BANK"
+        elif normalized_symbol.upper() == "NIFTYBANK":
+            normalized_symbol = "NIFTY BANK"
+        elif normalized_symbol.upper() == "NIFTY":
+            normalized_symbol = "NIFTY 50"
+
+        candidates = [
+            f"{self.exchange}:{normalized_symbol}",  # Primary format: NSE:NIFTY BANK
+            f"NSE:{normalized_symbol}",
+            f"NSE:{self.symbol}",  # Original symbol
+            f"NFO:{normalized_symbol}",
+            normalized_symbol,  # Just symbol without exchange
+            self.symbol,  # Original symbol without exchange
+        ]
+        return list(dict.fromkeys(candidates))
+
     def fetch_quote(self) -> Any:
         if self.kite:
-            # Normalize symbol: BANKNIFTY -> NIFTY BANK (Zerodha format)
-            normalized_symbol = self.symbol
-            if normalized_symbol.upper() == "BANKNIFTY":
-                normalized_symbol = "NIFTY BANK"
-            elif normalized_symbol.upper() == "NIFTYBANK":
-                normalized_symbol = "NIFTY BANK"
-            elif normalized_symbol.upper() == "NIFTY":
-                normalized_symbol = "NIFTY 50"
-            
-            try:
-                # Try primary format: NSE:NIFTY BANK
-                primary_symbol = f"{self.exchange}:{normalized_symbol}"
-                quotes = self.kite.quote([primary_symbol])
-                if quotes and len(quotes) > 0:
-                    q = list(quotes.values())[0]
-                    return q
-            except (IndexError, KeyError, ValueError) as e:
-                pass
-            
-            # Try alternative symbol formats
-            alt_symbols = [
-                f"NSE:{normalized_symbol}",
-                f"NSE:{self.symbol}",  # Original symbol
-                f"NFO:{normalized_symbol}",
-                normalized_symbol,  # Just symbol without exchange
-                self.symbol,  # Original symbol without exchange
-            ]
-            
-            for alt_symbol in alt_symbols:
+            for candidate in self.quote_symbols():
                 try:
-                    quotes = self.kite.quote([alt_symbol])
+                    quotes = self.kite.quote([candidate])
                     if quotes and len(quotes) > 0:
                         q = list(quotes.values())[0]
                         return q
-                except:
+                except Exception:
                     continue
             
             # All attempts failed
             raise ValueError(f"Could not fetch quote for {self.exchange}:{self.symbol} (tried: NSE:NIFTY BANK, {self.exchange}:{self.symbol}, and alternatives)")
-            return q
         # synthetic fallback
         self.drift += random.uniform(-5, 5)
         self.price = max(1.0, self.price + self.drift)
@@ -203,12 +203,12 @@ class LTPDataCollector:
             return {"last_price": self.price, "depth": {}}
 
     def collect_once(self) -> None:
-        if pytz:
-            ist = pytz.timezone('Asia/Kolkata')
-            ts = datetime.now(ist).replace(tzinfo=None)
-        else:
-            ts = datetime.now(timezone.utc).replace(tzinfo=None)
-        quote = self.fetch_quote()
+        self.write_quote(self.fetch_quote())
+
+    def write_quote(self, quote: Any, ts: Optional[datetime] = None) -> None:
+        """Store one quote as the latest tick (market store and direct Redis keys)."""
+        if ts is None:
+            ts = now_ist()
         qd = self._quote_to_dict(quote)
         price = float(qd.get("last_price") or qd.get("last") or self.price)
         depth = qd.get("depth") or {}
@@ -0,0 +1,194 @@
+"""Batched quote polling for a whole watchlist - one broker call per cycle.
+
+Replaces the separate LTP and depth collector processes with one loop:
+symbols are resolved once (every spelling of every unresolved entry goes out
+in a single quote() call), then each cycle quotes the whole watchlist in as
+few quote() calls as the broker's per-request limit allows and fans each
+quote out to its writers:
+
+    LTP    LTPDataCollector.write_quote (market store tick + latest price keys)
+    depth  DepthCollector.write_depth (depth:{key}:* keys)
+    store  MarketTick into the market store for extra watchlist symbols
+
+An entry whose symbol stops appearing in responses (e.g. an expired futures
+contract) is resolved again on the next cycle.
+
+Environment Variables:
+    QUOTE_WATCHLIST: extra "EXCHANGE:SYMBOL" entries, comma separated
+    QUOTE_BATCH_SIZE: symbols per quote() call (default: 500, Kite's limit)
+    QUOTE_POLL_INTERVAL: seconds between cycle starts (default: 2.0)
+"""
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .depth_collector import DepthCollector
+from .ltp_collector import LTPDataCollector, build_kite_client, now_ist
+
+KITE_QUOTE_LIMIT = 500
+
+
+@dataclass
+class WatchEntry:
+    """One watched instrument: how to spell it and where its quotes go."""
+
+    name: str
+    candidates: Callable[[], List[str]]
+    writers: List[Callable[[Any, datetime], None]]
+    symbol: Optional[str] = None  # resolved spelling
+
+
+class QuotePoller:
+    """Polls a watchlist with batched quote() calls and fans quotes out to writers."""
+
+    def __init__(self, kite: Any, ltp: Optional[LTPDataCollector] = None,
+                 depth: Optional[DepthCollector] = None, store: Any = None,
+                 watchlist: Iterable[str] = (), batch_size: int = KITE_QUOTE_LIMIT):
+        """Initialize quote poller.
+
+        Args:
+            kite: Provider or KiteConnect client with quote(symbols)
+            ltp: LTP collector whose write_quote receives the underlying's quote
+            depth: Depth collector whose write_depth receives the depth instrument's quote
+            store: MarketStore receiving ticks for the extra watchlist symbols
+            watchlist: Extra "EXCHANGE:SYMBOL" entries written to the store
+            batch_size: Maximum symbols per quote() call
+        """
+        self.kite = kite
+        self.ltp = ltp
+        self.batch_size = max(1, int(batch_size))
+        self.entries: List[WatchEntry] = []
+        self.api_calls = 0
+        if ltp is not None:
+            self.entries.append(WatchEntry("ltp", ltp.quote_symbols, [ltp.write_quote]))
+        if depth is not None:
+            self.entries.append(WatchEntry("depth", depth.depth_symbols, [lambda q, ts: depth.write_depth(q)]))
+        if store is not None:
+            for symbol in watchlist:
+                self.entries.append(WatchEntry(symbol, lambda symbol=symbol: [symbol],
+                                               [self._store_writer(store, symbol)]))
+
+    @staticmethod
+    def _store_writer(store: Any, symbol: str) -> Callable[[Any, datetime], None]:
+        from ..contracts import MarketTick
+
+        instrument = symbol.split(":")[-1]
+
+        def write(quote: Any, ts: datetime) -> None:
+            data = quote.to_dict() if hasattr(quote, "to_dict") else quote
+            price = data.get("last_price")
+            if price is None:
+                return
+            volume = data.get("volume")
+            store.store_tick(MarketTick(instrument=instrument, timestamp=ts, last_price=float(price),
+                                        volume=int(volume) if volume else None))
+
+        return write
+
+    def _quote(self, symbols: List[str], split_failed: bool = False) -> Dict[str, Any]:
+        """Quote symbols in batches of at most batch_size.
+
+        A failed batch is skipped, or with split_failed quoted one symbol at a
+        time (a single malformed spelling can fail a whole request).
+        """
+        quotes: Dict[str, Any] = {}
+        for i in range(0, len(symbols), self.batch_size):
+            batch = symbols[i:i + self.batch_size]
+            self.api_calls += 1
+            try:
+                quotes.update(self.kite.quote(batch) or {})
+            except Exception as e:
+                if split_failed and len(batch) > 1:
+                    for symbol in batch:
+                        quotes.update(self._quote([symbol]))
+                else:
+                    print(f"[quotes] quote() failed for {len(batch)} symbols: {e}", file=sys.stderr)
+        return quotes
+
+    def poll_once(self) -> int:
+        """Quote the whole watchlist and run every writer; returns the number of entries written."""
+        ts = now_ist()
+        if not self.kite:
+            # Synthetic fallback lives in the LTP collector
+            if self.ltp is not None:
+                self.ltp.collect_once()
+                return 1
+            return 0
+
+        quotes: Dict[str, Any] = {}
+        unresolved = [entry for entry in self.entries if entry.symbol is None]
+        if unresolved:
+            # All spellings of all unresolved entries in one call; the first one present wins
+            candidates = {entry.name: entry.candidates() for entry in unresolved}
+            quotes = self._quote(list(dict.fromkeys(s for names in candidates.values() for s in names)),
+                                 split_failed=True)
+            for entry in unresolved:
+                entry.symbol = next((s for s in candidates[entry.name] if s in quotes), None)
+                if entry.symbol is None:
+                    print(f"[quotes] Could not resolve {entry.name} (tried: {', '.join(candidates[entry.name])})",
+                          file=sys.stderr)
+
+        pending = list(dict.fromkeys(entry.symbol for entry in self.entries
+                                     if entry.symbol is not None and entry.symbol not in quotes))
+        if pending:
+            quotes.update(self._quote(pending))
+
+        written = 0
+        for entry in self.entries:
+            if entry.symbol is None:
+                continue
+            quote = quotes.get(entry.symbol)
+            if quote is None:
+                entry.symbol = None  # resolve again next cycle
+                continue
+            for writer in entry.writers:
+                try:
+                    writer(quote, ts)
+                except Exception as e:
+                    print(f"[quotes] {entry.name} writer failed for {entry.symbol}: {e}", file=sys.stderr)
+            written += 1
+        return written
+
+    def run_forever(self, interval: float = 2.0) -> None:
+        """Poll every `interval` seconds, measured between cycle starts."""
+        print(f"[quotes] Polling {len(self.entries)} watchlist entries every {interval}s")
+        next_at = time.monotonic()
+        while True:
+            try:
+                self.poll_once()
+            except KeyboardInterrupt:
+                print("\n[quotes] Stopped by user")
+                break
+            except Exception as e:
+                print(f"[quotes] Unexpected error: {e}", file=sys.stderr)
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_at = time.monotonic()  # fell behind: do not burst to catch up
+
+
+def main():
+    """Standalone entrypoint: one process for LTP, depth and watchlist quotes."""
+    kite = build_kite_client()
+    store = None
+    depth = None
+    ltp = LTPDataCollector(kite, market_memory=None)
+    if ltp.r is not None:
+        from ..api import build_store
+        store = build_store(redis_client=ltp.r)
+        ltp.market_memory = store
+        if kite:
+            depth = DepthCollector(kite=kite, redis_client=ltp.r)
+    watchlist = [s.strip() for s in os.getenv("QUOTE_WATCHLIST", "").split(",") if s.strip()]
+    poller = QuotePoller(kite, ltp=ltp, depth=depth, store=store, watchlist=watchlist,
+                         batch_size=int(os.getenv("QUOTE_BATCH_SIZE", str(KITE_QUOTE_LIMIT))))
+    poller.run_forever(interval=float(os.getenv("QUOTE_POLL_INTERVAL", "2.0")))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Lightweight contracts for NIFTY/BANKNIFTY data handling."""
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, Optional, Protocol
+from typing import Iterable, List, Optional, Protocol
 
 
 @dataclass
@@ -50,6 +50,15 @@ class MarketStore(Protocol):
     def get_latest_tick(self, instrument: str) -> Optional[MarketTick]:
         ...
 
+    def get_ticks(
+        self,
+        instrument: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        count: Optional[int] = None,
+    ) -> List[MarketTick]:
+        ...
+
     def store_ohlc(self, bar: OHLCBar) -> None:
         ...
 
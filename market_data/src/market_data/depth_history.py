@@ -0,0 +1,163 @@
+"""Packed market depth snapshots with a bounded per-instrument history ring.
+
+Each depth update is written in one MULTI/EXEC pipeline, so readers never
+see a torn book:
+
+    depth:{key}:snapshot   latest packed snapshot (one GET for the whole book)
+    depth:{key}:history    newest-first list of the last N packed snapshots
+    depth:{key}:buy|sell|timestamp|total_bid_qty|total_ask_qty
+                           legacy per-field keys, written in the same transaction
+
+A packed snapshot is compact JSON:
+
+    {"t": epoch seconds, "ts": ISO time, "buy": [[price, qty, orders], ...],
+     "sell": [...], "tbq": total bid qty, "taq": total ask qty}
+
+``DepthHistory`` reads a window of the ring with one LRANGE and exposes it as
+NumPy arrays for rolling order-flow imbalance, book imbalance and slippage,
+plus the window summaries LiquidityFilter reports (average_slippage,
+order_flow_signal).
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_HISTORY_LENGTH = int(os.getenv("DEPTH_HISTORY_LENGTH", "300"))
+
+
+def depth_key(symbol: str) -> str:
+    """Redis-safe depth key for a symbol (same rules as the depth collector)."""
+    return symbol.upper().replace(" ", "").replace("-", "_").replace(":", "_")
+
+
+def _level(level: Any) -> List[float]:
+    if isinstance(level, Mapping):
+        return [level.get("price", 0) or 0, level.get("quantity", 0) or 0, level.get("orders", 0) or 0]
+    return [getattr(level, "price", 0) or 0, getattr(level, "quantity", 0) or 0, getattr(level, "orders", 0) or 0]
+
+
+def pack_depth(buy: Iterable[Any], sell: Iterable[Any], timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+    """Pack bid/ask levels (dicts or objects with price/quantity/orders) into a snapshot."""
+    timestamp = timestamp or datetime.now()
+    bids = [_level(level) for level in buy]
+    asks = [_level(level) for level in sell]
+    return {
+        "t": timestamp.timestamp(),
+        "ts": timestamp.isoformat(),
+        "buy": bids,
+        "sell": asks,
+        "tbq": sum(level[1] for level in bids),
+        "taq": sum(level[1] for level in asks),
+    }
+
+
+def write_depth_snapshot(redis_client, key: str, snapshot: Mapping[str, Any],
+                         history_length: int = DEFAULT_HISTORY_LENGTH, legacy_keys: bool = True) -> None:
+    """Write one packed snapshot, its ring entry and (optionally) the legacy keys atomically."""
+    packed = json.dumps(snapshot, separators=(",", ":"))
+    prefix = f"depth:{key}"
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.set(f"{prefix}:snapshot", packed)
+    if history_length > 0:
+        pipe.lpush(f"{prefix}:history", packed)
+        pipe.ltrim(f"{prefix}:history", 0, history_length - 1)
+    if legacy_keys:
+        fields = ("price", "quantity", "orders")
+        pipe.set(f"{prefix}:buy", json.dumps([dict(zip(fields, level)) for level in snapshot["buy"]]))
+        pipe.set(f"{prefix}:sell", json.dumps([dict(zip(fields, level)) for level in snapshot["sell"]]))
+        pipe.set(f"{prefix}:timestamp", snapshot["ts"])
+        pipe.set(f"{prefix}:total_bid_qty", snapshot["tbq"])
+        pipe.set(f"{prefix}:total_ask_qty", snapshot["taq"])
+    pipe.execute()
+
+
+def read_depth_snapshot(redis_client, key: str) -> Optional[Dict[str, Any]]:
+    """Latest packed snapshot for a depth key, or None."""
+    raw = redis_client.get(f"depth:{key}:snapshot")
+    return json.loads(raw) if raw else None
+
+
+class DepthHistory:
+    """A window of depth snapshots, oldest first, as level arrays (NaN/0 padded to `levels`)."""
+
+    def __init__(self, snapshots: Sequence[Mapping[str, Any]], levels: int = 5):
+        n = len(snapshots)
+        self.timestamp = np.array([s.get("t", np.nan) for s in snapshots], dtype=np.float64)
+        self.bid_price = np.full((n, levels), np.nan)
+        self.bid_qty = np.zeros((n, levels))
+        self.ask_price = np.full((n, levels), np.nan)
+        self.ask_qty = np.zeros((n, levels))
+        for i, snapshot in enumerate(snapshots):
+            for side, price, qty in (("buy", self.bid_price, self.bid_qty), ("sell", self.ask_price, self.ask_qty)):
+                book = snapshot.get(side) or []
+                for j, level in enumerate(book[:levels]):
+                    price[i, j], qty[i, j] = level[0], level[1]
+
+    @classmethod
+    def load(cls, redis_client, key: str, window: Optional[int] = None, levels: int = 5) -> "DepthHistory":
+        """Read the last `window` snapshots (all when None) with one LRANGE."""
+        raw = redis_client.lrange(f"depth:{key}:history", 0, -1 if window is None else window - 1)
+        return cls([json.loads(item) for item in reversed(raw)], levels)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def book_imbalance(self) -> np.ndarray:
+        """Per snapshot total bid / (bid + ask) quantity (0.5 = balanced, NaN for an empty book)."""
+        bid = self.bid_qty.sum(axis=1)
+        total = bid + self.ask_qty.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, bid / total, np.nan)
+
+    def order_flow_imbalance(self) -> np.ndarray:
+        """Best-level order flow imbalance between consecutive snapshots (Cont, Kukanov & Stoikov).
+
+        Positive values mean net buying pressure; one value per snapshot after the first.
+        """
+        bp, bq = self.bid_price[:, 0], self.bid_qty[:, 0]
+        ap, aq = self.ask_price[:, 0], self.ask_qty[:, 0]
+        bid_flow = np.where(bp[1:] >= bp[:-1], bq[1:], 0.0) - np.where(bp[1:] <= bp[:-1], bq[:-1], 0.0)
+        ask_flow = np.where(ap[1:] <= ap[:-1], aq[1:], 0.0) - np.where(ap[1:] >= ap[:-1], aq[:-1], 0.0)
+        return bid_flow - ask_flow
+
+    def slippage(self, side: str, quantity: float) -> np.ndarray:
+        """Per snapshot |average fill price - best price| for a market order (NaN where depth is too thin)."""
+        buying = side.upper() == "BUY"
+        price = self.ask_price if buying else self.bid_price
+        qty = self.ask_qty if buying else self.bid_qty
+        # Quantity taken from each level: what is left of the order, capped by the level size
+        filled_before = np.concatenate([np.zeros((len(qty), 1)), np.cumsum(qty, axis=1)[:, :-1]], axis=1)
+        take = np.clip(quantity - filled_before, 0.0, qty)
+        cost = np.nansum(take * np.nan_to_num(price), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = np.abs(cost / quantity - price[:, 0])
+        result[take.sum(axis=1) < quantity] = np.nan
+        return result
+
+    def average_slippage(self, side: str, quantity: float) -> Optional[float]:
+        """Mean slippage over the snapshots deep enough to fill `quantity` (None if none are)."""
+        slippage = self.slippage(side, quantity)
+        return None if np.isnan(slippage).all() else float(np.nanmean(slippage))
+
+    def order_flow_signal(self) -> Dict[str, Any]:
+        """Net order flow imbalance and mean book imbalance over the window, with a pressure signal.
+
+        BUY_PRESSURE needs net buying flow and a bid-heavy book, SELL_PRESSURE the
+        opposite; NO_DATA with fewer than two snapshots.
+        """
+        if len(self) < 2:
+            return {"signal": "NO_DATA"}
+        ofi = float(self.order_flow_imbalance().sum())
+        imbalance = self.book_imbalance()
+        book_imbalance = 0.5 if np.isnan(imbalance).all() else float(np.nanmean(imbalance))
+        if ofi > 0 and book_imbalance > 0.5:
+            signal = "BUY_PRESSURE"
+        elif ofi < 0 and book_imbalance < 0.5:
+            signal = "SELL_PRESSURE"
+        else:
+            signal = "BALANCED"
+        return {"signal": signal, "ofi": ofi, "book_imbalance": book_imbalance, "snapshots": len(self)}
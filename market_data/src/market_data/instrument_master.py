@@ -0,0 +1,282 @@
+"""Shared instrument master: kite.instruments() once per exchange per trading day.
+
+The full NSE/NFO instrument lists are tens of thousands of rows. The master
+downloads each exchange at most once per session date, persists it as a
+gzipped columnar JSON file, and builds indexes so lookups are dict reads:
+
+    by tradingsymbol / name (per exchange), by instrument_token,
+    by contract (name, expiry, strike, instrument_type),
+    sorted expiries per (name, "FUT" | "OPT"), sorted strikes per (name, expiry),
+    option chain rows per (name, expiry) ordered by strike then type.
+
+Layout:
+    {cache_dir}/instruments_{EXCHANGE}_{YYYY-MM-DD}.json.gz
+
+Use get_instrument_master(kite) to share one master per Kite client across
+collectors and adapters. The cache directory is INSTRUMENT_CACHE_DIR (relative
+paths resolve against the market_data project directory, not the working
+directory), defaulting to market_data/data/instruments; set it empty to keep
+the master in memory only.
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+import weakref
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from core_kernel.market_hours import get_session_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGES = ("NSE", "NFO")
+OPTION_TYPES = ("CE", "PE")
+
+# market_data project directory (src/market_data/ -> market_data/)
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = "data/instruments"
+
+Instrument = Dict[str, Any]
+ContractKey = Tuple[str, date, float, str]
+
+
+def parse_expiry(value) -> Optional[date]:
+    """Expiry as a date (Kite returns dates; cached files and mocks use ISO strings)."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _normalize(row: Instrument, exchange: str) -> Instrument:
+    row = dict(row)
+    row["expiry"] = parse_expiry(row.get("expiry"))
+    row["strike"] = float(row.get("strike") or 0.0)
+    if not row.get("exchange"):
+        row["exchange"] = exchange
+    return row
+
+
+class InstrumentMaster:
+    """Indexed instrument lists for a Kite client, refreshed per trading day."""
+
+    def __init__(self, kite=None, cache_dir: Optional[Union[str, Path]] = None):
+        """Initialize instrument master.
+
+        Args:
+            kite: KiteConnect-like client with instruments(exchange)
+            cache_dir: Directory for the daily instrument files (None = memory only)
+        """
+        self.kite = kite
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._lock = threading.RLock()
+        self._loaded: Dict[str, date] = {}
+        self._rows: Dict[str, List[Instrument]] = {}
+        self._reset_indexes()
+
+    def _reset_indexes(self) -> None:
+        self._by_symbol: Dict[str, Dict[str, Instrument]] = defaultdict(dict)
+        self._by_name: Dict[str, Dict[str, Instrument]] = defaultdict(dict)
+        self._by_token: Dict[int, Instrument] = {}
+        self._by_contract: Dict[ContractKey, Instrument] = {}
+        self._expiries: Dict[Tuple[str, str], List[date]] = defaultdict(list)
+        self._strikes: Dict[Tuple[str, date], List[float]] = defaultdict(list)
+        self._chains: Dict[Tuple[str, date], List[Instrument]] = defaultdict(list)
+
+    # ------------------------------------------------------------------ loading
+
+    def _cache_path(self, exchange: str, session: date) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"instruments_{exchange}_{session.isoformat()}.json.gz"
+
+    def _read_cache(self, path: Path) -> Optional[List[Instrument]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable instrument cache {path}: {e}")
+            return None
+        columns = payload["columns"]
+        return [dict(zip(columns, values)) for values in payload["rows"]]
+
+    def _write_cache(self, path: Path, rows: List[Instrument]) -> None:
+        columns = sorted({key for row in rows for key in row})
+        payload = {
+            "columns": columns,
+            "rows": [
+                [value.isoformat() if isinstance(value, (date, datetime)) else value
+                 for value in (row.get(column) for column in columns)]
+                for row in rows
+            ],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"), default=str)
+        os.replace(tmp, path)
+
+    def load(self, exchange: str, now: Optional[datetime] = None) -> List[Instrument]:
+        """Instruments of an exchange for the current session (cached file, else download)."""
+        session = get_session_date(now)
+        with self._lock:
+            if self._loaded.get(exchange) == session:
+                return self._rows[exchange]
+
+            path = self._cache_path(exchange, session)
+            rows = self._read_cache(path) if path else None
+            if rows is None:
+                if self.kite is None:
+                    logger.warning(f"No kite client to download {exchange} instruments")
+                    rows = []
+                else:
+                    rows = [_normalize(row, exchange) for row in self.kite.instruments(exchange) or []]
+                    logger.info(f"Downloaded {len(rows)} {exchange} instruments")
+                    if path:
+                        try:
+                            self._write_cache(path, rows)
+                        except OSError as e:
+                            logger.warning(f"Could not write instrument cache {path}: {e}")
+
+            self._rows[exchange] = [_normalize(row, exchange) for row in rows]
+            self._loaded[exchange] = session
+            self._rebuild_indexes()
+            return self._rows[exchange]
+
+    def _rebuild_indexes(self) -> None:
+        self._reset_indexes()
+        expiries = defaultdict(set)
+        strikes = defaultdict(set)
+        for exchange, rows in self._rows.items():
+            for row in rows:
+                self._index(exchange, row, expiries, strikes)
+        self._expiries.update((key, sorted(values)) for key, values in expiries.items())
+        self._strikes.update((key, sorted(values)) for key, values in strikes.items())
+        for chain in self._chains.values():
+            chain.sort(key=lambda row: (row["strike"], row.get("instrument_type")))
+
+    def _index(self, exchange: str, row: Instrument, expiries, strikes) -> None:
+        symbol = row.get("tradingsymbol")
+        if symbol:
+            self._by_symbol[exchange].setdefault(symbol, row)
+        name = row.get("name")
+        if name:
+            self._by_name[exchange].setdefault(name, row)
+        token = row.get("instrument_token")
+        if token is not None:
+            self._by_token[int(token)] = row
+
+        expiry = row["expiry"]
+        instrument_type = row.get("instrument_type")
+        if not (name and expiry and instrument_type in ("FUT",) + OPTION_TYPES):
+            return
+        strike = row["strike"]
+        self._by_contract.setdefault((name, expiry, strike, instrument_type), row)
+        if instrument_type == "FUT":
+            expiries[(name, "FUT")].add(expiry)
+        else:
+            expiries[(name, "OPT")].add(expiry)
+            strikes[(name, expiry)].add(strike)
+            self._chains[(name, expiry)].append(row)
+
+    def _ensure(self, exchanges: Iterable[str]) -> None:
+        for exchange in exchanges:
+            self.load(exchange)
+
+    # ------------------------------------------------------------------ lookups
+
+    def by_symbol(self, tradingsymbol: str, exchange: str = "NSE") -> Optional[Instrument]:
+        self._ensure([exchange])
+        return self._by_symbol[exchange].get(tradingsymbol)
+
+    def by_name(self, name: str, exchange: str = "NSE") -> Optional[Instrument]:
+        self._ensure([exchange])
+        return self._by_name[exchange].get(name)
+
+    def by_token(self, instrument_token: int, exchanges: Iterable[str] = DEFAULT_EXCHANGES) -> Optional[Instrument]:
+        self._ensure(exchanges)
+        return self._by_token.get(int(instrument_token))
+
+    def contract(self, name: str, expiry: Union[date, str], strike: float, instrument_type: str,
+                 exchange: str = "NFO") -> Optional[Instrument]:
+        """Derivative contract by (name, expiry, strike, type); futures use strike 0."""
+        self._ensure([exchange])
+        return self._by_contract.get((name, parse_expiry(expiry), float(strike), instrument_type))
+
+    def expiries(self, name: str, kind: str = "OPT", exchange: str = "NFO",
+                 from_date: Optional[date] = None) -> List[date]:
+        """Sorted expiries of an underlying's options ("OPT") or futures ("FUT")."""
+        self._ensure([exchange])
+        expiries = self._expiries.get((name, kind), [])
+        if from_date is not None:
+            expiries = [expiry for expiry in expiries if expiry >= from_date]
+        return list(expiries)
+
+    def strikes(self, name: str, expiry: Union[date, str], exchange: str = "NFO") -> List[float]:
+        """Sorted option strikes for an underlying and expiry."""
+        self._ensure([exchange])
+        return list(self._strikes.get((name, parse_expiry(expiry)), []))
+
+    def option_chain(self, name: str, expiry: Union[date, str], exchange: str = "NFO") -> List[Instrument]:
+        """Option rows for an underlying and expiry, by strike then CE/PE."""
+        self._ensure([exchange])
+        return list(self._chains.get((name, parse_expiry(expiry)), []))
+
+    def options(self, name: str, exchange: str = "NFO") -> List[Instrument]:
+        """All option rows for an underlying, by expiry, strike and type."""
+        return [row for expiry in self.expiries(name, "OPT", exchange)
+                for row in self._chains.get((name, expiry), [])]
+
+    def nearest_future(self, name: str, on: Optional[date] = None, exchange: str = "NFO") -> Optional[Instrument]:
+        """Nearest unexpired future of an underlying (latest expiry if all have expired)."""
+        expiries = self.expiries(name, "FUT", exchange)
+        if not expiries:
+            return None
+        on = on or get_session_date()
+        expiry = next((expiry for expiry in expiries if expiry >= on), expiries[-1])
+        return self._by_contract.get((name, expiry, 0.0, "FUT"))
+
+    def token_for(self, instrument_symbol: str) -> Optional[int]:
+        """Instrument token by NSE tradingsymbol or name, else the nearest NFO future of that name."""
+        row = self.by_symbol(instrument_symbol, "NSE") or self.by_name(instrument_symbol, "NSE")
+        if row is None:
+            row = self.nearest_future(instrument_symbol)
+        return row.get("instrument_token") if row else None
+
+
+def _default_cache_dir() -> Optional[Path]:
+    """INSTRUMENT_CACHE_DIR resolved against PROJECT_DIR (None when set empty)."""
+    cache_dir = os.getenv("INSTRUMENT_CACHE_DIR", DEFAULT_CACHE_DIR)
+    return PROJECT_DIR / cache_dir if cache_dir else None
+
+
+_masters: "weakref.WeakKeyDictionary[Any, InstrumentMaster]" = weakref.WeakKeyDictionary()
+_offline_master: Optional[InstrumentMaster] = None
+_masters_lock = threading.Lock()
+
+
+def get_instrument_master(kite=None) -> InstrumentMaster:
+    """Process-wide InstrumentMaster for a Kite client (or the cached files only, without one)."""
+    global _offline_master
+    with _masters_lock:
+        master = _offline_master if kite is None else _masters.get(kite)
+        if master is None:
+            master = InstrumentMaster(kite, cache_dir=_default_cache_dir())
+            if kite is None:
+                _offline_master = master
+            else:
+                _masters[kite] = master
+        return master
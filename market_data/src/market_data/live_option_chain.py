@@ -0,0 +1,264 @@
+"""In-memory option chain maintained from streaming quotes.
+
+A LiveOptionChain holds one underlying/expiry as array-backed columns (one row
+per strike, one column block per CE/PE side) and applies each quote as an O(1)
+in-place update located through a token/symbol index. Quotes can come from:
+
+- the Kite ticker: ``kws.on_ticks = chain.on_ticks`` after subscribing
+  ``chain.tokens`` in full mode (full mode carries OI and depth);
+- the market store's pub/sub: ``chain.subscribe_store(redis_client)`` listens
+  on market:tick:{tradingsymbol} for every contract;
+- any code calling ``apply_tick``/``apply_ticks`` with quote dicts.
+
+Readers take consistent copies (``snapshot``/``to_chain_dict``) under the
+chain's lock instead of asking the broker. Cells changed since the last call
+can be published to Redis as one compact delta message (``publish_delta``).
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .options_analytics import OptionChainArrays
+
+logger = logging.getLogger(__name__)
+
+SIDES = ("CE", "PE")
+FIELDS = ("ltp", "oi", "volume", "bid", "ask", "updated_at")
+DELTA_CHANNEL_PREFIX = "options:chain"
+
+
+def _to_epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def _best_price(depth: Any, side: str) -> Optional[float]:
+    levels = (depth or {}).get(side) or []
+    price = levels[0].get("price") if levels else None
+    return price or None
+
+
+def _cell(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+class LiveOptionChain:
+    """One underlying/expiry option chain updated in place from quotes."""
+
+    def __init__(self, name: str, expiry: date, contracts: Iterable[Mapping[str, Any]]):
+        """Initialize from instrument master rows (tradingsymbol, instrument_token, strike, instrument_type)."""
+        self.name = name.upper()
+        self.expiry = expiry
+        rows = [row for row in contracts if row.get("instrument_type") in SIDES]
+        self.strike = np.array(sorted({float(row["strike"]) for row in rows}), dtype=np.float64)
+        n = len(self.strike)
+        self._columns: Dict[str, np.ndarray] = {field: np.full((2, n), np.nan) for field in FIELDS}
+        self._contracts: List[List[Optional[Mapping[str, Any]]]] = [[None] * n, [None] * n]
+        self._by_token: Dict[int, Tuple[int, int]] = {}
+        self._by_symbol: Dict[str, Tuple[int, int]] = {}
+        for row in rows:
+            cell = (SIDES.index(row["instrument_type"]), int(np.searchsorted(self.strike, float(row["strike"]))))
+            self._contracts[cell[0]][cell[1]] = row
+            self._by_token[int(row["instrument_token"])] = cell
+            self._by_symbol[row["tradingsymbol"]] = cell
+        self._lock = threading.Lock()
+        self._dirty: set = set()
+        self.version = 0
+        # time.monotonic() of the last applied quote (0.0 before the first one)
+        self.last_update = 0.0
+
+    @property
+    def tokens(self) -> List[int]:
+        """Instrument tokens of every contract (for ticker subscriptions)."""
+        return list(self._by_token)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol)
+
+    @property
+    def delta_channel(self) -> str:
+        return f"{DELTA_CHANNEL_PREFIX}:{self.name}:{self.expiry.isoformat()}"
+
+    # ------------------------------------------------------------------ updates
+
+    def _locate(self, quote: Mapping[str, Any]) -> Optional[Tuple[int, int]]:
+        token = quote.get("instrument_token")
+        if token is not None:
+            cell = self._by_token.get(int(token))
+            if cell is not None:
+                return cell
+        symbol = quote.get("tradingsymbol") or quote.get("instrument")
+        if symbol:
+            return self._by_symbol.get(str(symbol).split(":")[-1])
+        return None
+
+    def _apply(self, cell: Tuple[int, int], quote: Mapping[str, Any]) -> None:
+        side, i = cell
+        columns = self._columns
+        if quote.get("last_price") is not None:
+            columns["ltp"][side, i] = quote["last_price"]
+        if quote.get("oi") is not None:
+            columns["oi"][side, i] = quote["oi"]
+        volume = quote.get("volume_traded", quote.get("volume"))
+        if volume is not None:
+            columns["volume"][side, i] = volume
+        depth = quote.get("depth")
+        bid = quote.get("bid") if depth is None else _best_price(depth, "buy")
+        ask = quote.get("ask") if depth is None else _best_price(depth, "sell")
+        if bid is not None:
+            columns["bid"][side, i] = bid
+        if ask is not None:
+            columns["ask"][side, i] = ask
+        columns["updated_at"][side, i] = _to_epoch(
+            quote.get("exchange_timestamp") or quote.get("last_trade_time") or quote.get("timestamp"))
+        self._dirty.add(cell)
+
+    def apply_tick(self, quote: Mapping[str, Any]) -> bool:
+        """Apply one quote (Kite tick, quote() entry or store tick payload); False if not in this chain."""
+        cell = self._locate(quote)
+        if cell is None:
+            return False
+        with self._lock:
+            self._apply(cell, quote)
+            self.version += 1
+            self.last_update = time.monotonic()
+        return True
+
+    def apply_ticks(self, quotes: Iterable[Mapping[str, Any]]) -> int:
+        """Apply a batch of quotes under one lock; returns how many belonged to this chain."""
+        located = [(cell, quote) for quote in quotes for cell in (self._locate(quote),) if cell is not None]
+        if located:
+            with self._lock:
+                for cell, quote in located:
+                    self._apply(cell, quote)
+                self.version += 1
+                self.last_update = time.monotonic()
+        return len(located)
+
+    def on_ticks(self, ws, ticks: List[Mapping[str, Any]]) -> None:
+        """KiteTicker on_ticks callback."""
+        self.apply_ticks(ticks)
+
+    # ------------------------------------------------------------------ readers
+
+    def age(self) -> float:
+        """Seconds since the last applied quote (inf before the first one)."""
+        return time.monotonic() - self.last_update if self.last_update else float("inf")
+
+    def snapshot(self) -> OptionChainArrays:
+        """Consistent copy of the chain as OptionChainArrays (strikes without quotes included)."""
+        with self._lock:
+            ltp, oi, volume = (self._columns[field].copy() for field in ("ltp", "oi", "volume"))
+        return OptionChainArrays.from_columns(self.strike, ltp[0], oi[0], volume[0], ltp[1], oi[1], volume[1])
+
+    def to_chain_dict(self, strikes: Optional[Iterable[float]] = None) -> Dict[str, Any]:
+        """Chain in the fetch_options_chain format; contracts without any quote yet are left out."""
+        with self._lock:
+            columns = {field: values.copy() for field, values in self._columns.items()}
+            version = self.version
+        wanted = None if strikes is None else {float(s) for s in strikes}
+        rows = []
+        contracts = 0
+        for i, strike in enumerate(self.strike.tolist()):
+            if wanted is not None and strike not in wanted:
+                continue
+            row: Dict[str, Any] = {"strike": int(strike), "CE": None, "PE": None}
+            for side, option_type in enumerate(SIDES):
+                contract = self._contracts[side][i]
+                if contract is None or np.isnan(columns["updated_at"][side, i]):
+                    continue
+                contracts += 1
+                row[option_type] = {
+                    "tradingsymbol": contract["tradingsymbol"],
+                    "instrument_token": contract["instrument_token"],
+                    "expiry": self.expiry,
+                    "strike": int(strike),
+                    "option_type": option_type,
+                    "last_price": _cell(columns["ltp"][side, i]),
+                    "bid": _cell(columns["bid"][side, i]),
+                    "ask": _cell(columns["ask"][side, i]),
+                    "volume": int(np.nan_to_num(columns["volume"][side, i])),
+                    "oi": int(np.nan_to_num(columns["oi"][side, i])),
+                    "timestamp": datetime.fromtimestamp(columns["updated_at"][side, i]).isoformat(),
+                }
+            if row["CE"] or row["PE"]:
+                rows.append(row)
+        return {
+            "available": bool(rows),
+            "instrument": self.name,
+            "expiry": self.expiry.isoformat(),
+            "strikes": rows,
+            "total_contracts": contracts,
+            "version": version,
+            "source": "live",
+        }
+
+    # ------------------------------------------------------------------ deltas
+
+    def pop_delta(self) -> Optional[Dict[str, Any]]:
+        """Cells changed since the last call as one compact message, or None if nothing changed."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            dirty, self._dirty = sorted(self._dirty, key=lambda cell: (cell[1], cell[0])), set()
+            updates = [
+                [float(self.strike[i]), SIDES[side]] + [_cell(self._columns[field][side, i]) for field in FIELDS[:5]]
+                for side, i in dirty
+            ]
+            version = self.version
+        return {
+            "instrument": self.name,
+            "expiry": self.expiry.isoformat(),
+            "version": version,
+            "fields": ["strike", "type", *FIELDS[:5]],
+            "updates": updates,
+        }
+
+    def publish_delta(self, redis_client) -> int:
+        """Publish pending changes to options:chain:{name}:{expiry}; returns the number of updated cells."""
+        delta = self.pop_delta()
+        if delta is None:
+            return 0
+        redis_client.publish(self.delta_channel, json.dumps(delta, separators=(",", ":")))
+        return len(delta["updates"])
+
+    # ------------------------------------------------------------------ store feed
+
+    def subscribe_store(self, redis_client, timeout: float = 1.0) -> threading.Event:
+        """Apply ticks the market store publishes on market:tick:{tradingsymbol}, on a daemon thread.
+
+        Set the returned event to stop listening.
+        """
+        stop = threading.Event()
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*(f"market:tick:{symbol}" for symbol in self._by_symbol))
+
+        def listen() -> None:
+            try:
+                while not stop.is_set():
+                    message = pubsub.get_message(timeout=timeout)
+                    if not message or message.get("type") != "message":
+                        continue
+                    try:
+                        data = message["data"]
+                        self.apply_tick(json.loads(data.decode() if isinstance(data, bytes) else data))
+                    except (ValueError, TypeError) as exc:
+                        logger.debug(f"Ignoring malformed tick on {message.get('channel')}: {exc}")
+            finally:
+                pubsub.close()
+
+        threading.Thread(target=listen, name=f"live-chain-{self.name}", daemon=True).start()
+        return stop
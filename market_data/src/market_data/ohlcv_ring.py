@@ -0,0 +1,126 @@
+"""Fixed-size NumPy ring buffer for a rolling OHLCV window.
+
+Replaces the per-candle ``DataFrame.loc[len(df)] = row`` / ``.tail(window)``
+pattern, which copies and reallocates the whole window on every candle.
+
+Layout:
+    One preallocated array per column (float64 open/high/low/close/volume,
+    int64 epoch-nanosecond timestamps), each 2 x capacity long. Every value is
+    written at ``i`` and ``i + capacity`` so the last ``len`` values are always
+    one contiguous slice: column properties return zero-copy views that
+    pandas-ta (via ``pd.Series(view, copy=False)``) or NumPy can read directly.
+
+Memory per instrument is fixed at 2 x capacity x 6 x 8 bytes (~19 KB for the
+default 200-candle window) and appending a candle is a handful of scalar writes.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+COLUMNS = ("timestamp",) + PRICE_COLUMNS
+
+
+class OHLCVRingBuffer:
+    """Preallocated rolling window of OHLCV candles with contiguous views."""
+
+    __slots__ = ("capacity", "_columns", "_start", "_size")
+
+    def __init__(self, capacity: int = 200):
+        """Allocate the window.
+
+        Args:
+            capacity: Maximum number of candles kept (oldest are overwritten)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(2 * self.capacity, dtype=np.int64 if name == "timestamp" else np.float64)
+            for name in COLUMNS
+        }
+        self._start = 0  # Physical index of the oldest candle in the first half
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def append(
+        self,
+        timestamp_ns: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: Optional[float] = 0.0,
+    ) -> None:
+        """Append one candle, overwriting the oldest when the window is full."""
+        capacity = self.capacity
+        if self._size < capacity:
+            slot = self._start + self._size
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % capacity
+        mirror = slot + capacity if slot < capacity else slot - capacity
+
+        columns = self._columns
+        for name, value in (
+            ("timestamp", timestamp_ns),
+            ("open", open_),
+            ("high", high),
+            ("low", low),
+            ("close", close),
+            ("volume", volume or 0.0),
+        ):
+            column = columns[name]
+            column[slot] = value
+            column[mirror] = value
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def view(self, name: str) -> np.ndarray:
+        """Zero-copy contiguous view of a column, oldest candle first.
+
+        The view aliases the buffer: it reflects later appends to the slots it
+        covers, so copy it if it must outlive the next append.
+        """
+        return self._columns[name][self._start:self._start + self._size]
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self.view("timestamp")
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.view("open")
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.view("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.view("low")
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.view("close")
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.view("volume")
+
+    def row(self, index: int) -> Dict[str, float]:
+        """Single candle by position (negative indexes count from the newest)."""
+        if not -self._size <= index < self._size:
+            raise IndexError("candle index out of range")
+        physical = self._start + (index % self._size)
+        return {name: self._columns[name][physical].item() for name in COLUMNS}
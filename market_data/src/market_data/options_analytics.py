@@ -0,0 +1,246 @@
+"""Vectorized options-chain analytics.
+
+The chain is held as parallel NumPy arrays sorted by strike (strike, CE/PE
+LTP, OI and volume) so every metric is a handful of array operations:
+
+    max pain        O(n) via prefix sums of OI and strike-weighted OI
+    PCR             put/call ratio of OI or volume
+    concentration   share of each side's OI in its top strikes
+    walls           highest put OI below spot (support), call OI above (resistance)
+    change in OI    per-strike OI delta against an earlier snapshot, picked
+                    by OIReference (session open or a fixed look-back)
+
+Chains can be built from the adapter format (nested "CE"/"PE" quotes per
+strike), the flat API/dashboard rows (ce_oi, pe_ltp, ...) or the agent's
+separate call/put leg lists.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+_FIELDS = ("ltp", "oi", "volume")
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def _number(value) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _side_values(row: Mapping[str, Any], side: str) -> Dict[str, Any]:
+    """LTP/OI/volume of one side of a strike row, nested ("CE": {...}) or flat (ce_oi)."""
+    nested = row.get(side.upper())
+    if isinstance(nested, Mapping):
+        return {"ltp": nested.get("last_price", nested.get("ltp")),
+                "oi": nested.get("oi"), "volume": nested.get("volume")}
+    prefix = side.lower()
+    return {field: row.get(f"{prefix}_{field}") for field in _FIELDS}
+
+
+@dataclass(frozen=True)
+class OptionChainArrays:
+    """One expiry of an option chain as strike-sorted parallel arrays.
+
+    LTPs are NaN where a side has no quote; OI and volume are 0.
+    """
+
+    strike: np.ndarray
+    ce_ltp: np.ndarray
+    ce_oi: np.ndarray
+    ce_volume: np.ndarray
+    pe_ltp: np.ndarray
+    pe_oi: np.ndarray
+    pe_volume: np.ndarray
+
+    @classmethod
+    def from_columns(cls, strike, ce_ltp=None, ce_oi=None, ce_volume=None,
+                     pe_ltp=None, pe_oi=None, pe_volume=None) -> "OptionChainArrays":
+        """Build from column sequences; rows without a strike are dropped."""
+        strike = np.asarray(strike, dtype=np.float64)
+        n = len(strike)
+
+        def column(values, fill):
+            if values is None:
+                return np.full(n, fill)
+            return np.asarray(values, dtype=np.float64)
+
+        columns = [column(ce_ltp, np.nan), column(ce_oi, 0.0), column(ce_volume, 0.0),
+                   column(pe_ltp, np.nan), column(pe_oi, 0.0), column(pe_volume, 0.0)]
+        for i in (1, 2, 4, 5):
+            columns[i] = np.nan_to_num(columns[i], nan=0.0)
+
+        keep = ~np.isnan(strike)
+        order = np.argsort(strike[keep], kind="stable")
+        return cls(strike[keep][order], *(values[keep][order] for values in columns))
+
+    @classmethod
+    def from_strikes(cls, strikes: Iterable[Mapping[str, Any]]) -> "OptionChainArrays":
+        """Build from per-strike rows (nested CE/PE quotes or flat ce_*/pe_* keys)."""
+        rows = list(strikes or [])
+        sides = {side: [_side_values(row, side) for row in rows] for side in ("ce", "pe")}
+        columns = {
+            f"{side}_{field}": [_number(values[field]) for values in sides[side]]
+            for side in ("ce", "pe") for field in _FIELDS
+        }
+        return cls.from_columns([_number(row.get("strike")) for row in rows], **columns)
+
+    @classmethod
+    def from_legs(cls, calls: Iterable[Mapping[str, Any]], puts: Iterable[Mapping[str, Any]]) -> "OptionChainArrays":
+        """Build from separate call and put lists of {strike, price, oi, volume}."""
+        merged: Dict[float, Dict[str, Any]] = {}
+        for side, legs in (("ce", calls or []), ("pe", puts or [])):
+            for leg in legs:
+                strike = _number(leg.get("strike"))
+                if np.isnan(strike):
+                    continue
+                row = merged.setdefault(strike, {"strike": strike})
+                row[f"{side}_ltp"] = leg.get("price", leg.get("ltp", leg.get("last_price")))
+                row[f"{side}_oi"] = leg.get("oi")
+                row[f"{side}_volume"] = leg.get("volume")
+        return cls.from_strikes(merged.values())
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    # ------------------------------------------------------------------ metrics
+
+    def pain(self) -> np.ndarray:
+        """Total intrinsic value paid to option holders if expiry settles at each strike.
+
+        pain[i] = sum_{s < K_i} (K_i - s) * ce_oi(s) + sum_{s > K_i} (s - K_i) * pe_oi(s),
+        computed from prefix sums instead of a pass over all strikes per strike.
+        """
+        if not len(self):
+            return np.zeros(0)
+        k = self.strike
+        # Calls struck below K: K * sum(oi) - sum(oi * s) over earlier strikes
+        ce_oi_before = np.cumsum(self.ce_oi) - self.ce_oi
+        ce_value_before = np.cumsum(self.ce_oi * k) - self.ce_oi * k
+        call_pain = k * ce_oi_before - ce_value_before
+        # Puts struck above K: sum(oi * s) - K * sum(oi) over later strikes
+        pe_oi_after = self.pe_oi.sum() - np.cumsum(self.pe_oi)
+        pe_value_after = (self.pe_oi * k).sum() - np.cumsum(self.pe_oi * k)
+        put_pain = pe_value_after - k * pe_oi_after
+        return call_pain + put_pain
+
+    def max_pain(self) -> Optional[float]:
+        """Strike with the least total option-holder payout (lowest strike on ties)."""
+        if not len(self):
+            return None
+        return float(self.strike[int(np.argmin(self.pain()))])
+
+    def pcr(self, by: str = "oi") -> Optional[float]:
+        """Put/call ratio of total OI (by="oi") or volume (by="volume")."""
+        calls = float(getattr(self, f"ce_{by}").sum())
+        puts = float(getattr(self, f"pe_{by}").sum())
+        return puts / calls if calls > 0 else None
+
+    def oi_concentration(self, top: int = 3) -> Dict[str, Optional[float]]:
+        """Share of each side's total OI held by its `top` largest strikes."""
+        result: Dict[str, Optional[float]] = {}
+        for side in ("ce", "pe"):
+            oi = getattr(self, f"{side}_oi")
+            total = float(oi.sum())
+            if total <= 0:
+                result[side] = None
+                continue
+            k = min(top, len(oi))
+            result[side] = float(np.partition(oi, len(oi) - k)[len(oi) - k:].sum()) / total
+        return result
+
+    def walls(self, spot: Optional[float] = None, count: int = 1) -> Dict[str, List[float]]:
+        """Strikes with the largest OI: put OI at/below spot (support), call OI at/above (resistance).
+
+        Without a spot the whole chain is considered on both sides.
+        """
+        def top(oi: np.ndarray, mask: np.ndarray) -> List[float]:
+            candidates = np.flatnonzero(mask & (oi > 0))
+            order = candidates[np.argsort(-oi[candidates], kind="stable")][:count]
+            return [float(s) for s in self.strike[order]]
+
+        everywhere = np.ones(len(self), dtype=bool)
+        below = everywhere if spot is None else self.strike <= spot
+        above = everywhere if spot is None else self.strike >= spot
+        return {"support": top(self.pe_oi, below), "resistance": top(self.ce_oi, above)}
+
+    def change_in_oi(self, previous: "OptionChainArrays") -> Dict[str, np.ndarray]:
+        """Per-strike OI change against an earlier snapshot (new strikes count from 0)."""
+        if not len(previous):
+            return {"ce": self.ce_oi.copy(), "pe": self.pe_oi.copy()}
+        idx = np.clip(np.searchsorted(previous.strike, self.strike), 0, len(previous) - 1)
+        matched = previous.strike[idx] == self.strike
+        return {
+            side: getattr(self, f"{side}_oi") - np.where(matched, getattr(previous, f"{side}_oi")[idx], 0.0)
+            for side in ("ce", "pe")
+        }
+
+    def summary(self, spot: Optional[float] = None, previous: Optional["OptionChainArrays"] = None,
+                wall_count: int = 3) -> Dict[str, Any]:
+        """All chain metrics as a JSON-friendly dict."""
+        walls = self.walls(spot, wall_count)
+        largest = self.walls(None, 1)
+        result: Dict[str, Any] = {
+            "strikes": len(self),
+            "call_oi_total": int(self.ce_oi.sum()),
+            "put_oi_total": int(self.pe_oi.sum()),
+            "pcr": self.pcr("oi"),
+            "volume_pcr": self.pcr("volume"),
+            "max_pain": self.max_pain(),
+            "max_call_oi_strike": next(iter(largest["resistance"]), None),
+            "max_put_oi_strike": next(iter(largest["support"]), None),
+            "oi_concentration": self.oi_concentration(),
+            "support": walls["support"],
+            "resistance": walls["resistance"],
+        }
+        if previous is not None:
+            change = self.change_in_oi(previous)
+            result["call_oi_change"] = int(change["ce"].sum())
+            result["put_oi_change"] = int(change["pe"].sum())
+        return result
+
+
+class OIReference:
+    """Snapshots that change in OI is measured against, per chain key.
+
+    ``"session"`` measures against the first snapshot of the IST trading day;
+    a number of seconds measures against the newest snapshot at least that old
+    (the oldest one kept until a snapshot is old enough).
+    """
+
+    def __init__(self, reference: Union[str, float] = "session", clock: Callable[[], float] = time.time):
+        if reference == "session":
+            self.interval: Optional[float] = None
+        else:
+            self.interval = float(reference)
+            if self.interval <= 0:
+                raise ValueError(f"OI change interval must be positive, got {reference!r}")
+        self._clock = clock
+        self._snapshots: Dict[Hashable, Deque[Tuple[float, OptionChainArrays]]] = {}
+
+    def update(self, key: Hashable, arrays: OptionChainArrays) -> Tuple[OptionChainArrays, Dict[str, Any]]:
+        """Record a snapshot; returns the reference to diff it against and a description of it."""
+        now = self._clock()
+        snapshots = self._snapshots.setdefault(key, deque())
+        if self.interval is None:
+            day = datetime.fromtimestamp(now, IST).date()
+            if not snapshots or datetime.fromtimestamp(snapshots[0][0], IST).date() != day:
+                snapshots.clear()
+                snapshots.append((now, arrays))
+        else:
+            snapshots.append((now, arrays))
+            while len(snapshots) > 1 and snapshots[1][0] <= now - self.interval:
+                snapshots.popleft()
+        taken_at, reference = snapshots[0]
+        return reference, {
+            "type": "session_open" if self.interval is None else "interval",
+            "interval_seconds": self.interval,
+            "as_of": datetime.fromtimestamp(taken_at, IST).isoformat(),
+            "age_seconds": round(now - taken_at, 3),
+        }
@@ -0,0 +1,102 @@
+"""Options chain snapshot cache with single-flight fetches and background refresh.
+
+Building a chain snapshot means quoting every contract of an expiry (plus the
+futures price), so it is done at most once per TTL per (instrument, expiry):
+
+- fresh snapshots are returned straight from memory;
+- concurrent callers for a key with no fresh snapshot await the same
+  in-flight fetch instead of starting their own;
+- a background loop (``run_refresh``) rebuilds the snapshots that were read
+  recently while the market is open, so readers normally never wait.
+
+Failed fetches are not cached; every waiter of that fetch sees the exception.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from core_kernel.market_hours import IST, is_market_open
+
+logger = logging.getLogger(__name__)
+
+ChainKey = Tuple[str, str]
+ChainBuilder = Callable[[str, Optional[str]], Awaitable[Any]]
+
+
+class OptionsChainCache:
+    """Snapshot cache in front of an async ``builder(instrument, expiry)``."""
+
+    def __init__(self, builder: ChainBuilder, ttl: float = 5.0, idle_after: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._builder = builder
+        self.ttl = ttl
+        self.idle_after = idle_after
+        self._clock = clock
+        self._snapshots: Dict[ChainKey, Tuple[float, Any]] = {}
+        self._inflight: Dict[ChainKey, asyncio.Future] = {}
+        self._last_read: Dict[ChainKey, float] = {}
+
+    @staticmethod
+    def key(instrument: str, expiry: Optional[str] = None) -> ChainKey:
+        return instrument.upper(), expiry or ""
+
+    async def get(self, instrument: str, expiry: Optional[str] = None) -> Any:
+        """Latest snapshot for the chain, fetching it (once for all callers) if stale or missing."""
+        key = self.key(instrument, expiry)
+        now = self._clock()
+        self._last_read[key] = now
+        cached = self._snapshots.get(key)
+        if cached is not None and now - cached[0] < self.ttl:
+            return cached[1]
+        return await self.refresh(instrument, expiry)
+
+    async def refresh(self, instrument: str, expiry: Optional[str] = None) -> Any:
+        """Rebuild the snapshot, joining the fetch already in flight for this key if any."""
+        key = self.key(instrument, expiry)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch(key, instrument, expiry))
+            self._inflight[key] = inflight
+        # Shield so a cancelled caller does not cancel the fetch other callers are waiting on
+        return await asyncio.shield(inflight)
+
+    async def _fetch(self, key: ChainKey, instrument: str, expiry: Optional[str]) -> Any:
+        try:
+            snapshot = await self._builder(instrument, expiry)
+            self._snapshots[key] = (self._clock(), snapshot)
+            return snapshot
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, instrument: Optional[str] = None, expiry: Optional[str] = None) -> None:
+        """Drop one snapshot, or all of them when no instrument is given."""
+        if instrument is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(self.key(instrument, expiry), None)
+
+    async def refresh_active(self) -> int:
+        """Rebuild every snapshot read within ``idle_after`` seconds; returns how many were refreshed."""
+        now = self._clock()
+        for key, last_read in list(self._last_read.items()):
+            if now - last_read > self.idle_after:
+                del self._last_read[key]
+                self._snapshots.pop(key, None)
+        keys = list(self._last_read)
+        results = await asyncio.gather(*(self.refresh(name, expiry or None) for name, expiry in keys),
+                                       return_exceptions=True)
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Background options chain refresh failed for {key[0]} {key[1] or 'nearest'}: {result}")
+        return len(keys)
+
+    async def run_refresh(self, interval: float,
+                          market_open: Callable[[datetime], bool] = is_market_open) -> None:
+        """Refresh active snapshots every ``interval`` seconds while the market is open (until cancelled)."""
+        while True:
+            await asyncio.sleep(interval)
+            if market_open(datetime.now(IST).replace(tzinfo=None)):
+                await self.refresh_active()
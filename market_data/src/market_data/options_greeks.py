@@ -0,0 +1,188 @@
+"""Vectorized Black-76 implied volatility and Greeks for whole option chains.
+
+Index options are priced off the futures/forward price F (Black-76):
+
+    call = e^-rT * (F N(d1) - K N(d2))      put = e^-rT * (K N(-d2) - F N(-d1))
+
+Every function takes NumPy arrays (or scalars) that broadcast together, so one
+call prices or inverts every strike of every expiry at once. Implied
+volatility is solved with Newton steps kept inside a per-option bracket that
+is tightened on every iteration; whenever a Newton step would leave the
+bracket (or vega vanishes) the solver bisects instead, so it always converges.
+
+When no futures quote is available the forward is implied from put-call parity
+at the strike where call and put prices are closest.
+"""
+
+import math
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+try:
+    from scipy.special import ndtr as _ndtr
+except ImportError:  # scipy is optional; fall back to a polynomial approximation
+    _ndtr = None
+
+IST = timezone(timedelta(hours=5, minutes=30))
+EXPIRY_CLOSE = time(15, 30)
+MINUTES_PER_YEAR = 365.0 * 24 * 60
+
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+VOL_LOW, VOL_HIGH = 1e-4, 5.0
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (scipy if installed, else Abramowitz-Stegun 26.2.17, |error| < 7.5e-8)."""
+    x = np.asarray(x, dtype=np.float64)
+    if _ndtr is not None:
+        return _ndtr(x)
+    k = 1.0 / (1.0 + 0.2316419 * np.abs(x))
+    poly = k * (0.319381530 + k * (-0.356563782 + k * (1.781477937 + k * (-1.821255978 + k * 1.330274429))))
+    upper = 1.0 - norm_pdf(x) * poly
+    return np.where(x >= 0, upper, 1.0 - upper)
+
+
+def _d1_d2(forward, strike, t, vol):
+    vol_sqrt_t = vol * np.sqrt(t)
+    d1 = (np.log(forward / strike) + 0.5 * vol_sqrt_t * vol_sqrt_t) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def black_price(forward, strike, t, vol, rate: float = 0.0, is_call=True) -> np.ndarray:
+    """Black-76 option price; `is_call` may be a boolean array."""
+    forward, strike, t, vol = (np.asarray(a, dtype=np.float64) for a in (forward, strike, t, vol))
+    d1, d2 = _d1_d2(forward, strike, t, vol)
+    discount = np.exp(-rate * t)
+    call = discount * (forward * norm_cdf(d1) - strike * norm_cdf(d2))
+    put = discount * (strike * norm_cdf(-d2) - forward * norm_cdf(-d1))
+    return np.where(is_call, call, put)
+
+
+def implied_volatility(price, forward, strike, t, rate: float = 0.0, is_call=True,
+                       tol: float = 1e-6, max_iter: int = 60) -> np.ndarray:
+    """Annualised implied volatility (decimal) per option; NaN where the price has no solution.
+
+    Prices at or below intrinsic value, above the no-arbitrage bound, or with
+    non-positive inputs are NaN.
+    """
+    price, forward, strike, t = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                                      for a in (price, forward, strike, t)))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), price.shape)
+    discount = np.exp(-rate * t)
+    intrinsic = discount * np.where(is_call, np.maximum(forward - strike, 0.0), np.maximum(strike - forward, 0.0))
+    upper = discount * np.where(is_call, forward, strike)
+
+    with np.errstate(invalid="ignore"):
+        solvable = ((price > intrinsic) & (price < upper) & (forward > 0) & (strike > 0) & (t > 0))
+    iv = np.full(price.shape, np.nan)
+    if not solvable.any():
+        return iv
+
+    p, f, k, tt, call = (a[solvable] for a in (price, forward, strike, t, is_call))
+    disc = discount[solvable]
+    lo = np.full(p.shape, VOL_LOW)
+    hi = np.full(p.shape, VOL_HIGH)
+    # Brenner-Subrahmanyam seed (exact at the money), kept inside the bracket
+    vol = np.clip(_SQRT_2PI / np.sqrt(tt) * p / (disc * f), 0.05, 2.0)
+    active = np.ones(p.shape, dtype=bool)
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+        v = vol[idx]
+        d1, _ = _d1_d2(f[idx], k[idx], tt[idx], v)
+        diff = black_price(f[idx], k[idx], tt[idx], v, rate, call[idx]) - p[idx]
+        vega = disc[idx] * f[idx] * norm_pdf(d1) * np.sqrt(tt[idx])
+
+        too_high = diff > 0
+        hi[idx] = np.where(too_high, v, hi[idx])
+        lo[idx] = np.where(too_high, lo[idx], v)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = v - diff / vega
+        inside = np.isfinite(step) & (step > lo[idx]) & (step < hi[idx])
+        vol[idx] = np.where(inside, step, 0.5 * (lo[idx] + hi[idx]))
+        done = (np.abs(diff) < tol) | (hi[idx] - lo[idx] < tol * 1e-2)
+        vol[idx[done]] = v[done]
+        active[idx[done]] = False
+
+    iv[solvable] = vol
+    return iv
+
+
+def greeks(forward, strike, t, vol, rate: float = 0.0, is_call=True) -> Dict[str, np.ndarray]:
+    """Black-76 Greeks: delta (per 1.0 of forward), gamma, theta (per calendar day), vega (per vol point)."""
+    forward, strike, t, vol = (np.asarray(a, dtype=np.float64) for a in (forward, strike, t, vol))
+    d1, d2 = _d1_d2(forward, strike, t, vol)
+    discount = np.exp(-rate * t)
+    pdf = norm_pdf(d1)
+    sqrt_t = np.sqrt(t)
+    call_delta = discount * norm_cdf(d1)
+    put_delta = -discount * norm_cdf(-d1)
+    decay = -discount * forward * pdf * vol / (2.0 * sqrt_t)
+    call_theta = decay + rate * black_price(forward, strike, t, vol, rate, True)
+    put_theta = decay + rate * black_price(forward, strike, t, vol, rate, False)
+    return {
+        "delta": np.where(is_call, call_delta, put_delta),
+        "gamma": discount * pdf / (forward * vol * sqrt_t),
+        "theta": np.where(is_call, call_theta, put_theta) / 365.0,
+        "vega": discount * forward * pdf * sqrt_t / 100.0,
+    }
+
+
+def implied_forward(strike, call_price, put_price, t, rate: float = 0.0) -> Optional[float]:
+    """Forward from put-call parity (F = K + e^rT (C - P)) at the strike where |C - P| is smallest."""
+    strike, call_price, put_price = (np.asarray(a, dtype=np.float64) for a in (strike, call_price, put_price))
+    gap = call_price - put_price
+    valid = np.flatnonzero(np.isfinite(gap) & np.isfinite(strike))
+    if not len(valid):
+        return None
+    i = valid[np.argmin(np.abs(gap[valid]))]
+    return float(strike[i] + math.exp(rate * t) * gap[i])
+
+
+def years_to_expiry(expiry: Union[str, date, datetime], now: Optional[datetime] = None) -> float:
+    """Year fraction until 15:30 IST on the expiry date (at least one minute)."""
+    if isinstance(expiry, str):
+        expiry = date.fromisoformat(expiry[:10])
+    if isinstance(expiry, datetime):
+        expiry = expiry.date()
+    close = datetime.combine(expiry, EXPIRY_CLOSE, tzinfo=IST)
+    now = now or datetime.now(IST)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=IST)
+    minutes = (close - now).total_seconds() / 60.0
+    return max(minutes, 1.0) / MINUTES_PER_YEAR
+
+
+def chain_greeks(chain, t: float, forward: Optional[float] = None, rate: float = 0.0) -> Dict[str, np.ndarray]:
+    """IV (in percent) and Greeks for both sides of an OptionChainArrays.
+
+    Returns per-strike arrays keyed ce_iv, ce_delta, ce_gamma, ce_theta,
+    ce_vega and the same for pe_, aligned with ``chain.strike`` and NaN where
+    a side has no usable price. ``forward`` defaults to the parity-implied one.
+    """
+    n = len(chain.strike)
+    if forward is None:
+        forward = implied_forward(chain.strike, chain.ce_ltp, chain.pe_ltp, t, rate)
+    if not n or forward is None or not forward > 0:
+        return {f"{side}_{name}": np.full(n, np.nan)
+                for side in ("ce", "pe") for name in ("iv", "delta", "gamma", "theta", "vega")}
+
+    # Both sides in one solve: stack calls over puts
+    strike = np.concatenate([chain.strike, chain.strike])
+    price = np.concatenate([chain.ce_ltp, chain.pe_ltp])
+    is_call = np.arange(2 * n) < n
+    vol = implied_volatility(price, forward, strike, t, rate, is_call)
+    values = greeks(forward, strike, t, vol, rate, is_call)
+    values["iv"] = vol * 100.0
+    return {f"{side}_{name}": series[sl]
+            for name, series in values.items()
+            for side, sl in (("ce", slice(0, n)), ("pe", slice(n, None)))}
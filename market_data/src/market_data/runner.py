@@ -122,6 +122,8 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--mode', choices=['live', 'historical'], default='live')
     parser.add_argument('--start-collectors', action='store_true')
+    parser.add_argument('--collector-mode', choices=['separate', 'batched'], default=os.getenv('COLLECTOR_MODE', 'separate'),
+                        help='separate: LTP and depth collector processes; batched: one quote poller for the whole watchlist')
     parser.add_argument('--prompt-login', action='store_true', help='If credentials missing, attempt interactive login (useful for Dev machines)')
     parser.add_argument('--historical-source', type=str, default=None)
     parser.add_argument('--historical-speed', type=float, default=1.0)
@@ -177,11 +179,15 @@ def main():
                         print(f'[INFO] Details: {msg}')
                     raise SystemExit(1)
 
-                ltp_cmd = [PYTHON, '-m', 'market_data.collectors.ltp_collector']
-                depth_cmd = [PYTHON, '-m', 'market_data.collectors.depth_collector']
-                ltp_proc = start_process('LTP Collector', ltp_cmd)
-                depth_proc = start_process('Depth Collector', depth_cmd)
-                procs.extend([('LTP Collector', ltp_proc), ('Depth Collector', depth_proc)])
+                if args.collector_mode == 'batched':
+                    quotes_cmd = [PYTHON, '-m', 'market_data.collectors.quote_poller']
+                    procs.append(('Quote Poller', start_process('Quote Poller', quotes_cmd)))
+                else:
+                    ltp_cmd = [PYTHON, '-m', 'market_data.collectors.ltp_collector']
+                    depth_cmd = [PYTHON, '-m', 'market_data.collectors.depth_collector']
+                    ltp_proc = start_process('LTP Collector', ltp_cmd)
+                    depth_proc = start_process('Depth Collector', depth_cmd)
+                    procs.extend([('LTP Collector', ltp_proc), ('Depth Collector', depth_proc)])
 
                 # Wait a little for collectors to seed data into Redis
                 print('   [*] Waiting briefly for collectors to seed data (5s)...')
@@ -0,0 +1,169 @@
+"""Running per-session tick aggregates (VWAP, volume, open/high/low, tick count).
+
+Updated in O(1) per tick as the market store receives ticks, so readers get the
+session VWAP with one HGETALL instead of scanning every stored tick.
+
+Layout:
+    session_stats:{instrument} hash with session_date, open, high, low, last,
+    vwap, volume, tick_count, updated_at, and for each rolling window of N
+    minutes vwap_{N}m, volume_{N}m, high_{N}m, low_{N}m, tick_count_{N}m.
+
+Sessions follow core_kernel.market_hours.get_session_date(): all aggregates
+reset on the first tick of a new session. Tick volume is weighted as traded
+quantity, as in CandleBuilder. Rolling windows keep one bucket per minute, so a
+window of N minutes covers the current minute and the N - 1 before it.
+"""
+
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from core_kernel.market_hours import get_session_date
+
+from .contracts import MarketTick
+
+SESSION_STATS_PREFIX = "session_stats"
+DEFAULT_WINDOWS_MINUTES = (5, 15, 30)
+
+
+def session_stats_key(instrument: str) -> str:
+    """Redis key of the session aggregates hash for an instrument."""
+    return f"{SESSION_STATS_PREFIX}:{instrument}"
+
+
+def read_session_stats(redis_client, instrument: str) -> Dict[str, Any]:
+    """Read session aggregates with a single HGETALL.
+
+    Returns:
+        Dictionary of aggregates (numbers as floats, unavailable ones None),
+        empty if none are stored
+    """
+    raw = redis_client.hgetall(session_stats_key(instrument)) or {}
+    stats: Dict[str, Any] = {}
+    for key, value in raw.items():
+        key = key.decode("utf-8") if isinstance(key, bytes) else key
+        value = value.decode("utf-8") if isinstance(value, bytes) else value
+        if value == "":
+            stats[key] = None
+            continue
+        try:
+            stats[key] = float(value)
+        except (ValueError, TypeError):
+            stats[key] = value
+    return stats
+
+
+class _RollingWindow:
+    """Sums over the last N one-minute buckets."""
+
+    __slots__ = ("minutes", "_buckets", "price_volume", "volume", "tick_count")
+
+    def __init__(self, minutes: int):
+        self.minutes = minutes
+        # [minute, price_volume, volume, high, low, tick_count]
+        self._buckets: Deque[List[Any]] = deque()
+        self.price_volume = 0.0
+        self.volume = 0.0
+        self.tick_count = 0
+
+    def add(self, minute: int, price: float, volume: float) -> None:
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == minute:
+            bucket = buckets[-1]
+            bucket[1] += price * volume
+            bucket[2] += volume
+            if price > bucket[3]:
+                bucket[3] = price
+            if price < bucket[4]:
+                bucket[4] = price
+            bucket[5] += 1
+        else:
+            buckets.append([minute, price * volume, volume, price, price, 1])
+        self.price_volume += price * volume
+        self.volume += volume
+        self.tick_count += 1
+        self._evict(minute)
+
+    def _evict(self, minute: int) -> None:
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= minute - self.minutes:
+            _, price_volume, volume, _, _, tick_count = buckets.popleft()
+            self.price_volume -= price_volume
+            self.volume -= volume
+            self.tick_count -= tick_count
+
+    def snapshot(self) -> Dict[str, Any]:
+        suffix = f"{self.minutes}m"
+        return {
+            f"vwap_{suffix}": self.price_volume / self.volume if self.volume > 0 else None,
+            f"volume_{suffix}": self.volume,
+            f"high_{suffix}": max(bucket[3] for bucket in self._buckets) if self._buckets else None,
+            f"low_{suffix}": min(bucket[4] for bucket in self._buckets) if self._buckets else None,
+            f"tick_count_{suffix}": self.tick_count,
+        }
+
+
+class SessionAggregates:
+    """Session and rolling-window aggregates for one instrument."""
+
+    def __init__(self, windows_minutes: Iterable[int] = DEFAULT_WINDOWS_MINUTES):
+        self.windows_minutes = tuple(windows_minutes)
+        self.session_date: Optional[date] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.open: Optional[float] = None
+        self.high: Optional[float] = None
+        self.low: Optional[float] = None
+        self.last: Optional[float] = None
+        self.price_volume = 0.0
+        self.volume = 0.0
+        self.tick_count = 0
+        self.updated_at: Optional[datetime] = None
+        self._windows = [_RollingWindow(minutes) for minutes in self.windows_minutes]
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.price_volume / self.volume if self.volume > 0 else None
+
+    def update(self, tick: MarketTick) -> None:
+        """Add a tick, starting a new session when it belongs to a later one."""
+        session_date = get_session_date(tick.timestamp)
+        if session_date != self.session_date:
+            self.session_date = session_date
+            self._reset()
+
+        price = float(tick.last_price)
+        volume = float(tick.volume or 0)
+        if self.open is None:
+            self.open = self.high = self.low = price
+        elif price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.last = price
+        self.price_volume += price * volume
+        self.volume += volume
+        self.tick_count += 1
+        self.updated_at = tick.timestamp
+
+        minute = int(tick.timestamp.timestamp()) // 60
+        for window in self._windows:
+            window.add(minute, price, volume)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current aggregates; unavailable values are None."""
+        snapshot: Dict[str, Any] = {
+            "session_date": self.session_date.isoformat() if self.session_date else None,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "last": self.last,
+            "vwap": self.vwap,
+            "volume": self.volume,
+            "tick_count": self.tick_count,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+        for window in self._windows:
+            snapshot.update(window.snapshot())
+        return snapshot
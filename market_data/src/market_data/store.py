@@ -1,5 +1,6 @@
 """In-memory implementation of the MarketStore contract."""
 from collections import defaultdict, deque
+from datetime import datetime
 from typing import Deque, Dict, Iterable, List, Optional
 
 from .contracts import MarketStore, MarketTick, OHLCBar
@@ -8,17 +9,32 @@ from .contracts import MarketStore, MarketTick, OHLCBar
 class InMemoryMarketStore(MarketStore):
     """Lightweight store for ticks and OHLC bars (test-friendly)."""
 
-    def __init__(self, max_bars: int = 1000):
+    def __init__(self, max_bars: int = 1000, max_ticks: int = 10000):
         self._ticks: Dict[str, MarketTick] = {}
+        self._tick_log: Dict[str, Deque[MarketTick]] = defaultdict(lambda: deque(maxlen=max_ticks))
         self._ohlc: Dict[str, Dict[str, Deque[OHLCBar]]] = defaultdict(lambda: defaultdict(deque))
         self._max_bars = max_bars
 
     def store_tick(self, tick: MarketTick) -> None:
         self._ticks[tick.instrument] = tick
+        self._tick_log[tick.instrument].append(tick)
 
     def get_latest_tick(self, instrument: str) -> Optional[MarketTick]:
         return self._ticks.get(instrument)
 
+    def get_ticks(
+        self,
+        instrument: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        count: Optional[int] = None,
+    ) -> List[MarketTick]:
+        ticks = [
+            tick for tick in self._tick_log.get(instrument, ())
+            if (start is None or tick.timestamp >= start) and (end is None or tick.timestamp <= end)
+        ]
+        return ticks[:count] if count else ticks
+
     def store_ohlc(self, bar: OHLCBar) -> None:
         series = self._ohlc[bar.instrument][bar.timeframe]
         series.append(bar)
@@ -0,0 +1,506 @@
+"""Incremental (streaming) technical indicators engine.
+
+`TechnicalIndicatorsService` normally re-runs every pandas-ta function over the
+whole rolling window each time a candle closes. This engine instead keeps
+running state per indicator and updates all of them in constant time per
+closed bar, which is what we want when dozens of instruments are live.
+
+Architecture:
+    Closed candle → StreamingIndicatorEngine.update() → running state per indicator
+    TechnicalIndicatorsService → snapshot() → TechnicalIndicators fields
+
+Tolerance vs pandas-ta (same bars fed to both):
+    - Fixed-window indicators (SMA, WMA, Bollinger, stochastics, Williams %R,
+      CCI, MFI, CMF, ROC, momentum, Ichimoku, 20-period high/low, OBV over the
+      service window) match to float rounding (relative error < 1e-9).
+    - Recursive indicators (EMA, MACD, RSI, ATR, ADX/DI) are seeded with the SMA
+      of their first `length` inputs (Wilder/TA-Lib convention). pandas-ta
+      versions differ only in that seed, whose influence decays as
+      (1 - alpha) ** bars; after ~10 x length bars results agree within 1e-6
+      relative.
+
+CCI's mean absolute deviation has no exact O(1) recurrence, so it is computed
+over its fixed 20-value window; per-bar cost is still bounded by a constant.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+# Float epsilon used by pandas-ta's non_zero_range() when high == low
+_EPSILON = 2.220446049250313e-16
+
+# Re-sum running totals from the window every N pushes to stop drift
+_RESYNC_EVERY = 4096
+
+# TechnicalIndicators fields produced by the engine
+INDICATOR_FIELDS = (
+    "sma_10", "sma_20", "sma_50", "ema_10", "ema_20", "ema_50", "wma_20",
+    "rsi_14", "rsi_9", "stoch_k", "stoch_d", "williams_r",
+    "macd_value", "macd_signal", "macd_histogram",
+    "bollinger_upper", "bollinger_middle", "bollinger_lower",
+    "atr_14", "atr_20", "adx_14", "di_plus", "di_minus",
+    "ichimoku_tenkan", "ichimoku_kijun", "ichimoku_senkou_a", "ichimoku_senkou_b",
+    "obv", "volume_sma_20", "volume_rsi_14", "cmf_20",
+    "cci_20", "mfi_14", "roc_12", "momentum_10",
+    "high_20", "low_20",
+)
+
+
+class _Rolling:
+    """Fixed-length window with running mean and population variance."""
+
+    __slots__ = ("length", "values", "mean", "_m2", "_pushes")
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values: Deque[float] = deque(maxlen=length)
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._pushes = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.length
+
+    def push(self, value: float) -> None:
+        values = self.values
+        if len(values) < self.length:
+            n = len(values) + 1
+            delta = value - self.mean
+            self.mean += delta / n
+            self._m2 += delta * (value - self.mean)
+        else:
+            old = values[0]
+            old_mean = self.mean
+            self.mean = old_mean + (value - old) / self.length
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+        values.append(value)
+
+        self._pushes += 1
+        if self._pushes % _RESYNC_EVERY == 0:
+            self.mean = math.fsum(values) / len(values)
+            self._m2 = math.fsum((v - self.mean) ** 2 for v in values)
+
+    def average(self) -> Optional[float]:
+        return self.mean if self.full else None
+
+    def total(self) -> Optional[float]:
+        return self.mean * self.length if self.full else None
+
+    def stdev(self) -> Optional[float]:
+        """Population standard deviation (ddof=0) of the full window."""
+        if not self.full:
+            return None
+        return math.sqrt(max(self._m2, 0.0) / self.length)
+
+
+class _Wma:
+    """Linearly weighted moving average (newest value has weight `length`)."""
+
+    __slots__ = ("length", "values", "_sum", "_weighted", "_divisor", "_pushes")
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values: Deque[float] = deque(maxlen=length)
+        self._sum = 0.0
+        self._weighted = 0.0
+        self._divisor = length * (length + 1) / 2.0
+        self._pushes = 0
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.length:
+            # Every weight drops by one and the oldest value falls out
+            self._weighted += self.length * value - self._sum
+            self._sum += value - self.values[0]
+        else:
+            self._weighted += (len(self.values) + 1) * value
+            self._sum += value
+        self.values.append(value)
+
+        self._pushes += 1
+        if self._pushes % _RESYNC_EVERY == 0:
+            self._sum = math.fsum(self.values)
+            self._weighted = math.fsum(i * v for i, v in enumerate(self.values, start=1))
+
+    def value(self) -> Optional[float]:
+        if len(self.values) < self.length:
+            return None
+        return self._weighted / self._divisor
+
+
+class _Ema:
+    """Exponential average seeded with the SMA of the first `length` inputs.
+
+    With the default alpha this is the pandas-ta/TA-Lib EMA; pass
+    ``alpha=1/length`` for Wilder's RMA (used by RSI, ATR and ADX).
+    """
+
+    __slots__ = ("length", "alpha", "value", "_seed_sum", "_seed_count")
+
+    def __init__(self, length: int, alpha: Optional[float] = None):
+        self.length = length
+        self.alpha = alpha if alpha is not None else 2.0 / (length + 1)
+        self.value: Optional[float] = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+
+    def push(self, value: float) -> Optional[float]:
+        if self.value is None:
+            self._seed_sum += value
+            self._seed_count += 1
+            if self._seed_count == self.length:
+                self.value = self._seed_sum / self.length
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class _Extreme:
+    """Rolling max or min over `length` values (monotonic deque, amortized O(1))."""
+
+    __slots__ = ("length", "_is_max", "_queue", "_index")
+
+    def __init__(self, length: int, is_max: bool):
+        self.length = length
+        self._is_max = is_max
+        self._queue: Deque[Tuple[int, float]] = deque()
+        self._index = 0
+
+    def push(self, value: float) -> None:
+        queue = self._queue
+        if self._is_max:
+            while queue and queue[-1][1] <= value:
+                queue.pop()
+        else:
+            while queue and queue[-1][1] >= value:
+                queue.pop()
+        queue.append((self._index, value))
+        if queue[0][0] <= self._index - self.length:
+            queue.popleft()
+        self._index += 1
+
+    def value(self) -> Optional[float]:
+        if self._index < self.length:
+            return None
+        return self._queue[0][1]
+
+
+class _Channel:
+    """Highest high / lowest low over `length` bars."""
+
+    __slots__ = ("highest", "lowest")
+
+    def __init__(self, length: int):
+        self.highest = _Extreme(length, is_max=True)
+        self.lowest = _Extreme(length, is_max=False)
+
+    def push(self, high: float, low: float) -> None:
+        self.highest.push(high)
+        self.lowest.push(low)
+
+    def midpoint(self) -> Optional[float]:
+        hh, ll = self.highest.value(), self.lowest.value()
+        if hh is None or ll is None:
+            return None
+        return 0.5 * (hh + ll)
+
+
+class _Rsi:
+    """Wilder RSI over successive differences of the input."""
+
+    __slots__ = ("_gain", "_loss", "_previous")
+
+    def __init__(self, length: int):
+        self._gain = _Ema(length, alpha=1.0 / length)
+        self._loss = _Ema(length, alpha=1.0 / length)
+        self._previous: Optional[float] = None
+
+    def push(self, value: float) -> None:
+        if self._previous is not None:
+            change = value - self._previous
+            self._gain.push(change if change > 0 else 0.0)
+            self._loss.push(-change if change < 0 else 0.0)
+        self._previous = value
+
+    def value(self) -> Optional[float]:
+        gain, loss = self._gain.value, self._loss.value
+        if gain is None or loss is None or gain + loss == 0:
+            return None
+        return 100.0 * gain / (gain + loss)
+
+
+class _Obv:
+    """On-balance volume over the last `window` bars.
+
+    Mirrors pandas-ta run over a rolling window: the first bar of the window
+    counts as +volume, later bars are signed by the close-to-close change.
+    With ``window=None`` the sum runs over the whole stream.
+    """
+
+    __slots__ = ("_window", "_bars", "_signed_total", "_previous_close")
+
+    def __init__(self, window: Optional[int]):
+        self._window = window
+        # (signed volume, raw volume) per bar inside the window
+        self._bars: Deque[Tuple[float, float]] = deque()
+        self._signed_total = 0.0
+        self._previous_close: Optional[float] = None
+
+    def push(self, close: float, volume: float) -> None:
+        previous = self._previous_close
+        if previous is None or close > previous:
+            signed = volume
+        elif close < previous:
+            signed = -volume
+        else:
+            signed = 0.0
+        self._previous_close = close
+
+        self._bars.append((signed, volume))
+        self._signed_total += signed
+        if self._window is not None and len(self._bars) > self._window:
+            dropped, _ = self._bars.popleft()
+            self._signed_total -= dropped
+
+    def value(self) -> Optional[float]:
+        if not self._bars:
+            return None
+        first_signed, first_volume = self._bars[0]
+        return self._signed_total - first_signed + first_volume
+
+
+class StreamingIndicatorEngine:
+    """Constant-time-per-bar indicator state for a single instrument.
+
+    Produces the same indicator fields as the pandas-ta path in
+    `TechnicalIndicatorsService`; derived values (Bollinger width/%B, pivots,
+    signal strength) are still computed by the service.
+    """
+
+    def __init__(self, window_size: Optional[int] = 200):
+        """Initialize engine state.
+
+        Args:
+            window_size: Rolling window of the pandas path, used for OBV so both
+                engines agree. None accumulates OBV over the whole stream.
+        """
+        self.count = 0
+        self.last_bar: Optional[Dict[str, float]] = None
+        self.previous_bar: Optional[Dict[str, float]] = None
+
+        # Moving averages
+        self._sma = {length: _Rolling(length) for length in (10, 20, 50)}
+        self._ema = {length: _Ema(length) for length in (10, 20, 50)}
+        self._wma_20 = _Wma(20)
+
+        # Momentum
+        self._rsi = {length: _Rsi(length) for length in (14, 9)}
+        self._macd_fast = _Ema(12)
+        self._macd_slow = _Ema(26)
+        self._macd_signal = _Ema(9)
+        self._macd_value: Optional[float] = None
+        self._stoch_raw = _Rolling(3)
+        self._stoch_k = _Rolling(3)
+        self._closes: Deque[float] = deque(maxlen=13)  # ROC(12) and MOM(10)
+
+        # Volatility / trend strength
+        self._atr = {length: _Ema(length, alpha=1.0 / length) for length in (14, 20)}
+        self._dm_plus = _Ema(14, alpha=1.0 / 14)
+        self._dm_minus = _Ema(14, alpha=1.0 / 14)
+        self._adx = _Ema(14, alpha=1.0 / 14)
+
+        # Price channels (stochastics, Williams %R, Ichimoku, 20-period range)
+        self._channels = {length: _Channel(length) for length in (9, 14, 20, 26, 52)}
+        self._cloud: Deque[Tuple[Optional[float], Optional[float]]] = deque(maxlen=27)
+
+        # Volume
+        self._obv = _Obv(window_size)
+        self._volume_sma_20 = _Rolling(20)
+        self._volume_rsi_14 = _Rsi(14)
+        self._cmf_ad = _Rolling(20)
+        self._cmf_volume = _Rolling(20)
+        self._mfi_positive = _Rolling(14)
+        self._mfi_negative = _Rolling(14)
+        self._previous_typical: Optional[float] = None
+        self._cci_typical = _Rolling(20)
+
+        self._values: Dict[str, Optional[float]] = dict.fromkeys(INDICATOR_FIELDS)
+
+    def update(
+        self,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: Optional[float] = 0.0,
+    ) -> Dict[str, Optional[float]]:
+        """Apply one closed bar and return the latest indicator values."""
+        open_, high, low, close = float(open_), float(high), float(low), float(close)
+        volume = float(volume or 0.0)
+        previous_close = self.last_bar["close"] if self.last_bar else None
+
+        self.previous_bar = self.last_bar
+        self.last_bar = {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+        self.count += 1
+
+        for average in self._sma.values():
+            average.push(close)
+        for average in self._ema.values():
+            average.push(close)
+        self._wma_20.push(close)
+        for rsi in self._rsi.values():
+            rsi.push(close)
+
+        fast = self._macd_fast.push(close)
+        slow = self._macd_slow.push(close)
+        if fast is not None and slow is not None:
+            self._macd_value = fast - slow
+            self._macd_signal.push(self._macd_value)
+
+        self._closes.append(close)
+        for channel in self._channels.values():
+            channel.push(high, low)
+
+        # Stochastic %K/%D (14, 3, 3)
+        highest = self._channels[14].highest.value()
+        lowest = self._channels[14].lowest.value()
+        if highest is not None and lowest is not None:
+            self._stoch_raw.push(100.0 * (close - lowest) / ((highest - lowest) or _EPSILON))
+            stoch_k = self._stoch_raw.average()
+            if stoch_k is not None:
+                self._stoch_k.push(stoch_k)
+
+        # True range, ATR and directional movement
+        if previous_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+        for atr in self._atr.values():
+            atr.push(true_range)
+        if self.previous_bar is not None:
+            up = high - self.previous_bar["high"]
+            down = self.previous_bar["low"] - low
+            dm_plus = self._dm_plus.push(up if up > down and up > 0 else 0.0)
+            dm_minus = self._dm_minus.push(down if down > up and down > 0 else 0.0)
+            atr_14 = self._atr[14].value
+            if dm_plus is not None and dm_minus is not None and atr_14:
+                di_plus = 100.0 * dm_plus / atr_14
+                di_minus = 100.0 * dm_minus / atr_14
+                if di_plus + di_minus:
+                    self._adx.push(100.0 * abs(di_plus - di_minus) / (di_plus + di_minus))
+
+        # Ichimoku cloud: span values are plotted 26 bars ahead of when computed
+        tenkan = self._channels[9].midpoint()
+        kijun = self._channels[26].midpoint()
+        span_a = 0.5 * (tenkan + kijun) if tenkan is not None and kijun is not None else None
+        self._cloud.append((span_a, self._channels[52].midpoint()))
+
+        # Volume indicators
+        self._obv.push(close, volume)
+        self._volume_sma_20.push(volume)
+        self._volume_rsi_14.push(volume)
+        self._cmf_ad.push((2 * close - high - low) * volume / ((high - low) or _EPSILON))
+        self._cmf_volume.push(volume)
+
+        typical = (high + low + close) / 3.0
+        money_flow = typical * volume
+        previous_typical = self._previous_typical
+        self._mfi_positive.push(money_flow if previous_typical is not None and typical > previous_typical else 0.0)
+        self._mfi_negative.push(money_flow if previous_typical is not None and typical < previous_typical else 0.0)
+        self._previous_typical = typical
+        self._cci_typical.push(typical)
+
+        self._values = self._collect(close, typical)
+        return self._values
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Latest indicator values without advancing state."""
+        return dict(self._values)
+
+    def _collect(self, close: float, typical: float) -> Dict[str, Optional[float]]:
+        values: Dict[str, Optional[float]] = dict.fromkeys(INDICATOR_FIELDS)
+        values.update({
+            "sma_10": self._sma[10].average(),
+            "sma_20": self._sma[20].average(),
+            "sma_50": self._sma[50].average(),
+            "ema_10": self._ema[10].value,
+            "ema_20": self._ema[20].value,
+            "ema_50": self._ema[50].value,
+            "wma_20": self._wma_20.value(),
+            "rsi_14": self._rsi[14].value(),
+            "rsi_9": self._rsi[9].value(),
+            "stoch_k": self._stoch_k.values[-1] if self._stoch_k.values else None,
+            "stoch_d": self._stoch_k.average(),
+            "atr_14": self._atr[14].value,
+            "atr_20": self._atr[20].value,
+            "obv": self._obv.value(),
+            "volume_sma_20": self._volume_sma_20.average(),
+            "volume_rsi_14": self._volume_rsi_14.value(),
+            "high_20": self._channels[20].highest.value(),
+            "low_20": self._channels[20].lowest.value(),
+        })
+
+        # Williams %R (14)
+        highest = self._channels[14].highest.value()
+        lowest = self._channels[14].lowest.value()
+        values["williams_r"] = (
+            100.0 * ((close - lowest) / (highest - lowest) - 1)
+            if highest is not None and lowest is not None and highest != lowest
+            else None
+        )
+
+        # MACD (12, 26, 9)
+        signal = self._macd_signal.value
+        values["macd_value"] = self._macd_value
+        values["macd_signal"] = signal
+        values["macd_histogram"] = self._macd_value - signal if signal is not None else None
+
+        # Bollinger Bands (20, 2)
+        middle = self._sma[20].average()
+        deviation = self._sma[20].stdev()
+        if middle is not None and deviation is not None:
+            values["bollinger_middle"] = middle
+            values["bollinger_upper"] = middle + 2.0 * deviation
+            values["bollinger_lower"] = middle - 2.0 * deviation
+
+        # ADX / DI (14)
+        atr_14 = self._atr[14].value
+        if self._dm_plus.value is not None and self._dm_minus.value is not None and atr_14:
+            values["di_plus"] = 100.0 * self._dm_plus.value / atr_14
+            values["di_minus"] = 100.0 * self._dm_minus.value / atr_14
+        values["adx_14"] = self._adx.value
+
+        # Ichimoku (9, 26, 52) - current cloud is the span computed 26 bars ago
+        values["ichimoku_tenkan"] = self._channels[9].midpoint()
+        values["ichimoku_kijun"] = self._channels[26].midpoint()
+        if len(self._cloud) == self._cloud.maxlen:
+            values["ichimoku_senkou_a"], values["ichimoku_senkou_b"] = self._cloud[0]
+
+        # Chaikin Money Flow (20)
+        ad_total, volume_total = self._cmf_ad.total(), self._cmf_volume.total()
+        values["cmf_20"] = ad_total / volume_total if ad_total is not None and volume_total else None
+
+        # Money Flow Index (14)
+        positive, negative = self._mfi_positive.total(), self._mfi_negative.total()
+        values["mfi_14"] = (
+            100.0 * positive / (positive + negative)
+            if positive is not None and negative is not None and positive + negative > 0
+            else None
+        )
+
+        # Commodity Channel Index (20)
+        mean_typical = self._cci_typical.average()
+        if mean_typical is not None:
+            mean_deviation = sum(abs(v - mean_typical) for v in self._cci_typical.values) / self._cci_typical.length
+            if mean_deviation:
+                values["cci_20"] = (typical - mean_typical) / (0.015 * mean_deviation)
+
+        # Rate of change (12) and momentum (10)
+        closes = self._closes
+        if len(closes) == closes.maxlen and closes[0]:
+            values["roc_12"] = 100.0 * (close - closes[0]) / closes[0]
+        if len(closes) >= 11:
+            values["momentum_10"] = close - closes[-11]
+
+        return values
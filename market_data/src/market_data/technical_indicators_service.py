@@ -4,9 +4,14 @@ This service calculates comprehensive technical indicators using pandas and pand
 on historical OHLC data. Provides real-time indicators that traders actually use.
 
 Architecture:
-    OHLC Candles → Pandas DataFrame → Technical Calculations → Store in Redis
+    OHLC Candles → OHLCVRingBuffer (zero-copy views) → Technical Calculations → Store in Redis
+    Redis snapshot → one hash per instrument/timeframe (HGETALL), written in one pipeline
     Agent Analysis → get_indicators() → Read latest indicators
 
+Engines (selectable per instrument, see TechnicalIndicatorsService.set_engine):
+    - "pandas": re-runs pandas-ta over the rolling window on each candle (default)
+    - "streaming": StreamingIndicatorEngine updates running state in O(1) per candle
+
 Indicators calculated:
     - Moving Averages: SMA, EMA, WMA
     - Momentum: RSI, MACD, Stochastic
@@ -15,7 +20,9 @@ Indicators calculated:
     - Volume: OBV, Volume RSI
 """
 
+import json
 import logging
+import os
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 from collections import deque
@@ -24,8 +31,45 @@ import pandas_ta as ta
 from datetime import datetime, timedelta
 import redis
 
+from .ohlcv_ring import OHLCVRingBuffer, PRICE_COLUMNS
+from .streaming_indicators import StreamingIndicatorEngine
+
 logger = logging.getLogger(__name__)
 
+# Indicator engines selectable per instrument
+ENGINE_PANDAS = "pandas"        # Re-run pandas-ta over the rolling window on every candle
+ENGINE_STREAMING = "streaming"  # Incremental O(1)-per-bar state (StreamingIndicatorEngine)
+ENGINES = (ENGINE_PANDAS, ENGINE_STREAMING)
+
+# Redis layout: one hash per instrument and timeframe holding the whole snapshot
+INDICATORS_HASH_PREFIX = "indicators_hash"
+INDICATORS_TTL_SECONDS = 300
+
+
+def indicators_hash_key(instrument: str, timeframe: str = "1min") -> str:
+    """Redis key of the indicators snapshot hash for an instrument and timeframe."""
+    return f"{INDICATORS_HASH_PREFIX}:{instrument}:{timeframe}"
+
+
+def read_indicators_snapshot(redis_client, instrument: str, timeframe: str = "1min") -> Dict[str, Any]:
+    """Read an indicators snapshot with a single HGETALL.
+
+    Numeric fields are returned as floats, others (trend_direction, ...) as strings.
+
+    Returns:
+        Dictionary of indicators, empty if no snapshot is stored
+    """
+    raw = redis_client.hgetall(indicators_hash_key(instrument, timeframe)) or {}
+    snapshot: Dict[str, Any] = {}
+    for key, value in raw.items():
+        key = key.decode("utf-8") if isinstance(key, bytes) else key
+        value = value.decode("utf-8") if isinstance(value, bytes) else value
+        try:
+            snapshot[key] = float(value)
+        except (ValueError, TypeError):
+            snapshot[key] = value
+    return snapshot
+
 
 @dataclass
 class TechnicalIndicators:
@@ -134,21 +178,90 @@ class TechnicalIndicatorsService:
 
     This service uses pandas and pandas-ta to calculate comprehensive technical indicators
     on OHLC data. Maintains rolling windows of data for real-time indicator calculation.
+
+    Instruments can instead use the streaming engine (StreamingIndicatorEngine), which
+    updates every indicator in O(1) per closed candle rather than recalculating the window.
     """
 
-    def __init__(self, redis_client: Optional[redis.Redis] = None, window_size: int = 200):
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        window_size: int = 200,
+        engine: Optional[str] = None,
+        instrument_engines: Optional[Dict[str, str]] = None,
+        legacy_indicator_keys: Optional[bool] = None,
+        timeframe: str = "1min",
+    ):
         """Initialize technical indicators service.
 
         Args:
             redis_client: Redis client for caching indicators
             window_size: Number of candles to maintain for calculations (default 200 for robust indicators)
+            engine: Default indicator engine ("pandas" or "streaming").
+                    Defaults to TECHNICAL_INDICATORS_ENGINE env var, else "pandas".
+            instrument_engines: Per-instrument engine overrides, e.g. {"BANKNIFTY": "streaming"}
+            legacy_indicator_keys: Also write the per-field indicators:{instrument}:{field} keys
+                                   next to the snapshot hash, for readers not yet on HGETALL.
+                                   Defaults to INDICATORS_LEGACY_KEYS env var, else False.
+            timeframe: Candle timeframe this service's windows hold ("1min", "15min", ...);
+                       stamped on every snapshot and part of its Redis hash key.
         """
         self.redis_client = redis_client
+        self.timeframe = timeframe
         self.window_size = window_size
-        self._ohlc_data: Dict[str, pd.DataFrame] = {}  # instrument -> OHLC DataFrame
+        if legacy_indicator_keys is None:
+            legacy_indicator_keys = os.getenv("INDICATORS_LEGACY_KEYS", "false").lower() in ('1', 'true', 'yes')
+        self.legacy_indicator_keys = legacy_indicator_keys
+        self._ohlc_data: Dict[str, OHLCVRingBuffer] = {}  # instrument -> fixed-size OHLCV window
         self._data_windows: Dict[str, deque] = {}  # instrument -> deque of ticks (for tick-based updates)
         self._latest_indicators: Dict[str, TechnicalIndicators] = {}
-        
+
+        self.default_engine = self._validate_engine(
+            engine or os.getenv("TECHNICAL_INDICATORS_ENGINE", ENGINE_PANDAS)
+        )
+        self._instrument_engines: Dict[str, str] = {}
+        self._streaming_engines: Dict[str, StreamingIndicatorEngine] = {}
+        for instrument, instrument_engine in (instrument_engines or {}).items():
+            self.set_engine(instrument, instrument_engine)
+
+    @staticmethod
+    def _validate_engine(engine: str) -> str:
+        engine = (engine or "").lower()
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown indicator engine '{engine}', expected one of {ENGINES}")
+        return engine
+
+    def get_engine(self, instrument: str) -> str:
+        """Get the indicator engine used for an instrument."""
+        return self._instrument_engines.get(instrument, self.default_engine)
+
+    def set_engine(self, instrument: str, engine: str) -> None:
+        """Choose the indicator engine for an instrument.
+
+        Switching to the streaming engine warms it from the candles already held
+        for the instrument, so indicators stay continuous across the switch.
+
+        Args:
+            instrument: Instrument symbol
+            engine: "pandas" or "streaming"
+        """
+        engine = self._validate_engine(engine)
+        self._instrument_engines[instrument] = engine
+        if engine != ENGINE_STREAMING:
+            self._streaming_engines.pop(instrument, None)
+        elif instrument in self._ohlc_data:
+            self._warm_streaming_engine(instrument)
+
+    def _warm_streaming_engine(self, instrument: str) -> StreamingIndicatorEngine:
+        """Create a streaming engine for the instrument and replay held candles into it."""
+        streaming_engine = StreamingIndicatorEngine(window_size=self.window_size)
+        window = self._ohlc_data.get(instrument)
+        if window is not None:
+            for open_, high, low, close, volume in zip(*(window.view(name).tolist() for name in PRICE_COLUMNS)):
+                streaming_engine.update(open_, high, low, close, volume)
+        self._streaming_engines[instrument] = streaming_engine
+        return streaming_engine
+
     def update_tick(self, instrument: str, tick: Dict[str, Any]) -> TechnicalIndicators:
         """Update indicators based on new market tick.
         
@@ -177,35 +290,34 @@ class TechnicalIndicatorsService:
         self._latest_indicators[instrument] = indicators
 
         # Cache and publish to Redis if available
-        if self.redis_client:
-            try:
-                indicators_dict = asdict(indicators)
-                # Store each indicator as a key for quick lookup
-                for key, value in indicators_dict.items():
-                    if value is not None:
-                        self.redis_client.setex(f"indicators:{instrument}:{key}", 300, str(value))
-
-                # Publish a lightweight message with key indicators for real-time consumers
-                try:
-                    import json
-                    pub = {
-                        "instrument": instrument,
-                        "timestamp": indicators.timestamp,
-                        "current_price": indicators.current_price,
-                        # include important momentum/trend indicators used for signals
-                        "rsi_14": indicators.rsi_14,
-                        "macd_value": indicators.macd_value,
-                        "macd_signal": indicators.macd_signal,
-                        "adx_14": indicators.adx_14
-                    }
-                    self.redis_client.publish(f"indicators:{instrument}", json.dumps(pub))
-                except Exception as pub_err:
-                    logger.debug(f"Failed to publish indicators to Redis: {pub_err}")
-            except Exception as e:
-                logger.warning(f"Failed to cache indicators in Redis: {e}")
+        self._publish_indicators(instrument, indicators)
 
         return indicators
-    
+
+    def update_ticks(self, instrument: str, ticks: List[Dict[str, Any]]) -> Optional[TechnicalIndicators]:
+        """Update indicators with a batch of ticks, calculating and publishing once.
+
+        Used by batched tick writers; the resulting snapshot is the one update_tick
+        would leave after the last tick.
+
+        Args:
+            instrument: Instrument symbol
+            ticks: Ticks in arrival order
+
+        Returns:
+            Updated TechnicalIndicators object (the previous one if ticks is empty)
+        """
+        if not ticks:
+            return self._latest_indicators.get(instrument)
+        if instrument not in self._data_windows:
+            self._data_windows[instrument] = deque(maxlen=self.window_size)
+        self._data_windows[instrument].extend(ticks)
+
+        indicators = self._calculate_all_indicators(instrument)
+        self._latest_indicators[instrument] = indicators
+        self._publish_indicators(instrument, indicators)
+        return indicators
+
     def update_candle(self, instrument: str, candle: Dict[str, Any]) -> TechnicalIndicators:
         """Update indicators based on new OHLC candle using pandas.
 
@@ -216,25 +328,34 @@ class TechnicalIndicatorsService:
         Returns:
             Updated TechnicalIndicators object
         """
-        # Initialize DataFrame if needed
-        if instrument not in self._ohlc_data:
-            self._ohlc_data[instrument] = pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        # Initialize fixed-size window if needed
+        window = self._ohlc_data.get(instrument)
+        if window is None:
+            window = self._ohlc_data[instrument] = OHLCVRingBuffer(self.window_size)
 
-        # Add new candle to DataFrame
+        # Add new candle (overwrites the oldest once the window is full)
         new_row = {
-            'timestamp': pd.to_datetime(candle['start_at']) if isinstance(candle.get('start_at'), str)
-                        else pd.to_datetime(candle['timestamp']),
-            'open': candle['open'],
-            'high': candle['high'],
-            'low': candle['low'],
-            'close': candle['close'],
-            'volume': candle.get('volume', 0)
+            'timestamp': pd.Timestamp(candle['start_at']) if isinstance(candle.get('start_at'), str)
+                        else pd.Timestamp(candle['timestamp']),
+            'open': float(candle['open']),
+            'high': float(candle['high']),
+            'low': float(candle['low']),
+            'close': float(candle['close']),
+            'volume': float(candle.get('volume') or 0)
         }
+        window.append(
+            new_row['timestamp'].value, new_row['open'], new_row['high'],
+            new_row['low'], new_row['close'], new_row['volume']
+        )
 
-        # Append to DataFrame and maintain window size
-        self._ohlc_data[instrument].loc[len(self._ohlc_data[instrument])] = new_row
-        if len(self._ohlc_data[instrument]) > self.window_size:
-            self._ohlc_data[instrument] = self._ohlc_data[instrument].tail(self.window_size)
+        # Advance streaming state (O(1)); a fresh engine is warmed from the window instead
+        if self.get_engine(instrument) == ENGINE_STREAMING:
+            if instrument in self._streaming_engines:
+                self._streaming_engines[instrument].update(
+                    new_row['open'], new_row['high'], new_row['low'], new_row['close'], new_row['volume']
+                )
+            else:
+                self._warm_streaming_engine(instrument)
 
         # Calculate all indicators
         indicators = self._calculate_all_indicators(instrument)
@@ -243,33 +364,56 @@ class TechnicalIndicatorsService:
         self._latest_indicators[instrument] = indicators
 
         # Cache and publish to Redis if available
-        if self.redis_client:
-            try:
-                indicators_dict = asdict(indicators)
-                for key, value in indicators_dict.items():
-                    if value is not None:
-                        self.redis_client.setex(f"indicators:{instrument}:{key}", 300, str(value))
-
-                # Publish a lightweight message for real-time consumers
-                try:
-                    import json
-                    pub = {
-                        "instrument": instrument,
-                        "timestamp": indicators.timestamp,
-                        "current_price": indicators.current_price,
-                        "rsi_14": indicators.rsi_14,
-                        "macd_value": indicators.macd_value,
-                        "macd_signal": indicators.macd_signal,
-                        "adx_14": indicators.adx_14
-                    }
-                    self.redis_client.publish(f"indicators:{instrument}", json.dumps(pub))
-                except Exception as pub_err:
-                    logger.debug(f"Failed to publish indicators to Redis: {pub_err}")
-            except Exception as e:
-                logger.warning(f"Failed to cache indicators in Redis: {e}")
+        self._publish_indicators(instrument, indicators)
 
         return indicators
     
+    def _publish_indicators(self, instrument: str, indicators: TechnicalIndicators) -> None:
+        """Write the indicators snapshot to Redis and notify real-time consumers.
+
+        The snapshot is one hash (indicators_hash:{instrument}:{timeframe}) replaced,
+        expired and published in a single MULTI/EXEC pipeline round trip. With
+        legacy_indicator_keys the old per-field indicators:{instrument}:{field}
+        keys are queued into the same pipeline.
+        """
+        if not self.redis_client:
+            return
+
+        fields = {key: str(value) for key, value in asdict(indicators).items() if value is not None}
+        # Lightweight message with key indicators used for signals
+        message = json.dumps({
+            "instrument": instrument,
+            "timestamp": indicators.timestamp,
+            "current_price": indicators.current_price,
+            "timeframe": indicators.timeframe,
+            "rsi_14": indicators.rsi_14,
+            "macd_value": indicators.macd_value,
+            "macd_signal": indicators.macd_signal,
+            "adx_14": indicators.adx_14
+        })
+        channel = f"indicators:{instrument}"
+
+        try:
+            if not hasattr(self.redis_client, "pipeline"):
+                # Minimal clients without pipelining: per-field keys, one call each
+                for key, value in fields.items():
+                    self.redis_client.setex(f"indicators:{instrument}:{key}", INDICATORS_TTL_SECONDS, value)
+                self.redis_client.publish(channel, message)
+                return
+
+            hash_key = indicators_hash_key(instrument, indicators.timeframe)
+            pipe = self.redis_client.pipeline()
+            pipe.delete(hash_key)
+            pipe.hset(hash_key, mapping=fields)
+            pipe.expire(hash_key, INDICATORS_TTL_SECONDS)
+            if self.legacy_indicator_keys:
+                for key, value in fields.items():
+                    pipe.setex(f"indicators:{instrument}:{key}", INDICATORS_TTL_SECONDS, value)
+            pipe.publish(channel, message)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to cache indicators in Redis: {e}")
+
     def get_indicators(self, instrument: str) -> Optional[TechnicalIndicators]:
         """Get latest pre-calculated indicators for instrument.
         
@@ -304,7 +448,7 @@ class TechnicalIndicatorsService:
         return result
     
     def _calculate_all_indicators(self, instrument: str) -> TechnicalIndicators:
-        """Calculate comprehensive technical indicators using pandas and pandas-ta.
+        """Calculate comprehensive technical indicators with the instrument's engine.
 
         Args:
             instrument: Instrument symbol
@@ -312,192 +456,230 @@ class TechnicalIndicatorsService:
         Returns:
             Complete TechnicalIndicators object with all calculated indicators
         """
-        df = self._ohlc_data.get(instrument)
-        if df is None or len(df) < 20:  # Minimum data required
-            current_price = float(df["close"].iloc[-1]) if df is not None and len(df) > 0 else 0.0
+        window = self._ohlc_data.get(instrument)
+        if window is None or len(window) < 20:  # Minimum data required
+            current_price = float(window.close[-1]) if window is not None and len(window) > 0 else 0.0
             return TechnicalIndicators(
                 timestamp=datetime.now().isoformat(),
                 instrument=instrument,
-                current_price=current_price
+                current_price=current_price,
+                timeframe=self.timeframe
             )
 
-        current_price = float(df["close"].iloc[-1])
+        current_price = float(window.close[-1])
 
         indicators = TechnicalIndicators(
             timestamp=datetime.now().isoformat(),
             instrument=instrument,
-            current_price=current_price
+            current_price=current_price,
+            timeframe=self.timeframe
         )
 
         try:
-            # === TREND INDICATORS ===
-            # Moving Averages
-            if len(df) >= 10:
-                indicators.sma_10 = self._safe_float(ta.sma(df["close"], length=10))
-                indicators.ema_10 = self._safe_float(ta.ema(df["close"], length=10))
-
-            if len(df) >= 20:
-                indicators.sma_20 = self._safe_float(ta.sma(df["close"], length=20))
-                indicators.ema_20 = self._safe_float(ta.ema(df["close"], length=20))
-                indicators.wma_20 = self._safe_float(ta.wma(df["close"], length=20))
-
-            if len(df) >= 50:
-                indicators.sma_50 = self._safe_float(ta.sma(df["close"], length=50))
-                indicators.ema_50 = self._safe_float(ta.ema(df["close"], length=50))
-
-            # === MOMENTUM INDICATORS ===
-            if len(df) >= 14:
-                indicators.rsi_14 = self._safe_float(ta.rsi(df["close"], length=14))
-
-            if len(df) >= 9:
-                indicators.rsi_9 = self._safe_float(ta.rsi(df["close"], length=9))
-
-            if len(df) >= 14:
-                stoch = ta.stoch(df["high"], df["low"], df["close"])
-                if stoch is not None and len(stoch.columns) >= 2:
-                    indicators.stoch_k = self._safe_float(stoch.iloc[:, 0])  # STOCHk
-                    indicators.stoch_d = self._safe_float(stoch.iloc[:, 1])  # STOCHd
-
-                indicators.williams_r = self._safe_float(ta.willr(df["high"], df["low"], df["close"], length=14))
-
-            # MACD
-            if len(df) >= 26:
-                macd = ta.macd(df["close"])
-                if macd is not None and len(macd.columns) >= 3:
-                    indicators.macd_value = self._safe_float(macd.iloc[:, 0])    # MACD
-                    indicators.macd_signal = self._safe_float(macd.iloc[:, 1])   # MACDh
-                    indicators.macd_histogram = self._safe_float(macd.iloc[:, 2]) # MACDs
-
-            # === VOLATILITY INDICATORS ===
-            # Bollinger Bands
-            if len(df) >= 20:
-                bb = ta.bbands(df["close"], length=20)
-                if bb is not None and len(bb.columns) >= 3:
-                    indicators.bollinger_upper = self._safe_float(bb.iloc[:, 0])   # BBL
-                    indicators.bollinger_middle = self._safe_float(bb.iloc[:, 1])  # BBM
-                    indicators.bollinger_lower = self._safe_float(bb.iloc[:, 2])   # BBU
-                    # Calculate width and %B
-                    if indicators.bollinger_upper and indicators.bollinger_lower and indicators.bollinger_middle:
-                        indicators.bollinger_width = (indicators.bollinger_upper - indicators.bollinger_lower) / indicators.bollinger_middle
-                        indicators.bollinger_percent_b = (current_price - indicators.bollinger_lower) / (indicators.bollinger_upper - indicators.bollinger_lower) if (indicators.bollinger_upper - indicators.bollinger_lower) != 0 else 0
-
-            # ATR
-            if len(df) >= 14:
-                indicators.atr_14 = self._safe_float(ta.atr(df["high"], df["low"], df["close"], length=14))
-
-            if len(df) >= 20:
-                indicators.atr_20 = self._safe_float(ta.atr(df["high"], df["low"], df["close"], length=20))
-
-            # === TREND STRENGTH ===
-            if len(df) >= 14:
-                adx = ta.adx(df["high"], df["low"], df["close"], length=14)
-                if adx is not None and len(adx.columns) >= 3:
-                    indicators.adx_14 = self._safe_float(adx.iloc[:, 0])    # ADX
-                    indicators.di_plus = self._safe_float(adx.iloc[:, 1])  # DMP
-                    indicators.di_minus = self._safe_float(adx.iloc[:, 2]) # DMN
-
-            # Ichimoku Cloud (requires minimum data)
-            if len(df) >= 52:
-                ichimoku = ta.ichimoku(df["high"], df["low"], df["close"])
-                # ichimoku can return a tuple or DataFrame - handle both
-                if ichimoku is not None:
-                    if isinstance(ichimoku, tuple):
-                        # If tuple, skip ichimoku for now
-                        pass
-                    elif hasattr(ichimoku, 'columns') and len(ichimoku.columns) >= 5:
-                        indicators.ichimoku_tenkan = self._safe_float(ichimoku.iloc[:, 0])   # TENKAN
-                        indicators.ichimoku_kijun = self._safe_float(ichimoku.iloc[:, 1])    # KIJUN
-                        indicators.ichimoku_senkou_a = self._safe_float(ichimoku.iloc[:, 3]) # SENKOU_A
-                        indicators.ichimoku_senkou_b = self._safe_float(ichimoku.iloc[:, 4]) # SENKOU_B
-
-            # === VOLUME INDICATORS ===
-            if len(df) >= 1:
-                indicators.obv = self._safe_float(ta.obv(df["close"], df["volume"]))
-
-            if len(df) >= 20:
-                indicators.volume_sma_20 = self._safe_float(ta.sma(df["volume"], length=20))
-                indicators.volume_rsi_14 = self._safe_float(ta.rsi(df["volume"], length=14))
-
-            if len(df) >= 20:
-                indicators.cmf_20 = self._safe_float(ta.cmf(df["high"], df["low"], df["close"], df["volume"], length=20))
-
-            # === OSCILLATORS ===
-            if len(df) >= 20:
-                indicators.cci_20 = self._safe_float(ta.cci(df["high"], df["low"], df["close"], length=20))
-
-            if len(df) >= 14:
-                indicators.mfi_14 = self._safe_float(ta.mfi(df["high"], df["low"], df["close"], df["volume"], length=14))
-
-            if len(df) >= 12:
-                indicators.roc_12 = self._safe_float(ta.roc(df["close"], length=12))
+            if self.get_engine(instrument) == ENGINE_STREAMING:
+                streaming_engine = self._streaming_engines.get(instrument) or self._warm_streaming_engine(instrument)
+                self._apply_streaming_indicators(streaming_engine, indicators)
+            else:
+                self._apply_pandas_indicators(self._window_frame(window), indicators)
+            self._apply_derived_indicators(window, indicators)
+        except Exception as e:
+            logger.error(f"Error calculating indicators for {instrument}: {e}", exc_info=True)
 
-            if len(df) >= 10:
-                indicators.momentum_10 = self._safe_float(ta.mom(df["close"], length=10))
+        return indicators
 
-            # === SUPPORT/RESISTANCE ===
-            if len(df) >= 1:
-                # Use previous day's OHLC for pivot points (simplified)
-                prev_day = df.iloc[-2] if len(df) >= 2 else df.iloc[-1]
-                pivot_base = (prev_day["high"] + prev_day["low"] + prev_day["close"]) / 3
-                indicators.pivot_point = pivot_base
-                indicators.pivot_r1 = 2 * pivot_base - prev_day["low"]
-                indicators.pivot_r2 = pivot_base + (prev_day["high"] - prev_day["low"])
-                indicators.pivot_s1 = 2 * pivot_base - prev_day["high"]
-                indicators.pivot_s2 = pivot_base - (prev_day["high"] - prev_day["low"])
-
-            # === PRICE ACTION ===
-            if len(df) >= 20:
-                indicators.high_20 = float(df["high"].tail(20).max())
-                indicators.low_20 = float(df["low"].tail(20).min())
-                indicators.range_20 = indicators.high_20 - indicators.low_20
-
-            # === SIGNAL STRENGTH ===
-            # Composite signal based on multiple indicators (0-100 scale)
-            signal_score = 0
-            signal_count = 0
-
-            # RSI signals (30-70 range is neutral)
-            if indicators.rsi_14:
-                signal_count += 1
-                if indicators.rsi_14 < 30:
-                    signal_score += 100  # Oversold
-                elif indicators.rsi_14 > 70:
-                    signal_score += 0    # Overbought
-                else:
-                    signal_score += 50   # Neutral
+    def _apply_streaming_indicators(self, streaming_engine: StreamingIndicatorEngine,
+                                    indicators: TechnicalIndicators) -> None:
+        """Copy the streaming engine's latest values onto the indicators object (no recalculation)."""
+        for key, value in streaming_engine.snapshot().items():
+            setattr(indicators, key, value)
+
+    def _apply_pandas_indicators(self, df: pd.DataFrame, indicators: TechnicalIndicators) -> None:
+        """Calculate indicators by running pandas-ta over the whole rolling window."""
+        # === TREND INDICATORS ===
+        # Moving Averages
+        if len(df) >= 10:
+            indicators.sma_10 = self._safe_float(ta.sma(df["close"], length=10))
+            indicators.ema_10 = self._safe_float(ta.ema(df["close"], length=10))
+
+        if len(df) >= 20:
+            indicators.sma_20 = self._safe_float(ta.sma(df["close"], length=20))
+            indicators.ema_20 = self._safe_float(ta.ema(df["close"], length=20))
+            indicators.wma_20 = self._safe_float(ta.wma(df["close"], length=20))
+
+        if len(df) >= 50:
+            indicators.sma_50 = self._safe_float(ta.sma(df["close"], length=50))
+            indicators.ema_50 = self._safe_float(ta.ema(df["close"], length=50))
+
+        # === MOMENTUM INDICATORS ===
+        if len(df) >= 14:
+            indicators.rsi_14 = self._safe_float(ta.rsi(df["close"], length=14))
+
+        if len(df) >= 9:
+            indicators.rsi_9 = self._safe_float(ta.rsi(df["close"], length=9))
+
+        if len(df) >= 14:
+            stoch = ta.stoch(df["high"], df["low"], df["close"])
+            if stoch is not None and len(stoch.columns) >= 2:
+                indicators.stoch_k = self._safe_float(self._column(stoch, "STOCHk"))
+                indicators.stoch_d = self._safe_float(self._column(stoch, "STOCHd"))
+
+            indicators.williams_r = self._safe_float(ta.willr(df["high"], df["low"], df["close"], length=14))
+
+        # MACD
+        if len(df) >= 26:
+            macd = ta.macd(df["close"])
+            if macd is not None and len(macd.columns) >= 3:
+                indicators.macd_value = self._safe_float(self._column(macd, "MACD_"))
+                indicators.macd_signal = self._safe_float(self._column(macd, "MACDs_"))
+                indicators.macd_histogram = self._safe_float(self._column(macd, "MACDh_"))
+
+        # === VOLATILITY INDICATORS ===
+        # Bollinger Bands
+        if len(df) >= 20:
+            bb = ta.bbands(df["close"], length=20, std=2, ddof=0)
+            if bb is not None and len(bb.columns) >= 3:
+                indicators.bollinger_upper = self._safe_float(self._column(bb, "BBU"))
+                indicators.bollinger_middle = self._safe_float(self._column(bb, "BBM"))
+                indicators.bollinger_lower = self._safe_float(self._column(bb, "BBL"))
+
+        # ATR
+        if len(df) >= 14:
+            indicators.atr_14 = self._safe_float(ta.atr(df["high"], df["low"], df["close"], length=14))
+
+        if len(df) >= 20:
+            indicators.atr_20 = self._safe_float(ta.atr(df["high"], df["low"], df["close"], length=20))
+
+        # === TREND STRENGTH ===
+        if len(df) >= 14:
+            adx = ta.adx(df["high"], df["low"], df["close"], length=14)
+            if adx is not None and len(adx.columns) >= 3:
+                indicators.adx_14 = self._safe_float(self._column(adx, "ADX_"))
+                indicators.di_plus = self._safe_float(self._column(adx, "DMP_"))
+                indicators.di_minus = self._safe_float(self._column(adx, "DMN_"))
+
+        # Ichimoku Cloud (requires minimum data)
+        if len(df) >= 52:
+            ichimoku = ta.ichimoku(df["high"], df["low"], df["close"])
+            # pandas-ta returns (ichimoku DataFrame, forward span DataFrame)
+            if isinstance(ichimoku, tuple):
+                ichimoku = ichimoku[0]
+            if ichimoku is not None and hasattr(ichimoku, 'columns'):
+                indicators.ichimoku_tenkan = self._safe_float(self._column(ichimoku, "ITS_"))
+                indicators.ichimoku_kijun = self._safe_float(self._column(ichimoku, "IKS_"))
+                indicators.ichimoku_senkou_a = self._safe_float(self._column(ichimoku, "ISA_"))
+                indicators.ichimoku_senkou_b = self._safe_float(self._column(ichimoku, "ISB_"))
+
+        # === VOLUME INDICATORS ===
+        if len(df) >= 1:
+            indicators.obv = self._safe_float(ta.obv(df["close"], df["volume"]))
+
+        if len(df) >= 20:
+            indicators.volume_sma_20 = self._safe_float(ta.sma(df["volume"], length=20))
+            indicators.volume_rsi_14 = self._safe_float(ta.rsi(df["volume"], length=14))
+
+        if len(df) >= 20:
+            indicators.cmf_20 = self._safe_float(ta.cmf(df["high"], df["low"], df["close"], df["volume"], length=20))
+
+        # === OSCILLATORS ===
+        if len(df) >= 20:
+            indicators.cci_20 = self._safe_float(ta.cci(df["high"], df["low"], df["close"], length=20))
+
+        if len(df) >= 14:
+            indicators.mfi_14 = self._safe_float(ta.mfi(df["high"], df["low"], df["close"], df["volume"], length=14))
+
+        if len(df) >= 12:
+            indicators.roc_12 = self._safe_float(ta.roc(df["close"], length=12))
+
+        if len(df) >= 10:
+            indicators.momentum_10 = self._safe_float(ta.mom(df["close"], length=10))
+
+        # === PRICE ACTION ===
+        if len(df) >= 20:
+            indicators.high_20 = float(df["high"].tail(20).max())
+            indicators.low_20 = float(df["low"].tail(20).min())
+
+    @staticmethod
+    def _window_frame(window: OHLCVRingBuffer) -> pd.DataFrame:
+        """Wrap the window's column views for pandas-ta without copying them."""
+        return pd.DataFrame(
+            {name: pd.Series(window.view(name), copy=False) for name in PRICE_COLUMNS},
+            copy=False,
+        )
 
-            # MACD signals
-            if indicators.macd_histogram:
-                signal_count += 1
-                if indicators.macd_histogram > 0:
-                    signal_score += 75  # Bullish momentum
-                else:
-                    signal_score += 25  # Bearish momentum
-
-            # Bollinger Band position
-            if indicators.bollinger_percent_b:
-                signal_count += 1
-                if indicators.bollinger_percent_b < 0.2:
-                    signal_score += 100  # Near lower band (potential bounce)
-                elif indicators.bollinger_percent_b > 0.8:
-                    signal_score += 0    # Near upper band (potential reversal)
-                else:
-                    signal_score += 50   # Middle range
+    def _apply_derived_indicators(self, window: OHLCVRingBuffer, indicators: TechnicalIndicators) -> None:
+        """Calculate values derived from engine output (shared by both engines)."""
+        current_price = indicators.current_price
+
+        # Bollinger width and %B
+        if indicators.bollinger_upper and indicators.bollinger_lower and indicators.bollinger_middle:
+            indicators.bollinger_width = (indicators.bollinger_upper - indicators.bollinger_lower) / indicators.bollinger_middle
+            indicators.bollinger_percent_b = (current_price - indicators.bollinger_lower) / (indicators.bollinger_upper - indicators.bollinger_lower) if (indicators.bollinger_upper - indicators.bollinger_lower) != 0 else 0
+
+        # === SUPPORT/RESISTANCE ===
+        if len(window) >= 1:
+            # Use previous day's OHLC for pivot points (simplified)
+            prev_day = window.row(-2) if len(window) >= 2 else window.row(-1)
+            pivot_base = (prev_day["high"] + prev_day["low"] + prev_day["close"]) / 3
+            indicators.pivot_point = pivot_base
+            indicators.pivot_r1 = 2 * pivot_base - prev_day["low"]
+            indicators.pivot_r2 = pivot_base + (prev_day["high"] - prev_day["low"])
+            indicators.pivot_s1 = 2 * pivot_base - prev_day["high"]
+            indicators.pivot_s2 = pivot_base - (prev_day["high"] - prev_day["low"])
+
+        # === PRICE ACTION ===
+        if indicators.high_20 is not None and indicators.low_20 is not None:
+            indicators.range_20 = indicators.high_20 - indicators.low_20
+
+        # === SIGNAL STRENGTH ===
+        # Composite signal based on multiple indicators (0-100 scale)
+        signal_score = 0
+        signal_count = 0
+
+        # RSI signals (30-70 range is neutral)
+        if indicators.rsi_14:
+            signal_count += 1
+            if indicators.rsi_14 < 30:
+                signal_score += 100  # Oversold
+            elif indicators.rsi_14 > 70:
+                signal_score += 0    # Overbought
+            else:
+                signal_score += 50   # Neutral
 
-            # ADX trend strength
-            if indicators.adx_14:
-                signal_count += 1
-                if indicators.adx_14 > 25:
-                    signal_score += 80  # Strong trend
-                else:
-                    signal_score += 30  # Weak trend
+        # MACD signals
+        if indicators.macd_histogram:
+            signal_count += 1
+            if indicators.macd_histogram > 0:
+                signal_score += 75  # Bullish momentum
+            else:
+                signal_score += 25  # Bearish momentum
+
+        # Bollinger Band position
+        if indicators.bollinger_percent_b:
+            signal_count += 1
+            if indicators.bollinger_percent_b < 0.2:
+                signal_score += 100  # Near lower band (potential bounce)
+            elif indicators.bollinger_percent_b > 0.8:
+                signal_score += 0    # Near upper band (potential reversal)
+            else:
+                signal_score += 50   # Middle range
 
-            indicators.signal_strength = signal_score / max(signal_count, 1)
+        # ADX trend strength
+        if indicators.adx_14:
+            signal_count += 1
+            if indicators.adx_14 > 25:
+                signal_score += 80  # Strong trend
+            else:
+                signal_score += 30  # Weak trend
 
-        except Exception as e:
-            logger.error(f"Error calculating indicators for {instrument}: {e}", exc_info=True)
+        indicators.signal_strength = signal_score / max(signal_count, 1)
 
-        return indicators
+    @staticmethod
+    def _column(df: pd.DataFrame, prefix: str) -> Optional[pd.Series]:
+        """Find a pandas-ta output column by name prefix (column order differs across versions)."""
+        for column in df.columns:
+            if str(column).startswith(prefix):
+                return df[column]
+        return None
 
     def _safe_float(self, series_or_value) -> Optional[float]:
         """Safely extract float value from pandas Series or return None."""
@@ -0,0 +1,129 @@
+"""Import historical candles into the local columnar archive.
+
+Usage:
+    python -m market_data.tools.archive_import csv data/banknifty_1min.csv --instrument BANKNIFTY
+    python -m market_data.tools.archive_import zerodha --instrument "NIFTY BANK" \
+        --from 2025-01-01 --to 2025-12-31 --interval minute
+
+The archive root defaults to MARKET_DATA_ARCHIVE_DIR (else ./data/archive).
+"""
+
+import argparse
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from ..adapters.columnar_archive import ColumnarArchive, IST
+from ..adapters.historical_tick_replayer import find_instrument_token, zerodha_date_chunks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = os.getenv("MARKET_DATA_ARCHIVE_DIR", "data/archive")
+
+
+def zerodha_timeframe(interval: str) -> str:
+    """Archive timeframe for a Zerodha interval: "minute" -> "1min", "5minute" -> "5min"."""
+    interval = interval.lower()
+    if interval == "minute":
+        return "1min"
+    if interval.endswith("minute"):
+        return f"{interval[:-len('minute')]}min"
+    return interval
+
+
+def import_csv(archive: ColumnarArchive, path: Union[str, Path], instrument: str = "BANKNIFTY",
+               timeframe: str = "1min") -> int:
+    """Import a Date,Time,Open,High,Low,Close,Volume CSV (the replayer's CSV format).
+
+    Returns:
+        Number of candles written
+    """
+    df = pd.read_csv(path, dtype={"Date": str, "Time": str}).dropna(subset=["Date", "Time"])
+    timestamps = pd.to_datetime(df["Date"].str.strip() + " " + df["Time"].str.strip(), format="%Y-%m-%d %H:%M")
+    timestamps = timestamps.dt.tz_localize(IST)
+    return archive.write_candles(
+        instrument,
+        timeframe,
+        timestamps.dt.as_unit("ns").astype("int64").to_numpy(),
+        df["Open"].to_numpy(dtype=np.float64),
+        df["High"].to_numpy(dtype=np.float64),
+        df["Low"].to_numpy(dtype=np.float64),
+        df["Close"].to_numpy(dtype=np.float64),
+        df["Volume"].fillna(0).to_numpy(dtype=np.float64),
+    )
+
+
+def import_zerodha(archive: ColumnarArchive, kite, instrument_symbol: str, from_date: date, to_date: date,
+                   interval: str = "minute") -> int:
+    """Import candles from kite.historical_data(), fetched in interval-sized chunks.
+
+    Returns:
+        Number of candles written
+    """
+    instrument_token = find_instrument_token(kite, instrument_symbol)
+    if not instrument_token:
+        raise ValueError(f"Instrument token not found for {instrument_symbol}")
+
+    timeframe = zerodha_timeframe(interval)
+    written = 0
+    for chunk_start, chunk_end in zerodha_date_chunks(from_date, to_date, interval):
+        candles = kite.historical_data(
+            instrument_token=instrument_token,
+            from_date=chunk_start,
+            to_date=chunk_end,
+            interval=interval,
+            continuous=False,
+            oi=False
+        ) or []
+        if candles:
+            df = pd.DataFrame(candles)
+            timestamps = pd.to_datetime(df["date"])
+            timestamps = timestamps.dt.tz_localize(IST) if timestamps.dt.tz is None else timestamps.dt.tz_convert(IST)
+            written += archive.write_candles(
+                instrument_symbol,
+                timeframe,
+                timestamps.dt.as_unit("ns").astype("int64").to_numpy(),
+                df["open"], df["high"], df["low"], df["close"],
+                df["volume"].fillna(0) if "volume" in df else np.zeros(len(df)),
+            )
+        logger.info(f"Imported {len(candles)} {timeframe} candles for {instrument_symbol} ({chunk_start} to {chunk_end})")
+    return written
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Import historical candles into the columnar archive")
+    parser.add_argument("--root", default=DEFAULT_ARCHIVE_DIR, help="Archive root directory")
+    sources = parser.add_subparsers(dest="source", required=True)
+
+    csv_parser = sources.add_parser("csv", help="Import a Date,Time,Open,High,Low,Close,Volume CSV")
+    csv_parser.add_argument("path")
+    csv_parser.add_argument("--instrument", default="BANKNIFTY")
+    csv_parser.add_argument("--timeframe", default="1min")
+
+    zerodha_parser = sources.add_parser("zerodha", help="Import from Zerodha historical data")
+    zerodha_parser.add_argument("--instrument", default="NIFTY BANK")
+    zerodha_parser.add_argument("--from", dest="from_date", type=date.fromisoformat, required=True)
+    zerodha_parser.add_argument("--to", dest="to_date", type=date.fromisoformat, required=True)
+    zerodha_parser.add_argument("--interval", default="minute")
+
+    args = parser.parse_args()
+    archive = ColumnarArchive(args.root)
+    if args.source == "csv":
+        written = import_csv(archive, args.path, args.instrument, args.timeframe)
+    else:
+        from ..providers.factory import get_provider
+        kite = get_provider()
+        if kite is None:
+            parser.error("No Zerodha provider available (check credentials)")
+        written = import_zerodha(archive, kite, args.instrument, args.from_date, args.to_date, args.interval)
+    print(f"Wrote {written} rows to {archive.root}")
+
+
+if __name__ == "__main__":
+    main()
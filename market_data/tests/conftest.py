@@ -26,6 +26,12 @@ from unittest.mock import Mock, AsyncMock
 from market_data.contracts import MarketTick, OHLCBar
 
 
+@pytest.fixture(autouse=True)
+def isolated_instrument_cache(tmp_path, monkeypatch):
+    """Keep instrument master files written by tests out of the working tree."""
+    monkeypatch.setenv("INSTRUMENT_CACHE_DIR", str(tmp_path / "instruments"))
+
+
 @pytest.fixture
 def mock_kite():
     """Mock KiteConnect instance for testing."""
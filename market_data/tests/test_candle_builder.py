@@ -0,0 +1,211 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from market_data.adapters.candle_builder import CandleBuilder, MultiTimeframeCandleBuilder
+from market_data.adapters.redis_store import RedisMarketStore
+from market_data.contracts import MarketTick
+
+START = datetime(2026, 1, 9, 4, 0, tzinfo=timezone.utc)
+
+
+def _ticks(minutes: int, per_minute: int = 4):
+    for minute in range(minutes):
+        for i in range(per_minute):
+            price = 45000.0 + minute * 10 + (i % 3) * 2 - (i == 1) * 7
+            yield MarketTick(
+                instrument="BANKNIFTY",
+                timestamp=START + timedelta(minutes=minute, seconds=i * 15),
+                last_price=price,
+                volume=5,
+            )
+
+
+def test_rollups_match_direct_builders():
+    builder = MultiTimeframeCandleBuilder(timeframes=("1min", "5min", "15min"))
+    direct = {tf: CandleBuilder(timeframe=tf) for tf in ("5min", "15min")}
+    rolled, expected = [], []
+
+    for tick in _ticks(46):
+        rolled.extend(builder.process_tick(tick))
+        for direct_builder in direct.values():
+            closed = direct_builder.process_tick(tick)
+            if closed:
+                expected.append(closed)
+
+    for timeframe in ("5min", "15min"):
+        bars = [bar for bar in rolled if bar.timeframe == timeframe]
+        reference = [bar for bar in expected if bar.timeframe == timeframe]
+        assert len(bars) == {"5min": 9, "15min": 3}[timeframe]
+        for bar, ref in zip(bars, reference):
+            assert (bar.start_at, bar.open, bar.high, bar.low, bar.close, bar.volume) == \
+                (ref.start_at, ref.open, ref.high, ref.low, ref.close, ref.volume)
+
+
+def test_higher_timeframe_closes_with_last_base_bar():
+    builder = MultiTimeframeCandleBuilder(timeframes=("1min", "5min"))
+    closed = []
+    for tick in _ticks(6):
+        closed.extend(builder.process_tick(tick))
+
+    # The fifth minute closes on the first tick of the sixth, and with it the first 5min bar
+    assert [bar.timeframe for bar in closed] == ["1min"] * 4 + ["1min", "5min"]
+    assert closed[-1].start_at == START
+    assert closed[-1].volume == 5 * 4 * 5
+    assert builder.get_active_candle("BANKNIFTY", "5min") is None
+
+
+def test_per_timeframe_callbacks_and_force_close():
+    seen = {"all": [], "15min": []}
+    builder = MultiTimeframeCandleBuilder(
+        on_candle_close=seen["all"].append,
+        timeframe_callbacks={"15min": seen["15min"].append},
+    )
+    for tick in _ticks(20):
+        builder.process_tick(tick)
+    remaining = builder.force_close_all()
+
+    assert builder.timeframes == ("1min", "3min", "5min", "15min", "30min", "60min", "1d")
+    assert [bar.start_at for bar in seen["15min"]] == [START, START + timedelta(minutes=15)]
+    assert {bar.timeframe for bar in remaining} == set(builder.timeframes)
+    daily = [bar for bar in seen["all"] if bar.timeframe == "1d"]
+    assert len(daily) == 1 and daily[0].volume == 20 * 4 * 5
+
+
+def test_batch_matches_tick_by_tick():
+    ticks = list(_ticks(37))
+    timestamps = [tick.timestamp.timestamp() for tick in ticks]
+    prices = [tick.last_price for tick in ticks]
+    volumes = [tick.volume for tick in ticks]
+
+    scalar, batched = CandleBuilder(), CandleBuilder()
+    expected = [bar for bar in map(scalar.process_tick, ticks) if bar]
+    # Split mid-bucket: the second batch continues the active candle
+    closed = batched.process_ticks_batch("BANKNIFTY", timestamps[:50], prices[:50], volumes[:50], tz=timezone.utc)
+    closed += batched.process_ticks_batch("BANKNIFTY", timestamps[50:], prices[50:], volumes[50:], tz=timezone.utc)
+
+    assert len(closed) == len(expected) == 36
+    for bar, ref in zip(closed, expected):
+        assert (bar.start_at, bar.open, bar.high, bar.low, bar.close, bar.volume) == \
+            (ref.start_at, ref.open, ref.high, ref.low, ref.close, ref.volume)
+    assert batched.get_active_candle("BANKNIFTY").tick_count == 4
+
+
+def test_batch_rolls_up_and_validates_order():
+    builder = MultiTimeframeCandleBuilder(timeframes=("1min", "5min"))
+    start = START.timestamp()
+    timestamps = np.arange(start, start + 600, 15.0)
+    closed = builder.process_ticks_batch("BANKNIFTY", timestamps, np.linspace(100, 140, len(timestamps)))
+
+    assert [bar.timeframe for bar in closed].count("5min") == 1
+    with pytest.raises(ValueError):
+        builder.process_ticks_batch("BANKNIFTY", timestamps[::-1], timestamps)
+
+
+def test_late_ticks_are_dropped():
+    builder = CandleBuilder()
+    ticks = list(_ticks(3))
+    for tick in ticks[4:]:
+        builder.process_tick(tick)
+    assert builder.process_tick(ticks[0]) is None
+    assert builder.late_ticks == 1
+    assert builder.get_active_candle("BANKNIFTY").tick_count == 4
+
+
+def test_rejects_timeframes_not_multiple_of_base():
+    with pytest.raises(ValueError):
+        MultiTimeframeCandleBuilder(timeframes=("2min", "5min"))
+
+
+class FakeRedis:
+    def __init__(self):
+        self.kv = {}
+        self.zsets = {}
+
+    def ping(self):
+        return True
+
+    def setex(self, key, ttl, value):  # noqa: ARG002
+        self.kv[key] = value
+
+    def publish(self, channel, message):  # noqa: ARG002
+        pass
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, []).extend(mapping)
+
+    def zremrangebyscore(self, key, min_score, max_score):  # noqa: ARG002
+        pass
+
+
+def test_store_builds_every_timeframe_with_own_indicators():
+    redis = FakeRedis()
+    store = RedisMarketStore(redis, candle_timeframes=("1min", "5min"))
+    for tick in _ticks(11):
+        store.store_tick(tick)
+
+    assert len(redis.zsets["ohlc_sorted:BANKNIFTY:1min"]) == 10
+    assert len(redis.zsets["ohlc_sorted:BANKNIFTY:5min"]) == 2
+    five_minute = store._technical_services["5min"].get_indicators("BANKNIFTY")
+    assert five_minute.timeframe == "5min"
+    assert five_minute.current_price == pytest.approx(45000.0 + 9 * 10)
+
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def _session_ticks(day, tz=IST, naive=False):
+    """One tick per minute of the 09:15-15:30 IST session."""
+    open_ = datetime(day.year, day.month, day.day, 9, 15, tzinfo=IST)
+    for minute in range(376):
+        timestamp = (open_ + timedelta(minutes=minute)).astimezone(tz)
+        yield MarketTick(instrument="BANKNIFTY", timestamp=timestamp.replace(tzinfo=None) if naive else timestamp,
+                         last_price=45000.0 + minute, volume=1)
+
+
+def test_hourly_and_daily_bars_follow_the_ist_session():
+    builder = MultiTimeframeCandleBuilder(timeframes=("1min", "30min", "60min", "1d"))
+    bars = []
+    for tick in _session_ticks(datetime(2026, 1, 9)):
+        bars.extend(builder.process_tick(tick))
+    bars.extend(builder.force_close_all())
+
+    hourly = [bar for bar in bars if bar.timeframe == "60min"]
+    assert [bar.start_at.astimezone(IST).strftime("%H:%M") for bar in hourly] == \
+        ["09:15", "10:15", "11:15", "12:15", "13:15", "14:15", "15:15"]
+    assert [bar.volume for bar in hourly] == [60] * 6 + [16]  # 15:15-15:30 inclusive
+    assert [bar.start_at.astimezone(IST).strftime("%H:%M") for bar in bars if bar.timeframe == "30min"][:2] == \
+        ["09:15", "09:45"]
+
+    daily = [bar for bar in bars if bar.timeframe == "1d"]
+    assert len(daily) == 1 and daily[0].volume == 376
+    assert daily[0].start_at == datetime(2026, 1, 9, tzinfo=IST)
+
+
+def test_naive_and_aware_feeds_share_one_grid():
+    grids = []
+    for kwargs in ({"naive": True}, {"tz": timezone.utc}, {"tz": IST}):
+        builder = MultiTimeframeCandleBuilder(timeframes=("1min", "60min", "1d"))
+        bars = []
+        for tick in _session_ticks(datetime(2026, 1, 9), **kwargs):
+            bars.extend(builder.process_tick(tick))
+        bars.extend(builder.force_close_all())
+        grids.append([(bar.timeframe, bar.start_at.replace(tzinfo=bar.start_at.tzinfo or IST).timestamp(),
+                       bar.volume) for bar in bars if bar.timeframe != "1min"])
+
+    assert grids[0] == grids[1] == grids[2]
+    # Naive input gives naive IST wall-time bar starts
+    builder = CandleBuilder(timeframe="60min")
+    ticks = list(_session_ticks(datetime(2026, 1, 9), naive=True))[:61]
+    closed = [bar for bar in map(builder.process_tick, ticks) if bar]
+    assert closed[0].start_at == datetime(2026, 1, 9, 9, 15)
+
+
+def test_batch_buckets_follow_the_ist_session():
+    ticks = list(_session_ticks(datetime(2026, 1, 9)))
+    builder = CandleBuilder(timeframe="60min")
+    closed = builder.process_ticks_batch("BANKNIFTY", [tick.timestamp.timestamp() for tick in ticks],
+                                         [tick.last_price for tick in ticks], tz=IST)
+    assert [bar.start_at.strftime("%H:%M") for bar in closed] == ["09:15", "10:15", "11:15", "12:15", "13:15", "14:15"]
+    assert builder.get_active_candle("BANKNIFTY").start_time.strftime("%H:%M") == "15:15"
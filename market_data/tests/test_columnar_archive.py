@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data.adapters.columnar_archive import ColumnarArchive, IST
+from market_data.adapters.historical_tick_replayer import HistoricalTickReplayer
+from market_data.store import InMemoryMarketStore
+from market_data.tools.archive_import import import_csv, import_zerodha, zerodha_timeframe
+
+
+def _session(day: date, minutes: int = 375) -> pd.DatetimeIndex:
+    start = datetime(day.year, day.month, day.day, 9, 15, tzinfo=IST)
+    return pd.date_range(start, periods=minutes, freq="1min").as_unit("ns")
+
+
+def _write_days(archive: ColumnarArchive, days, minutes: int = 375) -> int:
+    timestamps = np.concatenate([_session(day, minutes).asi8 for day in days])
+    close = 45000 + np.arange(len(timestamps), dtype=np.float64)
+    return archive.write_candles("BANKNIFTY", "1min", timestamps, close - 1, close + 5, close - 5, close,
+                                 np.full(len(timestamps), 400))
+
+
+def test_partitions_by_ist_date_and_loads_memory_mapped(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    days = [date(2026, 1, 8), date(2026, 1, 9)]
+    assert _write_days(archive, days) == 750
+
+    assert archive.dates("BANKNIFTY", "1min") == days
+    assert archive.instruments() == ["BANKNIFTY"]
+
+    one_day = archive.load_candles("BANKNIFTY", start=days[1], end=days[1])
+    assert isinstance(one_day["close"], np.memmap)
+    assert len(one_day["close"]) == 375
+    assert pd.Timestamp(int(one_day["timestamp"][0]), tz="UTC").tz_convert(IST).hour == 9
+
+    both = archive.load_candles("BANKNIFTY")
+    assert len(both["timestamp"]) == 750
+    assert np.all(np.diff(both["timestamp"]) > 0)
+    assert archive.load_candles("BANKNIFTY", start=date(2026, 2, 1))["close"].size == 0
+
+
+def test_rewrite_merges_and_replaces_duplicates(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    _write_days(archive, [date(2026, 1, 9)], minutes=10)
+    index = _session(date(2026, 1, 9), 12)[8:]
+    archive.write_candles("BANKNIFTY", "1min", index.asi8, [1.0] * 4, [2.0] * 4, [0.5] * 4, [1.5] * 4, [7] * 4)
+
+    candles = archive.load_candles("BANKNIFTY")
+    assert len(candles["timestamp"]) == 12
+    assert candles["close"][7] == 45007.0
+    assert candles["close"][8:].tolist() == [1.5] * 4
+
+
+def test_ticks_use_their_own_columns(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    timestamps = _session(date(2026, 1, 9), 3).asi8
+    archive.write_ticks("BANKNIFTY", timestamps, [1.0, 2.0, 3.0], [5, 5, 5])
+    ticks = archive.load_ticks("BANKNIFTY")
+    assert ticks["last_price"].tolist() == [1.0, 2.0, 3.0]
+    with pytest.raises(ValueError):
+        archive.write("BANKNIFTY", "tick", {"last_price": [1.0]})
+
+
+def test_import_csv(tmp_path):
+    csv_path = tmp_path / "banknifty.csv"
+    csv_path.write_text(
+        "Date,Time,Open,High,Low,Close,Volume\n"
+        "2024-01-15,09:15,45000,45100,44950,45050,1500000\n"
+        "2024-01-15,09:16,45050,45120,45000,45110,900000\n"
+        "2024-01-16,09:15,45200,45250,45150,45180,1200000\n"
+    )
+    archive = ColumnarArchive(tmp_path / "archive")
+    assert import_csv(archive, csv_path) == 3
+    assert archive.dates("BANKNIFTY", "1min") == [date(2024, 1, 15), date(2024, 1, 16)]
+    assert archive.load_candles("BANKNIFTY", end=date(2024, 1, 15))["high"].tolist() == [45100.0, 45120.0]
+
+
+class FakeKite:
+    def __init__(self):
+        self.requests = []
+
+    def instruments(self, exchange):
+        return [{"tradingsymbol": "NIFTY BANK", "instrument_token": 260105}] if exchange == "NSE" else []
+
+    def historical_data(self, instrument_token, from_date, to_date, interval, continuous, oi):  # noqa: ARG002
+        self.requests.append((from_date, to_date))
+        start = datetime(from_date.year, from_date.month, from_date.day, 9, 15, tzinfo=IST)
+        return [
+            {"date": start + timedelta(minutes=i), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10}
+            for i in range(3)
+        ]
+
+
+def test_import_zerodha_in_chunks(tmp_path):
+    kite = FakeKite()
+    archive = ColumnarArchive(tmp_path)
+    written = import_zerodha(archive, kite, "NIFTY BANK", date(2026, 1, 1), date(2026, 3, 31))
+
+    assert kite.requests[0] == (date(2026, 1, 1), date(2026, 3, 1))
+    assert kite.requests[1] == (date(2026, 3, 2), date(2026, 3, 31))
+    assert written == 6
+    assert zerodha_timeframe("5minute") == "5min"
+    assert archive.dates("NIFTY BANK", "1min") == [date(2026, 1, 1), date(2026, 3, 2)]
+
+
+def test_replayer_loads_archive_like_csv(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    _write_days(archive, [date(2026, 1, 9)], minutes=5)
+
+    replayer = HistoricalTickReplayer(InMemoryMarketStore(), data_source=str(tmp_path), instrument_symbol="BANKNIFTY")
+    ticks = replayer._load_ticks()
+    expected = replayer._ohlc_to_ticks(
+        timestamp=_session(date(2026, 1, 9), 1)[0].to_pydatetime(),
+        open=44999.0, high=45005.0, low=44995.0, close=45000.0, volume=400, instrument="BANKNIFTY",
+    )
+
+    assert len(ticks) == 20
+    assert [(t.timestamp, t.last_price, t.volume) for t in islice(ticks, 4)] == \
+        [(t.timestamp, t.last_price, t.volume) for t in expected]
+    assert len(list(ticks)) == 20
+
+
+def test_replayer_expands_archive_per_day_on_demand(tmp_path, monkeypatch):
+    archive = ColumnarArchive(tmp_path)
+    days = [date(2026, 1, 8), date(2026, 1, 9), date(2026, 1, 12)]
+    _write_days(archive, days, minutes=5)
+    assert archive.count("BANKNIFTY", "1min", start=days[1]) == 10
+
+    loaded = []
+    load_candles = ColumnarArchive.load_candles
+    monkeypatch.setattr(ColumnarArchive, "load_candles",
+                        lambda self, *args: loaded.append(args[2]) or load_candles(self, *args))
+
+    replayer = HistoricalTickReplayer(InMemoryMarketStore(), data_source=str(tmp_path), instrument_symbol="BANKNIFTY",
+                                      from_date=days[1])
+    ticks = replayer._load_ticks()
+    assert len(ticks) == 40 and loaded == []  # counted from the column headers only
+
+    first = next(iter(ticks))
+    assert first.timestamp == _session(days[1], 1)[0].to_pydatetime()
+    assert loaded == [days[1]]
+    timestamps = [t.timestamp for t in ticks]
+    assert timestamps == sorted(timestamps)
+    assert loaded == [days[1], days[1], days[2]]
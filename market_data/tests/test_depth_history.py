@@ -0,0 +1,121 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from market_data.depth_history import DepthHistory, pack_depth, read_depth_snapshot, write_depth_snapshot
+
+START = datetime(2026, 10, 15, 10, 0)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.transactions = []
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    def ltrim(self, key, start, end):
+        self.data[key] = self.data.get(key, [])[start:end + 1]
+
+    def lrange(self, key, start, end):
+        return self.data.get(key, [])[start:None if end == -1 else end + 1]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self, transaction)
+
+
+class FakePipeline:
+    def __init__(self, redis_client, transaction):
+        self.redis_client = redis_client
+        self.transaction = transaction
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        self.redis_client.transactions.append((self.transaction, [name for name, _ in self.commands]))
+        for name, args in self.commands:
+            getattr(self.redis_client, name)(*args)
+
+
+def _book(bid, bid_qty, ask, ask_qty, levels=5, step=0.05):
+    return ([{"price": round(bid - i * step, 2), "quantity": bid_qty, "orders": 1} for i in range(levels)],
+            [{"price": round(ask + i * step, 2), "quantity": ask_qty, "orders": 1} for i in range(levels)])
+
+
+def test_snapshot_ring_and_legacy_keys_written_in_one_transaction():
+    r = FakeRedis()
+    for i in range(5):
+        write_depth_snapshot(r, "BANKNIFTYFUT", pack_depth(*_book(100 + i, 10, 100.05 + i, 20),
+                                                           START + timedelta(seconds=i)), history_length=3)
+
+    assert len(r.transactions) == 5
+    transaction, commands = r.transactions[0]
+    assert transaction and commands.count("set") == 6 and "lpush" in commands and "ltrim" in commands
+
+    assert len(r.data["depth:BANKNIFTYFUT:history"]) == 3
+    latest = read_depth_snapshot(r, "BANKNIFTYFUT")
+    assert latest["buy"][0] == [104, 10, 1] and (latest["tbq"], latest["taq"]) == (50, 100)
+    assert json.loads(r.data["depth:BANKNIFTYFUT:buy"])[0] == {"price": 104, "quantity": 10, "orders": 1}
+    assert r.data["depth:BANKNIFTYFUT:timestamp"] == (START + timedelta(seconds=4)).isoformat()
+    assert r.data["depth:BANKNIFTYFUT:total_ask_qty"] == 100
+
+    history = DepthHistory.load(r, "BANKNIFTYFUT", window=2)
+    assert history.bid_price[:, 0].tolist() == [103, 104]  # oldest first
+    assert len(DepthHistory.load(r, "BANKNIFTYFUT")) == 3
+
+
+def test_order_flow_and_book_imbalance():
+    books = [_book(100.0, 10, 100.1, 10), _book(100.0, 15, 100.1, 10),   # bid size up: +5
+             _book(100.05, 8, 100.1, 10),                                 # bid price up: +8
+             _book(100.05, 8, 100.1, 4)]                                  # ask size down: +6
+    history = DepthHistory([pack_depth(buy, sell, START) for buy, sell in books])
+
+    assert history.order_flow_imbalance().tolist() == pytest.approx([5, 8, 6])
+    assert history.book_imbalance()[0] == pytest.approx(0.5)
+    assert history.book_imbalance()[-1] == pytest.approx(8 / 12)
+
+
+def test_slippage_walks_levels_and_flags_thin_books():
+    buy, sell = _book(100.0, 10, 100.1, 10)
+    history = DepthHistory([pack_depth(buy, sell, START), pack_depth(buy[:1], sell[:1], START)])
+
+    # 25 lots: 10 @ 100.10, 10 @ 100.15, 5 @ 100.20 -> average 100.14
+    assert history.slippage("BUY", 25)[0] == pytest.approx(0.04)
+    assert np.isnan(history.slippage("BUY", 25)[1])
+    assert history.slippage("SELL", 10).tolist() == pytest.approx([0.0, 0.0])
+
+
+def test_window_summaries_used_by_the_liquidity_filter():
+    r = FakeRedis()
+    books = [_book(100.0, 10, 100.1, 10), _book(100.0, 15, 100.1, 10), _book(100.05, 8, 100.1, 4)]
+    for i, (buy, sell) in enumerate(books):
+        write_depth_snapshot(r, "BANKNIFTYFUT", pack_depth(buy, sell, START + timedelta(seconds=i)))
+
+    history = DepthHistory.load(r, "BANKNIFTYFUT", window=3)
+    signal = history.order_flow_signal()
+    # Flow +5 (bid size up), then +8 (bid price up) + 6 (ask size down); bids hold most of the book
+    assert signal["signal"] == "BUY_PRESSURE" and signal["snapshots"] == 3
+    assert signal["ofi"] == pytest.approx(19)
+    assert signal["book_imbalance"] == pytest.approx((50 / 100 + 75 / 125 + 40 / 60) / 3)
+    assert DepthHistory.load(r, "BANKNIFTYFUT", window=1).order_flow_signal() == {"signal": "NO_DATA"}
+
+    sell_side = DepthHistory([pack_depth(*_book(100.0, 5, 100.1, 20), START),
+                              pack_depth(*_book(99.95, 5, 100.1, 20), START)])
+    assert sell_side.order_flow_signal()["signal"] == "SELL_PRESSURE"
+
+    # 12 lots: 10 @ 100.10 + 2 @ 100.15 in the 10-lot books, 4 @ 100.10/100.15/100.20 in the 4-lot one
+    assert history.average_slippage("BUY", 12) == pytest.approx((0.1 / 12 * 2 + 0.05) / 3)
+    # 30 lots only fit in the two 10-lot books (10 @ 100.10/100.15/100.20); the thin book is skipped
+    assert history.average_slippage("BUY", 30) == pytest.approx(0.05)
+    assert history.average_slippage("BUY", 100) is None
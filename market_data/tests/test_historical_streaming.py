@@ -0,0 +1,103 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from core_kernel import time_service
+
+from market_data.adapters.columnar_archive import ColumnarArchive, IST
+from market_data.adapters.historical_tick_replayer import HistoricalTickReplayer
+from market_data.store import InMemoryMarketStore
+
+
+def _write_session(archive: ColumnarArchive, instrument: str, day: date, minutes: int, base: float, offset_s: int = 0):
+    start = datetime(day.year, day.month, day.day, 9, 15, offset_s, tzinfo=IST)
+    timestamps = pd.date_range(start, periods=minutes, freq="1min").as_unit("ns").asi8
+    close = base + np.arange(minutes, dtype=np.float64)
+    archive.write_candles(instrument, "1min", timestamps, close, close + 1, close - 1, close, np.full(minutes, 100))
+
+
+def test_streaming_merges_instruments_in_time_order(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    for day in (date(2026, 1, 8), date(2026, 1, 9)):
+        _write_session(archive, "BANKNIFTY", day, 5, 45000.0)
+        _write_session(archive, "NIFTY", day, 5, 21000.0, offset_s=5)
+
+    replayer = HistoricalTickReplayer(InMemoryMarketStore(), data_source=str(tmp_path),
+                                      streaming=True, instruments=["BANKNIFTY", "NIFTY"])
+    ticks = list(replayer._iter_ticks())
+
+    assert len(ticks) == 2 * 2 * 5 * 4
+    assert [t.timestamp for t in ticks] == sorted(t.timestamp for t in ticks)
+    assert [t.instrument for t in ticks[:4]] == ["BANKNIFTY", "NIFTY", "BANKNIFTY", "NIFTY"]
+
+    single = HistoricalTickReplayer(InMemoryMarketStore(), data_source=str(tmp_path), instrument_symbol="NIFTY")
+    assert [(t.timestamp, t.last_price, t.volume) for t in single._iter_ticks()] == \
+        [(t.timestamp, t.last_price, t.volume) for t in single._load_ticks()]
+
+
+class FakeKite:
+    def __init__(self):
+        self.requests = []
+
+    def instruments(self, exchange):
+        if exchange != "NSE":
+            return []
+        return [{"tradingsymbol": "NIFTY BANK", "instrument_token": 1},
+                {"tradingsymbol": "NIFTY 50", "instrument_token": 2}]
+
+    def historical_data(self, instrument_token, from_date, to_date, interval, continuous, oi):  # noqa: ARG002
+        self.requests.append((instrument_token, from_date))
+        start = datetime(from_date.year, from_date.month, from_date.day, 9, 15, tzinfo=IST)
+        return [
+            {"date": start + timedelta(minutes=i), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 8}
+            for i in range(3)
+        ]
+
+
+def test_streaming_zerodha_fetches_chunks_lazily():
+    kite = FakeKite()
+    replayer = HistoricalTickReplayer(
+        InMemoryMarketStore(), data_source="zerodha", kite=kite, streaming=True,
+        instruments=["NIFTY BANK", "NIFTY 50"], from_date=date(2025, 1, 1), to_date=date(2025, 12, 31),
+    )
+
+    first = list(islice(replayer._iter_ticks(), 4))
+    assert [t.instrument for t in first] == ["NIFTY BANK", "NIFTY 50", "NIFTY BANK", "NIFTY 50"]
+    # Only the first 60-day chunk of each instrument has been requested
+    assert kite.requests == [(1, date(2025, 1, 1)), (2, date(2025, 1, 1))]
+
+
+async def _run_replay(replayer):
+    replayer.running = True
+    await replayer._replay_loop()
+
+
+def test_streaming_replay_loop(tmp_path):
+    archive = ColumnarArchive(tmp_path)
+    _write_session(archive, "BANKNIFTY", date(2026, 1, 9), 10, 45000.0)
+    store = InMemoryMarketStore()
+    replayer = HistoricalTickReplayer(store, data_source=str(tmp_path), instrument_symbol="BANKNIFTY",
+                                      streaming=True, rebase=True, rebase_to=datetime(2026, 2, 2, 9, 15, tzinfo=IST))
+
+    asyncio.run(_run_replay(replayer))
+
+    assert replayer.ticks_loaded == replayer.ticks_replayed == 40
+    assert replayer.rebase_offset == datetime(2026, 2, 2, tzinfo=IST) - datetime(2026, 1, 9, tzinfo=IST)
+    assert store.get_latest_tick("BANKNIFTY").last_price == 45009.0
+
+
+def test_replay_advances_shared_virtual_clock_in_steps(tmp_path, monkeypatch):
+    archive = ColumnarArchive(tmp_path)
+    _write_session(archive, "BANKNIFTY", date(2026, 1, 9), 10, 45000.0)
+    monkeypatch.setenv("USE_VIRTUAL_TIME", "1")
+    monkeypatch.setattr(time_service, "_time_service", time_service.TimeService())
+    replayer = HistoricalTickReplayer(InMemoryMarketStore(), data_source=str(tmp_path), instrument_symbol="BANKNIFTY",
+                                      streaming=True, speed=1e6)
+
+    asyncio.run(_run_replay(replayer))
+
+    last_tick = datetime(2026, 1, 9, 9, 24, 45, tzinfo=IST)
+    assert time_service.now() == last_tick
+    assert replayer.virtual_clock.updates < replayer.ticks_replayed
@@ -0,0 +1,120 @@
+import pytest
+
+from market_data.technical_indicators_service import (
+    TechnicalIndicatorsService,
+    indicators_hash_key,
+    read_indicators_snapshot,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.kv = {}
+        self.hashes = {}
+        self.ttls = {}
+        self.published = []
+        self.executed = 0
+
+    def ping(self):
+        return True
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def setex(self, key, ttl, value):
+        self.kv[key] = value
+        self.ttls[key] = ttl
+
+    def get(self, key):
+        return self.kv.get(key)
+
+    def keys(self, pattern):
+        prefix = pattern.rstrip("*")
+        return [key for key in self.kv if key.startswith(prefix)]
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class FakePipeline:
+    """Queues commands and applies them on execute(), like a MULTI/EXEC pipeline."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        redis = self.redis
+        for name, args, kwargs in self.commands:
+            if name == "delete":
+                redis.hashes.pop(args[0], None)
+            elif name == "hset":
+                redis.hashes.setdefault(args[0], {}).update(kwargs["mapping"])
+            elif name == "expire":
+                redis.ttls[args[0]] = args[1]
+            else:
+                getattr(redis, name)(*args, **kwargs)
+        redis.executed += 1
+        self.commands = []
+
+
+def _feed(service: TechnicalIndicatorsService, count: int = 30) -> None:
+    for i in range(count):
+        service.update_candle("BANKNIFTY", {
+            "start_at": f"2026-01-09T10:{i:02d}:00",
+            "open": 100.0 + i, "high": 101.0 + i, "low": 99.0 + i, "close": 100.5 + i, "volume": 10,
+        })
+
+
+def test_snapshot_written_as_one_hash_per_pipeline():
+    redis = FakeRedis()
+    service = TechnicalIndicatorsService(redis_client=redis)
+    _feed(service)
+
+    assert redis.executed == 30
+    assert redis.kv == {}
+    assert redis.ttls[indicators_hash_key("BANKNIFTY")] == 300
+    assert len(redis.published) == 30
+    assert redis.published[-1][0] == "indicators:BANKNIFTY"
+
+    snapshot = read_indicators_snapshot(redis, "BANKNIFTY")
+    latest = service.get_indicators("BANKNIFTY")
+    assert snapshot["sma_20"] == pytest.approx(latest.sma_20)
+    assert snapshot["trend_direction"] == latest.trend_direction
+
+
+def test_legacy_keys_written_in_same_pipeline():
+    redis = FakeRedis()
+    service = TechnicalIndicatorsService(redis_client=redis, legacy_indicator_keys=True)
+    _feed(service, count=5)
+
+    assert redis.executed == 5
+    assert float(redis.kv["indicators:BANKNIFTY:current_price"]) == pytest.approx(104.5)
+
+
+
+def test_tick_batch_is_calculated_and_published_once():
+    batched, single = FakeRedis(), FakeRedis()
+    batch_service = TechnicalIndicatorsService(redis_client=batched)
+    tick_service = TechnicalIndicatorsService(redis_client=single)
+    _feed(batch_service)
+    _feed(tick_service)
+    ticks = [{"last_price": 130.0 + i, "volume": 5, "timestamp": f"2026-01-09T10:30:{i:02d}"} for i in range(4)]
+
+    published = len(batched.published)
+    result = batch_service.update_ticks("BANKNIFTY", ticks)
+    for tick in ticks:
+        tick_service.update_tick("BANKNIFTY", tick)
+
+    assert len(batched.published) == published + 1
+    assert result == batch_service.get_indicators("BANKNIFTY")
+    batch_snapshot, tick_snapshot = (redis.hgetall(indicators_hash_key("BANKNIFTY")) for redis in (batched, single))
+    batch_snapshot.pop("timestamp"), tick_snapshot.pop("timestamp")  # calculation wall time
+    assert batch_snapshot == tick_snapshot
+    assert batch_service.update_ticks("BANKNIFTY", []) is result
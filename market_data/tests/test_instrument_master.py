@@ -0,0 +1,103 @@
+import asyncio
+from datetime import date, datetime
+
+from market_data.adapters.historical_tick_replayer import find_instrument_token
+from market_data.adapters.mock_options_chain import MockOptionsChainAdapter
+from market_data.collectors.depth_collector import get_banknifty_futures_symbol
+from market_data.instrument_master import PROJECT_DIR, InstrumentMaster, get_instrument_master
+
+NEAR, FAR, EXPIRED = date(2026, 10, 27), date(2026, 11, 24), date(2026, 9, 29)
+
+
+def _option(symbol, token, expiry, strike, option_type):
+    return {"tradingsymbol": symbol, "instrument_token": token, "name": "BANKNIFTY", "expiry": expiry,
+            "strike": strike, "instrument_type": option_type, "exchange": "NFO"}
+
+
+class FakeKite:
+    def __init__(self):
+        self.downloads = []
+
+    def instruments(self, exchange):
+        self.downloads.append(exchange)
+        if exchange == "NSE":
+            return [{"tradingsymbol": "NIFTY BANK", "name": "NIFTY BANK", "instrument_token": 260105,
+                     "expiry": "", "strike": 0.0, "instrument_type": "EQ"}]
+        return [
+            {"tradingsymbol": "BANKNIFTY26SEPFUT", "instrument_token": 1, "name": "BANKNIFTY",
+             "expiry": EXPIRED, "strike": 0.0, "instrument_type": "FUT"},
+            {"tradingsymbol": "BANKNIFTY26NOVFUT", "instrument_token": 3, "name": "BANKNIFTY",
+             "expiry": FAR, "strike": 0.0, "instrument_type": "FUT"},
+            {"tradingsymbol": "BANKNIFTY26OCTFUT", "instrument_token": 2, "name": "BANKNIFTY",
+             "expiry": NEAR, "strike": 0.0, "instrument_type": "FUT"},
+            _option("BANKNIFTY26OCT45500PE", 12, NEAR, 45500.0, "PE"),
+            _option("BANKNIFTY26OCT45000CE", 10, NEAR, 45000.0, "CE"),
+            _option("BANKNIFTY26OCT45500CE", 11, NEAR, 45500.0, "CE"),
+            _option("BANKNIFTY26NOV46000CE", 20, FAR, 46000.0, "CE"),
+        ]
+
+    def ltp(self, symbols):
+        return {symbol: {"last_price": 100.0} for symbol in symbols}
+
+
+def test_indexes(tmp_path):
+    master = InstrumentMaster(FakeKite(), cache_dir=tmp_path)
+
+    assert master.by_symbol("NIFTY BANK")["instrument_token"] == 260105
+    assert master.by_token(11)["tradingsymbol"] == "BANKNIFTY26OCT45500CE"
+    assert master.contract("BANKNIFTY", "2026-10-27", 45500, "PE")["instrument_token"] == 12
+    assert master.expiries("BANKNIFTY") == [NEAR, FAR]
+    assert master.expiries("BANKNIFTY", "FUT") == [EXPIRED, NEAR, FAR]
+    assert master.strikes("BANKNIFTY", NEAR) == [45000.0, 45500.0]
+    assert [row["instrument_token"] for row in master.option_chain("BANKNIFTY", NEAR)] == [10, 11, 12]
+    assert master.nearest_future("BANKNIFTY", on=date(2026, 10, 16))["tradingsymbol"] == "BANKNIFTY26OCTFUT"
+    assert master.token_for("BANKNIFTY") == master.nearest_future("BANKNIFTY")["instrument_token"]
+
+
+def test_downloads_once_per_session_and_reuses_file(tmp_path):
+    kite = FakeKite()
+    master = InstrumentMaster(kite, cache_dir=tmp_path)
+    master.load("NFO", now=datetime(2026, 10, 16, 9, 0))
+    master.load("NFO", now=datetime(2026, 10, 16, 15, 0))
+    assert kite.downloads == ["NFO"]
+    assert (tmp_path / "instruments_NFO_2026-10-16.json.gz").exists()
+
+    # Another process on the same day reads the file
+    other_kite = FakeKite()
+    other = InstrumentMaster(other_kite, cache_dir=tmp_path)
+    assert other.load("NFO", now=datetime(2026, 10, 16, 10, 0)) == master.load("NFO", now=datetime(2026, 10, 16, 10, 0))
+    assert other_kite.downloads == []
+
+    master.load("NFO", now=datetime(2026, 10, 19, 9, 0))
+    assert kite.downloads == ["NFO", "NFO"]
+
+
+def test_offline_master_without_cache_file_is_empty(tmp_path):
+    master = InstrumentMaster(None, cache_dir=tmp_path)
+    assert master.load("NFO", now=datetime(2026, 10, 16, 9, 0)) == []
+    assert master.by_symbol("BANKNIFTY26OCTFUT") is None
+    assert list(tmp_path.iterdir()) == []  # nothing cached for the session
+
+
+def test_cache_dir_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("INSTRUMENT_CACHE_DIR")
+    assert get_instrument_master(FakeKite()).cache_dir == PROJECT_DIR / "data" / "instruments"
+    monkeypatch.setenv("INSTRUMENT_CACHE_DIR", "cache")
+    assert get_instrument_master(FakeKite()).cache_dir == PROJECT_DIR / "cache"
+    monkeypatch.setenv("INSTRUMENT_CACHE_DIR", "")
+    assert get_instrument_master(FakeKite()).cache_dir is None
+
+
+def test_consumers_share_one_master():
+    kite = FakeKite()
+    assert find_instrument_token(kite, "NIFTY BANK") == 260105
+    assert get_banknifty_futures_symbol(kite) == get_instrument_master(kite).nearest_future("BANKNIFTY")["tradingsymbol"]
+
+    adapter = MockOptionsChainAdapter(kite, "BANKNIFTY")
+    for _ in range(2):
+        chain = asyncio.run(adapter.fetch_options_chain(expiry="2026-10-27"))
+        assert chain["available"]
+        assert [strike["strike"] for strike in chain["strikes"]] == [45000, 45500]
+        assert chain["available_expiries"] == ["2026-10-27", "2026-11-24"]
+    assert sorted(kite.downloads) == ["NFO", "NSE"]
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+from market_data.adapters.mock_options_chain import MockOptionsChainAdapter
+from market_data.live_option_chain import LiveOptionChain
+
+EXPIRY = date(2026, 10, 27)
+
+
+def _option(symbol, token, strike, option_type):
+    return {"tradingsymbol": symbol, "instrument_token": token, "name": "BANKNIFTY", "expiry": EXPIRY,
+            "strike": strike, "instrument_type": option_type, "exchange": "NFO"}
+
+
+CONTRACTS = [
+    _option("BANKNIFTY26OCT45500PE", 12, 45500.0, "PE"),
+    _option("BANKNIFTY26OCT45000CE", 10, 45000.0, "CE"),
+    _option("BANKNIFTY26OCT45500CE", 11, 45500.0, "CE"),
+    _option("BANKNIFTY26OCT45000PE", 13, 45000.0, "PE"),
+]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def test_ticks_update_cells_in_place_by_token_or_symbol():
+    chain = LiveOptionChain("banknifty", EXPIRY, CONTRACTS)
+    assert chain.strike.tolist() == [45000.0, 45500.0]
+    assert sorted(chain.tokens) == [10, 11, 12, 13]
+
+    assert chain.apply_tick({"instrument_token": 10, "last_price": 420.5, "oi": 150000, "volume_traded": 900,
+                             "depth": {"buy": [{"price": 420.0}], "sell": [{"price": 421.0}]}})
+    assert chain.apply_tick({"instrument": "BANKNIFTY26OCT45500PE", "last_price": 310.0, "volume": 50,
+                             "timestamp": "2026-10-16T10:00:00"})
+    assert not chain.apply_tick({"instrument_token": 999, "last_price": 1.0})
+    # Partial ticks leave the other fields alone
+    assert chain.apply_ticks([{"instrument_token": 10, "last_price": 425.0}, {"instrument_token": 999}]) == 1
+
+    arrays = chain.snapshot()
+    assert arrays.ce_ltp[0] == 425.0 and arrays.ce_oi[0] == 150000 and arrays.ce_volume[0] == 900
+    assert arrays.pe_ltp[1] == 310.0 and np.isnan(arrays.ce_ltp[1])
+
+    data = chain.to_chain_dict()
+    assert data["available"] and data["total_contracts"] == 2 and data["source"] == "live"
+    assert data["strikes"][0]["CE"]["bid"] == 420.0 and data["strikes"][0]["PE"] is None
+    assert data["strikes"][1]["PE"]["timestamp"] == "2026-10-16T10:00:00"
+    assert [row["strike"] for row in chain.to_chain_dict(strikes=[45500])["strikes"]] == [45500]
+
+
+def test_snapshot_is_a_copy():
+    chain = LiveOptionChain("BANKNIFTY", EXPIRY, CONTRACTS)
+    chain.apply_tick({"instrument_token": 11, "last_price": 200.0})
+    before = chain.snapshot()
+    chain.apply_tick({"instrument_token": 11, "last_price": 250.0})
+    assert before.ce_ltp[1] == 200.0
+    assert chain.snapshot().ce_ltp[1] == 250.0
+
+
+def test_publish_delta_sends_only_changed_cells():
+    chain = LiveOptionChain("BANKNIFTY", EXPIRY, CONTRACTS)
+    redis = FakeRedis()
+    assert chain.publish_delta(redis) == 0
+
+    chain.apply_ticks([{"instrument_token": 12, "last_price": 300.0, "oi": 10},
+                       {"instrument_token": 10, "last_price": 400.0},
+                       {"instrument_token": 10, "last_price": 401.0}])
+    assert chain.publish_delta(redis) == 2
+    channel, message = redis.published[-1]
+    delta = json.loads(message)
+    assert channel == "options:chain:BANKNIFTY:2026-10-27"
+    assert delta["fields"][:4] == ["strike", "type", "ltp", "oi"]
+    assert delta["updates"] == [[45000.0, "CE", 401.0, None, None, None, None],
+                                [45500.0, "PE", 300.0, 10.0, None, None, None]]
+    assert chain.publish_delta(redis) == 0
+
+
+class FakeKite:
+    def __init__(self):
+        self.quotes = 0
+
+    def instruments(self, exchange):
+        return CONTRACTS if exchange == "NFO" else []
+
+    def ltp(self, symbols):
+        self.quotes += 1
+        return {symbol: {"last_price": 100.0, "oi": 5} for symbol in symbols}
+
+
+def test_adapter_serves_live_chain_without_polling():
+    kite = FakeKite()
+    adapter = MockOptionsChainAdapter(kite, "BANKNIFTY")
+
+    async def scenario():
+        chain = await adapter.live_chain(expiry="2026-10-27")
+        seeded = kite.quotes
+        chain.apply_tick({"instrument_token": 11, "last_price": 180.0})
+        served = await adapter.fetch_options_chain(expiry="2026-10-27")
+        adapter.drop_live_chain("BANKNIFTY")
+        polled = await adapter.fetch_options_chain(expiry="2026-10-27")
+        return seeded, served, polled
+
+    seeded, served, polled = asyncio.run(scenario())
+    assert seeded == 1
+    assert served["source"] == "live" and served["available_expiries"] == ["2026-10-27"]
+    assert served["strikes"][1]["CE"]["last_price"] == 180.0
+    assert served["strikes"][0]["PE"]["oi"] == 5
+    assert kite.quotes == 2 and polled["source"] == "mock_cache"
+
+
+def test_stale_live_chain_is_refreshed_from_the_broker():
+    kite = FakeKite()
+    adapter = MockOptionsChainAdapter(kite, "BANKNIFTY", max_live_age=10)
+
+    async def scenario():
+        chain = await adapter.live_chain(expiry="2026-10-27")
+        fresh = await adapter.fetch_options_chain(expiry="2026-10-27")
+        chain.last_update -= 60  # feed went quiet
+        stale = await adapter.fetch_options_chain(expiry="2026-10-27")
+        return chain, fresh, stale
+
+    chain, fresh, stale = asyncio.run(scenario())
+    assert fresh["source"] == "live" and stale["source"] == "mock_cache"
+    assert kite.quotes == 2  # seed + one fallback poll
+    assert chain.age() < 10  # the poll brought the live chain up to date
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+        self.channels = []
+        self.closed = threading.Event()
+
+    def subscribe(self, *channels):
+        self.channels.extend(channels)
+
+    def get_message(self, timeout=None):
+        if self.messages:
+            return self.messages.pop(0)
+        time.sleep(0.01)
+        return None
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeStoreRedis(FakeRedis):
+    def __init__(self, messages):
+        super().__init__()
+        self.pubsubs = []
+        self.messages = messages
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        self.pubsubs.append(FakePubSub(self.messages))
+        return self.pubsubs[-1]
+
+
+def test_live_feed_applies_store_ticks_and_publishes_deltas():
+    tick = {"instrument": "BANKNIFTY26OCT45000CE", "last_price": 432.0, "timestamp": "2026-10-16T10:00:00"}
+    redis = FakeStoreRedis([])
+    adapter = MockOptionsChainAdapter(FakeKite(), "BANKNIFTY")
+
+    async def scenario():
+        chain = await adapter.start_live_feed(redis, expiry="2026-10-27")
+        assert await adapter.start_live_feed(redis, expiry="2026-10-27") is chain
+        chain.pop_delta()  # drop the seed poll's changes
+        redis.messages.append({"type": "message", "channel": "market:tick:BANKNIFTY26OCT45000CE",
+                               "data": json.dumps(tick)})
+        for _ in range(200):
+            if chain.snapshot().ce_ltp[0] == 432.0:
+                break
+            await asyncio.sleep(0.01)
+        return chain
+
+    chain = asyncio.run(scenario())
+    assert len(redis.pubsubs) == 1
+    assert sorted(redis.pubsubs[0].channels) == sorted(f"market:tick:{row['tradingsymbol']}" for row in CONTRACTS)
+    assert chain.snapshot().ce_ltp[0] == 432.0
+    assert adapter.publish_live_deltas(redis) == 1
+    assert redis.published[-1][0] == "options:chain:BANKNIFTY:2026-10-27"
+
+    adapter.drop_live_chain()
+    assert redis.pubsubs[0].closed.wait(2)
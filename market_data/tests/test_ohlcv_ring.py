@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from market_data.ohlcv_ring import OHLCVRingBuffer
+from market_data.technical_indicators_service import TechnicalIndicatorsService
+
+
+def _fill(buffer: OHLCVRingBuffer, count: int) -> None:
+    for i in range(count):
+        buffer.append(i * 60_000_000_000, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10 * i)
+
+
+def test_append_keeps_latest_candles_in_order():
+    buffer = OHLCVRingBuffer(capacity=5)
+    _fill(buffer, 3)
+    assert len(buffer) == 3
+    assert buffer.close.tolist() == [100.5, 101.5, 102.5]
+
+    _fill(buffer, 12)
+    assert len(buffer) == 5
+    assert buffer.full
+    assert buffer.close.tolist() == [107.5, 108.5, 109.5, 110.5, 111.5]
+    assert buffer.timestamp.dtype == np.int64
+    assert buffer.timestamp[-1] == 11 * 60_000_000_000
+
+
+def test_views_are_contiguous_and_zero_copy():
+    buffer = OHLCVRingBuffer(capacity=4)
+    _fill(buffer, 7)
+
+    for view in (buffer.open, buffer.high, buffer.low, buffer.close, buffer.volume, buffer.timestamp):
+        assert view.flags["C_CONTIGUOUS"]
+        assert view.base is not None
+
+    frame = TechnicalIndicatorsService._window_frame(buffer)
+    assert np.shares_memory(frame["close"].to_numpy(), buffer.close)
+
+
+def test_memory_is_fixed_per_instrument():
+    buffer = OHLCVRingBuffer(capacity=200)
+    allocated = [buffer.view(name).base.nbytes for name in ("open", "close", "timestamp")]
+    _fill(buffer, 1000)
+    assert [buffer.view(name).base.nbytes for name in ("open", "close", "timestamp")] == allocated
+
+
+def test_row_indexing():
+    buffer = OHLCVRingBuffer(capacity=3)
+    _fill(buffer, 5)
+
+    assert buffer.row(0)["close"] == 102.5
+    assert buffer.row(-1)["volume"] == 40.0
+    with pytest.raises(IndexError):
+        buffer.row(3)
+
+
+def test_service_window_is_bounded():
+    service = TechnicalIndicatorsService(window_size=30)
+    for i in range(45):
+        service.update_candle("BANKNIFTY", {
+            "start_at": f"2026-01-09T10:{i:02d}:00",
+            "open": 100.0 + i, "high": 101.0 + i, "low": 99.0 + i, "close": 100.5 + i, "volume": 10,
+        })
+
+    window = service._ohlc_data["BANKNIFTY"]
+    assert len(window) == 30
+    assert window.close[0] == pytest.approx(115.5)
+    indicators = service.get_indicators("BANKNIFTY")
+    assert indicators.sma_20 == pytest.approx(float(np.mean(window.close[-20:])))
+    assert indicators.pivot_point == pytest.approx((144.0 + 142.0 + 143.5) / 3)
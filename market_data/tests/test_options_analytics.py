@@ -0,0 +1,111 @@
+import numpy as np
+
+from market_data.options_analytics import OIReference, OptionChainArrays
+
+
+def _naive_max_pain(strikes, ce_oi, pe_oi):
+    best, best_pain = None, float("inf")
+    for k in strikes:
+        pain = sum((k - s) * c for s, c in zip(strikes, ce_oi) if s < k)
+        pain += sum((s - k) * p for s, p in zip(strikes, pe_oi) if s > k)
+        if pain < best_pain:
+            best, best_pain = k, pain
+    return best
+
+
+def test_max_pain_matches_nested_loop():
+    rng = np.random.default_rng(7)
+    strikes = [44000.0 + 100 * i for i in range(40)]
+    ce_oi = rng.integers(0, 50_000, len(strikes)).tolist()
+    pe_oi = rng.integers(0, 50_000, len(strikes)).tolist()
+    # Shuffled input must be sorted internally
+    order = rng.permutation(len(strikes))
+    chain = OptionChainArrays.from_columns(
+        [strikes[i] for i in order], ce_oi=[ce_oi[i] for i in order], pe_oi=[pe_oi[i] for i in order]
+    )
+    assert chain.max_pain() == _naive_max_pain(strikes, ce_oi, pe_oi)
+
+
+def test_builders_accept_nested_flat_and_leg_formats():
+    nested = OptionChainArrays.from_strikes([
+        {"strike": 45100, "CE": {"last_price": 80, "oi": 300, "volume": 10}, "PE": {"last_price": 120, "oi": 100}},
+        {"strike": 45000, "CE": {"last_price": 150, "oi": 100}, "PE": None},
+    ])
+    flat = OptionChainArrays.from_strikes([
+        {"strike": 45000, "ce_ltp": 150, "ce_oi": 100, "pe_ltp": None, "pe_oi": 0},
+        {"strike": 45100, "ce_ltp": 80, "ce_oi": 300, "ce_volume": 10, "pe_ltp": 120, "pe_oi": 100},
+    ])
+    legs = OptionChainArrays.from_legs(
+        [{"strike": 45000, "price": 150, "oi": 100}, {"strike": 45100, "price": 80, "oi": 300, "volume": 10}],
+        [{"strike": 45100, "price": 120, "oi": 100}],
+    )
+    for chain in (nested, flat, legs):
+        assert chain.strike.tolist() == [45000.0, 45100.0]
+        assert chain.ce_oi.tolist() == [100.0, 300.0]
+        assert chain.pe_oi.tolist() == [0.0, 100.0]
+        assert np.isnan(chain.pe_ltp[0])
+
+
+def test_summary_pcr_walls_and_concentration():
+    chain = OptionChainArrays.from_columns(
+        [44800, 44900, 45000, 45100, 45200],
+        ce_oi=[10, 20, 30, 90, 50],
+        pe_oi=[80, 60, 40, 10, 5],
+        ce_volume=[1, 1, 1, 1, 1],
+        pe_volume=[2, 2, 2, 2, 2],
+    )
+    summary = chain.summary(spot=45050, wall_count=2)
+    assert summary["pcr"] == 195 / 200
+    assert summary["volume_pcr"] == 2.0
+    assert summary["support"] == [44800.0, 44900.0]
+    assert summary["resistance"] == [45100.0, 45200.0]
+    assert summary["max_call_oi_strike"] == 45100.0
+    assert summary["max_put_oi_strike"] == 44800.0
+    assert summary["oi_concentration"]["ce"] == 170 / 200
+
+
+def test_change_in_oi_against_previous_snapshot():
+    previous = OptionChainArrays.from_columns([45000, 45100], ce_oi=[100, 200], pe_oi=[50, 50])
+    current = OptionChainArrays.from_columns([45000, 45100, 45200], ce_oi=[150, 180, 40], pe_oi=[50, 70, 0])
+    change = current.change_in_oi(previous)
+    assert change["ce"].tolist() == [50.0, -20.0, 40.0]
+    assert change["pe"].tolist() == [0.0, 20.0, 0.0]
+    summary = current.summary(previous=previous)
+    assert summary["call_oi_change"] == 70
+    assert summary["put_oi_change"] == 20
+
+
+def test_oi_reference_is_the_session_open_snapshot():
+    clock = [1792124100.0]  # 2026-10-16 09:45 IST
+    book = OIReference("session", clock=lambda: clock[0])
+    first = OptionChainArrays.from_columns([45000], ce_oi=[100], pe_oi=[50])
+    reference, info = book.update(("BANKNIFTY", "2026-10-27"), first)
+    assert reference is first and info["type"] == "session_open" and info["age_seconds"] == 0
+
+    clock[0] += 3
+    reference, info = book.update(("BANKNIFTY", "2026-10-27"), OptionChainArrays.from_columns([45000], ce_oi=[130]))
+    assert reference is first and info["as_of"] == "2026-10-16T09:45:00+05:30" and info["age_seconds"] == 3
+
+    clock[0] += 86400  # next session starts over
+    today = OptionChainArrays.from_columns([45000], ce_oi=[10])
+    assert book.update(("BANKNIFTY", "2026-10-27"), today)[0] is today
+
+
+def test_oi_reference_over_an_interval():
+    clock = [1000.0]
+    book = OIReference(300, clock=lambda: clock[0])
+    snapshots = []
+    for _ in range(200):  # one snapshot every 3 s, like the background refresh
+        snapshots.append(OptionChainArrays.from_columns([45000], ce_oi=[len(snapshots)]))
+        reference, info = book.update("key", snapshots[-1])
+        clock[0] += 3
+    assert info["type"] == "interval" and info["interval_seconds"] == 300.0
+    assert info["age_seconds"] == 300.0 and reference is snapshots[-101]
+    assert len(book._snapshots["key"]) == 101
+
+
+def test_empty_chain():
+    chain = OptionChainArrays.from_strikes([])
+    assert chain.max_pain() is None
+    assert chain.pcr() is None
+    assert chain.summary()["support"] == []
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from market_data.options_chain_cache import OptionsChainCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Builder:
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    async def __call__(self, instrument, expiry):
+        self.calls.append((instrument, expiry))
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("quote failed")
+        return {"instrument": instrument, "expiry": expiry, "fetch": len(self.calls)}
+
+
+def test_concurrent_callers_share_one_fetch():
+    builder = Builder()
+    cache = OptionsChainCache(builder, ttl=5)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get("banknifty") for _ in range(10)),
+                                    cache.get("BANKNIFTY", "2026-10-27"))
+
+    results = asyncio.run(scenario())
+    assert set(builder.calls) == {("banknifty", None), ("BANKNIFTY", "2026-10-27")}
+    assert all(result is results[0] for result in results[:10])
+
+
+def test_snapshot_reused_until_ttl_expires():
+    builder, clock = Builder(), Clock()
+    cache = OptionsChainCache(builder, ttl=5, clock=clock)
+
+    async def scenario():
+        first = await cache.get("BANKNIFTY")
+        clock.now = 4.9
+        second = await cache.get("BANKNIFTY")
+        clock.now = 5.0
+        third = await cache.get("BANKNIFTY")
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first is second
+    assert third["fetch"] == 2
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    builder = Builder()
+    builder.fail = True
+    cache = OptionsChainCache(builder, ttl=5)
+
+    async def scenario():
+        results = await asyncio.gather(cache.get("BANKNIFTY"), cache.get("BANKNIFTY"), return_exceptions=True)
+        builder.fail = False
+        return results, await cache.get("BANKNIFTY")
+
+    failures, recovered = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in failures)
+    assert len(builder.calls) == 2
+    assert recovered["fetch"] == 2
+
+
+def test_refresh_active_rebuilds_recently_read_chains_only():
+    builder, clock = Builder(), Clock()
+    cache = OptionsChainCache(builder, ttl=5, idle_after=60, clock=clock)
+
+    async def scenario():
+        await cache.get("BANKNIFTY")
+        clock.now = 30
+        await cache.get("NIFTY", "2026-10-28")
+        clock.now = 70
+        refreshed = await cache.refresh_active()
+        # Fresh from the background refresh: no fetch on read
+        snapshot = await cache.get("NIFTY", "2026-10-28")
+        return refreshed, snapshot
+
+    refreshed, snapshot = asyncio.run(scenario())
+    assert refreshed == 1
+    assert builder.calls[-1] == ("NIFTY", "2026-10-28")
+    assert snapshot["fetch"] == 3 and len(builder.calls) == 3
+
+
+def test_run_refresh_skips_closed_market():
+    builder = Builder()
+    cache = OptionsChainCache(builder, ttl=5)
+
+    async def scenario():
+        await cache.get("BANKNIFTY")
+        task = asyncio.create_task(cache.run_refresh(0.01, market_open=lambda now: False))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert len(builder.calls) == 1
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import numpy as np
+
+from market_data.options_analytics import OptionChainArrays
+from market_data.options_greeks import (
+    IST, black_price, chain_greeks, greeks, implied_forward, implied_volatility, years_to_expiry,
+)
+
+FORWARD, T, RATE = 45000.0, 7 / 365, 0.065
+STRIKES = np.arange(42000.0, 48000.0, 100.0)
+SMILE = 0.14 + 0.5 * ((STRIKES - FORWARD) / FORWARD) ** 2
+
+
+def test_implied_volatility_recovers_smile_for_calls_and_puts():
+    for is_call in (True, False):
+        prices = black_price(FORWARD, STRIKES, T, SMILE, RATE, is_call)
+        iv = implied_volatility(prices, FORWARD, STRIKES, T, RATE, is_call)
+        np.testing.assert_allclose(iv, SMILE, atol=1e-6)
+
+
+def test_unsolvable_prices_are_nan():
+    iv = implied_volatility([0.0, 50000.0, np.nan, 300.0], FORWARD, [45000.0, 45000.0, 45000.0, 45000.0], T, RATE)
+    assert np.isnan(iv[:3]).all()
+    assert 0.05 < iv[3] < 0.5
+
+
+def test_greeks_match_finite_differences():
+    vol, strike = 0.15, 45500.0
+    g = greeks(FORWARD, strike, T, vol, RATE, True)
+    bump = 1.0
+    up = black_price(FORWARD + bump, strike, T, vol, RATE, True)
+    down = black_price(FORWARD - bump, strike, T, vol, RATE, True)
+    mid = black_price(FORWARD, strike, T, vol, RATE, True)
+    assert abs(g["delta"] - (up - down) / (2 * bump)) < 1e-4
+    assert abs(g["gamma"] - (up - 2 * mid + down) / bump ** 2) < 1e-5
+    vega = (black_price(FORWARD, strike, T, vol + 0.005, RATE, True)
+            - black_price(FORWARD, strike, T, vol - 0.005, RATE, True))
+    assert abs(g["vega"] - vega) < 0.01
+    theta = (black_price(FORWARD, strike, T - 0.5 / 365, vol, RATE, True)
+             - black_price(FORWARD, strike, T + 0.5 / 365, vol, RATE, True))
+    assert abs(g["theta"] / theta - 1) < 0.01
+    put = greeks(FORWARD, strike, T, vol, RATE, False)
+    assert abs((g["delta"] - put["delta"]) - np.exp(-RATE * T)) < 1e-9
+
+
+def test_chain_greeks_uses_parity_forward_when_no_futures_price():
+    calls = black_price(FORWARD, STRIKES, T, SMILE, RATE, True)
+    puts = black_price(FORWARD, STRIKES, T, SMILE, RATE, False)
+    assert abs(implied_forward(STRIKES, calls, puts, T, RATE) - FORWARD) < 1e-6
+
+    chain = OptionChainArrays.from_columns(STRIKES, ce_ltp=calls, pe_ltp=puts)
+    solved = chain_greeks(chain, T, rate=RATE)
+    np.testing.assert_allclose(solved["ce_iv"], SMILE * 100, atol=1e-3)
+    np.testing.assert_allclose(solved["pe_iv"], SMILE * 100, atol=1e-3)
+    atm = int(np.flatnonzero(STRIKES == FORWARD)[0])
+    assert 0.45 < solved["ce_delta"][atm] < 0.55
+    assert -0.55 < solved["pe_delta"][atm] < -0.45
+
+
+def test_chain_greeks_without_prices_is_all_nan():
+    chain = OptionChainArrays.from_columns([45000, 45100])
+    solved = chain_greeks(chain, T)
+    assert set(solved) >= {"ce_iv", "pe_delta", "ce_gamma", "pe_theta", "ce_vega"}
+    assert all(np.isnan(values).all() for values in solved.values())
+
+
+def test_years_to_expiry_counts_to_expiry_close():
+    now = datetime(2026, 10, 27, 9, 30, tzinfo=IST)
+    assert abs(years_to_expiry("2026-10-27", now) - 360 / (365 * 24 * 60)) < 1e-12
+    assert years_to_expiry("2026-10-20", now) == 1 / (365 * 24 * 60)
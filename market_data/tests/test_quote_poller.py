@@ -0,0 +1,127 @@
+import json
+
+from market_data.collectors.depth_collector import DepthCollector
+from market_data.collectors.ltp_collector import LTPDataCollector
+from market_data.collectors.quote_poller import QuotePoller
+
+DEPTH = {"buy": [{"price": 45240.0, "quantity": 75, "orders": 3}],
+         "sell": [{"price": 45245.0, "quantity": 50, "orders": 2}]}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    def ltrim(self, key, start, end):
+        self.data[key] = self.data.get(key, [])[start:end + 1]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        for name, args in self.commands:
+            getattr(self.redis_client, name)(*args)
+
+
+class FakeKite:
+    def __init__(self, known):
+        self.known = dict(known)
+        self.calls = []
+
+    def quote(self, symbols):
+        self.calls.append(list(symbols))
+        return {s: {"last_price": self.known[s], "volume": 10, "depth": DEPTH} for s in symbols if s in self.known}
+
+
+class FakeStore:
+    def __init__(self):
+        self.ticks = []
+
+    def store_tick(self, tick):
+        self.ticks.append(tick)
+
+
+def _poller(kite, watchlist=(), batch_size=500):
+    redis_client = FakeRedis()
+    ltp = LTPDataCollector(kite, market_memory=None)
+    ltp.exchange, ltp.symbol, ltp.r = "NSE", "BANKNIFTY", redis_client
+    depth = DepthCollector(kite=kite, redis_client=redis_client)
+    depth.exchange, depth.symbol, depth.key = "NFO", "BANKNIFTY26OCTFUT", "BANKNIFTY26OCTFUT"
+    depth.full_symbol = "NFO:BANKNIFTY26OCTFUT"
+    store = FakeStore()
+    poller = QuotePoller(kite, ltp=ltp, depth=depth, store=store, watchlist=watchlist, batch_size=batch_size)
+    return poller, redis_client, store
+
+
+def test_resolves_once_then_one_call_per_cycle():
+    kite = FakeKite({"NSE:NIFTY BANK": 45210.5, "NFO:BANKNIFTY26OCTFUT": 45242.0, "NSE:RELIANCE": 2900.0})
+    poller, redis_client, store = _poller(kite, watchlist=["NSE:RELIANCE"])
+
+    assert poller.poll_once() == 3
+    assert len(kite.calls) == 1  # every spelling of every entry in one call
+    assert poller.poll_once() == 3
+    assert kite.calls[-1] == ["NSE:NIFTY BANK", "NFO:BANKNIFTY26OCTFUT", "NSE:RELIANCE"]
+    assert len(kite.calls) == 2
+
+    assert redis_client.data["price:BANKNIFTY:latest"] == "45210.5"
+    assert json.loads(redis_client.data["depth:BANKNIFTY26OCTFUT:buy"])[0]["price"] == 45240.0
+    assert redis_client.data["depth:BANKNIFTY26OCTFUT:total_ask_qty"] == 50
+    assert [(t.instrument, t.last_price) for t in store.ticks] == [("RELIANCE", 2900.0)] * 2
+
+
+def test_watchlist_is_split_at_batch_size():
+    symbols = [f"NSE:STOCK{i}" for i in range(5)]
+    kite = FakeKite({s: 100.0 for s in symbols} | {"NSE:NIFTY BANK": 1.0, "NFO:BANKNIFTY26OCTFUT": 1.0})
+    poller, _, store = _poller(kite, watchlist=symbols, batch_size=3)
+    poller.poll_once()
+    kite.calls.clear()
+    poller.poll_once()
+    assert [len(batch) for batch in kite.calls] == [3, 3, 1]
+    assert len(store.ticks) == 10
+
+
+def test_missing_symbol_is_resolved_again():
+    kite = FakeKite({"NSE:NIFTY BANK": 45210.5, "NFO:BANKNIFTY26OCTFUT": 45242.0})
+    poller, _, _ = _poller(kite)
+    poller.poll_once()
+    ltp_entry = poller.entries[0]
+    assert ltp_entry.symbol == "NSE:NIFTY BANK"
+
+    del kite.known["NSE:NIFTY BANK"]
+    kite.known["NSE:BANKNIFTY"] = 45211.0
+    assert poller.poll_once() == 1 and ltp_entry.symbol is None
+    assert poller.poll_once() == 2 and ltp_entry.symbol == "NSE:BANKNIFTY"
+
+
+def test_failed_resolution_batch_falls_back_to_single_symbols():
+    class StrictKite(FakeKite):
+        def quote(self, symbols):
+            if any(":" not in s for s in symbols):
+                self.calls.append(list(symbols))
+                raise ValueError("invalid instrument")
+            return super().quote(symbols)
+
+    kite = StrictKite({"NSE:NIFTY BANK": 45210.5, "NFO:BANKNIFTY26OCTFUT": 45242.0})
+    poller, _, _ = _poller(kite)
+    assert poller.poll_once() == 2
+    kite.calls.clear()
+    poller.poll_once()
+    assert len(kite.calls) == 1
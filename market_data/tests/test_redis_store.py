@@ -1,3 +1,4 @@
+import json
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -79,3 +80,294 @@ def test_store_ohlc_and_retrieve_sorted():
     assert fetched[0].open == 2
     assert fetched[1].open == 3
 
+
+
+class PipelinedFakeRedis(FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.published = []
+        self.round_trips = 0
+
+    def setex(self, key, ttl, value):  # noqa: ARG002
+        self.round_trips += 1
+        super().setex(key, ttl, value)
+
+    def publish(self, channel, message):
+        self.round_trips += 1
+        self.published.append((channel, message))
+
+    def pipeline(self, transaction=True):  # noqa: ARG002
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(("setex", (key, ttl, value)))
+
+    def publish(self, channel, message):
+        self.commands.append(("publish", (channel, message)))
+
+    def execute(self):
+        self.redis.round_trips += 1
+        for name, args in self.commands:
+            if name == "setex":
+                self.redis.kv[args[0]] = args[2]
+            else:
+                self.redis.published.append(args)
+
+
+def test_batched_tick_writes_use_one_pipeline_and_dedupe_latest():
+    redis = PipelinedFakeRedis()
+    store = RedisMarketStore(
+        redis, enable_candle_building=False, enable_technical_indicators=False,
+        write_batch_window_ms=60_000, write_batch_max_ticks=100,
+    )
+    base = datetime.now(timezone.utc)
+    for i in range(6):
+        instrument = "BANKNIFTY" if i % 2 else "NIFTY"
+        store.store_tick(MarketTick(instrument=instrument, timestamp=base + timedelta(seconds=i),
+                                    last_price=45000.0 + i, volume=i))
+
+    assert redis.round_trips == 0
+    assert store.flush() == 6
+    assert redis.round_trips == 1
+    assert len([key for key in redis.kv if key.startswith("tick:") and not key.endswith("latest")]) == 6
+    assert redis.kv["price:BANKNIFTY:latest"] == str(45005.0)
+    assert redis.kv["price:NIFTY:latest"] == str(45004.0)
+
+    channels = [channel for channel, _ in redis.published]
+    assert sorted(channels) == ["market:tick", "market:tick", "market:tick:BANKNIFTY", "market:tick:NIFTY"]
+    # Same single-tick message shape as unbatched mode, one per instrument
+    shared = [json.loads(message) for channel, message in redis.published if channel == "market:tick"]
+    assert [(tick["instrument"], tick["last_price"]) for tick in shared] == [("NIFTY", 45004.0), ("BANKNIFTY", 45005.0)]
+
+
+def test_batched_writes_flush_when_full_and_on_close():
+    redis = PipelinedFakeRedis()
+    store = RedisMarketStore(
+        redis, enable_candle_building=False, enable_technical_indicators=False,
+        write_batch_window_ms=60_000, write_batch_max_ticks=3,
+    )
+    base = datetime.now(timezone.utc)
+    for i in range(4):
+        store.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base + timedelta(seconds=i),
+                                    last_price=45000.0 + i))
+
+    assert redis.round_trips == 1
+    assert redis.kv["price:BANKNIFTY:latest"] == str(45002.0)
+
+    store.close()
+    assert redis.round_trips == 2
+    assert redis.kv["price:BANKNIFTY:latest"] == str(45003.0)
+    # After close, ticks are written directly
+    store.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base, last_price=1.0))
+    assert redis.kv["price:BANKNIFTY:latest"] == "1.0"
+
+
+class RecordingTechService:
+    def __init__(self):
+        self.calls = []
+
+    def update_tick(self, instrument, tick):
+        self.calls.append((instrument, [tick["last_price"]]))
+
+    def update_ticks(self, instrument, ticks):
+        self.calls.append((instrument, [tick["last_price"] for tick in ticks]))
+
+
+def _batched_store(redis, **kwargs):
+    store = RedisMarketStore(redis, enable_candle_building=False, enable_technical_indicators=False,
+                             write_batch_window_ms=60_000, **kwargs)
+    store._enable_technical_indicators = True
+    store._technical_service = RecordingTechService()
+    return store
+
+
+def test_batched_ticks_update_indicators_once_per_instrument_on_flush():
+    store = _batched_store(PipelinedFakeRedis(), write_batch_max_ticks=100)
+    base = datetime.now(timezone.utc)
+    for i in range(5):
+        instrument = "BANKNIFTY" if i % 2 else "NIFTY"
+        store.store_tick(MarketTick(instrument=instrument, timestamp=base + timedelta(seconds=i), last_price=float(i)))
+
+    assert store._technical_service.calls == []
+    store.flush()
+    assert store._technical_service.calls == [("NIFTY", [0.0, 2.0, 4.0]), ("BANKNIFTY", [1.0, 3.0])]
+
+
+class FailingPipelinedFakeRedis(PipelinedFakeRedis):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def pipeline(self, transaction=True):  # noqa: ARG002
+        pipe = FakePipeline(self)
+        if self.failures:
+            self.failures -= 1
+
+            def fail():
+                raise ConnectionError("redis down")
+
+            pipe.execute = fail
+        return pipe
+
+
+def test_failed_flush_requeues_ticks_and_counts_dropped_ones():
+    redis = FailingPipelinedFakeRedis(failures=2)
+    store = _batched_store(redis, write_batch_max_ticks=100)
+    store._max_pending_ticks = 4
+    base = datetime.now(timezone.utc)
+
+    def tick(i):
+        store.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base + timedelta(seconds=i),
+                                    last_price=float(i)))
+
+    for i in range(3):
+        tick(i)
+    with pytest.raises(ConnectionError):
+        store.flush()
+    assert [t.last_price for t in store._pending_ticks] == [0.0, 1.0, 2.0] and store.ticks_dropped == 0
+    assert store._technical_service.calls == []  # indicators wait for the write
+
+    for i in range(3, 5):
+        tick(i)
+    with pytest.raises(ConnectionError):
+        store.flush()
+    # Failed ticks stay ahead of newer ones; over the limit the oldest go
+    assert [t.last_price for t in store._pending_ticks] == [1.0, 2.0, 3.0, 4.0] and store.ticks_dropped == 1
+
+    assert store.flush() == 4
+    assert redis.kv["price:BANKNIFTY:latest"] == "4.0"
+    assert store._technical_service.calls == [("BANKNIFTY", [1.0, 2.0, 3.0, 4.0])]
+
+
+class StreamFakeRedis(FakeRedis):
+    """FakeRedis with the stream commands used by the tick log."""
+
+    def __init__(self):
+        super().__init__()
+        self.streams = {}
+        self.groups = {}
+        self.trims = []
+        self._clock_ms = 1_700_000_000_000
+
+    def publish(self, channel, message):  # noqa: ARG002
+        pass
+
+    def xadd(self, key, fields, id="*", maxlen=None, minid=None, approximate=True):  # noqa: ARG002
+        entries = self.streams.setdefault(key, [])
+        if id == "*":
+            self._clock_ms += 1000
+            id = f"{self._clock_ms}-0"
+        elif entries and tuple(map(int, id.split("-"))) <= tuple(map(int, entries[-1][0].split("-"))):
+            raise Exception("ERR The ID specified in XADD is equal or smaller than the target stream top item")
+        entries.append((id, {k: str(v) for k, v in fields.items()}))
+        self.trims.append(("maxlen", maxlen) if maxlen else ("minid", minid))
+        return id
+
+    def xrevrange(self, key, max="+", min="-", count=None):  # noqa: ARG002
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    def xrange(self, key, min="-", max="+", count=None):
+        def ms(entry_id):
+            return int(entry_id.split("-")[0])
+
+        entries = [
+            entry for entry in self.streams.get(key, [])
+            if (min == "-" or ms(entry[0]) >= int(min)) and (max == "+" or ms(entry[0]) <= int(max))
+        ]
+        return entries[:count] if count else entries
+
+    def xgroup_create(self, key, group, id="$", mkstream=False):  # noqa: ARG002
+        if (key, group) in self.groups:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+        entries = self.streams.setdefault(key, [])
+        self.groups[(key, group)] = len(entries) if id == "$" else 0
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):  # noqa: ARG002
+        response = []
+        for key in streams:
+            position = self.groups[(key, group)]
+            entries = self.streams.get(key, [])[position:position + count]
+            self.groups[(key, group)] = position + len(entries)
+            if entries:
+                response.append((key, entries))
+        return response
+
+    def xack(self, key, group, *entry_ids):  # noqa: ARG002
+        return len(entry_ids)
+
+
+def test_tick_log_appends_to_stream_and_reads_by_time():
+    redis = StreamFakeRedis()
+    store = RedisMarketStore(redis, enable_candle_building=False, enable_technical_indicators=False)
+    base = datetime.now(timezone.utc)
+    for i in range(5):
+        store.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base + timedelta(seconds=i),
+                                    last_price=45000.0 + i, volume=i or None))
+
+    assert not [key for key in redis.kv if key.startswith("tick:") and not key.endswith(":latest")]
+    assert len(redis.streams["tick_stream:BANKNIFTY"]) == 5
+    assert redis.trims[0][0] == "minid"
+
+    ticks = store.get_ticks("BANKNIFTY")
+    assert [tick.last_price for tick in ticks] == [45000.0 + i for i in range(5)]
+    assert ticks[0].volume is None and ticks[1].volume == 1
+    assert ticks[2].timestamp == base + timedelta(seconds=2)
+
+    # Stream IDs are tick times in epoch ms: third and fourth ticks
+    start = base + timedelta(seconds=2)
+    window = store.get_ticks("BANKNIFTY", start=start, end=start + timedelta(seconds=1))
+    assert [tick.last_price for tick in window] == [45002.0, 45003.0]
+
+
+def test_tick_log_ids_follow_tick_time_and_stay_increasing():
+    redis = StreamFakeRedis()
+    store = RedisMarketStore(redis, enable_candle_building=False, enable_technical_indicators=False)
+    # A replayed session (naive IST timestamps), stored long after it happened
+    base = datetime(2026, 10, 14, 10, 0, 0)
+    base_ms = int(base.replace(tzinfo=timezone(timedelta(hours=5, minutes=30))).timestamp() * 1000)
+    for offset, price in ((0, 1.0), (1, 2.0), (1, 3.0), (0, 4.0), (5, 5.0)):
+        store.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base + timedelta(seconds=offset),
+                                    last_price=price))
+
+    ids = [entry_id for entry_id, _ in redis.streams["tick_stream:BANKNIFTY"]]
+    # Same-ms and late ticks go right after the newest entry
+    assert ids == [f"{base_ms}-0", f"{base_ms + 1000}-0", f"{base_ms + 1000}-1", f"{base_ms + 1000}-2",
+                   f"{base_ms + 5000}-0"]
+    # Trimming keeps tick_ttl of tick time, so a replayed day is not trimmed on insert
+    assert redis.trims[-1] == ("minid", base_ms + 5000 - 24 * 3600 * 1000)
+
+    window = store.get_ticks("BANKNIFTY", start=base + timedelta(seconds=1), end=base + timedelta(seconds=2))
+    assert [tick.last_price for tick in window] == [2.0, 3.0, 4.0]
+
+    # A new process continues after the stream's newest entry
+    restarted = RedisMarketStore(redis, enable_candle_building=False, enable_technical_indicators=False)
+    restarted.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base, last_price=6.0))
+    assert redis.streams["tick_stream:BANKNIFTY"][-1][0] == f"{base_ms + 5000}-1"
+
+
+def test_tick_log_consumer_groups_and_legacy_keys():
+    redis = StreamFakeRedis()
+    store = RedisMarketStore(redis, enable_candle_building=False, enable_technical_indicators=False,
+                             tick_stream_maxlen=1000)
+    base = datetime.now(timezone.utc)
+    store.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base, last_price=1.0))
+    store.create_tick_consumer_group("BANKNIFTY", "signals")
+    store.create_tick_consumer_group("BANKNIFTY", "signals")
+    store.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base, last_price=2.0))
+
+    delivered = store.read_tick_group("BANKNIFTY", "signals", "worker-1")
+    assert [tick.last_price for _, tick in delivered] == [2.0]
+    assert store.ack_ticks("BANKNIFTY", "signals", *(entry_id for entry_id, _ in delivered)) == 1
+    assert redis.trims[-1] == ("maxlen", 1000)
+
+    legacy = RedisMarketStore(StreamFakeRedis(), enable_candle_building=False,
+                              enable_technical_indicators=False, tick_log="keys")
+    legacy.store_tick(MarketTick(instrument="BANKNIFTY", timestamp=base, last_price=3.0))
+    assert f"tick:BANKNIFTY:{base.isoformat()}" in legacy.redis.kv
+    assert legacy.get_ticks("BANKNIFTY") == []
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from market_data.adapters.historical_tick_replayer import HistoricalTickReplayer
+from market_data.adapters.replay_scheduler import IST, ReplayScheduler, trading_seconds_between
+from market_data.contracts import MarketTick
+from market_data.store import InMemoryMarketStore
+
+OPEN = datetime(2026, 1, 9, 9, 15, tzinfo=IST)  # Friday
+
+
+class FakeClock:
+    def __init__(self, oversleep: float = 0.0):
+        self.now = 100.0
+        self.oversleep = oversleep
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds + self.oversleep
+
+
+def _ticks(*seconds):
+    return [MarketTick("BANKNIFTY", OPEN + timedelta(seconds=s), 100.0 + i, 1) for i, s in enumerate(seconds)]
+
+
+def _run(scheduler, ticks):
+    async def collect():
+        return [batch async for batch in scheduler.batches_of(ticks)]
+    return asyncio.run(collect())
+
+
+def test_follows_event_time_and_batches_same_deadline():
+    clock = FakeClock()
+    scheduler = ReplayScheduler(10.0, clock=clock, sleep=clock.sleep)
+    batches = _run(scheduler, _ticks(0, 1, 1, 1.0001, 10, 40))
+
+    assert [len(batch) for batch in batches] == [1, 3, 1, 1]
+    # Deadlines at 0, 0.1, 1.0, 4.0 s of wall time: sleeps follow the real gaps
+    assert clock.sleeps == [0, 0.1, 0.9, 3.0]
+    assert scheduler.get_statistics()["ticks"] == 6
+
+
+def test_skips_closed_hours():
+    clock = FakeClock()
+    close = datetime(2026, 1, 9, 15, 29, tzinfo=IST)
+    ticks = [MarketTick("BANKNIFTY", close, 1.0, 1),
+             MarketTick("BANKNIFTY", datetime(2026, 1, 12, 9, 16, tzinfo=IST), 2.0, 1)]
+
+    _run(ReplayScheduler(60.0, clock=clock, sleep=clock.sleep), ticks)
+    # One minute before Friday's close plus one after Monday's open
+    assert clock.sleeps == [0, 2.0]
+
+    clock = FakeClock()
+    _run(ReplayScheduler(60.0, skip_closed_hours=False, clock=clock, sleep=clock.sleep), ticks)
+    assert clock.sleeps[1] == pytest.approx((ticks[1].timestamp - close).total_seconds() / 60.0)
+
+
+def test_reports_drift_and_catches_up_overdue_ticks():
+    clock = FakeClock(oversleep=0.5)
+    scheduler = ReplayScheduler(1.0, clock=clock, sleep=clock.sleep)
+    batches = _run(scheduler, _ticks(0, 1, 1.2, 1.4, 3))
+
+    # Every sleep overruns by 0.5 s: the 1.4 s tick is already due when the
+    # 1.2 s batch is formed, so it goes out with it
+    assert [len(batch) for batch in batches] == [1, 1, 2, 1]
+    stats = scheduler.get_statistics()
+    assert stats["drift_ms_last"] == pytest.approx(500.0)
+    # The overdue 1.2 s batch was 0.3 s late before its (overrunning) yield
+    assert stats["drift_ms_max"] == pytest.approx(800.0)
+    assert stats["batches"] == 4
+
+
+def test_trading_seconds_between():
+    assert trading_seconds_between(OPEN, OPEN + timedelta(minutes=5)) == 300
+    # Friday 15:00 to Monday 09:45: 30 minutes on each side of the weekend
+    assert trading_seconds_between(datetime(2026, 1, 9, 15, 0, tzinfo=IST),
+                                   datetime(2026, 1, 12, 9, 45, tzinfo=IST)) == 3600
+    with pytest.raises(ValueError):
+        ReplayScheduler(0)
+
+
+def test_replayer_uses_scheduler_when_paced():
+    store = InMemoryMarketStore()
+    replayer = HistoricalTickReplayer(store, data_source="synthetic", speed=1e6)
+    replayer._load_ticks = lambda: _ticks(*range(0, 240, 15))
+
+    async def run():
+        replayer.running = True
+        await replayer._replay_loop()
+
+    asyncio.run(run())
+    stats = replayer.get_statistics()
+    assert stats["ticks_replayed"] == 16
+    assert stats["timing"]["ticks"] == 16
+    assert store.get_latest_tick("BANKNIFTY").last_price == 115.0
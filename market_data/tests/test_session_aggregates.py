@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from market_data.adapters.redis_store import RedisMarketStore
+from market_data.contracts import MarketTick
+from market_data.session_aggregates import SessionAggregates, read_session_stats
+
+IST = timezone(timedelta(hours=5, minutes=30))
+OPEN = datetime(2026, 1, 9, 9, 15, tzinfo=IST)
+
+
+def _tick(minutes: float, price: float, volume: int = 10) -> MarketTick:
+    return MarketTick("BANKNIFTY", OPEN + timedelta(minutes=minutes), price, volume)
+
+
+def test_session_vwap_and_range():
+    aggregates = SessionAggregates(windows_minutes=(5,))
+    for minutes, price, volume in ((0, 100.0, 10), (1, 104.0, 30), (2, 98.0, 20), (3, 101.0, 0)):
+        aggregates.update(_tick(minutes, price, volume))
+
+    snapshot = aggregates.snapshot()
+    assert snapshot["vwap"] == pytest.approx((100 * 10 + 104 * 30 + 98 * 20) / 60)
+    assert (snapshot["open"], snapshot["high"], snapshot["low"], snapshot["last"]) == (100.0, 104.0, 98.0, 101.0)
+    assert snapshot["volume"] == 60
+    assert snapshot["tick_count"] == 4
+    assert snapshot["session_date"] == "2026-01-09"
+
+
+def test_rolling_window_drops_old_minutes():
+    aggregates = SessionAggregates(windows_minutes=(5,))
+    for minute in range(10):
+        aggregates.update(_tick(minute, 100.0 + minute, 10 * (minute + 1)))
+
+    snapshot = aggregates.snapshot()
+    window = range(5, 10)
+    assert snapshot["volume_5m"] == sum(10 * (m + 1) for m in window)
+    assert snapshot["vwap_5m"] == pytest.approx(
+        sum((100.0 + m) * 10 * (m + 1) for m in window) / snapshot["volume_5m"]
+    )
+    assert (snapshot["high_5m"], snapshot["low_5m"], snapshot["tick_count_5m"]) == (109.0, 105.0, 5)
+
+
+def test_aggregates_reset_at_session_boundary():
+    aggregates = SessionAggregates()
+    aggregates.update(_tick(0, 100.0))
+    # 02:00 UTC next day is 07:30 IST: a new session
+    aggregates.update(MarketTick("BANKNIFTY", datetime(2026, 1, 10, 2, 0, tzinfo=timezone.utc), 120.0, 5))
+
+    snapshot = aggregates.snapshot()
+    assert snapshot["session_date"] == "2026-01-10"
+    assert (snapshot["open"], snapshot["vwap"], snapshot["tick_count"]) == (120.0, 120.0, 1)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.kv = {}
+        self.hashes = {}
+
+    def ping(self):
+        return True
+
+    def setex(self, key, ttl, value):  # noqa: ARG002
+        self.kv[key] = value
+
+    def publish(self, channel, message):  # noqa: ARG002
+        pass
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key, ttl):  # noqa: ARG002
+        pass
+
+
+def test_store_publishes_session_stats_hash():
+    redis = FakeRedis()
+    store = RedisMarketStore(redis, enable_candle_building=False, enable_technical_indicators=False)
+    store.store_tick(_tick(0, 100.0, 0))
+    assert store.get_session_stats("BANKNIFTY")["vwap"] is None
+
+    store.store_tick(_tick(1, 102.0, 10))
+    stats = read_session_stats(redis, "BANKNIFTY")
+    assert stats["vwap"] == pytest.approx(102.0)
+    assert stats["tick_count"] == 2
+    assert stats == store.get_session_stats("BANKNIFTY")
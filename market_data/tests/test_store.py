@@ -37,3 +37,14 @@ def test_store_ohlc_respects_limit():
     assert result[0] is bars[1]
     assert result[1] is bars[2]
 
+
+
+def test_get_ticks_by_time_window():
+    store = InMemoryMarketStore(max_ticks=3)
+    base_time = datetime.now(timezone.utc)
+    for i in range(4):
+        store.store_tick(MarketTick("BANKNIFTY", base_time + timedelta(seconds=i), 45000.0 + i))
+
+    window = store.get_ticks("BANKNIFTY", start=base_time + timedelta(seconds=2))
+    assert [tick.last_price for tick in window] == [45002.0, 45003.0]
+    assert len(store.get_ticks("BANKNIFTY")) == 3
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+import pytest
+
+from market_data.streaming_indicators import StreamingIndicatorEngine
+from market_data.technical_indicators_service import TechnicalIndicatorsService
+
+# Recursive indicators converge once seed influence has decayed (see module docstring)
+RELATIVE_TOLERANCE = 1e-6
+
+
+def _bars(count: int = 600, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 45000 + np.cumsum(rng.normal(0, 20, count))
+    open_ = close + rng.normal(0, 5, count)
+    high = np.maximum(open_, close) + rng.uniform(0, 15, count)
+    low = np.minimum(open_, close) - rng.uniform(0, 15, count)
+    volume = rng.integers(1000, 5000, count).astype(float)
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume})
+
+
+def _run_engine(df: pd.DataFrame, window_size=None) -> dict:
+    engine = StreamingIndicatorEngine(window_size=window_size)
+    values = {}
+    for row in df.itertuples(index=False):
+        values = engine.update(row.open, row.high, row.low, row.close, row.volume)
+    return values
+
+
+def _last(series) -> float:
+    return float(series.iloc[-1])
+
+
+def _named(df: pd.DataFrame, prefix: str) -> pd.Series:
+    return df[[c for c in df.columns if c.startswith(prefix)][0]]
+
+
+def test_streaming_matches_pandas_ta():
+    df = _bars()
+    high, low, close, volume = df["high"], df["low"], df["close"], df["volume"]
+    values = _run_engine(df)
+
+    macd = ta.macd(close)
+    bbands = ta.bbands(close, length=20, std=2, ddof=0)
+    adx = ta.adx(high, low, close, length=14)
+    stoch = ta.stoch(high, low, close)
+    expected = {
+        "sma_10": _last(ta.sma(close, length=10)),
+        "sma_50": _last(ta.sma(close, length=50)),
+        "ema_20": _last(ta.ema(close, length=20)),
+        "ema_50": _last(ta.ema(close, length=50)),
+        "wma_20": _last(ta.wma(close, length=20)),
+        "rsi_14": _last(ta.rsi(close, length=14)),
+        "rsi_9": _last(ta.rsi(close, length=9)),
+        "macd_value": _last(_named(macd, "MACD_")),
+        "macd_signal": _last(_named(macd, "MACDs_")),
+        "macd_histogram": _last(_named(macd, "MACDh_")),
+        "bollinger_upper": _last(_named(bbands, "BBU")),
+        "bollinger_lower": _last(_named(bbands, "BBL")),
+        "atr_14": _last(ta.atr(high, low, close, length=14)),
+        "adx_14": _last(_named(adx, "ADX_")),
+        "di_plus": _last(_named(adx, "DMP_")),
+        "di_minus": _last(_named(adx, "DMN_")),
+        "stoch_k": _last(_named(stoch, "STOCHk")),
+        "stoch_d": _last(_named(stoch, "STOCHd")),
+        "williams_r": _last(ta.willr(high, low, close, length=14)),
+        "cmf_20": _last(ta.cmf(high, low, close, volume, length=20)),
+        "mfi_14": _last(ta.mfi(high, low, close, volume, length=14)),
+        "roc_12": _last(ta.roc(close, length=12)),
+        "momentum_10": _last(ta.mom(close, length=10)),
+        "volume_sma_20": _last(ta.sma(volume, length=20)),
+        "volume_rsi_14": _last(ta.rsi(volume, length=14)),
+    }
+
+    for key, value in expected.items():
+        assert values[key] == pytest.approx(value, rel=RELATIVE_TOLERANCE), key
+
+
+def test_streaming_matches_reference_formulas():
+    """CCI, OBV and Ichimoku differ between pandas-ta releases, so check the textbook definitions."""
+    df = _bars()
+    high, low, close, volume = df["high"], df["low"], df["close"], df["volume"]
+    values = _run_engine(df, window_size=200)
+
+    typical = (high + low + close) / 3
+    mean_deviation = typical.rolling(20).apply(lambda w: np.abs(w - w.mean()).mean(), raw=True)
+    cci = (typical - typical.rolling(20).mean()) / (0.015 * mean_deviation)
+
+    window = df.tail(200)
+    signs = np.sign(window["close"].diff()).fillna(1.0)
+    obv = float((signs * window["volume"]).sum())
+
+    def midpoint(length):
+        return (high.rolling(length).max() + low.rolling(length).min()) / 2
+
+    span_a = ((midpoint(9) + midpoint(26)) / 2).shift(26)
+    span_b = midpoint(52).shift(26)
+
+    assert values["cci_20"] == pytest.approx(_last(cci), rel=RELATIVE_TOLERANCE)
+    assert values["obv"] == pytest.approx(obv, rel=RELATIVE_TOLERANCE)
+    assert values["ichimoku_tenkan"] == pytest.approx(_last(midpoint(9)))
+    assert values["ichimoku_kijun"] == pytest.approx(_last(midpoint(26)))
+    assert values["ichimoku_senkou_a"] == pytest.approx(_last(span_a))
+    assert values["ichimoku_senkou_b"] == pytest.approx(_last(span_b))
+    assert values["high_20"] == pytest.approx(float(high.tail(20).max()))
+    assert values["low_20"] == pytest.approx(float(low.tail(20).min()))
+
+
+def test_streaming_values_unavailable_until_warm():
+    df = _bars(count=15)
+    values = _run_engine(df)
+
+    assert values["sma_10"] is not None
+    assert values["sma_20"] is None
+    # Wilder seed: plain average of the first 14 gains/losses
+    changes = df["close"].diff().dropna()
+    gains, losses = changes.clip(lower=0).mean(), (-changes).clip(lower=0).mean()
+    assert values["rsi_14"] == pytest.approx(100 * gains / (gains + losses), rel=1e-9)
+    assert values["macd_value"] is None
+    assert values["ichimoku_senkou_a"] is None
+
+
+def _candle(row, minute: int) -> dict:
+    return {
+        "start_at": f"2026-01-09T10:{minute % 60:02d}:00",
+        "open": row.open,
+        "high": row.high,
+        "low": row.low,
+        "close": row.close,
+        "volume": row.volume,
+    }
+
+
+def test_service_engines_agree_per_instrument():
+    df = _bars(count=300)
+    service = TechnicalIndicatorsService(instrument_engines={"STREAM": "streaming"})
+
+    for minute, row in enumerate(df.itertuples(index=False)):
+        service.update_candle("PANDAS", _candle(row, minute))
+        service.update_candle("STREAM", _candle(row, minute))
+
+    assert service.get_engine("PANDAS") == "pandas"
+    assert service.get_engine("STREAM") == "streaming"
+
+    pandas_values = service.get_indicators("PANDAS")
+    streaming_values = service.get_indicators("STREAM")
+    for key in ("sma_20", "ema_20", "rsi_14", "macd_signal", "bollinger_upper", "atr_14",
+                "stoch_k", "mfi_14", "bollinger_percent_b", "pivot_point", "range_20"):
+        assert getattr(streaming_values, key) == pytest.approx(getattr(pandas_values, key), rel=1e-4), key
+
+
+@pytest.mark.parametrize("engine", ["streaming", "STREAMING"])
+def test_switching_to_streaming_warms_from_window(engine):
+    df = _bars(count=120)
+    service = TechnicalIndicatorsService()
+    rows = list(df.itertuples(index=False))
+
+    for minute, row in enumerate(rows[:100]):
+        service.update_candle("BANKNIFTY", _candle(row, minute))
+    service.set_engine("BANKNIFTY", engine)
+    assert service.get_engine("BANKNIFTY") == "streaming"
+    assert "BANKNIFTY" in service._streaming_engines  # warmed at the switch, not on the next candle
+    for minute, row in enumerate(rows[100:], start=100):
+        indicators = service.update_candle("BANKNIFTY", _candle(row, minute))
+
+    assert indicators.sma_50 == pytest.approx(_last(ta.sma(df["close"], length=50)), rel=1e-9)
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        TechnicalIndicatorsService(engine="talib")
@@ -0,0 +1,161 @@
+import asyncio
+import struct
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from market_data.adapters.ticker_stream import (
+    IST, TickerStreamIngestion, encode_message, encode_packet, iter_packets,
+)
+from market_data.contracts import MarketTick
+
+START = datetime(2026, 10, 15, 9, 15, tzinfo=IST)
+
+
+class ListStore:
+    def __init__(self):
+        self.ticks = []
+
+    def store_tick(self, tick):
+        self.ticks.append(tick)
+
+
+def _ticks(instrument, prices, step_ms=100):
+    return [MarketTick(instrument=instrument, timestamp=START + timedelta(milliseconds=i * step_ms),
+                       last_price=price, volume=1000 + i) for i, price in enumerate(prices)]
+
+
+def test_packets_round_trip_in_every_mode():
+    ts = int(START.timestamp())
+    message = encode_message([
+        encode_packet(260105, 45012.35, mode="ltp"),
+        encode_packet(11, 420.5, volume=9000, mode="quote"),
+        encode_packet(12, 99.05, volume=150, exchange_ts=ts, mode="full"),
+        struct.pack(">7i", 256265, 2451230, 0, 0, 0, 0, 0),                 # index quote (28 bytes)
+        struct.pack(">8i", 256265, 2451240, 0, 0, 0, 0, 0, ts),             # index full (32 bytes)
+    ])
+    assert [len(p) for p in (encode_packet(1, 1, mode=m) for m in ("ltp", "quote", "full"))] == [8, 44, 184]
+
+    assert list(iter_packets(message)) == [
+        (260105, 45012.35, None, None),
+        (11, 420.5, 9000, None),
+        (12, 99.05, 150, ts),
+        (256265, 24512.3, None, None),
+        (256265, 24512.4, None, ts),
+    ]
+
+
+def test_heartbeats_and_truncated_messages_are_tolerated():
+    assert list(iter_packets(b"\x00")) == []
+    message = encode_message([encode_packet(1, 10.0, mode="ltp"), encode_packet(2, 20.0, mode="quote")])
+    assert list(iter_packets(message[:-4])) == [(1, 10.0, None, None)]
+
+
+def test_ingestion_stores_known_tokens_with_exchange_time():
+    store = ListStore()
+    seen = []
+    ingestion = TickerStreamIngestion(store, instruments={11: "BANKNIFTY"}, on_tick_callback=seen.append)
+    message = encode_message([
+        encode_packet(11, 45000.0, volume=10, exchange_ts=int(START.timestamp())),
+        encode_packet(99, 1.0),
+    ])
+
+    assert asyncio.run(ingestion.on_message(message)) == 1
+    assert asyncio.run(ingestion.on_message(b"\x00")) == 0
+    assert asyncio.run(ingestion.on_message('{"type": "error"}')) == 0
+
+    tick, = store.ticks
+    assert (tick.instrument, tick.last_price, tick.volume, tick.timestamp) == ("BANKNIFTY", 45000.0, 10, START)
+    assert seen == [tick]
+    assert ingestion.get_statistics()["unknown_packets"] == 1
+
+
+class BlockingStore(ListStore):
+    """Store whose writes block like a synchronous Redis round trip."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def store_tick(self, tick):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        super().store_tick(tick)
+
+
+def test_store_writes_run_off_the_event_loop():
+    message = encode_message([encode_packet(1, 45000.0 + i, mode="ltp") for i in range(3)])
+
+    async def scenario():
+        store = BlockingStore()
+        ingestion = TickerStreamIngestion(store, instruments={1: "BANKNIFTY"})
+        beats = 0
+
+        async def heartbeat():
+            nonlocal beats
+            while True:
+                await asyncio.sleep(0.01)
+                beats += 1
+
+        task = asyncio.create_task(heartbeat())
+        stored = await ingestion.on_message(message)
+        task.cancel()
+        return store, stored, beats
+
+    store, stored, beats = asyncio.run(scenario())
+    assert stored == 3 and [t.last_price for t in store.ticks] == [45000.0, 45001.0, 45002.0]
+    assert threading.get_ident() not in store.threads
+    assert beats >= 5  # the loop kept running while the store blocked for 150 ms
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TickerStreamIngestion(mode="snap")
+
+
+def test_streams_local_feed_into_store_end_to_end():
+    pytest.importorskip("websockets")
+    from market_data.adapters.ticker_feed_server import TickerFeedServer
+
+    ticks = sorted(_ticks("BANKNIFTY", [45000.0 + i for i in range(50)])
+                   + _ticks("NIFTY", [24500.0 + i for i in range(50)]), key=lambda t: t.timestamp)
+
+    async def scenario():
+        server = TickerFeedServer(ticks, {"BANKNIFTY": 1, "NIFTY": 2}, port=0, heartbeat=0.01)
+        url = await server.start()
+        store = ListStore()
+        ingestion = TickerStreamIngestion(store, url=url, instruments={1: "BANKNIFTY"})
+        ingestion.start()
+        await asyncio.wait_for(server.finished.wait(), 5)
+        await asyncio.sleep(0.05)
+        ingestion.stop()
+        await server.stop()
+        return store.ticks, server
+
+    stored, server = asyncio.run(scenario())
+    # Only the subscribed token is sent; prices, volumes and exchange times survive the wire
+    assert server.ticks_sent == 50
+    assert [t.last_price for t in stored] == [45000.0 + i for i in range(50)]
+    assert [t.volume for t in stored] == [1000 + i for i in range(50)]
+    assert stored[0].timestamp == START
+    assert {t.instrument for t in stored} == {"BANKNIFTY"}
+
+
+def test_feed_server_paces_fixed_rate():
+    pytest.importorskip("websockets")
+    from market_data.adapters.ticker_feed_server import TickerFeedServer
+
+    server = TickerFeedServer(_ticks("BANKNIFTY", np.arange(20.0).tolist()), {"BANKNIFTY": 1}, rate=200)
+
+    async def drain():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        sizes = [len(batch) async for batch in server._batches()]
+        return sizes, loop.time() - started
+
+    sizes, elapsed = asyncio.run(drain())
+    assert sum(sizes) == 20
+    assert elapsed >= 0.08  # 20 ticks at 200/s
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark SignalMonitor condition evaluation: the scalar per-condition path
+(_evaluate_condition / _additional_conditions_met) against the compiled
+ConditionKernel, at 1k, 10k and 100k resting conditions.
+
+    python scripts/diagnostics/bench_signal_conditions.py [--sizes 1000 10000 100000] [--ticks 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add engine_module/src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "engine_module" / "src"))
+
+from engine_module.condition_book import CROSSING_OPERATORS  # noqa: E402
+from engine_module.condition_kernel import ConditionKernel  # noqa: E402
+from engine_module.signal_monitor import ConditionOperator, SignalMonitor, TradingCondition  # noqa: E402
+
+INDICATORS = [f"ind_{i}" for i in range(40)]
+EXTRA_OPERATORS = [">", "<", ">=", "<="]
+
+
+def print_header(text, char="="):
+    """Print formatted header."""
+    width = 70
+    print(f"\n{char * width}")
+    print(f"  {text}")
+    print(f"{char * width}\n")
+
+
+def build_conditions(rng, count):
+    conditions = []
+    for i in range(count):
+        extras = [{"indicator": rng.choice(INDICATORS), "operator": rng.choice(EXTRA_OPERATORS),
+                   "threshold": rng.uniform(0, 100)} for _ in range(rng.choice([0, 1, 2, 3]))]
+        conditions.append(TradingCondition(
+            condition_id=f"c{i}", instrument="BANKNIFTY", indicator=rng.choice(INDICATORS),
+            operator=rng.choice(list(ConditionOperator)), threshold=rng.uniform(0, 100), action="BUY",
+            additional_conditions=extras))
+    return conditions
+
+
+def timed(fn, ticks):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(ticks):
+        result = fn()
+    return (time.perf_counter() - started) / ticks * 1000, result
+
+
+def bench(size, ticks, seed=11):
+    rng = random.Random(seed)
+    conditions = build_conditions(rng, size)
+    indicators = {name: rng.uniform(0, 100) for name in INDICATORS}
+    previous = {name: rng.uniform(0, 100) for name in INDICATORS}
+
+    monitor = SignalMonitor(technical_service=object())
+    monitor._redis_client = None
+    kernel = ConditionKernel()
+    for c in conditions:
+        kernel.add(c.condition_id, c.indicator, c.operator.value, c.threshold, c.additional_conditions)
+    previous_values = {("BANKNIFTY", name): value for name, value in previous.items()}
+
+    def scalar_all():
+        met = []
+        for c in conditions:
+            if c.operator.value in CROSSING_OPERATORS:
+                # One previous value per indicator per tick, as check_signals sees it
+                key = ("BANKNIFTY", c.indicator)
+                monitor._previous_values[key] = previous_values[key]
+            if monitor._evaluate_condition(c, indicators):
+                met.append(c.condition_id)
+        return met
+
+    def kernel_all():
+        return kernel.evaluate(indicators, previous)
+
+    # The AND-group stage check_signals runs on the threshold book's candidates
+    grouped = [c for c in conditions if c.additional_conditions]
+    grouped_ids = [c.condition_id for c in grouped]
+
+    def scalar_groups():
+        return [SignalMonitor._additional_conditions_met(c, indicators) for c in grouped]
+
+    def kernel_groups():
+        return kernel.clauses_met(grouped_ids, indicators).tolist()
+
+    scalar_ms, expected = timed(scalar_all, ticks)
+    kernel_ms, actual = timed(kernel_all, ticks)
+    assert actual == expected, "kernel and scalar evaluation disagree"
+    scalar_groups_ms, expected_groups = timed(scalar_groups, ticks)
+    kernel_groups_ms, actual_groups = timed(kernel_groups, ticks)
+    assert actual_groups == expected_groups, "kernel and scalar AND-groups disagree"
+    return len(expected), scalar_ms, kernel_ms, len(grouped), scalar_groups_ms, kernel_groups_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--ticks", type=int, default=5, help="timed ticks per size")
+    args = parser.parse_args()
+
+    print_header("Signal condition evaluation (ms per tick)")
+    print(f"  {'conditions':>10} {'met':>7} {'scalar':>9} {'kernel':>9} {'speedup':>8}"
+          f"   {'groups':>7} {'scalar':>9} {'kernel':>9} {'speedup':>8}")
+    for size in args.sizes:
+        met, scalar_ms, kernel_ms, groups, scalar_groups_ms, kernel_groups_ms = bench(size, args.ticks)
+        print(f"  {size:>10,} {met:>7,} {scalar_ms:>9.2f} {kernel_ms:>9.2f} {scalar_ms / kernel_ms:>7.1f}x"
+              f"   {groups:>7,} {scalar_groups_ms:>9.2f} {kernel_groups_ms:>9.2f}"
+              f" {scalar_groups_ms / kernel_groups_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@
 
 import logging
 from typing import Dict, Any, Optional, Tuple
+
 from data.market_memory import MarketMemory
+from market_data.depth_history import DepthHistory, depth_key
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +19,20 @@ class LiquidityFilter:
     3. Depth imbalance detection (institutional flow)
     """
     
-    def __init__(self, market_memory: MarketMemory):
+    def __init__(self, market_memory: MarketMemory, redis_client: Optional[Any] = None):
+        """
+        Args:
+            market_memory: Source of the latest tick with depth
+            redis_client: Redis client holding depth:{key}:history snapshots (enables rolling metrics)
+        """
         self.market_memory = market_memory
+        self.redis_client = redis_client
+
+    def _depth_history(self, instrument: str, window: int) -> Optional[DepthHistory]:
+        if self.redis_client is None:
+            return None
+        history = DepthHistory.load(self.redis_client, depth_key(instrument), window)
+        return history if len(history) else None
     
     def can_trade(
         self, 
@@ -91,7 +105,8 @@ class LiquidityFilter:
         self, 
         instrument: str, 
         side: str, 
-        quantity: int
+        quantity: int,
+        window: Optional[int] = None
     ) -> Optional[float]:
         """
         Estimate slippage using weighted average depth price.
@@ -100,11 +115,18 @@ class LiquidityFilter:
             instrument: Instrument symbol
             side: "BUY" or "SELL"
             quantity: Order quantity
+            window: Average over the last `window` depth snapshots (one Redis read)
+                instead of the latest tick only; needs redis_client
         
         Returns:
             Estimated slippage per unit (None if insufficient depth)
         """
         try:
+            if window:
+                history = self._depth_history(instrument, window)
+                if history is not None:
+                    return history.average_slippage(side, quantity)
+
             instrument_key = instrument.replace("-", "").replace(" ", "").upper()
             tick = self.market_memory.get_latest_tick(instrument_key)
             
@@ -191,3 +213,24 @@ class LiquidityFilter:
             logger.error(f"Depth imbalance error: {exc}")
             return {"signal": "ERROR", "error": str(exc)}
 
+    def get_order_flow_imbalance(self, instrument: str, window: int = 60) -> Dict[str, Any]:
+        """
+        Rolling best-level order flow imbalance over the last `window` depth snapshots.
+        
+        Returns:
+            {
+                "signal": "BUY_PRESSURE" | "SELL_PRESSURE" | "BALANCED" | "NO_DATA",
+                "ofi": float (net best-level flow, positive = buying),
+                "book_imbalance": float (average bid share of top-5 quantity),
+                "snapshots": int
+            }
+        """
+        try:
+            history = self._depth_history(instrument, window)
+            if history is None:
+                return {"signal": "NO_DATA"}
+            return history.order_flow_signal()
+            
+        except Exception as exc:
+            logger.error(f"Order flow imbalance error: {exc}")
+            return {"signal": "ERROR", "error": str(exc)}
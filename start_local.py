@@ -1527,11 +1527,13 @@ async def main():
             # Clear any virtual time from previous historical runs (live mode uses real time)
             try:
                 import redis
+                from core_kernel.time_service import TimeService
                 redis_host = os.getenv("REDIS_HOST", "localhost")
                 redis_port = int(os.getenv("REDIS_PORT", "6379"))
                 redis_client = redis.Redis(host=redis_host, port=redis_port, db=0, decode_responses=True)
-                redis_client.delete("system:virtual_time:enabled")
-                redis_client.delete("system:virtual_time:current")
+                redis_client.ping()
+                # Also publishes "" on system:virtual_time:updates, so running services drop their cached clock
+                TimeService(redis_client=redis_client, subscribe=False).clear_virtual_time()
                 print("   ✅ Cleared virtual time (live mode uses real-time)")
             except Exception as e:
                 print(f"   ⚠️  Could not clear virtual time: {e}")
@@ -18,6 +18,29 @@ class FakeRedis:
         self.published.append((channel, message))
 
 
+class FakeCheckpointRedis(FakeRedis):
+    """FakeRedis with the MGET / pipelined SETEX used by SignalMonitor checkpoints."""
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    def execute(self):
+        for command in self.commands:
+            self.redis_client.setex(*command)
+
+
 def test_cross_detection_uses_persisted_previous_value(monkeypatch):
     """Ensure CROSSES_ABOVE/BELOW reads previous value from Redis and updates it."""
     # Ensure project root is importable (tests may run with different cwd)
@@ -28,7 +51,7 @@ def test_cross_detection_uses_persisted_previous_value(monkeypatch):
 
     from engine_module.signal_monitor import SignalMonitor, TradingCondition, ConditionOperator
 
-    fake_redis = FakeRedis()
+    fake_redis = FakeCheckpointRedis()
 
     # Pre-seed previous value lower than threshold (e.g., RSI previously 29)
     fake_redis.setex("indicators_prev:BANKNIFTY:rsi_14", 3600, "29")
@@ -76,7 +99,9 @@ def test_cross_detection_uses_persisted_previous_value(monkeypatch):
 
     assert result is True, f"Cross detection should trigger when previous (29) < 30 and current (31) > 30 (got {result})"
 
-    # Ensure Redis was updated with the new previous value
+    # Ensure Redis is updated with the new previous value at the next checkpoint
+    assert float(fake_redis.get("indicators_prev:BANKNIFTY:rsi_14")) == 29.0
+    assert monitor.checkpoint_previous_values() == 1
     pv = fake_redis.get("indicators_prev:BANKNIFTY:rsi_14")
     assert float(pv) == 31.0
 